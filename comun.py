@@ -0,0 +1,876 @@
+"""
+Estado, recursos y utilidades compartidas por las páginas de la app MUPAI.
+
+`streamlit_app.py` solo configura la página y enruta; cada archivo en
+`paginas/` importa de aquí lo que necesita, de modo que en cada rerun se
+ejecuta únicamente el código de la página activa.
+"""
+import streamlit as st
+from datetime import datetime
+import base64
+import smtplib
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+import os
+import random
+import string
+import sqlite3
+import time
+import uuid
+import logging
+
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from mupai import busqueda, digest, popularidad, sesiones, tokens
+from mupai.almacen import AlmacenEvaluaciones, normalizar_email
+from mupai.arquetipos import arquetipo_de, ruta_modelo
+from mupai.catalogo import GRUPOS_ALIMENTOS, OPCIONES
+from mupai.correo import crear_mensaje_resumen, PASSWORD_PENDIENTE
+from mupai.respuestas import CAMPOS, CAMPOS_LISTA, Respuestas
+from mupai.resumen import crear_resumen
+from mupai.validacion import (
+    datos_faltantes,
+    grupos_incompletos,
+    validar_paso,
+)
+from mupai.spool import SpoolCorreo, TrabajadorReenvio
+
+logger = logging.getLogger(__name__)
+
+# ==================== PÁGINAS ====================
+# Rutas relativas a streamlit_app.py, en el orden en que se desbloquean
+PAGINA_ACCESO = "paginas/acceso.py"
+PAGINA_DATOS_PERSONALES = "paginas/datos_personales.py"
+PAGINA_CUESTIONARIO = "paginas/cuestionario.py"
+PAGINA_RESULTADOS = "paginas/resultados.py"
+ORDEN_PAGINAS = [PAGINA_ACCESO, PAGINA_DATOS_PERSONALES, PAGINA_CUESTIONARIO, PAGINA_RESULTADOS]
+
+def pagina_de_etapa():
+    """Página que corresponde al avance actual del usuario"""
+    if not st.session_state.authenticated:
+        return PAGINA_ACCESO
+    if not st.session_state.datos_completos:
+        return PAGINA_DATOS_PERSONALES
+    if not st.session_state.get("correo_enviado", False):
+        return PAGINA_CUESTIONARIO
+    return PAGINA_RESULTADOS
+
+def pagina_permitida(pagina):
+    """Se puede volver a páginas ya desbloqueadas, pero no adelantarse ni regresar al acceso"""
+    etapa = pagina_de_etapa()
+    if pagina == PAGINA_ACCESO or etapa == PAGINA_ACCESO:
+        return pagina == etapa
+    return ORDEN_PAGINAS.index(pagina) <= ORDEN_PAGINAS.index(etapa)
+
+# ==================== ADAPTADOR DEL NÚCLEO (mupai) ====================
+# La validación y el resumen son funciones puras en mupai/ que reciben un
+# objeto Respuestas; aquí solo se toma una instantánea de st.session_state.
+
+def respuestas_actuales():
+    """Copia las respuestas de la sesión a un objeto Respuestas"""
+    return Respuestas.desde_mapeo(st.session_state)
+
+def crear_resumen_email():
+    r = respuestas_actuales()
+    return crear_resumen(r, cambios=cambios_evaluacion(), arquetipo=arquetipo_de(r, ruta_modelo(obtener_almacen().ruta)))
+
+# ==================== FUNCIONES DE VALIDACIÓN PROGRESIVA ====================
+
+def clave_checkbox(key, option):
+    """Key del widget de una opción dentro de la lista `key`"""
+    return f"{key}_{option.replace(' ', '_').replace('(', '').replace(')', '').replace('/', '_')}"
+
+def create_vertical_checkboxes(title, options, key, help_text=""):
+    """
+    Create vertical checkboxes for short option lists.
+    Returns the selected options as a list.
+    """
+    st.markdown(f"**{title}**")
+    if help_text:
+        st.info(f"💡 **Instrucción:** {help_text}")
+    
+    # Initialize session state for this key if it doesn't exist
+    if key not in st.session_state:
+        st.session_state[key] = []
+    
+    # Experimento de orden: las sesiones en la variante "popularidad" ven primero lo más elegido
+    if st.session_state.get("variante_orden") == popularidad.VARIANTE_POPULARIDAD:
+        ordenadas = popularidad.ordenar(key, options)
+        if ordenadas is not options:
+            st.caption("⭐ Ordenadas de las más a las menos elegidas por otros clientes")
+            options = ordenadas
+    
+    selected_options = []
+    
+    # Create checkboxes in a clean vertical layout
+    for option in options:
+        checkbox_key = clave_checkbox(key, option)
+        is_checked = st.checkbox(
+            option, 
+            key=checkbox_key, 
+            value=(option in st.session_state.get(key, []))
+        )
+        if is_checked:
+            selected_options.append(option)
+    
+    # Update session state
+    st.session_state[key] = selected_options
+    return selected_options
+
+# ==================== BÚSQUEDA DE OPCIONES POR PASO ====================
+# Listas del catálogo en las que busca el buscador de cada paso
+CLAVES_BUSQUEDA = {
+    1: GRUPOS_ALIMENTOS["Proteínas grasas"],
+    2: GRUPOS_ALIMENTOS["Proteínas magras"],
+    3: GRUPOS_ALIMENTOS["Proteína en polvo"],
+    4: GRUPOS_ALIMENTOS["Grasas saludables"],
+    5: GRUPOS_ALIMENTOS["Carbohidratos"],
+    6: GRUPOS_ALIMENTOS["Vegetales"],
+    7: GRUPOS_ALIMENTOS["Frutas"],
+    12: ("antojos_dulces", "antojos_salados", "antojos_comida_rapida", "antojos_bebidas", "antojos_picantes"),
+    15: ("condiciones_medicas",),
+}
+
+def _alternar_desde_busqueda(clave, opcion, clave_resultado):
+    """Marca o desmarca en la lista del paso la opción elegida en los resultados de búsqueda"""
+    seleccion = [o for o in st.session_state.get(clave, []) if o != opcion]
+    if st.session_state[clave_resultado]:
+        seleccion.append(opcion)
+    st.session_state[clave] = seleccion
+    # Sin estado propio, la casilla de la lista se vuelve a crear con el valor de `clave`
+    st.session_state.pop(clave_checkbox(clave, opcion), None)
+    st.session_state.busqueda_modifico = True
+
+@st.fragment
+def buscador_de_opciones(paso):
+    """
+    Caja de búsqueda sobre las listas del paso. Escribir solo vuelve a
+    ejecutar este fragmento; marcar un resultado actualiza toda la página.
+    """
+    consulta = st.text_input(
+        "🔎 Buscar en las opciones de este paso",
+        key=f"buscar_paso_{paso}",
+        placeholder="Escribe parte del nombre, con o sin acentos"
+    )
+    if st.session_state.pop("busqueda_modifico", False):
+        st.rerun()
+    if not consulta.strip():
+        return
+    resultados = busqueda.buscar(consulta, CLAVES_BUSQUEDA[paso])
+    if not resultados:
+        st.caption("Sin coincidencias en este paso")
+        return
+    for clave, opcion in resultados:
+        clave_resultado = f"buscar_paso_{paso}_{clave_checkbox(clave, opcion)}"
+        # El estado se toma siempre de la casilla de la lista, por si se cambió fuera del buscador
+        marcada = st.session_state.get(clave_checkbox(clave, opcion), opcion in st.session_state.get(clave, []))
+        st.session_state[clave_resultado] = marcada
+        st.checkbox(opcion, key=clave_resultado, on_change=_alternar_desde_busqueda, args=(clave, opcion, clave_resultado))
+
+def create_multiselect_with_bullet_list(title, options, key, help_text=""):
+    """
+    Create a multiselect with a bullet list above it for longer option lists.
+    Returns the selected options as a list.
+    """
+    st.markdown(f"**{title}**")
+    if help_text:
+        st.info(f"💡 **Instrucción:** {help_text}")
+    
+    # Display available options as a bullet list
+    st.markdown("**Opciones disponibles:**")
+    with st.expander("Ver todas las opciones disponibles", expanded=False):
+        for option in options:
+            st.markdown(f"• {option}")
+    
+    # Create the multiselect
+    selected = st.multiselect(
+        f"Selecciona de la lista de {len(options)} opciones:",
+        options,
+        key=key,
+        default=st.session_state.get(key, []),
+        placeholder=f"🔽 Haz clic para seleccionar de {len(options)} opciones disponibles"
+    )
+    
+    return selected
+
+def get_step_validator(step_number):
+    """Obtiene la función de validación para un paso específico"""
+    return lambda: validar_paso(step_number, respuestas_actuales())
+
+def validate_step_legacy(step_number):
+    """Función de compatibilidad que devuelve solo True/False para la UI de progreso"""
+    validator = get_step_validator(step_number)
+    is_valid, _ = validator()
+    return is_valid
+
+def iniciar_cronometro_paso():
+    """Marca el momento en que el paso actual se empezó a contestar (para el experimento de orden)"""
+    st.session_state.inicio_paso = time.monotonic()
+
+def registrar_tiempo_paso(paso):
+    """Registra cuánto tardó la sesión en el paso (solo la primera vez que lo completa) y reinicia el cronómetro"""
+    inicio = st.session_state.get("inicio_paso")
+    if inicio is not None and not st.session_state.step_completed.get(paso):
+        popularidad.registrar_tiempo_paso(st.session_state.variante_orden, paso, time.monotonic() - inicio)
+    iniciar_cronometro_paso()
+
+def advance_to_next_step():
+    """Avanza al siguiente paso si la validación es exitosa"""
+    current_step = st.session_state.get('current_step', 1)
+    validator = get_step_validator(current_step)
+    
+    is_valid, missing_items = validator()
+    
+    if is_valid:
+        registrar_tiempo_paso(current_step)
+        # Marcar el paso actual como completado
+        st.session_state.step_completed[current_step] = True
+        # Avanzar al siguiente paso
+        if current_step < 15:
+            st.session_state.current_step = current_step + 1
+            st.session_state.max_unlocked_step = max(st.session_state.max_unlocked_step, current_step + 1)
+        return True
+    else:
+        # Mostrar mensaje de error específico sobre los subgrupos/campos faltantes
+        if len(missing_items) == 1:
+            st.error(f"⚠️ **Para continuar, debes completar:** {missing_items[0]}")
+        else:
+            missing_list = "\n".join([f"• {item}" for item in missing_items])
+            st.error(f"⚠️ **Para continuar, debes completar los siguientes subgrupos/campos:**\n\n{missing_list}")
+        
+        st.info("💡 **Recuerda:** Si no consumes algo de una categoría, marca 'Ninguno'. Si un campo de texto no aplica, escribe 'No aplica'.")
+        return False
+
+def go_to_previous_step():
+    """Retrocede al paso anterior"""
+    current_step = st.session_state.get('current_step', 1)
+    if current_step > 1:
+        st.session_state.current_step = current_step - 1
+        iniciar_cronometro_paso()
+
+def generate_unique_code():
+    """Genera un código único de 6 caracteres alfanuméricos"""
+    return ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
+
+def enviar_email_solicitud_acceso(nombre, email, whatsapp, codigo):
+    """Envía email al administrador con la solicitud de acceso"""
+    try:
+        email_origen = "administracion@muscleupgym.fitness"
+        email_destino = "administracion@muscleupgym.fitness"
+        password = st.secrets.get("zoho_password", "TU_PASSWORD_AQUI")
+        
+        # Para desarrollo/testing, si no hay contraseña configurada, simular envío exitoso
+        if password == "TU_PASSWORD_AQUI":
+            import time
+            time.sleep(1)  # Simular tiempo de envío
+            st.warning("⚠️ **Modo de desarrollo:** Email simulado - configurar secrets para envío real")
+            return True
+
+        msg = MIMEMultipart()
+        msg['From'] = email_origen
+        msg['To'] = email_destino
+        msg['Subject'] = f"Solicitud de acceso MUPAI - {nombre}"
+
+        contenido = f"""
+NUEVA SOLICITUD DE ACCESO AL SISTEMA MUPAI
+==========================================
+
+Datos del solicitante:
+- Nombre: {nombre}
+- Correo electrónico: {email}
+- Número de WhatsApp: {whatsapp}
+- Código generado: {codigo}
+- Fecha de solicitud: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+
+Este código es de un solo uso y debe ser proporcionado al usuario para acceder al sistema.
+
+Sistema: MUPAI - Muscle Up Performance Assessment Intelligence
+"""
+
+        msg.attach(MIMEText(contenido, 'plain'))
+
+        server = smtplib.SMTP('smtp.zoho.com', 587)
+        server.starttls()
+        server.login(email_origen, password)
+        server.send_message(msg)
+        server.quit()
+
+        return True
+    except Exception as e:
+        st.error(f"Error al enviar solicitud: {str(e)}")
+        return False
+
+# Función para verificar datos completos
+def datos_completos_para_email():
+    return datos_faltantes(respuestas_actuales())
+
+def verificar_grupos_obligatorios_completos():
+    """Verifica que los grupos obligatorios (1-6) estén completados"""
+    return grupos_incompletos(respuestas_actuales())
+
+# ==================== ESTADO DE SESIÓN ====================
+# Widgets con key cuyo valor debe sobrevivir mientras su página no se muestra
+CLAVES_WIDGET_PERSISTENTES = ("acepto_descargo",)
+
+def inicializar_estado():
+    """Inicialización de estado de sesión robusta (solo una vez por sesión)"""
+    defaults = {
+        "datos_completos": False,
+        "correo_enviado": False,
+        "preferencias_alimentarias": {},
+        "restricciones_dieteticas": {},
+        "nombre": "",
+        "telefono": "",
+        "email_cliente": "",
+        "edad": "",
+        "sexo": "Hombre",
+        "fecha_llenado": datetime.now().strftime("%Y-%m-%d"),
+        "acepto_terminos": False,
+        # ============ NUEVA AUTENTICACIÓN SIMPLIFICADA - Variables ============
+        "authenticated": False,  # Usuario autenticado para acceder al cuestionario
+        "access_request_sent": False,  # Solicitud de acceso enviada
+        "access_code": "",  # Código único generado
+        "access_user_name": "",  # Nombre del usuario que solicita acceso
+        "access_user_email": "",  # Email del usuario que solicita acceso
+        "access_user_whatsapp": "",  # WhatsApp del usuario que solicita acceso
+        "code_used": False,  # Código ya utilizado
+        "access_stage": "request",  # Etapa actual: "request", "form", "code_sent", "authenticated"
+        # ============ FIN NUEVA AUTENTICACIÓN SIMPLIFICADA - Variables ============
+        # Variables para el flujo progresivo
+        "current_step": 1,
+        "step_completed": {
+            1: False,  # Proteínas grasas
+            2: False,  # Proteínas magras
+            3: False,  # Proteína en polvo
+            4: False,  # Grasas saludables (antes paso 3)
+            5: False,  # Carbohidratos (antes paso 4)
+            6: False,  # Vegetales (antes paso 5)
+            7: False,  # Frutas (antes paso 6)
+            8: False,  # Aceites de cocción (antes paso 7)
+            9: False,  # Bebidas (antes paso 8)
+            10: False,  # Métodos de cocción (antes paso 9)
+            11: False,  # Alergias/intolerancias (antes paso 10)
+            12: False,  # Antojos (antes paso 11)
+            13: False,  # Frecuencia de comidas (antes paso 12)
+            14: False,  # Sugerencias de menús (antes paso 13)
+            15: False   # Condiciones médicas y medicamentos
+        },
+        "max_unlocked_step": 1,
+        # Experimento A/B del orden de las listas largas y cronómetro del paso actual
+        "variante_orden": random.choice(popularidad.VARIANTES),
+        "inicio_paso": None,
+        # Paso 15: Condiciones médicas y medicamentos
+        "condiciones_medicas": [],
+        "condiciones_otras": "",
+        "consume_medicamentos": [],
+        "medicamentos_lista": "",
+        "consume_suplementos": [],
+        "suplementos_lista": ""
+    }
+    for k, v in defaults.items():
+        if k not in st.session_state:
+            st.session_state[k] = v
+    # Reasignar la clave desliga el valor del widget y evita que Streamlit lo borre al cambiar de página
+    for clave in CLAVES_WIDGET_PERSISTENTES:
+        if clave in st.session_state:
+            st.session_state[clave] = st.session_state[clave]
+
+# ==================== TOKENS DE ACCESO ====================
+# Al validar su código el cliente recibe un token firmado con vencimiento que
+# queda en la URL (?acceso=...). Con el mismo `token_secreto` en secrets,
+# cualquier réplica lo verifica sin estado compartido: un reinicio, un cambio
+# de réplica o recargar la página no lo regresan a pedir otro código. Para
+# rotar el secreto, el anterior va en `token_secretos_anteriores` mientras
+# vencen sus tokens. Sin `token_secreto` no se emiten tokens.
+PARAMETRO_TOKEN = "acceso"
+
+def secretos_token():
+    """Secretos con que se verifican los tokens; el primero es el que firma"""
+    secreto = st.secrets.get("token_secreto")
+    return [secreto, *st.secrets.get("token_secretos_anteriores", [])] if secreto else []
+
+def emitir_token_acceso():
+    """Emite el token de la sesión recién autenticada y lo deja en la URL"""
+    secretos = secretos_token()
+    if not secretos:
+        return
+    horas = float(st.secrets.get("token_horas", tokens.VIGENCIA_HORAS))
+    st.session_state.token_acceso = tokens.emitir(secretos[0], horas * 3600)
+    st.query_params[PARAMETRO_TOKEN] = st.session_state.token_acceso
+
+def autenticar_con_token():
+    """
+    Autentica la sesión con el token de la URL, si es válido y vigente, y
+    mantiene el token en la URL al cambiar de página (st.switch_page la limpia).
+    """
+    token = st.query_params.get(PARAMETRO_TOKEN)
+    if st.session_state.authenticated:
+        if st.session_state.get("token_acceso") and token != st.session_state.token_acceso:
+            st.query_params[PARAMETRO_TOKEN] = st.session_state.token_acceso
+        return
+    if not token:
+        return
+    if tokens.verificar(secretos_token(), token) is None:
+        del st.query_params[PARAMETRO_TOKEN]
+        return
+    st.session_state.authenticated = True
+    st.session_state.code_used = True
+    st.session_state.access_stage = "authenticated"
+    st.session_state.token_acceso = token
+
+# ==================== PLANTILLAS Y SECCIONES ESTÁTICAS ====================
+# El HTML estático vive en templates/ y se carga y arma una sola vez por proceso.
+DIRECTORIO_PLANTILLAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+TARJETAS_MISION = [
+    ("🎯 Misión",
+     "Hacer accesible la evaluación nutricional basada en ciencia, ofreciendo análisis de patrones alimentarios personalizados que se adaptan a todos los estilos de vida.",
+     "info"),
+    ("👁️ Visión",
+     "Ser el referente global en evaluación de patrones alimentarios digitales, uniendo investigación nutricional con experiencia práctica personalizada.",
+     "success"),
+    ("🤝 Compromiso",
+     "Nos guiamos por la ética, transparencia y precisión científica para ofrecer recomendaciones nutricionales reales, medibles y sostenibles.",
+     "warning"),
+]
+
+TARJETAS_DESCARGO = [
+    ("🔬 Naturaleza Científica",
+     "Esta herramienta proporciona estimaciones basadas en algoritmos científicos validados. Los resultados son orientativos y no constituyen un diagnóstico médico o nutricional.",
+     "info"),
+    ("⚕️ Limitaciones",
+     "No reemplaza la consulta con profesionales de la salud. Los cálculos pueden tener margen de error según la precisión de los datos ingresados.",
+     "warning"),
+    ("🎯 Uso Recomendado",
+     "Utiliza estos resultados como punto de partida informativo. Consulta con profesionales certificados antes de implementar cambios significativos.",
+     "success"),
+    ("📞 Responsabilidad",
+     "MUPAI y Muscle Up GYM no se hacen responsables por el uso inadecuado de esta información. El usuario asume la responsabilidad.",
+     "danger"),
+]
+
+@st.cache_resource
+def leer_plantilla(nombre):
+    """Lee un archivo de templates/ una sola vez por proceso"""
+    with open(os.path.join(DIRECTORIO_PLANTILLAS, nombre), encoding="utf-8") as f:
+        return f.read()
+
+# Tarjetas visuales robustas
+def crear_tarjeta(titulo, contenido, tipo="info"):
+    colores = {
+        "info": "var(--mupai-yellow)",
+        "success": "var(--mupai-success)",
+        "warning": "var(--mupai-warning)",
+        "danger": "var(--mupai-danger)"
+    }
+    color = colores.get(tipo, "var(--mupai-yellow)")
+    return leer_plantilla("tarjeta.html").format(titulo=titulo, contenido=contenido, color=color)
+
+@st.cache_resource
+def cargar_secciones_estaticas():
+    """Precalcula el HTML de las tarjetas, el descargo y la bienvenida"""
+    return {
+        "mision": [crear_tarjeta(*tarjeta) for tarjeta in TARJETAS_MISION],
+        "descargo": [crear_tarjeta(*tarjeta) for tarjeta in TARJETAS_DESCARGO],
+        "confirmacion_descargo": leer_plantilla("confirmacion_descargo.html"),
+        "bienvenida": leer_plantilla("bienvenida.html"),
+    }
+@st.cache_resource
+def cargar_encabezado():
+    """Codifica los logos una sola vez por proceso y arma el header principal"""
+    logos = {}
+    for clave, archivo in (("logo_mupai_b64", "LOGO MUPAI.png"), ("logo_gym_b64", "LOGO MUP.png")):
+        try:
+            with open(archivo, 'rb') as f:
+                logos[clave] = base64.b64encode(f.read()).decode()
+        except FileNotFoundError:
+            logos[clave] = ""
+    return leer_plantilla("encabezado.html").format(**logos)
+
+def aplicar_estilos():
+    """CSS principal, ocultamiento de elementos de GitHub/Fork y header con logos"""
+    st.markdown(leer_plantilla("estilos_base.html"), unsafe_allow_html=True)
+    st.markdown(leer_plantilla("estilos.html"), unsafe_allow_html=True)
+    st.markdown(leer_plantilla("ocultar_github.html"), unsafe_allow_html=True)
+    st.markdown(cargar_encabezado(), unsafe_allow_html=True)
+
+def mostrar_pie():
+    """Botón de nueva evaluación y footer de las páginas del cuestionario"""
+    # Limpieza de sesión y botón de nueva evaluación
+    if st.button("🔄 Nueva Evaluación", key="nueva"):
+        for key in list(st.session_state.keys()):
+            del st.session_state[key]
+        st.switch_page(PAGINA_ACCESO)
+
+    # Footer moderno
+    st.markdown("""
+<div class="footer-mupai">
+    <h4>MUPAI / Muscle up GYM Alimentary Pattern Assessment Intelligence</h4>
+    <span>Digital Nutrition Science</span>
+    <br>
+    <span>© 2025 MUPAI - Muscle up GYM / MUPAI</span>
+    <br>
+    <a href="https://muscleupgym.fitness" target="_blank">muscleupgym.fitness</a>
+</div>
+""", unsafe_allow_html=True)
+
+# ==================== ENTREGA DE CORREOS: SPOOL Y MODO DIGEST ====================
+# Todo correo de evaluación se guarda primero como .eml en el spool local
+# (datos/spool) y un trabajador en segundo plano lo envía cuando Zoho responde,
+# así finalizar la evaluación nunca depende de la latencia o disponibilidad de SMTP.
+# Con `digest_activo = true` en secrets, las evaluaciones sin condiciones médicas
+# se encolan y se envían consolidadas cada `digest_intervalo_minutos`.
+# Las evaluaciones urgentes (con condiciones médicas) se siguen enviando al momento.
+
+@st.cache_resource
+def obtener_trabajador_reenvio():
+    """Crea una sola vez por proceso el spool y el hilo que lo vacía por SMTP"""
+    password = st.secrets.get("zoho_password", PASSWORD_PENDIENTE)
+    trabajador = TrabajadorReenvio(SpoolCorreo(), password)
+    # Sin contraseña configurada (modo desarrollo) los correos solo quedan en el spool
+    if password != PASSWORD_PENDIENTE:
+        trabajador.start()
+    return trabajador
+
+def encolar_email_resumen(contenido, nombre_cliente, fecha, clave):
+    """Guarda el resumen en el spool de salida; el envío ocurre en segundo plano"""
+    try:
+        trabajador = obtener_trabajador_reenvio()
+        trabajador.spool.guardar(crear_mensaje_resumen(contenido, nombre_cliente, fecha), clave=clave)
+        trabajador.despertar()
+        return True
+    except (OSError, sqlite3.Error) as e:
+        st.error(f"Error al registrar el email: {str(e)}")
+        return False
+
+def digest_activo():
+    return bool(st.secrets.get("digest_activo", False))
+
+@st.cache_resource
+def iniciar_programador_digest():
+    """Arranca una sola vez por proceso el hilo que genera el digest"""
+    trabajador = obtener_trabajador_reenvio()
+    programador = digest.ProgramadorDigest(
+        trabajador.spool,
+        st.secrets.get("digest_intervalo_minutos", digest.INTERVALO_MINUTOS),
+        al_generar=trabajador.despertar
+    )
+    programador.start()
+    return programador
+
+def entregar_resumen_evaluacion(contenido):
+    """Encola el resumen en el digest o en el spool de envío inmediato si es urgente o el digest está apagado"""
+    if digest_activo() and not digest.es_urgente(st.session_state.get('condiciones_medicas', [])):
+        try:
+            digest.encolar_evaluacion(
+                contenido,
+                st.session_state.get('nombre', ''),
+                st.session_state.get('email_cliente', ''),
+                st.session_state.get('fecha_llenado', ''),
+                st.session_state.get('edad', ''),
+                st.session_state.get('telefono', '')
+            )
+            return True
+        except OSError as e:
+            st.error(f"Error al registrar la evaluación: {str(e)}")
+            return False
+    # La clave por evaluación evita duplicados si se intenta finalizar dos veces
+    if 'id_evaluacion' not in st.session_state:
+        st.session_state.id_evaluacion = uuid.uuid4().hex
+    return encolar_email_resumen(
+        contenido,
+        st.session_state.get('nombre', ''),
+        st.session_state.get('fecha_llenado', ''),
+        clave=f"evaluacion-{st.session_state.id_evaluacion}"
+    )
+
+def guardar_evaluacion():
+    """
+    Guarda la evaluación en el almacén (para precargarla cuando el cliente
+    regrese); al insertarla se calculan sus cambios frente a la anterior del
+    mismo cliente, que el resumen lee después sin recalcular nada.
+    """
+    if 'id_evaluacion' not in st.session_state:
+        st.session_state.id_evaluacion = uuid.uuid4().hex
+    try:
+        obtener_almacen().guardar(
+            AlmacenEvaluaciones.nuevo_registro(respuestas_actuales(), "app", None, st.session_state.id_evaluacion)
+        )
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("No se pudo guardar la evaluación en el almacén: %s", e)
+    # Un cuestionario sin terminar de una sesión anterior ya no tiene caso retomarlo
+    borrar_borradores_cliente()
+
+def cambios_evaluacion():
+    """Cambios precalculados de la evaluación guardada frente a la anterior del cliente, o None"""
+    if 'id_evaluacion' not in st.session_state:
+        return None
+    try:
+        return obtener_almacen().cambios(st.session_state.id_evaluacion)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("No se pudieron leer los cambios de la evaluación: %s", e)
+        return None
+
+def registrar_evaluacion_finalizada(resumen):
+    """
+    Guarda el resumen entregado junto a la evaluación, cierra el cronómetro
+    del último paso y suma sus selecciones a los contadores de popularidad.
+    """
+    registrar_tiempo_paso(15)
+    try:
+        obtener_almacen().actualizar_resumen(st.session_state.id_evaluacion, resumen)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("No se pudo guardar el resumen en el almacén: %s", e)
+    popularidad.registrar_evaluacion(respuestas_actuales(), st.session_state.id_evaluacion)
+
+# ==================== CLIENTES QUE REGRESAN ====================
+# Al registrar sus datos personales se busca la última evaluación del cliente
+# y se le ofrece precargar todas sus respuestas para que solo corrija lo que
+# cambió. Solo se busca por el email con que validó su código de acceso, y solo
+# si es el mismo que registró: un email o teléfono escrito a mano podría ser de
+# otra persona (y un teléfono puede ser compartido) y expondría sus respuestas.
+CAMPOS_PERSONALES = frozenset({"nombre", "telefono", "email_cliente", "edad", "sexo", "fecha_llenado"})
+
+@st.cache_resource
+def obtener_almacen():
+    """Almacén de evaluaciones del proceso (crea o migra la tabla una sola vez)"""
+    return AlmacenEvaluaciones()
+
+def email_verificado(valores=None):
+    """Email normalizado con que se validó el código de acceso, si coincide con el registrado; si no, None"""
+    valores = st.session_state if valores is None else valores
+    email = normalizar_email(valores.get("access_user_email"))
+    if not valores.get("authenticated") or email != normalizar_email(valores.get("email_cliente")):
+        return None
+    return email
+
+def buscar_evaluacion_previa():
+    """
+    Busca (una vez por sesión) lo que el cliente puede retomar: su cuestionario
+    sin terminar de una sesión desalojada, si es posterior a su última
+    evaluación, o si no esa evaluación para precargarla.
+    """
+    if "evaluacion_previa" in st.session_state:
+        return
+    email = email_verificado()
+    if email is None:
+        st.session_state.evaluacion_previa = None
+        return
+    try:
+        previa = obtener_almacen().ultima_de_cliente(email)
+        borrador = obtener_almacen().borrador_de_cliente(email)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("No se pudo buscar la evaluación previa: %s", e)
+        previa = borrador = None
+    if borrador and (previa is None or borrador["guardado"] > previa["recibido"]):
+        st.session_state.evaluacion_previa = {
+            "id": borrador["id"],
+            "fecha": datetime.fromtimestamp(borrador["guardado"]).strftime("%Y-%m-%d"),
+            "respuestas": borrador["respuestas"],
+            "progreso": borrador["progreso"],
+        }
+        return
+    st.session_state.evaluacion_previa = previa and {
+        "id": previa["id"],
+        "fecha": datetime.fromtimestamp(previa["recibido"]).strftime("%Y-%m-%d"),
+        "respuestas": previa["respuestas"],
+    }
+
+def borrar_borradores_cliente():
+    email = email_verificado()
+    if email is None:
+        return
+    try:
+        obtener_almacen().borrar_borradores(email)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("No se pudieron borrar los borradores del cliente: %s", e)
+
+def precargar_evaluacion_previa():
+    """Copia a la sesión las respuestas de la evaluación previa (salvo datos personales) y, si es un borrador, su avance"""
+    previa = st.session_state.evaluacion_previa
+    respuestas = previa["respuestas"]
+    for campo in CAMPOS:
+        valor = respuestas.get(campo)
+        if campo in CAMPOS_PERSONALES or valor in (None, ""):
+            continue
+        if campo in CAMPOS_LISTA:
+            # Opciones que ya no existen en el catálogo se descartan
+            valor = [opcion for opcion in valor if campo not in OPCIONES or opcion in OPCIONES[campo]]
+            # Sin estado propio, cada casilla se vuelve a crear con el valor precargado
+            for opcion in OPCIONES.get(campo, ()):
+                st.session_state.pop(clave_checkbox(campo, opcion), None)
+        st.session_state[campo] = valor
+    if "progreso" in previa:
+        progreso = previa["progreso"]
+        st.session_state.current_step = progreso["current_step"]
+        st.session_state.max_unlocked_step = progreso["max_unlocked_step"]
+        # JSON guarda las claves de los pasos como texto
+        st.session_state.step_completed = {int(paso): hecho for paso, hecho in progreso["step_completed"].items()}
+        borrar_borradores_cliente()
+    st.session_state.evaluacion_precargada = previa["id"]
+    st.session_state.evaluacion_previa = None
+
+def descartar_evaluacion_previa():
+    if "progreso" in st.session_state.evaluacion_previa:
+        borrar_borradores_cliente()
+    st.session_state.evaluacion_previa = None
+
+def ofrecer_evaluacion_previa():
+    """Aviso con la opción de precargar la evaluación anterior del cliente o su cuestionario sin terminar, si los hay"""
+    previa = st.session_state.get("evaluacion_previa")
+    if previa:
+        if "progreso" in previa:
+            st.info(
+                f"👋 **¡Bienvenido de nuevo!** Guardamos tu cuestionario sin terminar del {previa['fecha']} "
+                f"(ibas en el paso {previa['progreso']['current_step']}). Puedes continuar donde lo dejaste."
+            )
+            etiqueta = "📋 Continuar mi cuestionario"
+        else:
+            st.info(
+                f"👋 **¡Bienvenido de nuevo!** Encontramos tu evaluación del {previa['fecha']}. "
+                "Puedes precargar tus respuestas anteriores y solo cambiar lo que sea diferente."
+            )
+            etiqueta = "📋 Usar mis respuestas anteriores"
+        col1, col2 = st.columns(2)
+        col1.button(etiqueta, key="precargar_previa", on_click=precargar_evaluacion_previa)
+        col2.button("✨ Empezar de cero", key="descartar_previa", on_click=descartar_evaluacion_previa)
+    elif st.session_state.get("evaluacion_precargada"):
+        st.caption("📋 Respuestas precargadas de tu evaluación anterior: revisa cada paso y cambia lo que sea diferente.")
+
+# ==================== MEMORIA DE SESIONES Y DESALOJO ====================
+# Cada rerun anota la sesión con el tamaño aproximado de su estado. Un hilo
+# desaloja las sesiones sin actividad por más de `sesion_ttl_minutos`
+# (secrets): vuelca al almacén de borradores el cuestionario a medias y vacía
+# su estado; el cliente lo retoma al volver a registrar sus datos con el mismo
+# email con que validó su acceso. Con `panel_instrumentacion = true` en
+# secrets la barra lateral muestra la cuenta.
+CLAVES_PROGRESO = ("current_step", "max_unlocked_step", "step_completed")
+CLAVES_CASILLA = frozenset(clave_checkbox(clave, opcion) for clave, opciones in OPCIONES.items() for opcion in opciones)
+
+def _tipo_clave(clave, valor):
+    if clave in CLAVES_CASILLA:
+        return "casillas"
+    if isinstance(valor, (list, tuple, set, dict)):
+        return "listas"
+    if isinstance(valor, str):
+        return "textos"
+    return "otros"
+
+@st.cache_resource
+def obtener_registro_sesiones():
+    """Registro de sesiones del proceso, compartido con el hilo que las desaloja"""
+    return sesiones.RegistroSesiones()
+
+def comenzar_rerun():
+    """Anota que empieza un rerun de la sesión actual: el desalojo no la toca hasta `terminar_rerun`"""
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    obtener_registro_sesiones().comenzar(ctx.session_id, ctx.session_state)
+
+def terminar_rerun():
+    """Anota el fin del rerun de la sesión actual con la memoria que ocupa su estado"""
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    cuenta = sesiones.contabilizar(ctx.session_state.filtered_state, _tipo_clave)
+    obtener_registro_sesiones().terminar(ctx.session_id, cuenta)
+
+def sesion_activa(identificador):
+    """False si el servidor de Streamlit ya cerró la sesión (sin runtime, como en pruebas, no se sabe: True)"""
+    if not runtime.exists():
+        return True
+    return runtime.get_instance().is_active_session(identificador)
+
+def _email_borrador(valores):
+    """Email verificado con que se guarda el borrador de una sesión inactiva, o None si no hay nada que guardar"""
+    # Sin email verificado el borrador no se podría ofrecer a su dueño con seguridad
+    email = email_verificado(valores)
+    if email and valores.get("datos_completos") and not valores.get("correo_enviado"):
+        return email
+    return None
+
+def respaldar_sesion(almacen, identificador, estado):
+    """Guarda como borrador el cuestionario a medias de una sesión inactiva (sin tocar su estado)"""
+    valores = estado.filtered_state
+    email = _email_borrador(valores)
+    if email:
+        progreso = {clave: valores[clave] for clave in CLAVES_PROGRESO}
+        almacen.guardar_borrador(identificador, email, Respuestas.desde_mapeo(valores), progreso)
+
+def vaciar_sesion(identificador, estado):
+    """Vacía el estado de una sesión desalojada; el registro lo llama solo si no tiene un rerun en curso"""
+    valores = estado.filtered_state
+    guardado = _email_borrador(valores) is not None
+    for clave in valores:
+        try:
+            del estado[clave]
+        except KeyError:
+            pass
+    # Al volver, se le avisa al cliente por qué empieza de nuevo
+    estado["sesion_desalojada"] = "borrador" if guardado else "vacia"
+
+@st.cache_resource
+def iniciar_desalojo_sesiones():
+    """Arranca una sola vez por proceso el hilo que desaloja las sesiones inactivas"""
+    almacen = obtener_almacen()
+    desalojador = sesiones.DesalojadorSesiones(
+        obtener_registro_sesiones(),
+        lambda identificador, estado: respaldar_sesion(almacen, identificador, estado),
+        vaciar_sesion,
+        st.secrets.get("sesion_ttl_minutos", sesiones.TTL_MINUTOS),
+        activa=sesion_activa
+    )
+    desalojador.start()
+    return desalojador
+
+def avisar_sesion_desalojada():
+    """Aviso (una vez) para quien regresa a una sesión que se desalojó por inactividad"""
+    motivo = st.session_state.pop("sesion_desalojada", None)
+    if motivo == "borrador":
+        st.info(
+            "⏳ Tu sesión se cerró por inactividad. Guardamos tu cuestionario: "
+            "al registrar de nuevo tus datos podrás continuar donde lo dejaste."
+        )
+    elif motivo:
+        st.info("⏳ Tu sesión se cerró por inactividad.")
+
+def panel_instrumentacion_activo():
+    return bool(st.secrets.get("panel_instrumentacion", False))
+
+def mostrar_panel_instrumentacion():
+    """Memoria de la sesión actual y de todas las del proceso, en la barra lateral"""
+    registro = obtener_registro_sesiones()
+    ctx = get_script_run_ctx()
+    propia = ctx and registro.cuenta(ctx.session_id)
+    totales = registro.totales()
+    with st.sidebar.expander("📊 Instrumentación", expanded=False):
+        st.markdown("**Sesiones del proceso**")
+        st.caption(
+            f"{totales['sesiones']} en memoria · {totales['bytes'] / 1e6:.1f} MB · "
+            f"{totales['desalojadas']} desalojadas por inactividad"
+        )
+        if propia:
+            st.markdown("**Esta sesión**")
+            st.caption(f"{propia['claves']} claves · {propia['bytes'] / 1024:.0f} KB")
+            st.caption(" · ".join(
+                f"{tipo}: {grupo['claves']} ({grupo['bytes'] / 1024:.0f} KB)"
+                for tipo, grupo in sorted(propia["por_tipo"].items())
+            ))
+            st.caption("Más pesadas: " + ", ".join(f"{clave} ({tamano / 1024:.1f} KB)" for clave, tamano in propia["mayores"]))
+
+def iniciar_servicios_correo():
+    """Arranca (una vez por proceso) el trabajador del spool y, si aplica, el digest"""
+    obtener_trabajador_reenvio()
+    if digest_activo():
+        iniciar_programador_digest()
+
+def iniciar_servicios_sesion():
+    """
+    Anota el inicio del rerun de la sesión actual y arranca (una vez por
+    proceso) el desalojo de sesiones inactivas; va antes de leer el estado y
+    el script debe llamar `terminar_rerun` al final (en un `finally`)
+    """
+    comenzar_rerun()
+    iniciar_desalojo_sesiones()
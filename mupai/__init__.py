@@ -0,0 +1 @@
+"""Módulos de soporte de MUPAI - Evaluación de Patrones Alimentarios."""
@@ -0,0 +1,149 @@
+"""
+Índice invertido de alergias, intolerancias y condiciones médicas → alimentos
+del catálogo.
+
+Las reglas (subgrupos completos y palabras en el nombre del alimento) se
+evalúan una sola vez al importar contra todo el catálogo. Después, saber qué
+alimentos excluir es una unión de conjuntos ya calculados y detectar un
+conflicto (p. ej. "Camarón" marcado junto con alergia a mariscos) solo
+recorre lo que el cliente seleccionó.
+"""
+import re
+
+from mupai.catalogo import GRUPOS_ALIMENTOS, OPCIONES, OPCIONES_NINGUNO
+
+# Preguntas del catálogo cuyas opciones son alimentos o bebidas que se consumen
+CLAVES_ALIMENTOS = tuple(clave for claves in GRUPOS_ALIMENTOS.values() for clave in claves) + ("bebidas_sin_calorias",)
+
+# Alimentos relacionados con cada alergia, intolerancia o condición médica:
+# los subgrupos indicados completos y los alimentos con alguna palabra que
+# empiece así (expresión regular, sin distinguir mayúsculas), salvo excepciones.
+# Una misma opción ("Gluten") vale igual como alergia o como intolerancia.
+REGLAS = {
+    # Alergias alimentarias (paso 11)
+    "Lácteos": {
+        "claves": ("quesos_grasos", "quesos_magros", "lacteos_enteros"),
+        "palabras": ("queso", "leche", "yogur", "crema", "nata", "requesón", "mantequilla con sal",
+                     "mantequilla sin sal", "ghee", "whey", r"suero\b", "caseína", "caseinato"),
+        "excepto": ("almendra", "coco", "soya"),
+    },
+    "Huevo": {"palabras": ("huevo", "clara", "albúmina")},
+    "Frutos secos": {
+        "palabras": ("almendra", "nuez", "nueces", "pistache", "cacahuate", "maní"),
+    },
+    "Mariscos": {
+        "claves": ("mariscos_grasos", "mariscos_magros"),
+        "palabras": ("camarón", "langost", "cangrejo", "jaiba", "ostra", "ostion", "almeja", "mejillon"),
+    },
+    "Pescado": {
+        "claves": ("pescados_grasos", "pescados_magros"),
+        "palabras": ("atún", "salmón", "sardina", "anchov"),
+    },
+    "Gluten": {
+        "palabras": ("trigo", "espagueti", "macarrones", "penne", "coditos", "lasaña", "cuscús", "bulgur",
+                     r"pan\b", "harina", "ramen", "granola", "avena", "cereal integral"),
+        "excepto": ("sin gluten",),
+    },
+    "Soya": {"palabras": ("soya", "edamame")},
+    "Semillas": {"palabras": ("semilla", "chía", "linaza", "tahini", "ajonjolí", "girasol", "pepitas")},
+    # Intolerancias digestivas (paso 11)
+    "Lácteos con lactosa": {
+        "claves": ("lacteos_enteros",),
+        "palabras": ("leche", "yogur", "crema", "nata", "queso crema", "queso para untar", "requesón",
+                     "queso cottage", "queso ricotta", "queso panela", "queso doble crema", "queso oaxaca",
+                     "concentrado de suero", "mezcla de concentrado"),
+        "excepto": ("almendra", "coco", "soya", "deslactosada"),
+    },
+    "Leguminosas": {
+        "claves": ("leguminosas",),
+        "palabras": ("frijol", "lenteja", "garbanzo", r"habas\b", "soya", "edamame", "hummus", "guisante",
+                     "chícharo", "cacahuate", "maní"),
+    },
+    "FODMAPs": {
+        "palabras": (r"ajo\b", "ajillo", "cebolla", "cebollín", "puerro", "manzana", "pera", "mango", "sandía", "coliflor",
+                     "champiñon", "espárrago", "frijol", "lenteja", "garbanzo", "leche entera", "yogur entero",
+                     "trigo", "pasta de legumbres", "ciruela", "durazno", "nectarina", "cereza", "higo"),
+    },
+    "Endulzantes artificiales": {"palabras": ("refrescos sin calorías", "bebidas con electrolitos sin azúcar")},
+    "Crucíferas": {
+        "palabras": ("brócoli", "coliflor", r"col\b", "repollo", "kale", "rábano", "berros", "rúcula"),
+    },
+    # Condiciones médicas (paso 15)
+    "Gota (ácido úrico elevado)": {
+        "claves": ("organos_grasos", "organos_magros", "mariscos_grasos", "mariscos_magros"),
+        "palabras": ("sardina", "anchov", "arenque", "macarela", "trucha"),
+    },
+    "Embarazo": {
+        "palabras": ("hígado", "sesos", "pez espada", "queso brie", "queso camembert", "queso roquefort",
+                     "tuétano"),
+    },
+    "Lactancia": {"palabras": ("pez espada",)},
+    "Enfermedad renal crónica": {
+        "palabras": ("jamón", "salami", "chorizo", "salchicha", "mortadela", "pepperoni", "pastrami",
+                     "longaniza", "tocino", "aceitunas", "ramen"),
+    },
+}
+
+# Motivos que se revisan como conflicto en el paso 11 (lo declarado como alergia o intolerancia)
+MOTIVOS_CONFLICTO = frozenset(
+    opcion for clave in ("alergias_alimentarias", "intolerancias_digestivas")
+    for opcion in OPCIONES[clave] if opcion in REGLAS
+)
+
+
+def _patron(palabras):
+    return re.compile(r"\b(?:" + "|".join(palabras) + ")", re.IGNORECASE) if palabras else None
+
+
+def alimentos_de_regla(regla):
+    """{(clave, opción)} del catálogo que cumplen una regla (subgrupos completos, palabras y excepciones)"""
+    claves = regla.get("claves", ())
+    palabras, excepciones = _patron(regla.get("palabras")), _patron(regla.get("excepto"))
+    return frozenset(
+        (clave, opcion)
+        for clave in CLAVES_ALIMENTOS
+        for opcion in OPCIONES[clave]
+        if opcion not in OPCIONES_NINGUNO
+        and not (excepciones and excepciones.search(opcion))
+        and (clave in claves or (palabras and palabras.search(opcion)))
+    )
+
+
+def _construir_indice():
+    return {motivo: alimentos_de_regla(regla) for motivo, regla in REGLAS.items()}
+
+
+# motivo → {(clave, opción)} con todos los alimentos del catálogo que le afectan
+INDICE = _construir_indice()
+
+
+def motivos_declarados(r, incluir_condiciones=True):
+    """Alergias, intolerancias (y condiciones médicas) declaradas que tienen regla en el índice"""
+    motivos = (r.alergias_alimentarias or []) + (r.intolerancias_digestivas or [])
+    if incluir_condiciones:
+        motivos = motivos + (r.condiciones_medicas or [])
+    return [motivo for motivo in dict.fromkeys(motivos) if motivo in INDICE]
+
+
+def alimentos_excluidos(r, incluir_condiciones=True):
+    """Conjunto de (clave, opción) que el cliente no debe recibir según lo que declaró"""
+    return frozenset().union(*(INDICE[motivo] for motivo in motivos_declarados(r, incluir_condiciones)))
+
+
+def conflictos(r):
+    """
+    Alimentos seleccionados que chocan con una alergia o intolerancia declarada,
+    como lista de {"motivo", "alimentos"} en el orden en que se declararon.
+    """
+    motivos = [m for m in motivos_declarados(r, incluir_condiciones=False) if m in MOTIVOS_CONFLICTO]
+    if not motivos:
+        return []
+    seleccionados = [
+        (clave, opcion) for clave in CLAVES_ALIMENTOS for opcion in getattr(r, clave, None) or ()
+    ]
+    resultado = []
+    for motivo in motivos:
+        alimentos = [opcion for clave, opcion in seleccionados if (clave, opcion) in INDICE[motivo]]
+        if alimentos:
+            resultado.append({"motivo": motivo, "alimentos": list(dict.fromkeys(alimentos))})
+    return resultado
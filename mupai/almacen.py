@@ -0,0 +1,501 @@
+"""
+Almacén local de evaluaciones recibidas (SQLite en modo WAL).
+
+Las escrituras se hacen por lotes en una sola transacción: quien recibe
+muchas evaluaciones (la API o el procesamiento en lote) las agrupa y llama a
+`guardar_lote`, en lugar de abrir una transacción por evaluación. En esa misma
+transacción se calculan los cambios de cada evaluación nueva frente a la
+anterior del mismo cliente (ver `mupai.cambios`), para que el resumen y la
+API solo tengan que leerlos, y se indexan sus textos libres en FTS5 (ver
+`mupai.textos`). Las respuestas y el resumen se guardan comprimidos con un
+diccionario zstd (ver `mupai.compresion`); leerlos los descomprime.
+
+La tabla `borradores` guarda cuestionarios sin terminar de sesiones
+desalojadas por inactividad (ver `mupai.sesiones`), para ofrecerlos al
+cliente cuando regrese; se buscan solo por el email verificado en el acceso.
+"""
+import json
+import os
+import re
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+
+from mupai.cambios import diferencias
+from mupai.compresion import MIN_MUESTRAS, MUESTRAS_ENTRENAMIENTO, SIN_DICCIONARIO, Compresion, diccionario_de, entrenar
+from mupai.textos import CAMPOS_TEXTO_LIBRE, consulta_fts
+
+RUTA_ALMACEN = os.path.join("datos", "evaluaciones.sqlite")
+# Los teléfonos se comparan por sus últimos 10 dígitos (sin lada internacional ni separadores)
+DIGITOS_TELEFONO = 10
+
+
+def normalizar_email(email):
+    return (email or "").strip().lower() or None
+
+
+def normalizar_telefono(telefono):
+    digitos = re.sub(r"[^0-9]", "", str(telefono or ""))
+    return digitos[-DIGITOS_TELEFONO:] if len(digitos) >= DIGITOS_TELEFONO else None
+
+
+class AlmacenEvaluaciones:
+    """Evaluaciones completas con sus respuestas (JSON) y el resumen generado"""
+
+    def __init__(self, ruta=RUTA_ALMACEN):
+        self.ruta = ruta
+        self.compresion = Compresion(self._leer_diccionario)
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        with closing(self._conectar()) as con, con:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS evaluaciones (
+                    id TEXT PRIMARY KEY,
+                    recibido REAL NOT NULL,
+                    origen TEXT NOT NULL,
+                    nombre TEXT,
+                    email TEXT,
+                    respuestas TEXT NOT NULL,
+                    resumen TEXT,
+                    telefono TEXT
+                )
+            """)
+            columnas = {fila[1] for fila in con.execute("PRAGMA table_info(evaluaciones)")}
+            if "telefono" not in columnas:
+                self._agregar_telefono(con)
+            con.execute("CREATE INDEX IF NOT EXISTS evaluaciones_email ON evaluaciones (email, recibido)")
+            con.execute("CREATE INDEX IF NOT EXISTS evaluaciones_telefono ON evaluaciones (telefono, recibido)")
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS cambios (
+                    id TEXT PRIMARY KEY,
+                    anterior TEXT NOT NULL,
+                    diferencias TEXT NOT NULL
+                )
+            """)
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS diccionarios (
+                    id INTEGER PRIMARY KEY,
+                    datos BLOB NOT NULL,
+                    creado REAL NOT NULL
+                )
+            """)
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS borradores (
+                    id TEXT PRIMARY KEY,
+                    guardado REAL NOT NULL,
+                    email TEXT NOT NULL,
+                    respuestas BLOB NOT NULL,
+                    progreso TEXT NOT NULL
+                )
+            """)
+            con.execute("CREATE INDEX IF NOT EXISTS borradores_email ON borradores (email, guardado)")
+            con.execute("CREATE INDEX IF NOT EXISTS borradores_guardado ON borradores (guardado)")
+            # El índice de textos se llenaba con un trigger que no puede leer respuestas comprimidas
+            con.execute("DROP TRIGGER IF EXISTS evaluaciones_textos")
+            existe = con.execute("SELECT 1 FROM sqlite_master WHERE name = 'textos_libres'").fetchone()
+            if not existe:
+                self._crear_indice_textos(con)
+
+    @staticmethod
+    def _crear_indice_textos(con):
+        """Índice FTS5 de los textos libres (rowid = rowid de la evaluación) y su llenado inicial"""
+        columnas = ", ".join(CAMPOS_TEXTO_LIBRE)
+        valores = ", ".join(f"json_extract(respuestas, '$.{campo}')" for campo in CAMPOS_TEXTO_LIBRE)
+        con.execute(
+            f"CREATE VIRTUAL TABLE textos_libres USING fts5({columnas}, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '3')"
+        )
+        # Solo puede haber texto sin comprimir en almacenes anteriores al índice
+        con.execute(
+            f"INSERT INTO textos_libres (rowid, {columnas}) SELECT rowid, {valores} FROM evaluaciones "
+            "WHERE typeof(respuestas) = 'text'"
+        )
+
+    @staticmethod
+    def _agregar_telefono(con, tamano=500):
+        """Migra almacenes anteriores: columna de teléfono normalizado, llenada desde las respuestas guardadas"""
+        con.execute("ALTER TABLE evaluaciones ADD COLUMN telefono TEXT")
+        desde = 0
+        while True:
+            filas = con.execute(
+                "SELECT rowid, json_extract(respuestas, '$.telefono') FROM evaluaciones "
+                "WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (desde, tamano)
+            ).fetchall()
+            if not filas:
+                return
+            con.executemany(
+                "UPDATE evaluaciones SET telefono = ? WHERE rowid = ?",
+                [(normalizar_telefono(telefono), rowid) for rowid, telefono in filas if normalizar_telefono(telefono)]
+            )
+            desde = filas[-1][0]
+
+    def _conectar(self):
+        con = sqlite3.connect(self.ruta, timeout=30)
+        # En WAL, NORMAL solo puede perder la última transacción ante un corte de energía, nunca corromper
+        con.execute("PRAGMA synchronous=NORMAL")
+        return con
+
+    @staticmethod
+    def nuevo_registro(respuestas, origen, resumen=None, identificador=None):
+        """Arma la fila a guardar a partir de un objeto Respuestas"""
+        return (
+            identificador or uuid.uuid4().hex,
+            time.time(),
+            origen,
+            respuestas.nombre,
+            normalizar_email(respuestas.email_cliente),
+            json.dumps(respuestas.a_dict(), ensure_ascii=False, default=str),
+            resumen,
+            normalizar_telefono(respuestas.telefono),
+        )
+
+    def guardar_lote(self, registros, tamano=500):
+        """
+        Guarda varios registros en una sola transacción, comprimidos, con sus
+        textos libres indexados y sus cambios frente a la evaluación anterior;
+        ids repetidos (ya guardados o dentro del lote) se ignoran.
+        """
+        with closing(self._conectar()) as con, con:
+            nuevos = {}
+            for registro in registros:
+                nuevos.setdefault(registro[0], registro)
+            for i in range(0, len(nuevos), tamano):
+                ids = list(nuevos)[i:i + tamano]
+                for (identificador,) in con.execute(
+                    f"SELECT id FROM evaluaciones WHERE id IN ({', '.join('?' * len(ids))})", ids
+                ):
+                    del nuevos[identificador]
+            nuevos = [(registro, json.loads(registro[5])) for registro in nuevos.values()]
+
+            diccionario = self._diccionario_actual(con)
+            con.executemany(
+                "INSERT OR IGNORE INTO evaluaciones (id, recibido, origen, nombre, email, respuestas, resumen, telefono) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (*registro[:5], self.compresion.comprimir(registro[5], diccionario),
+                     self.compresion.comprimir(registro[6], diccionario), registro[7])
+                    for registro, _ in nuevos
+                ]
+            )
+            self._indexar_textos(con, nuevos)
+            self._guardar_cambios(con, nuevos)
+        return len(registros)
+
+    @staticmethod
+    def _indexar_textos(con, nuevos):
+        columnas = ", ".join(CAMPOS_TEXTO_LIBRE)
+        con.executemany(
+            f"INSERT INTO textos_libres (rowid, {columnas}) "
+            f"SELECT rowid, {', '.join('?' * len(CAMPOS_TEXTO_LIBRE))} FROM evaluaciones WHERE id = ?",
+            [
+                (*(None if datos.get(campo) is None else str(datos[campo]) for campo in CAMPOS_TEXTO_LIBRE), registro[0])
+                for registro, datos in nuevos
+            ]
+        )
+
+    def _guardar_cambios(self, con, nuevos):
+        """Cambios de cada (registro, respuestas) frente a la evaluación previa del mismo cliente; los ya calculados se conservan"""
+        filas = []
+        for (identificador, recibido, _, _, email, _, _, telefono), datos in nuevos:
+            anterior = self._ultima(con, email, telefono, antes_de=recibido, excluir=identificador)
+            if anterior is not None:
+                cambios = diferencias(json.loads(self.compresion.descomprimir(anterior[5])), datos)
+                filas.append((identificador, anterior[0], json.dumps(cambios, ensure_ascii=False)))
+        con.executemany("INSERT OR IGNORE INTO cambios (id, anterior, diferencias) VALUES (?, ?, ?)", filas)
+        return len(filas)
+
+    def _leer_diccionario(self, identificador):
+        with closing(self._conectar()) as con:
+            fila = con.execute("SELECT datos FROM diccionarios WHERE id = ?", (identificador,)).fetchone()
+        if fila is None:
+            raise LookupError(f"El almacén no tiene el diccionario zstd {identificador}")
+        return fila[0]
+
+    @staticmethod
+    def _diccionario_actual(con):
+        fila = con.execute("SELECT id FROM diccionarios ORDER BY creado DESC LIMIT 1").fetchone()
+        return fila[0] if fila else SIN_DICCIONARIO
+
+    def guardar_diccionario(self, identificador, datos):
+        """Registra un diccionario zstd; las escrituras siguientes usan el más reciente"""
+        with closing(self._conectar()) as con, con:
+            con.execute(
+                "INSERT OR REPLACE INTO diccionarios (id, datos, creado) VALUES (?, ?, ?)",
+                (identificador, datos, time.time())
+            )
+
+    def entrenar_diccionario(self, muestras=MUESTRAS_ENTRENAMIENTO):
+        """Entrena y registra un diccionario con las evaluaciones más recientes; retorna su id o None si hay pocas"""
+        registros = self.recientes(muestras)
+        if len(registros) < MIN_MUESTRAS:
+            return None
+        identificador, datos = entrenar([texto for registro in registros for texto in registro[5:7] if texto])
+        self.guardar_diccionario(identificador, datos)
+        return identificador
+
+    def recientes(self, n):
+        """Las n evaluaciones más recientes como registros (respuestas y resumen descomprimidos), la más nueva primero"""
+        with closing(self._conectar()) as con:
+            filas = con.execute(
+                "SELECT id, recibido, origen, nombre, email, respuestas, resumen, telefono FROM evaluaciones "
+                "ORDER BY rowid DESC LIMIT ?",
+                (n,)
+            ).fetchall()
+        return [
+            (*fila[:5], self.compresion.descomprimir(fila[5]), self.compresion.descomprimir(fila[6]), fila[7])
+            for fila in filas
+        ]
+
+    def recomprimir(self, tamano=500):
+        """Reescribe las respuestas y resúmenes con el diccionario más reciente y compacta el archivo; retorna cuántas reescribió"""
+        total, desde = 0, 0
+        with closing(self._conectar()) as con:
+            diccionario = self._diccionario_actual(con)
+            while True:
+                with con:
+                    filas = con.execute(
+                        "SELECT rowid, respuestas, resumen FROM evaluaciones WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                        (desde, tamano)
+                    ).fetchall()
+                    if not filas:
+                        break
+                    cambios = [
+                        (self._recomprimido(respuestas, diccionario), self._recomprimido(resumen, diccionario), rowid)
+                        for rowid, respuestas, resumen in filas
+                        if diccionario_de(respuestas) != diccionario
+                    ]
+                    con.executemany("UPDATE evaluaciones SET respuestas = ?, resumen = ? WHERE rowid = ?", cambios)
+                total += len(cambios)
+                desde = filas[-1][0]
+            con.execute("VACUUM")
+            # En WAL el VACUUM se escribe primero al -wal; el checkpoint lo vuelca y lo trunca
+            con.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return total
+
+    def _recomprimido(self, valor, diccionario):
+        return self.compresion.comprimir(self.compresion.descomprimir(valor), diccionario)
+
+    def tamano_en_disco(self):
+        return sum(os.path.getsize(self.ruta + sufijo) for sufijo in ("", "-wal") if os.path.exists(self.ruta + sufijo))
+
+    def recalcular_cambios(self, tamano=500):
+        """
+        Calcula los cambios de las evaluaciones guardadas antes de existir la
+        tabla, o cuya anterior ya no es del mismo cliente según `_ultima` (p. ej.
+        emparejadas solo por un teléfono compartido); retorna cuántas tienen anterior.
+        """
+        total, desde = 0, 0
+        with closing(self._conectar()) as con, con:
+            con.execute(
+                "DELETE FROM cambios WHERE id IN ("
+                "SELECT c.id FROM cambios c JOIN evaluaciones e ON e.id = c.id JOIN evaluaciones a ON a.id = c.anterior "
+                "WHERE CASE WHEN e.email IS NOT NULL THEN a.email IS NOT e.email "
+                "ELSE a.email IS NOT NULL OR a.telefono IS NOT e.telefono END)"
+            )
+            while True:
+                filas = con.execute(
+                    "SELECT rowid, id, recibido, origen, nombre, email, respuestas, resumen, telefono FROM evaluaciones "
+                    "WHERE rowid > ? AND id NOT IN (SELECT id FROM cambios) ORDER BY rowid LIMIT ?",
+                    (desde, tamano)
+                ).fetchall()
+                if not filas:
+                    return total
+                total += self._guardar_cambios(
+                    con, [(fila[1:], json.loads(self.compresion.descomprimir(fila[6]))) for fila in filas]
+                )
+                desde = filas[-1][0]
+
+    def actualizar_resumen(self, identificador, resumen):
+        with closing(self._conectar()) as con, con:
+            con.execute(
+                "UPDATE evaluaciones SET resumen = ? WHERE id = ?",
+                (self.compresion.comprimir(resumen, self._diccionario_actual(con)), identificador)
+            )
+
+    def guardar(self, registro):
+        return self.guardar_lote([registro])
+
+    def obtener(self, identificador):
+        with closing(self._conectar()) as con:
+            fila = con.execute(
+                "SELECT id, recibido, origen, nombre, email, respuestas, resumen FROM evaluaciones WHERE id = ?",
+                (identificador,)
+            ).fetchone()
+        return self._evaluacion(fila)
+
+    def ultima_de_cliente(self, email=None, telefono=None):
+        """Evaluación más reciente del mismo cliente (ver `_ultima`), o None"""
+        with closing(self._conectar()) as con:
+            fila = self._ultima(con, normalizar_email(email), normalizar_telefono(telefono))
+        return self._evaluacion(fila)
+
+    @staticmethod
+    def _ultima(con, email, telefono, antes_de=None, excluir=None):
+        """
+        Fila más reciente de un cliente (email o teléfono ya normalizados),
+        opcionalmente anterior a `antes_de`. Con email se busca solo por email:
+        un teléfono compartido (casa, gimnasio) no debe mezclar a dos personas.
+        El teléfono solo identifica entre evaluaciones que no tienen email.
+        """
+        if email:
+            condicion, parametros = "email = ?", [email]
+        elif telefono:
+            condicion, parametros = "telefono = ? AND email IS NULL", [telefono]
+        else:
+            return None
+        if antes_de is not None:
+            condicion += " AND recibido <= ?"
+            parametros.append(antes_de)
+        if excluir is not None:
+            condicion += " AND id != ?"
+            parametros.append(excluir)
+        return con.execute(
+            "SELECT id, recibido, origen, nombre, email, respuestas, resumen FROM evaluaciones "
+            f"WHERE {condicion} ORDER BY recibido DESC LIMIT 1",
+            parametros
+        ).fetchone()
+
+    def guardar_borrador(self, identificador, email, respuestas, progreso):
+        """Guarda (o reemplaza) el cuestionario sin terminar de una sesión: email verificado, Respuestas y avance"""
+        with closing(self._conectar()) as con, con:
+            con.execute(
+                "INSERT OR REPLACE INTO borradores (id, guardado, email, respuestas, progreso) VALUES (?, ?, ?, ?, ?)",
+                (
+                    identificador,
+                    time.time(),
+                    normalizar_email(email),
+                    self.compresion.comprimir(
+                        json.dumps(respuestas.a_dict(), ensure_ascii=False, default=str), self._diccionario_actual(con)
+                    ),
+                    json.dumps(progreso),
+                )
+            )
+
+    def borrador_de_cliente(self, email):
+        """Borrador más reciente de un email verificado: {id, guardado, respuestas, progreso}, o None"""
+        email = normalizar_email(email)
+        if not email:
+            return None
+        with closing(self._conectar()) as con:
+            fila = con.execute(
+                "SELECT id, guardado, respuestas, progreso FROM borradores WHERE email = ? ORDER BY guardado DESC LIMIT 1",
+                (email,)
+            ).fetchone()
+        if fila is None:
+            return None
+        return {
+            "id": fila[0],
+            "guardado": fila[1],
+            "respuestas": json.loads(self.compresion.descomprimir(fila[2])),
+            "progreso": json.loads(fila[3]),
+        }
+
+    def borrar_borradores(self, email):
+        """Elimina los borradores de un cliente (al retomarlo o al finalizar una evaluación)"""
+        with closing(self._conectar()) as con, con:
+            return con.execute("DELETE FROM borradores WHERE email = ?", (normalizar_email(email),)).rowcount
+
+    def purgar_borradores(self, antes_de):
+        """Elimina los borradores guardados antes de `antes_de` (epoch); retorna cuántos"""
+        with closing(self._conectar()) as con, con:
+            return con.execute("DELETE FROM borradores WHERE guardado < ?", (antes_de,)).rowcount
+
+    def contar_borradores(self):
+        with closing(self._conectar()) as con:
+            return con.execute("SELECT COUNT(*) FROM borradores").fetchone()[0]
+
+    def buscar_textos(self, consulta, limite=20):
+        """Evaluaciones cuyos textos libres contienen todas las palabras de la consulta, las más recientes primero"""
+        expresion = consulta_fts(consulta)
+        if expresion is None:
+            return []
+        with closing(self._conectar()) as con:
+            filas = con.execute(
+                "SELECT e.id, e.recibido, e.nombre, snippet(textos_libres, -1, '[', ']', '…', 12) "
+                "FROM textos_libres JOIN evaluaciones e ON e.rowid = textos_libres.rowid "
+                # Por rowid el índice se detiene al llenar el límite; ordenar por relevancia puntuaría cada coincidencia
+                "WHERE textos_libres MATCH ? ORDER BY textos_libres.rowid DESC LIMIT ?",
+                (expresion, limite)
+            ).fetchall()
+        return [
+            {"id": fila[0], "recibido": fila[1], "nombre": fila[2], "fragmento": fila[3]}
+            for fila in filas
+        ]
+
+    def cambios(self, identificador):
+        """{anterior, recibido_anterior, diferencias} de una evaluación, o None si no tiene evaluación anterior"""
+        with closing(self._conectar()) as con:
+            fila = con.execute(
+                "SELECT c.anterior, e.recibido, c.diferencias FROM cambios c "
+                "LEFT JOIN evaluaciones e ON e.id = c.anterior WHERE c.id = ?",
+                (identificador,)
+            ).fetchone()
+        if fila is None:
+            return None
+        return {"anterior": fila[0], "recibido_anterior": fila[1], "diferencias": json.loads(fila[2])}
+
+    def _evaluacion(self, fila):
+        if fila is None:
+            return None
+        return {
+            "id": fila[0],
+            "recibido": fila[1],
+            "origen": fila[2],
+            "nombre": fila[3],
+            "email": fila[4],
+            "respuestas": json.loads(self.compresion.descomprimir(fila[5])),
+            "resumen": self.compresion.descomprimir(fila[6]),
+        }
+
+    def contar(self):
+        with closing(self._conectar()) as con:
+            return con.execute("SELECT COUNT(*) FROM evaluaciones").fetchone()[0]
+
+    def iterar(self, tamano=500):
+        """Recorre todas las evaluaciones (id, respuestas) por páginas, sin cargarlas todas a memoria"""
+        ultimo = ""
+        with closing(self._conectar()) as con:
+            while True:
+                filas = con.execute(
+                    "SELECT id, respuestas FROM evaluaciones WHERE id > ? ORDER BY id LIMIT ?",
+                    (ultimo, tamano)
+                ).fetchall()
+                if not filas:
+                    return
+                for identificador, respuestas in filas:
+                    yield identificador, json.loads(self.compresion.descomprimir(respuestas))
+                ultimo = filas[-1][0]
+
+    def iterar_nuevas(self, desde=0, tamano=500):
+        """Evaluaciones guardadas después del rowid `desde`, como (rowid, respuestas), en orden de llegada"""
+        with closing(self._conectar()) as con:
+            while True:
+                filas = con.execute(
+                    "SELECT rowid, respuestas FROM evaluaciones WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                    (desde, tamano)
+                ).fetchall()
+                if not filas:
+                    return
+                for rowid, respuestas in filas:
+                    yield rowid, json.loads(self.compresion.descomprimir(respuestas))
+                desde = filas[-1][0]
+
+    def encabezados(self, rowids):
+        """{rowid: {id, recibido, origen, nombre}} de varias evaluaciones, sin cargar sus respuestas"""
+        rowids = [int(rowid) for rowid in rowids]
+        if not rowids:
+            return {}
+        with closing(self._conectar()) as con:
+            filas = con.execute(
+                f"SELECT rowid, id, recibido, origen, nombre FROM evaluaciones "
+                f"WHERE rowid IN ({', '.join('?' * len(rowids))})",
+                rowids
+            ).fetchall()
+        return {
+            fila[0]: {"id": fila[1], "recibido": fila[2], "origen": fila[3], "nombre": fila[4]}
+            for fila in filas
+        }
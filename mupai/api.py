@@ -0,0 +1,213 @@
+"""
+API HTTP local (ASGI) para que gimnasios asociados envíen evaluaciones
+completas sin pasar por la interfaz de Streamlit.
+
+- `POST /evaluaciones`: recibe un JSON con las mismas claves que
+  `st.session_state`, lo valida con las reglas de los pasos 1 a 15 y lo guarda.
+  Si faltan datos responde 422 con `missing_items` redactados igual que en la app;
+  si un campo tiene un tipo inválido (p. ej. un número donde va una lista),
+  400 con el error de cada campo en `campos`. Un `id_evaluacion` propio solo
+  sirve para reintentar el envío sin duplicar: se guarda como
+  `{origen}:{id_evaluacion}` (es el id que se responde y que se consulta), y
+  reenviarlo con otras respuestas responde 409.
+- `GET /evaluaciones/{id}`: consulta una evaluación guardada, con sus cambios
+  frente a la anterior del mismo cliente (ver `mupai.cambios`).
+- `GET /evaluaciones/{id}/similares?k=10`: evaluaciones guardadas con las
+  selecciones más parecidas (ver `mupai.similares`).
+- `GET /busqueda?q=metformina&limite=20`: evaluaciones cuyos textos libres
+  contienen la consulta (ver `mupai.textos`).
+- `GET /salud`: estado del servicio y de la cola de escritura.
+
+Las escrituras a SQLite se agrupan: mientras una transacción está en curso,
+las evaluaciones nuevas se acumulan y se guardan juntas en la siguiente.
+
+    python -m mupai.api --host 127.0.0.1 --port 8600
+"""
+import argparse
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from mupai.almacen import RUTA_ALMACEN, AlmacenEvaluaciones
+from mupai.arquetipos import arquetipo_de, ruta_modelo
+from mupai.respuestas import Respuestas, TiposInvalidos, normalizar
+from mupai.resumen import crear_resumen
+from mupai.similares import SIMILARES_MOSTRADOS, clientes_similares
+from mupai.textos import MAX_RESULTADOS
+from mupai.validacion import reporte_validacion
+
+logger = logging.getLogger(__name__)
+
+MAX_POR_LOTE = 500
+MAX_EN_COLA = 10000
+MAX_SIMILARES = 100
+MAX_BUSQUEDA = 200
+
+
+class EscritorPorLotes:
+    """Tarea asíncrona que vacía la cola de registros en transacciones agrupadas"""
+
+    def __init__(self, almacen, max_por_lote=MAX_POR_LOTE, max_en_cola=MAX_EN_COLA):
+        self.almacen = almacen
+        self.max_por_lote = max_por_lote
+        self.cola = asyncio.Queue(maxsize=max_en_cola)
+        self._tarea = None
+
+    async def iniciar(self):
+        self._tarea = asyncio.create_task(self._ciclo(), name="mupai-escritor")
+
+    async def detener(self):
+        # Primero se guarda lo que ya estaba en cola
+        await self.cola.join()
+        self._tarea.cancel()
+
+    async def guardar(self, registro):
+        """Encola el registro y espera a que su lote quede guardado"""
+        futuro = asyncio.get_running_loop().create_future()
+        # Con la cola llena, las peticiones esperan aquí (contrapresión)
+        await self.cola.put((registro, futuro))
+        await futuro
+
+    async def _ciclo(self):
+        while True:
+            lote = [await self.cola.get()]
+            while len(lote) < self.max_por_lote and not self.cola.empty():
+                lote.append(self.cola.get_nowait())
+            try:
+                await asyncio.to_thread(self.almacen.guardar_lote, [registro for registro, _ in lote])
+            except Exception as e:
+                logger.exception("Error al guardar un lote de %d evaluaciones", len(lote))
+                for _, futuro in lote:
+                    if not futuro.done():
+                        futuro.set_exception(e)
+            else:
+                for _, futuro in lote:
+                    if not futuro.done():
+                        futuro.set_result(None)
+            finally:
+                for _ in lote:
+                    self.cola.task_done()
+
+
+def crear_app(almacen=None):
+    almacen = almacen or AlmacenEvaluaciones()
+    escritor = EscritorPorLotes(almacen)
+    modelo_arquetipos = ruta_modelo(almacen.ruta)
+
+    @asynccontextmanager
+    async def ciclo_de_vida(app):
+        await escritor.iniciar()
+        yield
+        await escritor.detener()
+
+    async def recibir_evaluacion(request):
+        try:
+            datos = await request.json()
+        except ValueError:
+            return JSONResponse({"error": "El cuerpo debe ser JSON válido"}, status_code=400)
+        if not isinstance(datos, dict):
+            return JSONResponse({"error": "Se esperaba un objeto JSON con las respuestas"}, status_code=400)
+
+        try:
+            r = Respuestas.desde_mapeo(normalizar(datos))
+        except TiposInvalidos as e:
+            return JSONResponse({"error": "Campos con tipo inválido", "campos": e.errores}, status_code=400)
+        reporte = reporte_validacion(r)
+        if not reporte["valido"]:
+            return JSONResponse({
+                "valido": False,
+                "missing_items": reporte["pasos_incompletos"],
+                "datos_faltantes": reporte["datos_faltantes"],
+                "grupos_incompletos": reporte["grupos_incompletos"],
+                "datos_personales": reporte["datos_personales"],
+            }, status_code=422)
+
+        origen = str(datos.get("origen") or request.headers.get("x-origen") or "api")
+        # Un id_evaluacion propio permite reintentar el envío sin duplicar; va con el origen
+        # para que dos gimnasios con la misma numeración no compartan evaluaciones
+        identificador = f"{origen}:{datos['id_evaluacion']}" if datos.get("id_evaluacion") else None
+        resumen = crear_resumen(r, arquetipo=arquetipo_de(r, modelo_arquetipos))
+        registro = AlmacenEvaluaciones.nuevo_registro(r, f"api:{origen}", resumen, identificador)
+        if identificador is not None:
+            guardada = await asyncio.to_thread(almacen.obtener, identificador)
+            if guardada is not None and guardada["respuestas"] != json.loads(registro[5]):
+                return JSONResponse(
+                    {"error": "Ese id_evaluacion ya se usó con otras respuestas", "id": identificador}, status_code=409
+                )
+        try:
+            await escritor.guardar(registro)
+        except Exception:
+            return JSONResponse({"error": "No se pudo guardar la evaluación, intenta nuevamente"}, status_code=503)
+        return JSONResponse({"valido": True, "id": registro[0]}, status_code=201)
+
+    async def consultar_evaluacion(request):
+        identificador = request.path_params["identificador"]
+        evaluacion = await asyncio.to_thread(almacen.obtener, identificador)
+        if evaluacion is None:
+            return JSONResponse({"error": "Evaluación no encontrada"}, status_code=404)
+        # Calculados al guardar; None si es la primera evaluación del cliente
+        evaluacion["cambios"] = await asyncio.to_thread(almacen.cambios, identificador)
+        return JSONResponse(evaluacion)
+
+    async def similares_a_evaluacion(request):
+        identificador = request.path_params["identificador"]
+        try:
+            k = int(request.query_params.get("k", SIMILARES_MOSTRADOS))
+        except ValueError:
+            return JSONResponse({"error": "k debe ser un número entero"}, status_code=400)
+        evaluacion = await asyncio.to_thread(almacen.obtener, identificador)
+        if evaluacion is None:
+            return JSONResponse({"error": "Evaluación no encontrada"}, status_code=404)
+        r = Respuestas.desde_mapeo(evaluacion["respuestas"])
+        similares = await asyncio.to_thread(
+            clientes_similares, r, max(1, min(k, MAX_SIMILARES)), almacen.ruta, identificador
+        )
+        return JSONResponse({"id": identificador, "similares": similares})
+
+    async def buscar_en_textos(request):
+        consulta = request.query_params.get("q", "").strip()
+        if not consulta:
+            return JSONResponse({"error": "Falta el parámetro q"}, status_code=400)
+        try:
+            limite = int(request.query_params.get("limite", MAX_RESULTADOS))
+        except ValueError:
+            return JSONResponse({"error": "limite debe ser un número entero"}, status_code=400)
+        resultados = await asyncio.to_thread(almacen.buscar_textos, consulta, max(1, min(limite, MAX_BUSQUEDA)))
+        return JSONResponse({"consulta": consulta, "resultados": resultados})
+
+    async def salud(request):
+        return JSONResponse({"estado": "ok", "en_cola": escritor.cola.qsize()})
+
+    return Starlette(
+        routes=[
+            Route("/evaluaciones", recibir_evaluacion, methods=["POST"]),
+            Route("/evaluaciones/{identificador}", consultar_evaluacion, methods=["GET"]),
+            Route("/evaluaciones/{identificador}/similares", similares_a_evaluacion, methods=["GET"]),
+            Route("/busqueda", buscar_en_textos, methods=["GET"]),
+            Route("/salud", salud, methods=["GET"]),
+        ],
+        lifespan=ciclo_de_vida,
+    )
+
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="API local de evaluaciones MUPAI")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--almacen", default=RUTA_ALMACEN)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    uvicorn.run(crear_app(AlmacenEvaluaciones(args.almacen)), host=args.host, port=args.port,
+                log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
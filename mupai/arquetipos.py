@@ -0,0 +1,328 @@
+"""
+Arquetipos de clientes: grupos de evaluaciones con selecciones de alimentos
+parecidas (p. ej. "proteínas grasas + carbohidratos" o "mariscos y frutas").
+
+Cada evaluación guardada es una fila 0/1 sobre los alimentos del catálogo
+(`nutrientes.tabla().seleccion`), normalizada a longitud 1. Los arquetipos
+son los centroides de un k-means esférico (similitud coseno, adecuada para
+filas binarias con distinta cantidad de selecciones): se inicializan con
+k-means++ sobre una muestra y se ajustan por mini-lotes, de modo que cada
+reagrupamiento periódico solo recorre las evaluaciones guardadas desde el
+anterior. Los centroides se guardan en `datos/arquetipos.npz`; asignar una
+evaluación nueva es un producto punto contra k centroides.
+
+El reagrupamiento corre como proceso aparte (cron o servicio), nunca dentro
+de la app:
+
+    python -m mupai.arquetipos --almacen datos/evaluaciones.sqlite --completo --k 8
+    python -m mupai.arquetipos --continuo --intervalo 60
+"""
+import argparse
+import hashlib
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from mupai.almacen import RUTA_ALMACEN, AlmacenEvaluaciones
+from mupai.catalogo import GRUPOS_ALIMENTOS
+from mupai.nutrientes import tabla
+from mupai.respuestas import Respuestas
+
+logger = logging.getLogger(__name__)
+
+def ruta_modelo(ruta_almacen):
+    """El modelo se guarda junto al almacén cuyas evaluaciones agrupa"""
+    return os.path.join(os.path.dirname(ruta_almacen), "arquetipos.npz")
+
+
+RUTA_MODELO = ruta_modelo(RUTA_ALMACEN)
+K_ARQUETIPOS = 8
+TAMANO_LOTE = 1024
+EPOCAS = 5
+MUESTRA_INICIAL = 20000
+# Tope del peso acumulado por centroide: la tasa de aprendizaje nunca baja de
+# 1/PESO_MAXIMO y el modelo sigue los cambios de la cohorte con el tiempo
+PESO_MAXIMO = 5000.0
+INTERVALO_MINUTOS = 60
+# Grupos cuya participación en el arquetipo supera a la de la cohorte por este factor lo describen
+FACTOR_GRUPO_DISTINTIVO = 1.15
+ALIMENTOS_DISTINTIVOS = 3
+CLAVES_ALIMENTOS = tuple(clave for claves in GRUPOS_ALIMENTOS.values() for clave in claves)
+SEMILLA = 20250
+
+
+def huella():
+    """Identifica las columnas del catálogo; un modelo guardado con otro catálogo se descarta"""
+    columnas = "\n".join(f"{clave}={opcion}" for clave, opcion in tabla().columnas)
+    return hashlib.blake2b(columnas.encode(), digest_size=8).hexdigest()
+
+
+def _unitarias(x):
+    """Filas normalizadas a longitud 1 (float32) y máscara de filas con al menos una selección"""
+    x = np.asarray(x, dtype=np.float32)
+    normas = np.sqrt((x * x).sum(axis=1))
+    validas = normas > 0
+    x[validas] /= normas[validas, None]
+    return x, validas
+
+
+def _kmeans_mas_mas(x, k, aleatorio):
+    """Centroides iniciales por k-means++ (distancia 1 - coseno) sobre filas unitarias"""
+    centroides = [x[aleatorio.integers(len(x))]]
+    distancia = 1.0 - x @ centroides[0]
+    for _ in range(1, k):
+        pesos = np.maximum(distancia, 0).astype(np.float64)
+        total = pesos.sum()
+        i = aleatorio.choice(len(x), p=pesos / total) if total > 0 else aleatorio.integers(len(x))
+        centroides.append(x[i])
+        distancia = np.minimum(distancia, 1.0 - x @ x[i])
+    return np.array(centroides, dtype=np.float32)
+
+
+class ModeloArquetipos:
+    """Centroides de los arquetipos con sus pesos, ajustables por mini-lotes"""
+
+    def __init__(self, ruta=RUTA_MODELO):
+        self.ruta = ruta
+        self.reiniciar()
+        self._leer()
+
+    def reiniciar(self, k=K_ARQUETIPOS):
+        """Modelo sin entrenar: el siguiente reagrupamiento recorre todo el almacén"""
+        columnas = len(tabla().columnas)
+        self.k = k
+        self.centroides = np.zeros((0, columnas), dtype=np.float32)
+        self.pesos = np.zeros(0, dtype=np.float64)
+        self.miembros = np.zeros(0, dtype=np.int64)
+        self.media = np.zeros(columnas, dtype=np.float64)
+        self.n = 0
+        self.marca = 0
+        self._descripciones = None
+
+    def _leer(self):
+        if not os.path.exists(self.ruta):
+            return
+        with np.load(self.ruta) as datos:
+            if str(datos["huella"]) != huella():
+                return
+            self.centroides = datos["centroides"]
+            self.pesos = datos["pesos"]
+            self.miembros = datos["miembros"]
+            self.media = datos["media"]
+            self.n = int(datos["n"])
+            self.marca = int(datos["marca"])
+            self.k = len(self.centroides)
+
+    def guardar(self):
+        directorio = os.path.dirname(self.ruta) or "."
+        os.makedirs(directorio, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=directorio, suffix=".npz", delete=False) as f:
+            np.savez(
+                f, centroides=self.centroides, pesos=self.pesos, miembros=self.miembros,
+                media=self.media, n=self.n, marca=self.marca, huella=huella()
+            )
+        os.replace(f.name, self.ruta)
+
+    @property
+    def entrenado(self):
+        return len(self.centroides) > 0
+
+    def _inicializar(self, x, aleatorio):
+        muestra = x[aleatorio.permutation(len(x))[:MUESTRA_INICIAL]]
+        unitarias, validas = _unitarias(muestra)
+        unitarias = unitarias[validas]
+        if len(unitarias) < self.k:
+            return False
+        self.centroides = _kmeans_mas_mas(unitarias, self.k, aleatorio)
+        self.pesos = np.zeros(self.k, dtype=np.float64)
+        self.miembros = np.zeros(self.k, dtype=np.int64)
+        return True
+
+    def _minilote(self, x, contar):
+        """Un paso de k-means por mini-lote (Sculley, 2010) con tasa 1/peso por centroide"""
+        x, validas = _unitarias(x)
+        x = x[validas]
+        if not len(x):
+            return
+        asignados = np.argmax(x @ self.centroides.T, axis=1)
+        uno_caliente = np.zeros((self.k, len(x)), dtype=np.float32)
+        uno_caliente[asignados, np.arange(len(x))] = 1.0
+        cuantos = uno_caliente.sum(axis=1).astype(np.float64)
+        sumas = uno_caliente @ x
+        self.pesos += cuantos
+        tocados = cuantos > 0
+        tasa = (1.0 / self.pesos[tocados])[:, None]
+        self.centroides[tocados] += (tasa * (sumas[tocados] - cuantos[tocados, None] * self.centroides[tocados])).astype(np.float32)
+        self.centroides /= np.maximum(np.sqrt((self.centroides ** 2).sum(axis=1)), 1e-12)[:, None]
+        np.minimum(self.pesos, PESO_MAXIMO, out=self.pesos)
+        if contar:
+            self.miembros += cuantos.astype(np.int64)
+            self.n += len(x)
+            self.media += (x.sum(axis=0, dtype=np.float64) - len(x) * self.media) / self.n
+        self._descripciones = None
+
+    def entrenar(self, x, epocas=1, semilla=SEMILLA):
+        """
+        Ajusta los centroides con la matriz de selección `x` (evaluaciones ×
+        columnas) por mini-lotes; inicializa con k-means++ si no hay modelo.
+        Retorna False si hay menos evaluaciones que arquetipos.
+        """
+        aleatorio = np.random.default_rng(semilla)
+        if not self.entrenado and not self._inicializar(x, aleatorio):
+            return False
+        for epoca in range(epocas):
+            orden = aleatorio.permutation(len(x))
+            for inicio in range(0, len(x), TAMANO_LOTE):
+                # Las evaluaciones cuentan para los miembros y la media de la cohorte una sola vez
+                self._minilote(x[orden[inicio:inicio + TAMANO_LOTE]], contar=epoca == epocas - 1)
+        return True
+
+    def asignar(self, x):
+        """(arquetipo, afinidad) de cada fila de `x`; arquetipo -1 para filas sin selecciones"""
+        unitarias, validas = _unitarias(x)
+        similitud = unitarias @ self.centroides.T
+        arquetipo = np.where(validas, np.argmax(similitud, axis=1), -1)
+        afinidad = np.where(validas, similitud.max(axis=1), 0.0)
+        return arquetipo, afinidad
+
+    def descripciones(self):
+        """Nombre y rasgos de cada arquetipo: grupos sobrerrepresentados y alimentos que lo distinguen"""
+        if self._descripciones is None:
+            t = tabla()
+            media = self.media / max(np.linalg.norm(self.media), 1e-12)
+            reparto_cohorte = t.pertenencia @ media / max(media.sum(), 1e-12)
+            descripciones = []
+            for i, centroide in enumerate(self.centroides.astype(np.float64)):
+                reparto = t.pertenencia @ centroide / max(centroide.sum(), 1e-12)
+                factor = reparto / np.maximum(reparto_cohorte, 1e-12)
+                grupos = [t.grupos[g] for g in np.argsort(-factor, kind="stable") if factor[g] >= FACTOR_GRUPO_DISTINTIVO]
+                exceso = centroide - media
+                alimentos = list(dict.fromkeys(
+                    t.nombres[j] for j in np.argsort(-exceso, kind="stable")[:ALIMENTOS_DISTINTIVOS * 2] if exceso[j] > 0
+                ))[:ALIMENTOS_DISTINTIVOS]
+                descripciones.append({
+                    "numero": i + 1,
+                    "nombre": " + ".join(grupos[:2]) if grupos else "Selección equilibrada",
+                    "grupos": grupos,
+                    "alimentos": alimentos,
+                    "participacion": round(float(self.miembros[i] / max(self.miembros.sum(), 1)), 3),
+                })
+            self._descripciones = descripciones
+        return self._descripciones
+
+    def arquetipo(self, r):
+        """Arquetipo de unas respuestas (dict de `descripciones` más `afinidad`), o None sin modelo o sin selecciones"""
+        if not self.entrenado:
+            return None
+        t = tabla()
+        columnas = {t.columna[(clave, opcion)] for clave in CLAVES_ALIMENTOS for opcion in getattr(r, clave, None) or ()
+                    if (clave, opcion) in t.columna}
+        if not columnas:
+            return None
+        # Fila 0/1 normalizada: el coseno con cada centroide es la suma de sus columnas entre √(selecciones)
+        similitud = self.centroides[:, list(columnas)].sum(axis=1) / np.sqrt(len(columnas))
+        i = int(np.argmax(similitud))
+        return dict(self.descripciones()[i], afinidad=round(float(similitud[i]), 3))
+
+
+def _matriz_almacen(ruta_almacen, desde=0):
+    """Matriz de selección (uint8) de las evaluaciones guardadas después del rowid `desde` y el último rowid leído"""
+    t = tabla()
+    bloques, lote, marca = [], [], desde
+    # El almacén guarda las respuestas ya normalizadas
+    for rowid, datos in AlmacenEvaluaciones(ruta_almacen).iterar_nuevas(desde):
+        lote.append(Respuestas.desde_mapeo(datos))
+        marca = rowid
+        if len(lote) == TAMANO_LOTE:
+            bloques.append(t.seleccion(lote).astype(np.uint8))
+            lote = []
+    if lote:
+        bloques.append(t.seleccion(lote).astype(np.uint8))
+    x = np.concatenate(bloques) if bloques else np.zeros((0, len(t.columnas)), dtype=np.uint8)
+    return x, marca
+
+
+def reagrupar(ruta_almacen=RUTA_ALMACEN, ruta=RUTA_MODELO, k=K_ARQUETIPOS, completo=False):
+    """
+    Actualiza el modelo guardado con las evaluaciones nuevas del almacén (un
+    paso por mini-lotes) o, con `completo` o sin modelo previo, lo rehace
+    desde cero con todas. Retorna cuántas evaluaciones leyó.
+    """
+    modelo = ModeloArquetipos(ruta)
+    if completo or not modelo.entrenado or (k and k != modelo.k):
+        modelo.reiniciar(k or modelo.k)
+    if not os.path.exists(ruta_almacen):
+        return 0
+    x, marca = _matriz_almacen(ruta_almacen, modelo.marca)
+    if not len(x):
+        return 0
+    if not modelo.entrenar(x, EPOCAS if not modelo.entrenado else 1):
+        return 0
+    modelo.marca = marca
+    modelo.guardar()
+    return len(x)
+
+
+_modelos = {}
+_candado_modelos = threading.Lock()
+
+
+def modelo(ruta=RUTA_MODELO):
+    """Modelo compartido del proceso; se vuelve a leer cuando el reagrupamiento guarda uno nuevo"""
+    try:
+        modificado = os.stat(ruta).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    with _candado_modelos:
+        guardado = _modelos.get(ruta)
+        if guardado is None or guardado[0] != modificado:
+            guardado = _modelos[ruta] = (modificado, ModeloArquetipos(ruta))
+        return guardado[1]
+
+
+def arquetipo_de(r, ruta=RUTA_MODELO):
+    m = modelo(ruta)
+    return m.arquetipo(r) if m is not None else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reagrupamiento de arquetipos de clientes MUPAI")
+    parser.add_argument("--almacen", default=RUTA_ALMACEN)
+    parser.add_argument("--modelo", help="Archivo .npz del modelo (por defecto, junto al almacén)")
+    parser.add_argument("--k", type=int, default=None, help=f"Número de arquetipos (por defecto {K_ARQUETIPOS} o los del modelo)")
+    parser.add_argument("--completo", action="store_true", help="Descartar el modelo guardado y reagrupar todo")
+    parser.add_argument("--continuo", action="store_true", help="Seguir actualizando el modelo cada intervalo")
+    parser.add_argument("--intervalo", type=float, default=INTERVALO_MINUTOS, help="Minutos entre actualizaciones (modo continuo)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    ruta = args.modelo or ruta_modelo(args.almacen)
+    inicio = time.monotonic()
+    leidas = reagrupar(args.almacen, ruta, args.k, args.completo)
+    print(f"Evaluaciones leídas: {leidas} ({time.monotonic() - inicio:.1f} s)")
+    m = ModeloArquetipos(ruta)
+    for d in m.descripciones() if m.entrenado else ():
+        alimentos = ", ".join(d["alimentos"]) or "-"
+        print(f"  {d['numero']}. {d['nombre']} ({d['participacion']:.0%}) | distintivos: {alimentos}")
+
+    while args.continuo:
+        try:
+            time.sleep(max(args.intervalo, 1.0) * 60)
+        except KeyboardInterrupt:
+            break
+        try:
+            leidas = reagrupar(args.almacen, ruta, args.k)
+            if leidas:
+                logger.info("Arquetipos actualizados con %d evaluaciones nuevas", leidas)
+        except Exception:
+            logger.exception("Error al reagrupar; se reintentará en el siguiente intervalo")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
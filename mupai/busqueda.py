@@ -0,0 +1,146 @@
+"""
+Búsqueda mientras se escribe sobre las opciones del catálogo.
+
+El índice se arma una vez por proceso: cada opción se parte en palabras sin
+acentos ni mayúsculas ("Rúcula (arúgula)" → rucula, arugula), se le agregan
+los sinónimos regionales de sus palabras (chícharos ↔ guisantes ↔ arvejas) y
+cada prefijo de cada palabra apunta al conjunto de opciones que lo contienen.
+Buscar es intersecar, por cada palabra de la consulta, el conjunto de su
+prefijo: no se recorre el catálogo. Una palabra de la consulta en plural
+también busca sus singulares ("plátanos" encuentra el sinónimo platano, "papas"
+encuentra Papa).
+
+    python -m mupai.busqueda "arugula"
+    python -m mupai.busqueda "chich" --clave vegetales_lista
+"""
+import argparse
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+
+from mupai.catalogo import OPCIONES
+
+MAX_RESULTADOS = 15
+PALABRAS_VACIAS = frozenset({"a", "al", "con", "de", "del", "el", "en", "la", "las", "los", "o", "para", "sin", "y"})
+# Grupos de nombres regionales del mismo alimento; se escriben sin acentos y en singular
+SINONIMOS = (
+    ("chicharo", "guisante", "arveja"),
+    ("rucula", "arugula", "roqueta"),
+    ("jitomate", "tomate"),
+    ("betabel", "remolacha"),
+    ("calabacita", "calabacin", "zucchini"),
+    ("ejote", "vainita", "judia"),
+    ("aguacate", "palta"),
+    ("frijol", "poroto", "alubia"),
+    ("cacahuate", "mani"),
+    ("fresa", "frutilla"),
+    ("durazno", "melocoton"),
+    ("chabacano", "albaricoque"),
+    ("platano", "banana", "banano"),
+    ("camote", "batata", "boniato"),
+    ("papa", "patata"),
+    ("pina", "anana"),
+    ("puerro", "poro"),
+    ("cerdo", "puerco", "chancho"),
+    ("res", "ternera", "vaca"),
+    ("elote", "choclo", "mazorca"),
+    ("champinon", "hongo", "seta"),
+    ("pimiento", "morron", "pimenton"),
+    ("toronja", "pomelo"),
+    ("maracuya", "parchita"),
+    ("pitahaya", "pitaya"),
+    ("caqui", "persimon"),
+    ("camaron", "gamba"),
+    ("soya", "soja"),
+    ("ostion", "ostra"),
+    ("arandano", "blueberry"),
+    ("guanabana", "graviola"),
+    ("cilantro", "culantro"),
+)
+_PALABRA = re.compile(r"[a-z0-9]+")
+
+
+def plegar(texto):
+    """Minúsculas sin acentos ni diéresis (la ñ queda como n)"""
+    descompuesto = unicodedata.normalize("NFKD", texto.lower())
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+def _singulares(palabra):
+    """La palabra y sus posibles singulares, para emparejar sinónimos (fresas → fresa, frijoles → frijol)"""
+    formas = [palabra]
+    if len(palabra) > 3 and palabra.endswith("s"):
+        formas.append(palabra[:-1])
+        if palabra.endswith("es"):
+            formas.append(palabra[:-2])
+    return formas
+
+
+def palabras(texto):
+    return [p for p in _PALABRA.findall(plegar(texto)) if p not in PALABRAS_VACIAS]
+
+
+class IndiceBusqueda:
+    """Prefijos de las palabras (y sus sinónimos) de cada opción → opciones que los contienen"""
+
+    def __init__(self, opciones=OPCIONES):
+        self.entradas = tuple((clave, opcion) for clave, lista in opciones.items() for opcion in lista)
+        sinonimos = {palabra: grupo for grupo in SINONIMOS for palabra in grupo}
+
+        self.prefijos = {}
+        for i, (_, opcion) in enumerate(self.entradas):
+            terminos = set()
+            for palabra in palabras(opcion):
+                terminos.add(palabra)
+                for forma in _singulares(palabra):
+                    terminos.update(sinonimos.get(forma, ()))
+            for termino in terminos:
+                for largo in range(1, len(termino) + 1):
+                    self.prefijos.setdefault(termino[:largo], set()).add(i)
+        self.prefijos = {prefijo: frozenset(ids) for prefijo, ids in self.prefijos.items()}
+
+    def buscar(self, consulta, claves=None, limite=MAX_RESULTADOS):
+        """(clave, opción) que contienen todas las palabras de la consulta (o un singular suyo) como prefijo, en orden de catálogo"""
+        terminos = palabras(consulta)
+        if not terminos:
+            return []
+        encontrados = None
+        for termino in terminos:
+            ids = frozenset().union(*(self.prefijos.get(forma, frozenset()) for forma in _singulares(termino)))
+            encontrados = ids if encontrados is None else encontrados & ids
+            if not encontrados:
+                return []
+        resultado = [self.entradas[i] for i in sorted(encontrados)]
+        if claves is not None:
+            resultado = [(clave, opcion) for clave, opcion in resultado if clave in claves]
+        return resultado[:limite] if limite else resultado
+
+
+@lru_cache(maxsize=None)
+def indice():
+    """Índice compartido del proceso (se arma una sola vez)"""
+    return IndiceBusqueda()
+
+
+def buscar(consulta, claves=None, limite=MAX_RESULTADOS):
+    return indice().buscar(consulta, claves, limite)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Búsqueda en las opciones del catálogo MUPAI")
+    parser.add_argument("consulta")
+    parser.add_argument("--clave", action="append", help="Limitar a estas listas del catálogo")
+    parser.add_argument("--limite", type=int, default=MAX_RESULTADOS)
+    args = parser.parse_args(argv)
+
+    resultados = buscar(args.consulta, args.clave, args.limite)
+    if not resultados:
+        print("Sin resultados")
+    for clave, opcion in resultados:
+        print(f"{opcion}  [{clave}]")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
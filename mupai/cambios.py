@@ -0,0 +1,176 @@
+"""
+Cambios entre evaluaciones sucesivas de un mismo cliente.
+
+Las selecciones de cada pregunta se comparan como conjuntos de bits sobre sus
+opciones del catálogo (un entero por pregunta): lo agregado es `(a ^ b) & b`
+y lo quitado `(a ^ b) & a`. Los campos de texto libre (medicamentos, otras
+alergias, sugerencias) se parten en renglones y se comparan sin importar
+mayúsculas, acentos ni viñetas. El almacén calcula los cambios al insertar
+cada evaluación y los guarda; el resumen y la API solo los leen. El mismo
+cliente es el mismo email; el teléfono solo cuenta entre evaluaciones sin email,
+porque uno compartido (casa, gimnasio) mezclaría a dos personas.
+
+    python -m mupai.cambios <id de evaluación> --almacen datos/evaluaciones.sqlite
+"""
+import argparse
+import re
+import sys
+
+from mupai.busqueda import plegar
+from mupai.catalogo import OPCIONES
+from mupai.respuestas import CAMPOS_LISTA
+
+# Preguntas que se comparan, con el nombre con que aparecen en el resumen
+ETIQUETAS = {
+    "huevos_embutidos": "Huevos y embutidos",
+    "carnes_res_grasas": "Carnes de res grasas",
+    "carnes_cerdo_grasas": "Carnes de cerdo grasas",
+    "carnes_pollo_grasas": "Carnes de pollo/pavo grasas",
+    "organos_grasos": "Órganos y vísceras grasas",
+    "quesos_grasos": "Quesos altos en grasa",
+    "lacteos_enteros": "Lácteos enteros",
+    "pescados_grasos": "Pescados grasos",
+    "mariscos_grasos": "Mariscos grasos",
+    "carnes_res_magras": "Carnes de res magras",
+    "carnes_cerdo_magras": "Carnes de cerdo magras",
+    "carnes_pollo_magras": "Carnes de pollo/pavo magras",
+    "organos_magros": "Órganos magros",
+    "pescados_magros": "Pescados magros",
+    "mariscos_magros": "Mariscos magros",
+    "quesos_magros": "Quesos magros",
+    "lacteos_light": "Lácteos light",
+    "huevos_embutidos_light": "Huevos y embutidos light",
+    "proteina_polvo_tipos": "Proteína en polvo",
+    "preferencia_marca_proteina": "Preferencia de marca de proteína",
+    "nombre_marca_proteina": "Marca de proteína preferida",
+    "grasas_naturales": "Grasas naturales",
+    "frutos_secos_semillas": "Frutos secos y semillas",
+    "mantequillas_vegetales": "Mantequillas vegetales",
+    "cereales_integrales": "Cereales integrales",
+    "pastas": "Pastas",
+    "tortillas_panes": "Tortillas y panes",
+    "raices_tuberculos": "Raíces y tubérculos",
+    "leguminosas": "Leguminosas",
+    "vegetales_lista": "Vegetales",
+    "frutas_lista": "Frutas",
+    "aceites_coccion": "Aceites de cocción",
+    "bebidas_sin_calorias": "Bebidas sin calorías",
+    "metodos_coccion_accesibles": "Métodos de cocción",
+    "otro_metodo_coccion": "Otro método de cocción",
+    "alergias_alimentarias": "Alergias alimentarias",
+    "otra_alergia": "Otra alergia",
+    "intolerancias_digestivas": "Intolerancias digestivas",
+    "otra_intolerancia": "Otra intolerancia",
+    "antojos_dulces": "Antojos dulces",
+    "antojos_salados": "Antojos salados",
+    "antojos_comida_rapida": "Antojos de comida rápida",
+    "antojos_bebidas": "Antojos de bebidas",
+    "antojos_picantes": "Antojos picantes",
+    "otros_antojos": "Otros antojos",
+    "frecuencia_comidas_ck": "Frecuencia de comidas",
+    "otra_frecuencia": "Otra frecuencia",
+    "sugerencias_menus": "Sugerencias de menús",
+    "opcion_rapida_menu": "Opción rápida de menú",
+    "condiciones_medicas": "Condiciones médicas",
+    "condiciones_otras": "Otras condiciones",
+    "consume_medicamentos": "Consume medicamentos",
+    "medicamentos_lista": "Medicamentos",
+    "consume_suplementos": "Consume suplementos",
+    "suplementos_lista": "Suplementos",
+}
+# Posición de cada opción del catálogo en el entero de bits de su pregunta
+BIT = {clave: {opcion: i for i, opcion in enumerate(OPCIONES[clave])} for clave in ETIQUETAS if clave in OPCIONES}
+_SEPARADOR_RENGLONES = re.compile(r"[\n;]+")
+_VINETA = re.compile(r"^[\s\-•*·]+")
+
+
+def _bits(clave, seleccion):
+    """Entero con un bit por opción del catálogo seleccionada y las opciones fuera del catálogo aparte"""
+    posiciones = BIT[clave]
+    bits, otras = 0, []
+    for opcion in seleccion or ():
+        if opcion in posiciones:
+            bits |= 1 << posiciones[opcion]
+        else:
+            otras.append(opcion)
+    return bits, otras
+
+
+def _opciones(clave, bits):
+    return [opcion for opcion, i in BIT[clave].items() if bits >> i & 1]
+
+
+def _renglones(texto):
+    """Renglones de un texto libre, sin viñetas, indexados por su forma plegada (sin acentos ni mayúsculas)"""
+    renglones = {}
+    for renglon in _SEPARADOR_RENGLONES.split(str(texto or "")):
+        renglon = _VINETA.sub("", renglon).strip()
+        if renglon:
+            renglones.setdefault(" ".join(plegar(renglon).split()), renglon)
+    return renglones
+
+
+def diferencias(anterior, actual):
+    """
+    {pregunta: {"agregados": [...], "quitados": [...]}} con solo las
+    preguntas que cambiaron entre dos evaluaciones (dicts de respuestas).
+    """
+    cambios = {}
+    for clave in ETIQUETAS:
+        antes, ahora = anterior.get(clave), actual.get(clave)
+        if clave in BIT:
+            bits_antes, otras_antes = _bits(clave, antes)
+            bits_ahora, otras_ahora = _bits(clave, ahora)
+            distintos = bits_antes ^ bits_ahora
+            agregados = _opciones(clave, distintos & bits_ahora) + [o for o in otras_ahora if o not in otras_antes]
+            quitados = _opciones(clave, distintos & bits_antes) + [o for o in otras_antes if o not in otras_ahora]
+        elif clave in CAMPOS_LISTA:
+            agregados = [o for o in ahora or () if o not in (antes or ())]
+            quitados = [o for o in antes or () if o not in (ahora or ())]
+        else:
+            renglones_antes, renglones_ahora = _renglones(antes), _renglones(ahora)
+            agregados = [r for k, r in renglones_ahora.items() if k not in renglones_antes]
+            quitados = [r for k, r in renglones_antes.items() if k not in renglones_ahora]
+        if agregados or quitados:
+            cambios[clave] = {"agregados": agregados, "quitados": quitados}
+    return cambios
+
+
+def texto_cambios(cambios):
+    """Renglones legibles de un dict de `diferencias`"""
+    if not cambios:
+        return ["- Sin cambios en las respuestas"]
+    renglones = []
+    for clave, cambio in cambios.items():
+        renglones.append(f"- {ETIQUETAS[clave]}:")
+        if cambio["agregados"]:
+            renglones.append(f"    + {', '.join(cambio['agregados'])}")
+        if cambio["quitados"]:
+            renglones.append(f"    − {', '.join(cambio['quitados'])}")
+    return renglones
+
+
+def main(argv=None):
+    from mupai.almacen import RUTA_ALMACEN, AlmacenEvaluaciones
+
+    parser = argparse.ArgumentParser(description="Cambios de una evaluación MUPAI frente a la anterior del cliente")
+    parser.add_argument("id", nargs="?", help="Id de la evaluación")
+    parser.add_argument("--almacen", default=RUTA_ALMACEN)
+    parser.add_argument("--recalcular", action="store_true", help="Calcular los cambios de todas las evaluaciones guardadas")
+    args = parser.parse_args(argv)
+
+    almacen = AlmacenEvaluaciones(args.almacen)
+    if args.recalcular:
+        print(f"Evaluaciones con evaluación anterior: {almacen.recalcular_cambios()}")
+    if args.id:
+        cambios = almacen.cambios(args.id)
+        if cambios is None:
+            print("Sin evaluación anterior del mismo cliente (o id desconocido)", file=sys.stderr)
+            return 1
+        print(f"Cambios frente a {cambios['anterior']}:")
+        print("\n".join(texto_cambios(cambios["diferencias"])))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,691 @@
+"""
+Catálogo de opciones del cuestionario: la lista de opciones de cada pregunta
+de selección múltiple, indexada por su clave en `st.session_state`.
+
+La app, el procesamiento en lote y los análisis nutricionales leen las
+opciones de aquí para que todos usen exactamente los mismos nombres.
+"""
+
+OPCIONES = {
+    # Paso 1: Proteína animal con más contenido graso
+    "huevos_embutidos": [
+        "Huevo entero",
+        "Chorizo",
+        "Salchicha (Viena, alemana, parrillera)",
+        "Longaniza",
+        "Tocino",
+        "Jamón serrano",
+        "Jamón ibérico",
+        "Salami",
+        "Mortadela",
+        "Pastrami",
+        "Pepperoni",
+        "Ninguno",
+    ],
+    "carnes_res_grasas": [
+        "Aguja norteña",
+        "Diezmillo marmoleado",
+        "Costilla/Costillar",
+        "Ribeye",
+        "New York",
+        "T-bone",
+        "Porterhouse",
+        "Prime rib",
+        "Arrachera",
+        "Picaña",
+        "Suadero",
+        "Brisket/Pecho de res",
+        "Chamberete con tuétano",
+        "Falda marmoleada",
+        "Molida 80/20",
+        "Molida 85/15",
+        "Carne para asar con grasa",
+        "Chuck roast (diezmillo graso)",
+        "Paleta con grasa",
+        "Retazo con grasa",
+        "Short ribs",
+        "Cowboy steak",
+        "Tomahawk",
+        "Matambre",
+        "Entraña",
+        "Ninguno",
+    ],
+    "carnes_cerdo_grasas": [
+        "Costilla de cerdo",
+        "Panceta (belly)",
+        "Chuleta con grasa",
+        "Carnitas",
+        "Chicharrón prensado",
+        "Codillo",
+        "Espalda (Boston butt)",
+        "Picnic shoulder",
+        "Pata de cerdo",
+        "Ninguno",
+    ],
+    "carnes_pollo_grasas": [
+        "Muslo de pollo con piel",
+        "Pierna de pollo con piel",
+        "Alitas de pollo",
+        "Pollo entero con piel",
+        "Pavo con piel",
+        "Muslo de pavo",
+        "Ninguno",
+    ],
+    "organos_grasos": [
+        "Sesos de res",
+        "Tuétano de res",
+        "Molleja de res",
+        "Hígado de res",
+        "Riñón de res",
+        "Ninguno",
+    ],
+    "quesos_grasos": [
+        "Queso manchego",
+        "Queso doble crema",
+        "Queso oaxaca",
+        "Queso gouda",
+        "Queso crema",
+        "Queso cheddar",
+        "Queso roquefort",
+        "Queso brie",
+        "Queso camembert",
+        "Queso parmesano",
+        "Queso gruyere",
+        "Queso de cabra maduro",
+        "Ninguno",
+    ],
+    "lacteos_enteros": [
+        "Leche entera",
+        "Yogur entero azucarado",
+        "Yogur tipo griego entero",
+        "Yogur de frutas azucarado",
+        "Yogur bebible regular",
+        "Crema",
+        "Queso para untar (tipo Philadelphia original)",
+        "Nata",
+        "Crema agria",
+        "Ninguno",
+    ],
+    "pescados_grasos": [
+        "Atún en aceite",
+        "Salmón",
+        "Salmón en agua (enlatado)",
+        "Sardinas en aceite (enlatadas, escurridas)",
+        "Sardinas en agua (enlatadas, escurridas)",
+        "Sardinas en salsa de tomate (enlatadas, escurridas)",
+        "Macarela",
+        "Trucha",
+        "Arenque",
+        "Anchovetas",
+        "Pez espada",
+        "Anguila",
+        "Ninguno",
+    ],
+    "mariscos_grasos": [
+        "Pulpo",
+        "Pulpo al ajillo (lata, escurrido)",
+        "Calamar",
+        "Calamar en su tinta (lata, escurrido)",
+        "Mejillones",
+        "Mejillones en escabeche (lata, escurrido)",
+        "Ostras",
+        "Ostiones ahumados en aceite (lata, escurrido)",
+        "Cangrejo",
+        "Langosta",
+        "Caracol de mar",
+        "Ninguno",
+    ],
+    # Paso 2: Proteína animal magra
+    "carnes_res_magras": [
+        "Filete (lomo fino)",
+        "Lomo bajo (striploin limpio)",
+        "Centro de diezmillo limpio",
+        "Sirloin limpio/Aguayón",
+        "Bola/Pulpa bola",
+        "Cuete",
+        "Pulpa negra",
+        "Pulpa blanca",
+        "Espaldilla limpia",
+        "Milanesa de bola",
+        "Bistec de pierna",
+        "Molida 90/10",
+        "Molida 95/5",
+        "Molida 97/3",
+        "Falda limpia",
+        "Chamorro limpio",
+        "Tampiqueña magra",
+        "Medallones de res magros",
+        "Top round",
+        "Bottom round",
+        "Flank steak limpio",
+        "Maciza limpia",
+        "Ninguno",
+    ],
+    "carnes_cerdo_magras": [
+        "Lomo de cerdo",
+        "Filete de cerdo",
+        "Chuleta magra sin grasa",
+        "Solomillo de cerdo",
+        "Tenderloin",
+        "Pierna de cerdo magra (pulpa, sin grasa visible)",
+        "Ninguno",
+    ],
+    "carnes_pollo_magras": [
+        "Pechuga de pollo sin piel",
+        "Pechuga de pavo sin piel",
+        "Muslo de pollo sin piel",
+        "Pierna de pollo sin piel",
+        "Pierna de pavo sin piel",
+        "Molida de pollo magra",
+        "Molida de pechuga de pavo",
+        "Ninguno",
+    ],
+    "organos_magros": [
+        "Corazón de res",
+        "Lengua de res",
+        "Hígado de ternera",
+        "Riñones de ternera",
+        "Corazón de pollo",
+        "Hígado de pollo",
+        "Molleja de ternera",
+        "Ninguno",
+    ],
+    "pescados_magros": [
+        "Tilapia",
+        "Basa",
+        "Huachinango",
+        "Merluza",
+        "Robalo",
+        "Corvina",
+        "Cazón",
+        "Atún fresco (filete/medallón)",
+        "Atún en agua (enlatado, escurrido)",
+        "Bacalao",
+        "Lenguado",
+        "Mero",
+        "Dorado",
+        "Pargo",
+        "Ninguno",
+    ],
+    "mariscos_magros": [
+        "Camarón",
+        "Callo de hacha",
+        "Almeja",
+        "Langostino",
+        "Jaiba",
+        "Ninguno",
+    ],
+    "quesos_magros": [
+        "Queso panela regular",
+        "Queso panela light",
+        "requesón",
+        "Queso cottage regular",
+        "Queso cottage light",
+        "Queso ricotta",
+        "Queso oaxaca reducido en grasa",
+        "Queso mozzarella light",
+        "Ninguno",
+    ],
+    "lacteos_light": [
+        "Leche descremada",
+        "Leche deslactosada light",
+        "Leche de almendra sin azúcar",
+        "Leche de coco sin azúcar",
+        "Leche de soya sin azúcar",
+        "Yogur griego natural sin azúcar",
+        "Yogur griego light",
+        "Yogur bebible bajo en grasa",
+        "Yogur sin azúcar añadida",
+        "Yogur de frutas bajo en grasa y sin azúcar añadida",
+        "Queso crema light",
+        "Crema light",
+        "Ninguno",
+    ],
+    "huevos_embutidos_light": [
+        "Clara de huevo",
+        "Jamón de pechuga de pavo",
+        "Jamón de pierna bajo en grasa",
+        "Salchicha de pechuga de pavo (light)",
+        "Pechuga de pavo rebanada",
+        "Jamón serrano magro",
+        "Ninguno",
+    ],
+    # Paso 3: Proteína en polvo
+    "proteina_polvo_tipos": [
+        # Proteínas de Suero de Leche (Whey)
+        "Whey Protein Concentrate / Concentrado de suero (WPC 80)",
+        "Whey Protein Isolate / Aislado de suero (WPI 90+)",
+        "Whey Protein Hydrolyzed / Hidrolizado de suero (WPH)",
+        "Whey Blend / Mezcla de concentrado + aislado",
+        # Proteínas de Caseína
+        "Caseína Micelar",
+        "Caseinato de Calcio",
+        "Caseína Hidrolizada",
+        # Proteínas Vegetales
+        "Proteína de Soya Aislada",
+        "Proteína de Guisante (Pea Protein Isolate)",
+        "Proteína de Arroz Integral",
+        "Proteína de Cáñamo (Hemp Protein)",
+        "Proteína de Semilla de Calabaza",
+        "Blend Vegetal (mezcla de varias plantas)",
+        # Proteínas de Otras Fuentes
+        "Proteína de Carne (Beef Protein Isolate)",
+        "Proteína de Claras de Huevo",
+        "Albúmina de Huevo",
+        "Proteína de Colágeno Hidrolizado",
+        # Opción especial
+        "Ninguno (no consumo proteína en polvo)",
+    ],
+    "preferencia_marca_proteina": [
+        "Sí",
+        "No",
+    ],
+    # Paso 4: Grasas saludables
+    "grasas_naturales": [
+        "Aguacate",
+        "Aceitunas (negras, verdes)",
+        "Coco rallado natural",
+        "Coco fresco",
+        "Leche de coco sin azúcar",
+        "Ninguno",
+    ],
+    "frutos_secos_semillas": [
+        "Almendras",
+        "Nueces",
+        "Nuez de la India",
+        "Pistaches",
+        "Cacahuates naturales (sin sal)",
+        "Semillas de chía",
+        "Semillas de linaza",
+        "Semillas de girasol",
+        "Semillas de calabaza (pepitas)",
+        "Ninguno",
+    ],
+    "mantequillas_vegetales": [
+        "Mantequilla de maní natural",
+        "Mantequilla de almendra",
+        "Tahini (pasta de ajonjolí)",
+        "Mantequilla de nuez de la India",
+        "Ninguno",
+    ],
+    # Paso 5: Carbohidratos complejos y cereales
+    "cereales_integrales": [
+        "Avena (hojuelas/tradicional)",
+        "Avena instantánea natural sin azúcar",
+        "Arroz integral",
+        "Arroz blanco",
+        "Arroz precocido (marca, preparación rápida)",
+        "Arroz jazmín",
+        "Arroz basmati",
+        "Trigo bulgur",
+        "Cuscús",
+        "Quinoa",
+        "Amaranto",
+        "Cereal de maíz sin azúcar",
+        "Cereal integral alto en fibra",
+        "Granola sin azúcar añadida",
+        "Galletas de arroz integrales",
+        "Ninguno",
+    ],
+    "pastas": [
+        "Espagueti (pasta de trigo regular)",
+        "Macarrones (pasta de trigo regular)",
+        "Pluma/Penne (pasta de trigo regular)",
+        "Coditos (pasta de trigo regular)",
+        "Lasaña (pasta de trigo regular)",
+        "Espagueti integral (pasta)",
+        "Pluma/Penne integral (pasta)",
+        "Pasta sin gluten (maíz/arroz)",
+        "Pasta de legumbres (lenteja roja)",
+        "Pasta de legumbres (garbanzo)",
+        "Fideos de arroz (secos)",
+        "Ramen (seco)",
+        "Konjac (fideos shirataki)",
+        "Pasta de palmito (Palmini)",
+        "Ninguno",
+    ],
+    "tortillas_panes": [
+        "Tortilla de maíz (regular, empacada)",
+        "Tortilla de maíz ligera (light/delgada)",
+        "Tortilla de maíz con nopal",
+        "Tortilla de nopal (hecha con nopal fresco)",
+        "Tortilla de harina (regular)",
+        "Tortilla de harina integral",
+        "Tortilla de harina con avena",
+        "Pan rebanado sin azúcar añadida",
+        "Pan rebanado multigrano (sin azúcar)",
+        "Pan pita integral / pan árabe integral",
+        "Pan para hamburguesa regular",
+        "Pan para hamburguesa sin azúcar añadida",
+        "Pan para hot dog regular",
+        "Pan para hot dog sin azúcar añadida",
+        "Tostadas horneadas",
+        "Totopos",
+        "Ninguno",
+    ],
+    "raices_tuberculos": [
+        "Papa",
+        "Camote",
+        "Yuca",
+        "Plátano macho",
+        "Jícama",
+        "Zanahoria",
+        "Betabel",
+        "Ninguno",
+    ],
+    "leguminosas": [
+        "Frijoles negros",
+        "Frijoles bayos",
+        "Frijoles pintos",
+        "Lentejas",
+        "Garbanzos",
+        "Habas cocidas",
+        "Soya texturizada",
+        "Edamames (grano de soya)",
+        "Hummus (puré de garbanzo)",
+        "Ninguno",
+    ],
+    # Paso 6: Vegetales
+    "vegetales_lista": [
+        "Espinaca",
+        "Acelga",
+        "Kale",
+        "Lechuga (romana, italiana, orejona, iceberg)",
+        "Col morada",
+        "Col verde",
+        "Repollo",
+        "Brócoli",
+        "Coliflor",
+        "Ejote",
+        "Chayote",
+        "Calabacita",
+        "Nopal",
+        "Betabel",
+        "Zanahoria",
+        "Jitomate saladet",
+        "Jitomate bola",
+        "Tomate verde",
+        "Cebolla blanca",
+        "Cebolla morada",
+        "Cebollín",
+        "Puerro (poro)",
+        "Pimiento morrón (rojo, verde, amarillo, naranja)",
+        "Chile jalapeño",
+        "Chile serrano",
+        "Chile poblano",
+        "Chile habanero",
+        "Pepino",
+        "Apio",
+        "Rábano",
+        "Ajo",
+        "Berenjena",
+        "Champiñones",
+        "Guisantes (chícharos)",
+        "Verdolaga",
+        "Habas tiernas",
+        "Germen de alfalfa",
+        "Germen de soya",
+        "Flor de calabaza",
+        "Jícama",
+        "Espárragos",
+        "Rúcula (arúgula)",
+        "Berros",
+        "Cilantro",
+        "Perejil",
+        "Epazote",
+        "Ninguno",
+    ],
+    # Paso 7: Frutas
+    "frutas_lista": [
+        "Manzana (roja/verde/gala/fuji)",
+        "Pera",
+        "Naranja",
+        "Mandarina",
+        "Toronja",
+        "Mango (petacón/ataulfo)",
+        "Papaya",
+        "Sandía",
+        "Melón",
+        "Piña",
+        "Plátano (tabasco/dominico/macho)",
+        "Uvas",
+        "Fresas",
+        "Arándano azul (blueberry)",
+        "Zarzamoras",
+        "Frambuesas",
+        "Higo",
+        "Kiwi",
+        "Durazno",
+        "Nectarina",
+        "Ciruela",
+        "Granada",
+        "Cereza",
+        "Chabacano",
+        "Guayaba",
+        "Tuna",
+        "Níspero",
+        "Mamey",
+        "Pitahaya (dragon fruit)",
+        "Guanábana",
+        "Maracuyá",
+        "Caqui (persimón)",
+        "Tamarindo (pulpa natural, sin azúcar)",
+        "Coco (pulpa fresca)",
+        "Coco rallado sin azúcar",
+        "Lima",
+        "Limón",
+        "Puré de manzana sin azúcar",
+        "Fruta enlatada en agua/jugo",
+        "Fruta enlatada en almíbar (escurrida)",
+        "Ninguno",
+    ],
+    # Paso 8: Aceites de cocción
+    "aceites_coccion": [
+        "🫒 Aceite de oliva extra virgen",
+        "🥑 Aceite de aguacate",
+        "🥥 Aceite de coco virgen",
+        "🧈 Mantequilla con sal",
+        "🧈 Mantequilla sin sal",
+        "🧈 Mantequilla clarificada (ghee)",
+        "🐷 Manteca de cerdo (casera o artesanal)",
+        "🧴 Spray antiadherente sin calorías (aceite de oliva o aguacate)",
+        "❌ Prefiero cocinar sin aceite o con agua",
+        "Ninguno",
+    ],
+    # Paso 9: Bebidas sin calorías
+    "bebidas_sin_calorias": [
+        "💧 Agua natural",
+        "💦 Agua mineral",
+        "⚡ Bebidas con electrolitos sin azúcar (Electrolit Zero, SueroX, LMNT, etc.)",
+        "🍋 Agua infusionada con frutas naturales (limón, pepino, menta, etc.)",
+        "🍵 Té de hierbas sin azúcar (manzanilla, menta, jengibre, etc.)",
+        "🍃 Té verde o té negro sin azúcar",
+        "☕ Café negro sin azúcar",
+        "🥤 Refrescos sin calorías (Coca Cola Zero, Pepsi Light, etc.)",
+        "Ninguno",
+    ],
+    # Paso 10: Métodos de cocción
+    "metodos_coccion_accesibles": [
+        "🔥 A la plancha",
+        "🔥 A la parrilla",
+        "💧 Hervido",
+        "♨️ Al vapor",
+        "🔥 Horneado / al horno",
+        "💨 Air fryer (freidora de aire)",
+        "⚡ Microondas",
+        "🥄 Salteado (con poco aceite)",
+    ],
+    # Paso 11: Alergias e intolerancias
+    "alergias_alimentarias": [
+        "Lácteos",
+        "Huevo",
+        "Frutos secos",
+        "Mariscos",
+        "Pescado",
+        "Gluten",
+        "Soya",
+        "Semillas",
+        "Ninguna",
+    ],
+    "intolerancias_digestivas": [
+        "Lácteos con lactosa",
+        "Leguminosas",
+        "FODMAPs",
+        "Gluten",
+        "Crucíferas",
+        "Endulzantes artificiales",
+        "Ninguna",
+    ],
+    # Paso 12: Antojos
+    "antojos_dulces": [
+        "Chocolate con leche",
+        "Chocolate amargo",
+        "Pan dulce (conchas, donas, cuernitos)",
+        "Pastel (tres leches, chocolate, etc.)",
+        "Galletas (Marías, Emperador, Chokis, etc.)",
+        "Helado / Nieve",
+        "Flan / Gelatina",
+        "Dulces tradicionales (cajeta, obleas, jamoncillo, glorias)",
+        "Cereal azucarado",
+        "Leche condensada",
+        "Churros",
+        "Ninguno",
+    ],
+    "antojos_salados": [
+        "Papas fritas (Sabritas, Ruffles, etc.)",
+        "Cacahuates enchilados",
+        "Frituras (Doritos, Cheetos, Takis, etc.)",
+        "Totopos con salsa",
+        "Galletas saladas",
+        "Cacahuates japoneses",
+        "Chicharrón (de cerdo o harina)",
+        "Nachos con queso",
+        "Queso derretido o gratinado",
+        "Ninguno",
+    ],
+    "antojos_comida_rapida": [
+        "Tacos (pastor, asada, birria, etc.)",
+        "Tortas (cubana, ahogada, etc.)",
+        "Hamburguesas",
+        "Hot dogs",
+        "Pizza",
+        "Quesadillas fritas",
+        "Tamales",
+        "Pambazos",
+        "Sopes / gorditas",
+        "Elotes / esquites",
+        "Burritos",
+        "Enchiladas",
+        "Empanadas",
+        "Ninguno",
+    ],
+    "antojos_bebidas": [
+        "Refrescos regulares (Coca-Cola, Fanta, etc.)",
+        "Jugos industrializados (Boing, Jumex, etc.)",
+        "Malteadas / Frappés",
+        "Agua de sabor con azúcar (jamaica, horchata, tamarindo)",
+        "Café con azúcar y leche",
+        "Champurrado / atole",
+        "Licuado de plátano con azúcar",
+        "Bebidas alcohólicas (cerveza, tequila, vino, etc.)",
+        "Ninguno",
+    ],
+    "antojos_picantes": [
+        "Chiles en escabeche",
+        "Salsas picantes",
+        "Salsa Valentina, Tajín o Chamoy",
+        "Pepinos con chile y limón",
+        "Mangos verdes con chile",
+        "Gomitas enchiladas",
+        "Fruta con Miguelito o chile en polvo",
+        "Ninguno",
+    ],
+    # Paso 13: Frecuencia de comidas
+    "frecuencia_comidas_ck": [
+        "Desayuno, comida y cena (3 comidas principales)",
+        "Desayuno, comida, cena y una colación",
+        "Desayuno, comida, cena y dos colaciones",
+        "Solo dos comidas principales al día",
+        "Ayuno intermitente con dos comidas principales al día",
+        "Ayuno intermitente con tres comidas principales al día",
+        "Ayuno intermitente con tres comidas principales al día y una colación",
+        "Otro (especificar)",
+    ],
+    # Paso 15: Condiciones médicas, medicamentos y suplementos
+    "condiciones_medicas": [
+        "Diabetes Tipo 1",
+        "Diabetes Tipo 2",
+        "Prediabetes",
+        "Hipertensión arterial (presión alta)",
+        "Hipotensión arterial (presión baja)",
+        "Hipotiroidismo",
+        "Hipertiroidismo",
+        "Síndrome de ovario poliquístico (SOP)",
+        "Resistencia a la insulina",
+        "Síndrome metabólico",
+        "Enfermedad cardiovascular",
+        "Colesterol alto (hipercolesterolemia)",
+        "Triglicéridos altos (hipertrigliceridemia)",
+        "Enfermedad renal crónica",
+        "Hígado graso (esteatosis hepática)",
+        "Enfermedades gastrointestinales (Crohn, colitis ulcerosa, etc.)",
+        "Síndrome de intestino irritable (SII)",
+        "Reflujo gastroesofágico (ERGE)",
+        "Gota (ácido úrico elevado)",
+        "Anemia",
+        "Osteoporosis",
+        "Artritis reumatoide",
+        "Cáncer (actual o en tratamiento)",
+        "Embarazo",
+        "Lactancia",
+        "Menopausia",
+        "Trastornos de la conducta alimentaria (TCA)",
+        "Ninguna de las anteriores",
+    ],
+    "consume_medicamentos": [
+        "Sí",
+        "No",
+    ],
+    "consume_suplementos": [
+        "Sí",
+        "No",
+    ],
+}
+
+# Opciones que significan "no consumo nada de este subgrupo"
+OPCIONES_NINGUNO = frozenset({
+    "Ninguno",
+    "Ninguno (no consumo proteína en polvo)",
+    "Ninguna de las anteriores",
+    "❌ Prefiero cocinar sin aceite o con agua",
+})
+
+# Subgrupos de alimentos agrupados como en el resumen de resultados
+GRUPOS_ALIMENTOS = {
+    "Proteínas grasas": (
+        "huevos_embutidos", "carnes_res_grasas", "carnes_cerdo_grasas", "carnes_pollo_grasas",
+        "organos_grasos", "quesos_grasos", "lacteos_enteros", "pescados_grasos", "mariscos_grasos",
+    ),
+    "Proteínas magras": (
+        "carnes_res_magras", "carnes_cerdo_magras", "carnes_pollo_magras", "organos_magros",
+        "pescados_magros", "mariscos_magros", "quesos_magros", "lacteos_light", "huevos_embutidos_light",
+    ),
+    "Proteína en polvo": ("proteina_polvo_tipos",),
+    "Grasas saludables": ("grasas_naturales", "frutos_secos_semillas", "mantequillas_vegetales"),
+    "Carbohidratos": ("cereales_integrales", "pastas", "tortillas_panes", "raices_tuberculos", "leguminosas"),
+    "Vegetales": ("vegetales_lista",),
+    "Frutas": ("frutas_lista",),
+    "Aceites de cocción": ("aceites_coccion",),
+}
+
+
+def alimentos(claves=None):
+    """Alimentos únicos (sin opciones 'Ninguno') de los subgrupos indicados, en orden de catálogo"""
+    if claves is None:
+        claves = [clave for grupo in GRUPOS_ALIMENTOS.values() for clave in grupo]
+    vistos = {}
+    for clave in claves:
+        for opcion in OPCIONES[clave]:
+            if opcion not in OPCIONES_NINGUNO:
+                vistos.setdefault(opcion, None)
+    return list(vistos)
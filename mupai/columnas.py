@@ -0,0 +1,269 @@
+"""
+Matriz columnar de selecciones para análisis sobre toda la cohorte.
+
+Cada opción del catálogo es una columna de bits empacados (un bit por
+cliente), así que contar cuántos clientes eligieron cada opción es un conteo
+de bits por fila sin desempacar nada, y filtrar es un `&` con la máscara de los
+clientes que cumplen el filtro. Los datos demográficos (`edad`, `sexo`,
+`fecha_llenado`) son arreglos tipados de NumPy.
+
+Todo vive en `datos/columnas/` como archivos `.npy` por generación que se
+abren como memoria mapeada (sin copiarlos a memoria). Como las columnas
+empacadas no se pueden alargar en su lugar, las evaluaciones nuevas esperan
+en una cola en memoria (filas sin empacar) que entra en cada consulta hasta la
+siguiente compactación (ver `mupai.generaciones`).
+
+    python -m mupai.columnas --actualizar
+    python -m mupai.columnas --popularidad vegetales_lista --sexo Mujer --edad 30 45
+    python -m mupai.columnas --coocurrencia "frutas_lista=Fresa" --clave vegetales_lista
+    python -m mupai.columnas --benchmark 2000000
+"""
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from mupai.almacen import RUTA_ALMACEN
+from mupai.catalogo import OPCIONES
+from mupai.generaciones import ArreglosPorGeneracion, compartido
+
+# Universo: cada (pregunta, opción) del catálogo es una columna
+UNIVERSO = tuple((clave, opcion) for clave, opciones in OPCIONES.items() for opcion in opciones)
+COLUMNA = {par: j for j, par in enumerate(UNIVERSO)}
+SEXOS = ("Hombre", "Mujer")
+EDAD_DESCONOCIDA = -1
+# Una matriz guardada con otro catálogo se reconstruye
+HUELLA = hashlib.blake2b("\n".join(f"{c}={o}" for c, o in UNIVERSO + tuple(("sexo", s) for s in SEXOS)).encode(),
+                         digest_size=8).hexdigest()
+# Columnas que se procesan juntas (acota la memoria temporal de cada conteo y de cada compactación)
+COLUMNAS_POR_BLOQUE = 64
+TOP_MOSTRADAS = 10
+
+
+def _edad(valor):
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return EDAD_DESCONOCIDA
+
+
+def _fecha(valor):
+    try:
+        return np.datetime64(str(valor)[:10], "D")
+    except ValueError:
+        return np.datetime64("NaT", "D")
+
+
+def filas(lista_respuestas):
+    """Selección (respuestas × universo, booleana) y arreglos de edad, sexo y fecha de varias respuestas"""
+    x = np.zeros((len(lista_respuestas), len(UNIVERSO)), dtype=bool)
+    for i, r in enumerate(lista_respuestas):
+        for clave in OPCIONES:
+            for opcion in getattr(r, clave, None) or ():
+                j = COLUMNA.get((clave, opcion))
+                if j is not None:
+                    x[i, j] = True
+    edad = np.array([_edad(r.edad) for r in lista_respuestas], dtype=np.int16)
+    sexo = np.array([SEXOS.index(r.sexo) + 1 if r.sexo in SEXOS else 0 for r in lista_respuestas], dtype=np.int8)
+    fecha = np.array([_fecha(r.fecha_llenado) for r in lista_respuestas], dtype="datetime64[D]")
+    return x, edad, sexo, fecha
+
+
+class MatrizColumnar(ArreglosPorGeneracion):
+    """Columnas de bits por opción y demografía de la cohorte, más una cola de evaluaciones recientes"""
+    SUBDIRECTORIO = "columnas"
+    HUELLA = HUELLA
+    ARREGLOS = ("rowids", "seleccion", "edad", "sexo", "fecha")
+    COLA = ARREGLOS
+
+    def __init__(self, ruta_almacen=RUTA_ALMACEN, directorio=None):
+        self.rowids = np.empty(0, dtype=np.int64)
+        self.seleccion = np.empty((len(UNIVERSO), 0), dtype=np.uint8)
+        self.edad = np.empty(0, dtype=np.int16)
+        self.sexo = np.empty(0, dtype=np.int8)
+        self.fecha = np.empty(0, dtype="datetime64[D]")
+        super().__init__(ruta_almacen, directorio)
+
+    def _vaciar_cola(self):
+        self.cola_rowids = np.empty(0, dtype=np.int64)
+        self.cola_seleccion = np.empty((0, len(UNIVERSO)), dtype=bool)
+        self.cola_edad = np.empty(0, dtype=np.int16)
+        self.cola_sexo = np.empty(0, dtype=np.int8)
+        self.cola_fecha = np.empty(0, dtype="datetime64[D]")
+
+    def _escribir(self, generacion, n):
+        # Las columnas se escriben por bloques directo al archivo, sin armar la matriz completa en memoria
+        seleccion = np.lib.format.open_memmap(
+            self._ruta("seleccion", generacion), mode="w+", dtype=np.uint8, shape=(len(UNIVERSO), -(-n // 8))
+        )
+        for inicio in range(0, len(UNIVERSO), COLUMNAS_POR_BLOQUE):
+            bloque = slice(inicio, inicio + COLUMNAS_POR_BLOQUE)
+            bits = np.unpackbits(self.seleccion[bloque], axis=1, count=self.n).astype(bool)
+            seleccion[bloque] = np.packbits(np.concatenate([bits, self.cola_seleccion[:, bloque].T], axis=1), axis=1)
+        seleccion.flush()
+        del seleccion
+        for nombre in ("rowids", "edad", "sexo", "fecha"):
+            np.save(self._ruta(nombre, generacion), np.concatenate([getattr(self, nombre), getattr(self, f"cola_{nombre}")]))
+
+    def agregar_filas(self, rowids, x, edad, sexo, fecha):
+        """Agrega filas ya armadas (ver `filas`) a la cola"""
+        self.cola_rowids = np.concatenate([self.cola_rowids, np.asarray(rowids, dtype=np.int64)])
+        self.cola_seleccion = np.concatenate([self.cola_seleccion, x])
+        self.cola_edad = np.concatenate([self.cola_edad, edad])
+        self.cola_sexo = np.concatenate([self.cola_sexo, sexo])
+        self.cola_fecha = np.concatenate([self.cola_fecha, fecha])
+
+    def _encolar(self, rowids, lote):
+        self.agregar_filas(rowids, *filas(lote))
+
+    def filtro(self, edad=None, sexo=None, desde=None, hasta=None, opciones=()):
+        """
+        Clientes que cumplen todas las condiciones, como (bits empacados de la
+        matriz, booleanos de la cola): edad (mín, máx), sexo, rango de
+        fecha_llenado y opciones [(clave, opción)] seleccionadas.
+        """
+        mascaras = []
+        for edades, sexos, fechas in ((self.edad, self.sexo, self.fecha), (self.cola_edad, self.cola_sexo, self.cola_fecha)):
+            mascara = np.ones(len(edades), dtype=bool)
+            if edad is not None:
+                mascara &= (edades >= edad[0]) & (edades <= edad[1])
+            if sexo is not None:
+                mascara &= sexos == SEXOS.index(sexo) + 1
+            if desde is not None:
+                mascara &= fechas >= np.datetime64(desde, "D")
+            if hasta is not None:
+                mascara &= fechas <= np.datetime64(hasta, "D")
+            mascaras.append(mascara)
+        bits, cola = np.packbits(mascaras[0]), mascaras[1]
+        for par in opciones:
+            bits &= self.seleccion[COLUMNA[par]]
+            cola &= self.cola_seleccion[:, COLUMNA[par]]
+        return bits, cola
+
+    def contar(self, filtro=None):
+        if filtro is None:
+            return self.tamano()
+        bits, cola = filtro
+        return int(np.bitwise_count(bits).sum(dtype=np.int64)) + int(cola.sum())
+
+    def popularidad(self, filtro=None):
+        """Clientes (del filtro) que eligieron cada opción del universo"""
+        conteos = np.empty(len(UNIVERSO), dtype=np.int64)
+        for inicio in range(0, len(UNIVERSO), COLUMNAS_POR_BLOQUE):
+            bloque = self.seleccion[inicio:inicio + COLUMNAS_POR_BLOQUE]
+            if filtro is not None:
+                bloque = bloque & filtro[0]
+            conteos[inicio:inicio + COLUMNAS_POR_BLOQUE] = np.bitwise_count(bloque).sum(axis=1, dtype=np.int64)
+        cola = self.cola_seleccion if filtro is None else self.cola_seleccion[filtro[1]]
+        return conteos + cola.sum(axis=0)
+
+    def coocurrencia(self, par, filtro=None):
+        """Clientes que eligieron cada opción del universo entre los que eligieron `par` (clave, opción)"""
+        bits, cola = filtro if filtro is not None else self.filtro()
+        columna = COLUMNA[par]
+        return self.popularidad((bits & self.seleccion[columna], cola & self.cola_seleccion[:, columna]))
+
+
+def mas_elegidas(conteos, total, clave=None, top=TOP_MOSTRADAS):
+    """[(clave, opción, clientes, fracción)] de mayor a menor, opcionalmente de una sola pregunta"""
+    columnas = [j for j, (c, _) in enumerate(UNIVERSO) if clave is None or c == clave]
+    columnas.sort(key=lambda j: -conteos[j])
+    return [(*UNIVERSO[j], int(conteos[j]), conteos[j] / max(total, 1)) for j in columnas[:top]]
+
+
+def matriz(ruta_almacen=RUTA_ALMACEN):
+    """Matriz compartida del proceso para un almacén"""
+    return compartido(MatrizColumnar, ruta_almacen)
+
+
+def benchmark(n, semilla=0):
+    """Tiempo de conteo, filtro y coocurrencia sobre una matriz sintética de n clientes (densidad ~10%)"""
+    aleatorio = np.random.default_rng(semilla)
+    with tempfile.TemporaryDirectory() as directorio:
+        m = MatrizColumnar(os.path.join(directorio, "evaluaciones.sqlite"))
+        for inicio in range(0, n, 500_000):
+            k = min(500_000, n - inicio)
+            m.agregar_filas(
+                np.arange(inicio + 1, inicio + k + 1),
+                aleatorio.random((k, len(UNIVERSO)), dtype=np.float32) < 0.1,
+                aleatorio.integers(15, 81, k, dtype=np.int16),
+                aleatorio.integers(1, 3, k, dtype=np.int8),
+                np.datetime64("2024-01-01") + aleatorio.integers(0, 1000, k).astype("timedelta64[D]"),
+            )
+            m.marca = inicio + k
+            m._compactar()
+        m = MatrizColumnar(m.ruta_almacen)
+
+        tiempos = {}
+        inicio = time.perf_counter()
+        m.popularidad()
+        tiempos["popularidad"] = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        f = m.filtro(edad=(30, 45), sexo="Mujer", desde="2025-01-01")
+        m.popularidad(f)
+        tiempos["popularidad_filtrada"] = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        m.coocurrencia(UNIVERSO[0])
+        tiempos["coocurrencia"] = time.perf_counter() - inicio
+        return m.tamano(), tiempos
+
+
+def _par(texto):
+    clave, _, opcion = texto.partition("=")
+    if (clave, opcion) not in COLUMNA:
+        raise argparse.ArgumentTypeError(f"Opción desconocida: {texto} (se espera clave=opción del catálogo)")
+    return clave, opcion
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Análisis columnar de las selecciones de la cohorte MUPAI")
+    parser.add_argument("--almacen", default=RUTA_ALMACEN)
+    parser.add_argument("--actualizar", action="store_true", help="Agregar lo nuevo del almacén y compactar")
+    parser.add_argument("--popularidad", nargs="?", const="", metavar="CLAVE", help="Opciones más elegidas (de una pregunta)")
+    parser.add_argument("--coocurrencia", type=_par, metavar="CLAVE=OPCIÓN", help="Qué más eligen quienes eligieron esta opción")
+    parser.add_argument("--clave", help="Limitar la coocurrencia a una pregunta")
+    parser.add_argument("--edad", type=int, nargs=2, metavar=("MIN", "MAX"))
+    parser.add_argument("--sexo", choices=SEXOS)
+    parser.add_argument("--desde", help="fecha_llenado mínima (AAAA-MM-DD)")
+    parser.add_argument("--hasta", help="fecha_llenado máxima (AAAA-MM-DD)")
+    parser.add_argument("--con", type=_par, action="append", default=[], metavar="CLAVE=OPCIÓN",
+                        help="Solo clientes que eligieron esta opción (se puede repetir)")
+    parser.add_argument("--top", type=int, default=TOP_MOSTRADAS)
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Medir consultas sobre N clientes sintéticos")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        n, tiempos = benchmark(args.benchmark)
+        print(f"{n} clientes × {len(UNIVERSO)} opciones")
+        for nombre, segundos in tiempos.items():
+            print(f"  {nombre}: {segundos * 1000:.0f} ms")
+        return 0
+
+    m = matriz(args.almacen)
+    leidas = m.actualizar()
+    if args.actualizar:
+        m.compactar()
+        print(f"Evaluaciones nuevas: {leidas} | Matriz: {m.tamano()}")
+
+    f = m.filtro(args.edad, args.sexo, args.desde, args.hasta, args.con)
+    total = m.contar(f)
+    if args.popularidad is not None:
+        print(f"Clientes en el filtro: {total}")
+        for clave, opcion, n, fraccion in mas_elegidas(m.popularidad(f), total, args.popularidad or None, args.top):
+            print(f"  {opcion} [{clave}]: {n} ({fraccion:.0%})")
+    if args.coocurrencia:
+        base = m.contar(m.filtro(args.edad, args.sexo, args.desde, args.hasta, args.con + [args.coocurrencia]))
+        print(f"Clientes que eligieron {args.coocurrencia[1]}: {base} de {total}")
+        conteos = m.coocurrencia(args.coocurrencia, f)
+        conteos[COLUMNA[args.coocurrencia]] = 0
+        for clave, opcion, n, fraccion in mas_elegidas(conteos, base, args.clave, args.top):
+            print(f"  {opcion} [{clave}]: {n} ({fraccion:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+Compresión zstd con diccionario de las respuestas y los resúmenes guardados.
+
+Cada evaluación repite los mismos textos largos de opciones y encabezados de
+sección, así que un diccionario entrenado con evaluaciones anteriores deja
+cada una en una fracción de su tamaño. El almacén guarda los diccionarios en
+su propia base (un respaldo del archivo basta para leerlo), comprime al
+escribir con el más reciente y al leer descomprime con el que indica cada
+trama zstd; los valores guardados antes como texto se leen tal cual.
+
+    python -m mupai.compresion --entrenar --recomprimir
+    python -m mupai.compresion --benchmark --muestras 2000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import zstandard
+
+NIVEL = 9
+TAMANO_DICCIONARIO = 112 * 1024
+# Evaluaciones recientes con que se entrena un diccionario; con menos de MIN_MUESTRAS no vale la pena
+MUESTRAS_ENTRENAMIENTO = 5000
+MIN_MUESTRAS = 200
+SIN_DICCIONARIO = 0
+
+
+def entrenar(textos, tamano=TAMANO_DICCIONARIO):
+    """(id, bytes) de un diccionario zstd entrenado con una lista de textos"""
+    diccionario = zstandard.train_dictionary(tamano, [texto.encode("utf-8") for texto in textos])
+    return diccionario.dict_id(), diccionario.as_bytes()
+
+
+def diccionario_de(valor):
+    """Id del diccionario con que está comprimido un valor guardado (0 sin diccionario), o None si es texto"""
+    return None if valor is None or isinstance(valor, str) else zstandard.get_frame_parameters(valor).dict_id
+
+
+class Compresion:
+    """
+    Compresores y descompresores por diccionario. Los diccionarios se leen
+    una vez con `leer_diccionario(id)`; los (des)compresores de zstd no se
+    pueden compartir entre hilos, así que cada hilo tiene los suyos.
+    """
+
+    def __init__(self, leer_diccionario):
+        self.leer_diccionario = leer_diccionario
+        self.diccionarios = {}
+        self._candado = threading.Lock()
+        self._hilos = threading.local()
+
+    def _diccionario(self, identificador):
+        if identificador == SIN_DICCIONARIO:
+            return None
+        with self._candado:
+            if identificador not in self.diccionarios:
+                self.diccionarios[identificador] = zstandard.ZstdCompressionDict(self.leer_diccionario(identificador))
+            return self.diccionarios[identificador]
+
+    def _propios(self, tipo):
+        if not hasattr(self._hilos, tipo):
+            setattr(self._hilos, tipo, {})
+        return getattr(self._hilos, tipo)
+
+    def comprimir(self, texto, diccionario=SIN_DICCIONARIO):
+        if texto is None:
+            return None
+        compresores = self._propios("compresores")
+        if diccionario not in compresores:
+            compresores[diccionario] = zstandard.ZstdCompressor(level=NIVEL, dict_data=self._diccionario(diccionario))
+        return compresores[diccionario].compress(texto.encode("utf-8"))
+
+    def descomprimir(self, valor):
+        """Texto de un valor guardado: comprimido (bytes) o, de antes de comprimir, texto tal cual"""
+        if valor is None or isinstance(valor, str):
+            return valor
+        diccionario = diccionario_de(valor)
+        descompresores = self._propios("descompresores")
+        if diccionario not in descompresores:
+            descompresores[diccionario] = zstandard.ZstdDecompressor(dict_data=self._diccionario(diccionario))
+        return descompresores[diccionario].decompress(valor).decode("utf-8")
+
+
+def _medir(funcion, valores):
+    inicio = time.perf_counter()
+    resultado = [funcion(valor) for valor in valores]
+    return resultado, time.perf_counter() - inicio
+
+
+def benchmark(almacen, muestras=2000):
+    """Tasa de compresión y velocidad del códec y del almacén con y sin diccionario sobre evaluaciones reales"""
+    from mupai.almacen import AlmacenEvaluaciones
+
+    registros = almacen.recientes(muestras)
+    if len(registros) < 2 * MIN_MUESTRAS:
+        raise ValueError(f"Se necesitan al menos {2 * MIN_MUESTRAS} evaluaciones guardadas")
+    # Se entrena con la mitad más antigua y se mide con la más reciente, como pasaría en producción
+    mitad = len(registros) // 2
+    entrenamiento, prueba = registros[mitad:], registros[:mitad]
+    textos = [texto for registro in prueba for texto in (registro[5], registro[6]) if texto]
+    crudo = sum(len(texto.encode("utf-8")) for texto in textos)
+    identificador, datos = entrenar([texto for registro in entrenamiento for texto in (registro[5], registro[6]) if texto])
+
+    resultados = {"evaluaciones": len(prueba), "bytes_sin_comprimir": crudo}
+    compresion = Compresion(lambda _: datos)
+    for nombre, diccionario in (("sin_diccionario", SIN_DICCIONARIO), ("diccionario", identificador)):
+        comprimidos, segundos_c = _medir(lambda texto: compresion.comprimir(texto, diccionario), textos)
+        _, segundos_d = _medir(compresion.descomprimir, comprimidos)
+        resultados[nombre] = {
+            "tasa": crudo / sum(map(len, comprimidos)),
+            "comprimir_mb_s": crudo / segundos_c / 1e6,
+            "descomprimir_mb_s": crudo / segundos_d / 1e6,
+        }
+
+    with tempfile.TemporaryDirectory() as directorio:
+        destino = AlmacenEvaluaciones(os.path.join(directorio, "evaluaciones.sqlite"))
+        destino.guardar_diccionario(identificador, datos)
+        inicio = time.perf_counter()
+        for i in range(0, len(prueba), 500):
+            destino.guardar_lote(prueba[i:i + 500])
+        escritura = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        leidas = sum(1 for _ in destino.iterar())
+        lectura = time.perf_counter() - inicio
+        resultados["almacen"] = {
+            "escritura_eval_s": len(prueba) / escritura,
+            "lectura_eval_s": leidas / lectura,
+            "bytes_en_disco": destino.tamano_en_disco(),
+        }
+    return resultados
+
+
+def main(argv=None):
+    from mupai.almacen import RUTA_ALMACEN, AlmacenEvaluaciones
+
+    parser = argparse.ArgumentParser(description="Diccionarios zstd del almacén de evaluaciones MUPAI")
+    parser.add_argument("--almacen", default=RUTA_ALMACEN)
+    parser.add_argument("--entrenar", action="store_true", help="Entrenar un diccionario nuevo con las evaluaciones recientes")
+    parser.add_argument("--recomprimir", action="store_true", help="Reescribir lo guardado con el diccionario más reciente")
+    parser.add_argument("--benchmark", action="store_true", help="Medir tasa de compresión y velocidad")
+    parser.add_argument("--muestras", type=int, default=MUESTRAS_ENTRENAMIENTO)
+    args = parser.parse_args(argv)
+
+    almacen = AlmacenEvaluaciones(args.almacen)
+    if args.entrenar:
+        identificador = almacen.entrenar_diccionario(args.muestras)
+        print(f"Diccionario {identificador}" if identificador else f"Se necesitan al menos {MIN_MUESTRAS} evaluaciones")
+    if args.recomprimir:
+        antes = almacen.tamano_en_disco()
+        print(f"Evaluaciones recomprimidas: {almacen.recomprimir()}")
+        print(f"Tamaño en disco: {antes / 1e6:.1f} MB → {almacen.tamano_en_disco() / 1e6:.1f} MB")
+    if args.benchmark:
+        resultados = benchmark(almacen, args.muestras)
+        print(f"{resultados['evaluaciones']} evaluaciones, {resultados['bytes_sin_comprimir'] / 1e6:.1f} MB sin comprimir")
+        for nombre in ("sin_diccionario", "diccionario"):
+            r = resultados[nombre]
+            print(f"  {nombre:>16}: {r['tasa']:5.1f}x  comprimir {r['comprimir_mb_s']:6.1f} MB/s  "
+                  f"descomprimir {r['descomprimir_mb_s']:7.1f} MB/s")
+        r = resultados["almacen"]
+        print(f"  almacén con diccionario: escritura {r['escritura_eval_s']:.0f} eval/s, lectura {r['lectura_eval_s']:.0f} "
+              f"eval/s, {r['bytes_en_disco'] / 1e6:.1f} MB en disco")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""Construcción y envío de correos de MUPAI por SMTP (Zoho)."""
+import smtplib
+from contextlib import contextmanager
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+EMAIL_ADMIN = "administracion@muscleupgym.fitness"
+SMTP_HOST = "smtp.zoho.com"
+SMTP_PORT = 587
+PASSWORD_PENDIENTE = "TU_PASSWORD_AQUI"
+
+
+def crear_mensaje_resumen(contenido, nombre_cliente, fecha):
+    """Crea el mensaje con el resumen completo de la evaluación de un cliente"""
+    msg = MIMEMultipart()
+    msg['From'] = EMAIL_ADMIN
+    msg['To'] = EMAIL_ADMIN
+    msg['Subject'] = f"Evaluación patrones alimentarios MUPAI - {nombre_cliente} ({fecha})"
+    msg.attach(MIMEText(contenido, 'plain'))
+    return msg
+
+
+@contextmanager
+def sesion_smtp(password, timeout=30):
+    """Abre una sesión SMTP autenticada y la cierra al salir"""
+    server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=timeout)
+    try:
+        server.starttls()
+        server.login(EMAIL_ADMIN, password)
+        yield server
+    finally:
+        try:
+            server.quit()
+        except smtplib.SMTPException:
+            pass
+
+
+def enviar_mensajes(mensajes, password, timeout=30):
+    """Envía uno o varios mensajes reutilizando una sola sesión SMTP"""
+    with sesion_smtp(password, timeout) as server:
+        for msg in mensajes:
+            server.send_message(msg)
@@ -0,0 +1,228 @@
+"""
+Modo digest: las evaluaciones completadas se encolan localmente y un
+programador genera un solo correo consolidado por intervalo, con el resumen
+de cada cliente como archivo adjunto. El correo se entrega a través del
+spool de salida (`mupai.spool`).
+
+Uso independiente de Streamlit (p. ej. desde cron):
+
+    ZOHO_PASSWORD=... python -m mupai.digest --una-vez
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+import uuid
+from datetime import datetime
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from mupai.correo import EMAIL_ADMIN
+from mupai.spool import DIRECTORIO_SPOOL, SpoolCorreo, TrabajadorReenvio, reenviar_pendientes
+
+logger = logging.getLogger(__name__)
+
+DIRECTORIO_DIGEST = os.path.join("datos", "digest")
+INTERVALO_MINUTOS = 60
+MAX_POR_CORREO = 200
+SIN_CONDICIONES = "Ninguna de las anteriores"
+
+
+def es_urgente(condiciones_medicas):
+    """Una evaluación es urgente si reporta al menos una condición médica real"""
+    return any(c != SIN_CONDICIONES for c in (condiciones_medicas or []))
+
+
+def _subdirectorio(directorio, nombre):
+    ruta = os.path.join(directorio, nombre)
+    os.makedirs(ruta, exist_ok=True)
+    return ruta
+
+
+def encolar_evaluacion(contenido, nombre_cliente, email_cliente, fecha, edad, telefono,
+                       directorio=DIRECTORIO_DIGEST):
+    """Guarda la evaluación en la cola del digest. Retorna la ruta del archivo encolado."""
+    pendientes = _subdirectorio(directorio, "pendientes")
+    entrada = {
+        "nombre": nombre_cliente,
+        "email": email_cliente,
+        "fecha": fecha,
+        "edad": edad,
+        "telefono": telefono,
+        "contenido": contenido,
+        "encolado": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    nombre_archivo = f"{time.time_ns()}-{uuid.uuid4().hex[:8]}.json"
+    temporal = os.path.join(directorio, f".{nombre_archivo}.tmp")
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(entrada, f, ensure_ascii=False, default=str)
+    # El rename es atómico: el programador nunca ve archivos a medio escribir
+    destino = os.path.join(pendientes, nombre_archivo)
+    os.replace(temporal, destino)
+    return destino
+
+
+def _nombre_adjunto(entrada):
+    base = unicodedata.normalize("NFKD", str(entrada.get("nombre") or "cliente"))
+    base = base.encode("ascii", "ignore").decode()
+    base = re.sub(r"[^A-Za-z0-9]+", "_", base).strip("_") or "cliente"
+    return f"evaluacion_{base}_{entrada.get('fecha') or 'sin_fecha'}.txt"
+
+
+def crear_mensaje_digest(entradas):
+    """Crea un correo consolidado con un adjunto .txt por cada evaluación"""
+    ahora = datetime.now().strftime("%Y-%m-%d %H:%M")
+    msg = MIMEMultipart()
+    msg['From'] = EMAIL_ADMIN
+    msg['To'] = EMAIL_ADMIN
+    msg['Subject'] = f"Digest evaluaciones MUPAI - {len(entradas)} evaluaciones ({ahora})"
+
+    lineas = [
+        "DIGEST DE EVALUACIONES DE PATRONES ALIMENTARIOS MUPAI",
+        "=====================================================",
+        "",
+        f"Evaluaciones incluidas: {len(entradas)}",
+        f"Generado: {ahora}",
+        "",
+        "Clientes (el resumen completo de cada uno va adjunto):",
+    ]
+    for i, entrada in enumerate(entradas, 1):
+        lineas.append(
+            f"{i}. {entrada.get('nombre', 'No especificado')} | {entrada.get('email', 'No especificado')} | "
+            f"Tel: {entrada.get('telefono', 'No especificado')} | Edad: {entrada.get('edad', 'No especificado')} | "
+            f"Fecha: {entrada.get('fecha', 'No especificado')}"
+        )
+    lineas += ["", "Sistema: MUPAI - Muscle Up Performance Assessment Intelligence"]
+    msg.attach(MIMEText("\n".join(lineas), 'plain', 'utf-8'))
+
+    for entrada in entradas:
+        adjunto = MIMEText(entrada.get("contenido", ""), 'plain', 'utf-8')
+        adjunto.add_header('Content-Disposition', 'attachment', filename=_nombre_adjunto(entrada))
+        msg.attach(adjunto)
+    return msg
+
+
+def recuperar_en_envio(directorio=DIRECTORIO_DIGEST):
+    """Devuelve a pendientes lo que quedó reclamado por un envío interrumpido"""
+    enviando = _subdirectorio(directorio, "enviando")
+    pendientes = _subdirectorio(directorio, "pendientes")
+    for nombre in os.listdir(enviando):
+        os.replace(os.path.join(enviando, nombre), os.path.join(pendientes, nombre))
+
+
+def _reclamar_pendientes(directorio, limite):
+    """Mueve hasta `limite` archivos de pendientes a enviando (rename atómico)"""
+    pendientes = _subdirectorio(directorio, "pendientes")
+    enviando = _subdirectorio(directorio, "enviando")
+    reclamados = []
+    for nombre in sorted(os.listdir(pendientes)):
+        if len(reclamados) >= limite:
+            break
+        destino = os.path.join(enviando, nombre)
+        try:
+            os.rename(os.path.join(pendientes, nombre), destino)
+        except FileNotFoundError:
+            continue  # Otro proceso lo reclamó primero
+        reclamados.append(destino)
+    return reclamados
+
+
+def generar_digest(spool, directorio=DIRECTORIO_DIGEST, max_por_correo=MAX_POR_CORREO):
+    """
+    Convierte las evaluaciones encoladas en correos consolidados y los deja en
+    el spool de salida. Retorna el número de evaluaciones incluidas.
+    """
+    pendientes = _subdirectorio(directorio, "pendientes")
+    total = 0
+    while True:
+        reclamados = _reclamar_pendientes(directorio, max_por_correo)
+        if not reclamados:
+            return total
+        try:
+            entradas = []
+            for ruta in reclamados:
+                with open(ruta, encoding="utf-8") as f:
+                    entradas.append(json.load(f))
+            # La clave depende de los archivos incluidos: regenerar el mismo lote no duplica
+            nombres = "\n".join(os.path.basename(r) for r in reclamados)
+            clave = "digest-" + hashlib.sha256(nombres.encode("utf-8")).hexdigest()
+            spool.guardar(crear_mensaje_digest(entradas), clave=clave)
+        except Exception:
+            # Si falla, todo regresa a la cola para el siguiente intervalo
+            for ruta in reclamados:
+                os.replace(ruta, os.path.join(pendientes, os.path.basename(ruta)))
+            raise
+        for ruta in reclamados:
+            os.remove(ruta)
+        total += len(reclamados)
+
+
+class ProgramadorDigest(threading.Thread):
+    """Hilo en segundo plano que genera el digest cada `intervalo_minutos`"""
+
+    def __init__(self, spool, intervalo_minutos=INTERVALO_MINUTOS, directorio=DIRECTORIO_DIGEST,
+                 al_generar=None):
+        super().__init__(name="mupai-digest", daemon=True)
+        self.spool = spool
+        self.intervalo = max(float(intervalo_minutos), 1.0) * 60
+        self.directorio = directorio
+        self.al_generar = al_generar
+        self._detener = threading.Event()
+
+    def run(self):
+        recuperar_en_envio(self.directorio)
+        while not self._detener.wait(self.intervalo):
+            try:
+                incluidas = generar_digest(self.spool, self.directorio)
+                if incluidas:
+                    logger.info("Digest generado con %d evaluaciones", incluidas)
+                    if self.al_generar:
+                        self.al_generar()
+            except Exception:
+                logger.exception("Error al generar el digest; se reintentará en el siguiente intervalo")
+
+    def detener(self):
+        self._detener.set()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Envía el digest de evaluaciones MUPAI")
+    parser.add_argument("--directorio", default=DIRECTORIO_DIGEST)
+    parser.add_argument("--spool", default=DIRECTORIO_SPOOL)
+    parser.add_argument("--intervalo", type=float, default=INTERVALO_MINUTOS,
+                        help="Minutos entre envíos (modo continuo)")
+    parser.add_argument("--una-vez", action="store_true",
+                        help="Envía lo pendiente y termina (para cron)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    password = os.environ.get("ZOHO_PASSWORD")
+    if not password:
+        parser.error("Define la variable de entorno ZOHO_PASSWORD")
+
+    spool = SpoolCorreo(args.spool)
+    if args.una_vez:
+        recuperar_en_envio(args.directorio)
+        incluidas = generar_digest(spool, args.directorio)
+        enviados = reenviar_pendientes(spool, password)
+        print(f"Evaluaciones incluidas: {incluidas} | Correos enviados: {enviados}")
+        return
+
+    trabajador = TrabajadorReenvio(spool, password)
+    trabajador.start()
+    programador = ProgramadorDigest(spool, args.intervalo, args.directorio, al_generar=trabajador.despertar)
+    programador.start()
+    try:
+        programador.join()
+    except KeyboardInterrupt:
+        programador.detener()
+        trabajador.detener()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Arreglos derivados del almacén que se guardan por generaciones.
+
+El índice de similitud y la matriz columnar guardan lo que calculan de toda la
+cohorte como archivos `.npy` en su propio directorio junto al almacén; se
+abren como memoria mapeada y `meta.json` indica la generación vigente. Como
+esos arreglos no se pueden alargar en su lugar, las evaluaciones nuevas se leen
+del almacén por rowid a una cola en memoria; cuando la cola llega a
+`TAMANO_COLA` o a `FRACCION_COLA` de la generación (lo que sea mayor) se
+compacta en una generación nueva, así el costo de reescribir los archivos se
+reparte entre muchas evaluaciones.
+
+Cada proceso escribe los archivos de su generación con su propio nombre y
+publica reemplazando `meta.json` de forma atómica; si otro proceso publicó
+antes, se parte de su generación y de la cola solo se conserva lo que esa no
+incluye. `ArreglosPorGeneracion` resuelve todo eso; cada subclase define qué
+arreglos guarda, cómo encola un lote de respuestas y cómo escribe una
+generación.
+"""
+import glob
+import json
+import os
+import threading
+
+import numpy as np
+
+from mupai.almacen import AlmacenEvaluaciones
+from mupai.respuestas import Respuestas
+
+TAMANO_COLA = 4096
+FRACCION_COLA = 0.25
+
+
+class ArreglosPorGeneracion:
+    """
+    Arreglos de la generación vigente (memoria mapeada) más una cola en memoria.
+
+    Las subclases definen `SUBDIRECTORIO`, `HUELLA` (una generación guardada con
+    otra huella se ignora y se reconstruye), `ARREGLOS` (nombres de los `.npy`
+    de cada generación, empezando por `rowids`) y `COLA` (nombres de los
+    arreglos de la cola, `cola_<nombre>`), e implementan `_vaciar_cola`,
+    `_encolar(rowids, lote)` y `_escribir(generacion, n)`. Los arreglos se
+    reemplazan, nunca se modifican en su lugar, así que una consulta puede
+    tomarlos con `_vista` y trabajar sin retener el candado.
+    """
+    SUBDIRECTORIO = ""
+    HUELLA = ""
+    ARREGLOS = ("rowids",)
+    COLA = ("rowids",)
+
+    def __init__(self, ruta_almacen, directorio=None):
+        self.ruta_almacen = ruta_almacen
+        self.directorio = directorio or os.path.join(os.path.dirname(ruta_almacen), self.SUBDIRECTORIO)
+        self._candado = threading.Lock()
+        self.generacion = ""
+        self.marca = self.marca_generacion = 0
+        self.n = 0
+        self._vaciar_cola()
+        self._abrir()
+
+    def _vaciar_cola(self):
+        raise NotImplementedError
+
+    def _encolar(self, rowids, lote):
+        """Agrega a la cola un lote de respuestas con sus rowids"""
+        raise NotImplementedError
+
+    def _escribir(self, generacion, n):
+        """Escribe los `ARREGLOS` de la generación vigente unida a la cola (n filas)"""
+        raise NotImplementedError
+
+    def _ruta(self, nombre, generacion):
+        return os.path.join(self.directorio, f"{nombre}-{generacion}.npy")
+
+    def _meta(self):
+        ruta = os.path.join(self.directorio, "meta.json")
+        if not os.path.exists(ruta):
+            return None
+        with open(ruta, encoding="utf-8") as f:
+            meta = json.load(f)
+        return meta if meta.get("huella") == self.HUELLA else None
+
+    def _abrir(self, meta=None):
+        meta = meta or self._meta()
+        if meta is None:
+            return
+        g = meta["generacion"]
+        for nombre in self.ARREGLOS:
+            setattr(self, nombre, np.load(self._ruta(nombre, g), mmap_mode="r"))
+        self.n = meta["n"]
+        self.generacion, self.marca_generacion = g, meta["marca"]
+        self.marca = max(self.marca, self.marca_generacion)
+
+    def _compactar(self):
+        """Une la cola con la generación vigente y la publica como una generación nueva"""
+        # Si otro proceso ya publicó una generación más reciente, se parte de ella
+        meta = self._meta()
+        if meta and meta["generacion"] != self.generacion and meta["marca"] >= self.marca_generacion:
+            self._abrir(meta)
+            nuevas = self.cola_rowids > self.marca_generacion
+            for nombre in self.COLA:
+                setattr(self, f"cola_{nombre}", getattr(self, f"cola_{nombre}")[nuevas])
+
+        os.makedirs(self.directorio, exist_ok=True)
+        numero = int(self.generacion.split(".")[0]) + 1 if self.generacion else 1
+        g = f"{numero}.{os.getpid()}"
+        n = self.n + len(self.cola_rowids)
+        self._escribir(g, n)
+
+        # Cada proceso escribe archivos con su propio nombre; meta.json se reemplaza al final
+        meta = {"generacion": g, "marca": self.marca, "n": n, "huella": self.HUELLA}
+        temporal = os.path.join(self.directorio, f"meta.json.{os.getpid()}")
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(temporal, os.path.join(self.directorio, "meta.json"))
+        # Generaciones anteriores (quien aún las tenga mapeadas las conserva hasta cerrarlas)
+        for ruta in glob.glob(os.path.join(self.directorio, "*-*.npy")):
+            if int(ruta.rsplit("-", 1)[1].split(".")[0]) < numero:
+                os.remove(ruta)
+        self._vaciar_cola()
+        self._abrir(meta)
+
+    def actualizar(self):
+        """Encola lo guardado en el almacén desde la última revisión; retorna cuántas evaluaciones leyó"""
+        with self._candado:
+            if not os.path.exists(self.ruta_almacen):
+                return 0
+            leidas = 0
+            rowids, lote = [], []
+            # El almacén guarda las respuestas ya normalizadas
+            for rowid, datos in AlmacenEvaluaciones(self.ruta_almacen).iterar_nuevas(self.marca):
+                rowids.append(rowid)
+                lote.append(Respuestas.desde_mapeo(datos))
+                if len(lote) == TAMANO_COLA:
+                    leidas += self._agregar_lote(rowids, lote)
+                    rowids, lote = [], []
+            if lote:
+                leidas += self._agregar_lote(rowids, lote)
+            return leidas
+
+    def _agregar_lote(self, rowids, lote):
+        leidas = len(lote)
+        self.marca = max(self.marca, rowids[-1])
+        # Si a media lectura se adoptó la generación de otro proceso, lo que esta ya incluye no se vuelve a encolar
+        if rowids[0] <= self.marca_generacion:
+            nuevas = [i for i, rowid in enumerate(rowids) if rowid > self.marca_generacion]
+            rowids, lote = [rowids[i] for i in nuevas], [lote[i] for i in nuevas]
+        if lote:
+            self._encolar(rowids, lote)
+        if len(self.cola_rowids) >= max(TAMANO_COLA, FRACCION_COLA * self.n):
+            self._compactar()
+        return leidas
+
+    def compactar(self):
+        """Publica la cola ya, sin esperar a que se llene (p. ej. al terminar una carga inicial)"""
+        with self._candado:
+            if len(self.cola_rowids):
+                self._compactar()
+
+    def tamano(self):
+        with self._candado:
+            return self.n + len(self.cola_rowids)
+
+    def _vista(self, *nombres):
+        """Los atributos `nombres` leídos juntos, para que una compactación concurrente no los mezcle"""
+        with self._candado:
+            return tuple(getattr(self, nombre) for nombre in nombres)
+
+
+_compartidos = {}
+_candado_compartidos = threading.Lock()
+
+
+def compartido(clase, ruta_almacen):
+    """Instancia de `clase` compartida por el proceso para un almacén"""
+    with _candado_compartidos:
+        if (clase, ruta_almacen) not in _compartidos:
+            _compartidos[clase, ruta_almacen] = clase(ruta_almacen)
+        return _compartidos[clase, ruta_almacen]
@@ -0,0 +1,272 @@
+"""
+Interacciones medicamento–alimento a partir del texto libre del paso 15.
+
+Una tabla incluida (sin consultas externas) relaciona cada fármaco, por su
+nombre genérico y sus marcas comerciales, con los alimentos del catálogo que
+interactúan con él. Las menciones en `medicamentos_lista` y
+`suplementos_lista` se emparejan con un índice de trigramas que tolera
+errores de escritura ("coumadín", "warfarian") y lleva cada marca a su
+genérico. Los alimentos de cada interacción se guardan como un entero de bits
+sobre todas las opciones de alimentos del catálogo; cruzarlos con lo que el
+cliente seleccionó es un `&`.
+
+    python -m mupai.interacciones "Coumadin 5 mg diario"
+    python -m mupai.interacciones --almacen datos/evaluaciones.sqlite
+"""
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+
+from mupai.alergenos import CLAVES_ALIMENTOS, alimentos_de_regla
+from mupai.busqueda import plegar
+from mupai.catalogo import OPCIONES, OPCIONES_NINGUNO
+
+# Similitud de Dice mínima entre trigramas de la mención y del nombre
+SIMILITUD_MINIMA = 0.7
+# Las menciones más cortas solo cuentan si coinciden exactamente
+LARGO_MINIMO_APROXIMADO = 5
+CAMPOS_MEDICAMENTOS = ("medicamentos_lista", "suplementos_lista")
+
+# Grupos de alimentos que interactúan, con la forma de las reglas de `mupai.alergenos`
+VITAMINA_K = {
+    "palabras": ("espinaca", "acelga", "kale", "lechuga", "brócoli", "rúcula", "berros", "perejil", r"col\b",
+                 "coles de bruselas", "repollo"),
+    "motivo": "Vitamina K",
+    "indicacion": "Mantener una cantidad estable día a día; no eliminarlos ni aumentarlos de golpe",
+}
+TIRAMINA = {
+    "palabras": ("queso manchego", "queso gouda", "queso cheddar", "queso roquefort", "queso brie", "queso camembert",
+                 "queso parmesano", "queso gruyere", "queso de cabra maduro", "salami", "pepperoni", "chorizo",
+                 "jamón serrano", "salsa de soya", "miso", "chucrut", "kimchi", r"habas\b"),
+    "motivo": "Tiramina (quesos madurados, embutidos curados, fermentados)",
+    "indicacion": "Evitarlos: riesgo de crisis hipertensiva",
+}
+TORONJA = {
+    "palabras": ("toronja", "pomelo"),
+    "motivo": "Toronja",
+    "indicacion": "Evitarla: eleva la concentración del medicamento en sangre",
+}
+POTASIO = {
+    "palabras": ("plátano", "aguacate", "naranja", r"papa\b", "camote", "espinaca", "jitomate"),
+    "motivo": "Alimentos altos en potasio",
+    "indicacion": "Sin excesos; revisar el potasio en sangre con su médico",
+}
+CALCIO = {
+    "palabras": ("leche", "yogur", "queso", "kéfir"),
+    "excepto": ("almendra", "coco", "chocolate"),
+    "motivo": "Lácteos y calcio",
+    "indicacion": "Separarlos al menos 2 horas de la toma",
+}
+ABSORCION_TIROIDES = {
+    "palabras": ("soya", "edamame", "café", "linaza"),
+    "motivo": "Soya, café y fibra",
+    "indicacion": "Tomar la levotiroxina en ayunas, 30 a 60 minutos antes de ellos",
+}
+ABSORCION_HIERRO = {
+    "palabras": ("café", r"té\b", "leche", "yogur", "queso"),
+    "motivo": "Café, té y lácteos",
+    "indicacion": "Separarlos al menos 1 hora del suplemento de hierro",
+}
+
+# Genérico → marcas comerciales y grupos de alimentos con los que interactúa
+INTERACCIONES = {
+    "Warfarina": {"marcas": ("Coumadin", "Marevan", "Aldocumar"), "alimentos": (VITAMINA_K,)},
+    "Acenocumarol": {"marcas": ("Sintrom",), "alimentos": (VITAMINA_K,)},
+    "Fenelzina": {"marcas": ("Nardil",), "alimentos": (TIRAMINA,)},
+    "Tranilcipromina": {"marcas": ("Parnate",), "alimentos": (TIRAMINA,)},
+    "Selegilina": {"marcas": ("Emsam",), "alimentos": (TIRAMINA,)},
+    "Rasagilina": {"marcas": ("Azilect",), "alimentos": (TIRAMINA,)},
+    "Moclobemida": {"marcas": ("Aurorix",), "alimentos": (TIRAMINA,)},
+    "Linezolid": {"marcas": ("Zyvox",), "alimentos": (TIRAMINA,)},
+    "Simvastatina": {"marcas": ("Zocor",), "alimentos": (TORONJA,)},
+    "Atorvastatina": {"marcas": ("Lipitor", "Zarator"), "alimentos": (TORONJA,)},
+    "Lovastatina": {"marcas": ("Mevacor",), "alimentos": (TORONJA,)},
+    "Nifedipino": {"marcas": ("Adalat",), "alimentos": (TORONJA,)},
+    "Felodipino": {"marcas": ("Plendil",), "alimentos": (TORONJA,)},
+    "Amlodipino": {"marcas": ("Norvasc",), "alimentos": (TORONJA,)},
+    "Sildenafil": {"marcas": ("Viagra",), "alimentos": (TORONJA,)},
+    "Ciclosporina": {"marcas": ("Sandimmun", "Neoral"), "alimentos": (TORONJA,)},
+    "Tacrolimus": {"marcas": ("Prograf",), "alimentos": (TORONJA,)},
+    "Amiodarona": {"marcas": ("Cordarone",), "alimentos": (TORONJA,)},
+    "Buspirona": {"marcas": ("Buspar",), "alimentos": (TORONJA,)},
+    "Enalapril": {"marcas": ("Renitec",), "alimentos": (POTASIO,)},
+    "Lisinopril": {"marcas": ("Zestril", "Prinivil"), "alimentos": (POTASIO,)},
+    "Captopril": {"marcas": ("Capoten",), "alimentos": (POTASIO,)},
+    "Losartán": {"marcas": ("Cozaar",), "alimentos": (POTASIO,)},
+    "Valsartán": {"marcas": ("Diovan",), "alimentos": (POTASIO,)},
+    "Telmisartán": {"marcas": ("Micardis",), "alimentos": (POTASIO,)},
+    "Espironolactona": {"marcas": ("Aldactone",), "alimentos": (POTASIO,)},
+    "Doxiciclina": {"marcas": ("Vibramicina",), "alimentos": (CALCIO,)},
+    "Tetraciclina": {"marcas": ("Acromicina",), "alimentos": (CALCIO,)},
+    "Ciprofloxacino": {"marcas": ("Cipro", "Ciproxina"), "alimentos": (CALCIO,)},
+    "Levofloxacino": {"marcas": ("Tavanic", "Elequine"), "alimentos": (CALCIO,)},
+    "Alendronato": {"marcas": ("Fosamax",), "alimentos": (CALCIO,)},
+    "Levotiroxina": {"marcas": ("Eutirox", "Synthroid", "Tirosint", "Levoxyl"), "alimentos": (ABSORCION_TIROIDES,)},
+    "Sulfato ferroso": {"marcas": ("Ferranina", "Hierro"), "alimentos": (ABSORCION_HIERRO,)},
+}
+
+# Cada opción de alimento del catálogo es un bit de un único entero
+ALIMENTOS = tuple(
+    (clave, opcion) for clave in CLAVES_ALIMENTOS for opcion in OPCIONES[clave] if opcion not in OPCIONES_NINGUNO
+)
+BIT_ALIMENTO = {alimento: i for i, alimento in enumerate(ALIMENTOS)}
+
+
+def _mascara(alimentos):
+    mascara = 0
+    for alimento in alimentos:
+        mascara |= 1 << BIT_ALIMENTO[alimento]
+    return mascara
+
+
+def _opciones(bits):
+    """Nombres de los alimentos de un entero de bits, en orden del catálogo"""
+    opciones = []
+    while bits:
+        bajo = bits & -bits
+        opciones.append(ALIMENTOS[bajo.bit_length() - 1][1])
+        bits ^= bajo
+    return list(dict.fromkeys(opciones))
+
+
+# Genérico → [(grupo de alimentos, máscara de sus alimentos)], evaluado una sola vez al importar
+MASCARAS = {
+    generico: [(grupo, _mascara(alimentos_de_regla(grupo))) for grupo in entrada["alimentos"]]
+    for generico, entrada in INTERACCIONES.items()
+}
+
+
+def _trigramas(texto):
+    relleno = f"  {texto} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+def _menciones(texto):
+    """Palabras sueltas y pares de palabras consecutivas (para nombres como "sulfato ferroso"), sin dosis"""
+    palabras = [p for p in "".join(c if c.isalpha() else " " for c in plegar(texto)).split() if len(p) > 2]
+    return palabras + [f"{a} {b}" for a, b in zip(palabras, palabras[1:])]
+
+
+class IndiceMedicamentos:
+    """Trigramas de los nombres genéricos y marcas → nombres que los contienen"""
+
+    def __init__(self, interacciones=INTERACCIONES):
+        self.nombres = []
+        for generico, entrada in interacciones.items():
+            for nombre in (generico, *entrada["marcas"]):
+                self.nombres.append((plegar(nombre), generico))
+        self.exactos = {nombre: generico for nombre, generico in self.nombres}
+        self.tamanos = [len(_trigramas(nombre)) for nombre, _ in self.nombres]
+        self.trigramas = {}
+        for i, (nombre, _) in enumerate(self.nombres):
+            for trigrama in _trigramas(nombre):
+                self.trigramas.setdefault(trigrama, []).append(i)
+
+    def emparejar(self, mencion):
+        """(genérico, similitud) del nombre más parecido a una mención, o None"""
+        if mencion in self.exactos:
+            return self.exactos[mencion], 1.0
+        if len(mencion) < LARGO_MINIMO_APROXIMADO:
+            return None
+        trigramas = _trigramas(mencion)
+        compartidos = Counter(i for trigrama in trigramas for i in self.trigramas.get(trigrama, ()))
+        mejor = None
+        for i, n in compartidos.items():
+            similitud = 2 * n / (len(trigramas) + self.tamanos[i])
+            if similitud >= SIMILITUD_MINIMA and (mejor is None or similitud > mejor[1]):
+                mejor = (self.nombres[i][1], similitud)
+        return mejor
+
+    def medicamentos(self, texto):
+        """{genérico: mención con que aparece} de un texto libre"""
+        encontrados = {}
+        for mencion in _menciones(texto or ""):
+            pareja = self.emparejar(mencion)
+            if pareja is not None:
+                encontrados.setdefault(pareja[0], mencion)
+        return encontrados
+
+
+INDICE = IndiceMedicamentos()
+
+
+def medicamentos_declarados(r):
+    """{genérico: mención} de los medicamentos y suplementos escritos en el paso 15"""
+    encontrados = {}
+    for campo in CAMPOS_MEDICAMENTOS:
+        for generico, mencion in INDICE.medicamentos(getattr(r, campo, None)).items():
+            encontrados.setdefault(generico, mencion)
+    return encontrados
+
+
+def seleccion_bits(r):
+    """Entero con los bits de los alimentos que el cliente seleccionó"""
+    bits = 0
+    for clave in CLAVES_ALIMENTOS:
+        for opcion in getattr(r, clave, None) or ():
+            i = BIT_ALIMENTO.get((clave, opcion))
+            if i is not None:
+                bits |= 1 << i
+    return bits
+
+
+def interacciones(r):
+    """
+    Medicamentos mencionados que interactúan con alimentos seleccionados, como
+    lista de {"medicamento", "mencion", "motivo", "indicacion", "alimentos"}.
+    """
+    declarados = medicamentos_declarados(r)
+    if not declarados:
+        return []
+    seleccion = seleccion_bits(r)
+    resultado = []
+    for generico, mencion in declarados.items():
+        for grupo, mascara in MASCARAS[generico]:
+            if mascara & seleccion:
+                resultado.append({
+                    "medicamento": generico,
+                    "mencion": mencion,
+                    "motivo": grupo["motivo"],
+                    "indicacion": grupo["indicacion"],
+                    "alimentos": _opciones(mascara & seleccion),
+                })
+    return resultado
+
+
+def main(argv=None):
+    from mupai.almacen import RUTA_ALMACEN, AlmacenEvaluaciones
+    from mupai.respuestas import Respuestas
+
+    parser = argparse.ArgumentParser(description="Interacciones medicamento–alimento de las evaluaciones MUPAI")
+    parser.add_argument("texto", nargs="?", help="Texto libre de medicamentos a emparejar")
+    parser.add_argument("--almacen", nargs="?", const=RUTA_ALMACEN, help="Revisar todas las evaluaciones guardadas")
+    args = parser.parse_args(argv)
+
+    if args.texto:
+        encontrados = INDICE.medicamentos(args.texto)
+        if not encontrados:
+            print("Sin medicamentos reconocidos")
+        for generico, mencion in encontrados.items():
+            motivos = ", ".join(grupo["motivo"] for grupo in INTERACCIONES[generico]["alimentos"])
+            print(f"{mencion} → {generico} ({motivos})")
+
+    if args.almacen:
+        inicio, total, con_interacciones, por_medicamento = time.perf_counter(), 0, 0, Counter()
+        for identificador, datos in AlmacenEvaluaciones(args.almacen).iterar():
+            total += 1
+            encontradas = interacciones(Respuestas.desde_mapeo(datos))
+            if encontradas:
+                con_interacciones += 1
+                por_medicamento.update(dict.fromkeys(i["medicamento"] for i in encontradas))
+                print(json.dumps({"id": identificador, "interacciones": encontradas}, ensure_ascii=False))
+        segundos = time.perf_counter() - inicio
+        print(f"{con_interacciones} de {total} evaluaciones con interacciones ({segundos:.1f} s)", file=sys.stderr)
+        for generico, n in por_medicamento.most_common():
+            print(f"  {generico}: {n}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""
+Procesamiento en lote de respuestas capturadas fuera de la app (p. ej.
+formularios en papel transcritos a hojas de cálculo).
+
+Cada registro se valida con las mismas reglas que los pasos 1 a 15 de la app
+y, si es válido, se genera su resumen igual que el email a administración.
+Las entradas se leen en streaming y se reparten en un pool de procesos con un
+número acotado de tareas en vuelo, así miles de archivos no se cargan a memoria.
+
+Formatos aceptados (claves iguales a las de `st.session_state`):
+- `.json`: un objeto por archivo, o una lista de objetos.
+- `.jsonl`: un objeto por línea.
+- `.csv`: una evaluación por fila; en columnas de selección múltiple las
+  opciones se separan con `;`.
+
+Cada registro se identifica por la ruta de su archivo relativa a la raíz
+común de las entradas (`clinica_a/marzo.csv-3`), así archivos con el mismo
+nombre en distintas carpetas no se confunden. Una línea o un archivo que no
+se puede leer (JSON mal formado) se reporta como un registro con error, igual
+que uno inválido, sin detener el lote.
+
+El arquetipo de cada resumen sale del modelo junto a `--almacen` (o del
+archivo `--modelo`), no del directorio desde el que se ejecuta.
+
+Uso:
+
+    python -m mupai.lote respuestas/ capturas.csv --salida datos/lote --procesos 8
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from urllib.parse import quote
+
+from mupai.almacen import RUTA_ALMACEN
+from mupai.arquetipos import arquetipo_de, ruta_modelo
+from mupai.respuestas import Respuestas, normalizar
+from mupai.resumen import crear_resumen
+from mupai.validacion import reporte_validacion
+
+DIRECTORIO_SALIDA = os.path.join("datos", "lote")
+EXTENSIONES = (".json", ".jsonl", ".csv")
+# Tareas pendientes por proceso: suficiente para no dejar procesos ociosos
+# sin acumular en memoria toda la entrada
+TAREAS_POR_PROCESO = 8
+
+
+class ErrorDeLectura(ValueError):
+    """Registro que no se pudo leer; viaja al trabajador en lugar de sus datos para reportarse como error"""
+
+
+def cargar_datos(origen, datos):
+    """Datos de un registro de `leer_registros`: lee el archivo JSON si es None y levanta su ErrorDeLectura si lo hubo"""
+    if isinstance(datos, ErrorDeLectura):
+        raise datos
+    if datos is None:
+        # Archivos JSON individuales se leen dentro del proceso trabajador
+        with open(origen, encoding="utf-8") as f:
+            return json.load(f)
+    return datos
+
+
+def evaluar(datos, generado=None, modelo=None):
+    """
+    Valida un registro y genera su resumen, con su arquetipo si se da la ruta
+    de un `modelo` de arquetipos. Retorna (reporte, resumen o None).
+    """
+    r = Respuestas.desde_mapeo(normalizar(datos))
+    reporte = reporte_validacion(r)
+    resumen = None
+    if reporte["valido"]:
+        resumen = crear_resumen(r, generado, arquetipo=arquetipo_de(r, modelo) if modelo else None)
+    return reporte, resumen
+
+
+def _nombre_seguro(identificador):
+    """Nombre de archivo para un id; se codifica (a/x.json → a%2Fx.json) para que ids distintos no choquen"""
+    return quote(identificador, safe="-_.")
+
+
+def procesar_registro(tarea):
+    """Trabajo de un proceso del pool: evalúa un registro y escribe su resumen"""
+    identificador, origen, datos, directorio, generado, modelo = tarea
+    try:
+        reporte, resumen = evaluar(cargar_datos(origen, datos), generado, modelo)
+    except (OSError, ValueError, TypeError, AttributeError) as e:
+        return {"id": identificador, "origen": origen, "valido": False, "error": str(e)}
+
+    reporte = {"id": identificador, "origen": origen, **reporte}
+    if resumen is not None:
+        ruta = os.path.join(directorio, "resumenes", f"{_nombre_seguro(identificador)}.txt")
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write(resumen)
+        reporte["resumen"] = ruta
+    return reporte
+
+
+def _archivos(rutas):
+    for ruta in rutas:
+        if os.path.isdir(ruta):
+            for raiz, _, nombres in os.walk(ruta):
+                for nombre in sorted(nombres):
+                    if nombre.endswith(EXTENSIONES):
+                        yield os.path.join(raiz, nombre)
+        else:
+            yield ruta
+
+
+def leer_registros(rutas):
+    """
+    Genera (id, origen, datos) sin cargar la entrada completa; datos=None
+    significa 'leer en el trabajador' y un ErrorDeLectura, que no se pudo leer.
+    """
+    raiz = _raiz_comun(rutas)
+    for ruta in _archivos(rutas):
+        base = os.path.relpath(os.path.abspath(ruta), raiz).replace(os.sep, "/")
+        try:
+            yield from _registros_de_archivo(ruta, base)
+        except (OSError, ValueError) as e:
+            yield base, ruta, ErrorDeLectura(f"No se pudo leer el archivo: {e}")
+
+
+def _raiz_comun(rutas):
+    """Directorio común a todas las entradas (el directorio mismo si es uno solo)"""
+    directorios = [
+        os.path.abspath(ruta) if os.path.isdir(ruta) else os.path.dirname(os.path.abspath(ruta)) for ruta in rutas
+    ]
+    return os.path.commonpath(directorios) if directorios else os.getcwd()
+
+
+def _registros_de_archivo(ruta, base):
+    if ruta.endswith(".csv"):
+        with open(ruta, newline="", encoding="utf-8-sig") as f:
+            for fila, datos in enumerate(csv.DictReader(f), 1):
+                yield f"{base}-{fila}", ruta, datos
+    elif ruta.endswith(".jsonl"):
+        with open(ruta, encoding="utf-8") as f:
+            for linea_num, linea in enumerate(f, 1):
+                if linea.strip():
+                    try:
+                        datos = json.loads(linea)
+                    except ValueError as e:
+                        datos = ErrorDeLectura(f"Línea {linea_num} no es JSON válido: {e}")
+                    yield f"{base}-{linea_num}", ruta, datos
+    elif os.path.getsize(ruta) and _es_lista_json(ruta):
+        with open(ruta, encoding="utf-8") as f:
+            registros = json.load(f)
+        for indice, datos in enumerate(registros, 1):
+            yield f"{base}-{indice}", ruta, datos
+    else:
+        yield base, ruta, None
+
+
+def _es_lista_json(ruta):
+    with open(ruta, encoding="utf-8") as f:
+        for caracter in iter(lambda: f.read(1), ""):
+            if not caracter.isspace():
+                return caracter == "["
+    return False
+
+
+def procesar_lote(rutas, directorio=DIRECTORIO_SALIDA, procesos=None, generado=None, modelo=None):
+    """
+    Procesa todas las entradas con un pool de procesos y escribe `reporte.jsonl`
+    y un resumen .txt por registro válido (con su arquetipo según `modelo`, si
+    se da). Retorna (total, validos).
+    """
+    os.makedirs(os.path.join(directorio, "resumenes"), exist_ok=True)
+    generado = generado or datetime.now()
+    procesos = procesos or os.cpu_count() or 1
+    max_en_vuelo = procesos * TAREAS_POR_PROCESO
+    total = validos = 0
+
+    with ProcessPoolExecutor(max_workers=procesos) as pool, \
+            open(os.path.join(directorio, "reporte.jsonl"), "w", encoding="utf-8") as salida:
+        def escribir(terminados):
+            nonlocal total, validos
+            for futuro in terminados:
+                reporte = futuro.result()
+                salida.write(json.dumps(reporte, ensure_ascii=False) + "\n")
+                total += 1
+                validos += reporte["valido"]
+
+        en_vuelo = set()
+        for identificador, origen, datos in leer_registros(rutas):
+            en_vuelo.add(pool.submit(procesar_registro, (identificador, origen, datos, directorio, generado, modelo)))
+            if len(en_vuelo) >= max_en_vuelo:
+                terminados, en_vuelo = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                escribir(terminados)
+        escribir(wait(en_vuelo).done)
+    return total, validos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Valida y genera resúmenes MUPAI para respuestas en lote")
+    parser.add_argument("entradas", nargs="+", help="Archivos .json/.jsonl/.csv o directorios que los contengan")
+    parser.add_argument("--salida", default=DIRECTORIO_SALIDA)
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos en paralelo (por defecto, uno por CPU)")
+    parser.add_argument("--almacen", default=RUTA_ALMACEN, help="Almacén junto al que está el modelo de arquetipos")
+    parser.add_argument("--modelo", help="Archivo .npz del modelo de arquetipos (por defecto, junto al almacén)")
+    args = parser.parse_args(argv)
+
+    total, validos = procesar_lote(
+        args.entradas, args.salida, args.procesos, modelo=args.modelo or ruta_modelo(args.almacen)
+    )
+    print(f"Registros procesados: {total} | Válidos: {validos} | Con errores: {total - validos}")
+    print(f"Reporte: {os.path.join(args.salida, 'reporte.jsonl')}")
+    return 0 if total == validos else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
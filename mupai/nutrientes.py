@@ -0,0 +1,148 @@
+"""
+Composición nutrimental de los alimentos del catálogo y perfil nutricional de
+los alimentos disponibles de cada cliente.
+
+La tabla (`mupai/datos/nutrientes.csv`, valores por 100 g o 100 ml de porción
+comestible, en crudo o como se compra) se carga una sola vez por proceso en
+una matriz NumPy. Cada respuesta se convierte en un vector 0/1 sobre las
+opciones del catálogo, así el perfil de un cliente, o de toda una cohorte,
+se calcula con un par de multiplicaciones de matrices.
+"""
+import csv
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from mupai.catalogo import GRUPOS_ALIMENTOS, OPCIONES, OPCIONES_NINGUNO
+
+RUTA_TABLA = os.path.join(os.path.dirname(__file__), "datos", "nutrientes.csv")
+NUTRIENTES = (
+    "energia_kcal", "proteina_g", "grasa_g", "grasa_saturada_g",
+    "carbohidratos_g", "fibra_g", "omega3_g", "sodio_mg",
+)
+# Criterio por 100 g para declarar un alimento "alto en fibra"
+UMBRAL_FIBRA_G = 6.0
+# Una fuente de omega-3 debe serlo por densidad (g por 100 kcal), no por ser
+# muy grasosa: solo pescados y mariscos (EPA+DHA) y semillas y nueces (ALA),
+# con umbrales cercanos a los de "alto en omega-3" de cada tipo. Así quedan
+# fuera embutidos, quesos, mantequilla y aceites, cuyo omega-3 por 100 g
+# viene solo de su cantidad de grasa.
+CLAVES_OMEGA3_MARINO = frozenset({"pescados_grasos", "pescados_magros", "mariscos_grasos", "mariscos_magros"})
+CLAVES_OMEGA3_VEGETAL = frozenset({"frutos_secos_semillas"})
+UMBRAL_OMEGA3_MARINO_G_100KCAL = 0.5
+UMBRAL_OMEGA3_VEGETAL_G_100KCAL = 0.6
+
+
+class TablaNutrientes:
+    """Matriz alimentos × nutrientes y su proyección sobre las opciones del catálogo"""
+
+    def __init__(self, ruta=RUTA_TABLA):
+        with open(ruta, newline="", encoding="utf-8") as f:
+            filas = list(csv.DictReader(f))
+        self.alimentos = tuple(fila["alimento"] for fila in filas)
+        self.fila = {alimento: i for i, alimento in enumerate(self.alimentos)}
+        self.matriz = np.array([[float(fila[n]) for n in NUTRIENTES] for fila in filas], dtype=np.float64)
+
+        # Una columna por (subgrupo, opción): un alimento repetido en dos
+        # subgrupos (p. ej. Jícama) cuenta solo en el grupo donde se marcó
+        self.grupos = tuple(GRUPOS_ALIMENTOS)
+        self.columnas = tuple(
+            (clave, opcion)
+            for claves in GRUPOS_ALIMENTOS.values()
+            for clave in claves
+            for opcion in OPCIONES[clave]
+            if opcion not in OPCIONES_NINGUNO
+        )
+        faltantes = sorted({opcion for _, opcion in self.columnas if opcion not in self.fila})
+        if faltantes:
+            raise ValueError(f"Alimentos del catálogo sin composición en {ruta}: {', '.join(faltantes)}")
+        self.columna = {par: j for j, par in enumerate(self.columnas)}
+        self.nombres = tuple(opcion for _, opcion in self.columnas)
+
+        # composicion: opciones × nutrientes; pertenencia: grupos × opciones
+        self.composicion = self.matriz[[self.fila[opcion] for opcion in self.nombres]]
+        grupo_de_clave = {clave: g for g, claves in enumerate(GRUPOS_ALIMENTOS.values()) for clave in claves}
+        self.pertenencia = np.zeros((len(self.grupos), len(self.columnas)), dtype=np.float64)
+        for j, (clave, _) in enumerate(self.columnas):
+            self.pertenencia[grupo_de_clave[clave], j] = 1.0
+        self.fuente_fibra = self.composicion[:, NUTRIENTES.index("fibra_g")] >= UMBRAL_FIBRA_G
+        self.fuente_omega3 = self._fuentes_omega3()
+
+    def _fuentes_omega3(self):
+        """Opciones que son fuente de omega-3 por su grupo y su densidad por 100 kcal"""
+        energia = self.composicion[:, NUTRIENTES.index("energia_kcal")]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            por_100_kcal = np.where(energia > 0, self.composicion[:, NUTRIENTES.index("omega3_g")] / energia * 100, 0.0)
+        umbral = np.array([
+            UMBRAL_OMEGA3_MARINO_G_100KCAL if clave in CLAVES_OMEGA3_MARINO
+            else UMBRAL_OMEGA3_VEGETAL_G_100KCAL if clave in CLAVES_OMEGA3_VEGETAL
+            else np.inf
+            for clave, _ in self.columnas
+        ])
+        return por_100_kcal >= umbral
+
+    def seleccion(self, respuestas):
+        """Matriz 0/1 (respuestas × opciones del catálogo); opciones desconocidas se ignoran"""
+        claves = {clave for clave, _ in self.columnas}
+        x = np.zeros((len(respuestas), len(self.columnas)), dtype=np.float64)
+        for i, r in enumerate(respuestas):
+            for clave in claves:
+                for opcion in getattr(r, clave, None) or ():
+                    j = self.columna.get((clave, opcion))
+                    if j is not None:
+                        x[i, j] = 1.0
+        return x
+
+    def perfiles(self, x):
+        """
+        Perfil de cada fila de una matriz de selección. Retorna un dict de arreglos:
+        `conteos` (n × grupos), `promedios` (n × grupos × nutrientes, NaN si el
+        grupo está vacío) y el número de fuentes de fibra y de omega-3 (n).
+        """
+        conteos = x @ self.pertenencia.T
+        sumas = np.einsum("rc,gc,cn->rgn", x, self.pertenencia, self.composicion, optimize=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            promedios = sumas / conteos[..., None]
+        return {
+            "conteos": conteos,
+            "promedios": promedios,
+            "fuentes_fibra": x @ self.fuente_fibra,
+            "fuentes_omega3": x @ self.fuente_omega3,
+        }
+
+    def perfil(self, respuestas):
+        """Perfil nutricional de un cliente: densidad promedio por grupo y sus fuentes de fibra y omega-3"""
+        x = self.seleccion([respuestas])
+        calculo = self.perfiles(x)
+        marcadas = x[0] > 0
+        por_grupo = {}
+        for g, grupo in enumerate(self.grupos):
+            conteo = int(calculo["conteos"][0, g])
+            if conteo:
+                por_grupo[grupo] = {"alimentos": conteo, **dict(zip(NUTRIENTES, calculo["promedios"][0, g].round(1).tolist()))}
+        return {
+            "por_grupo": por_grupo,
+            "fuentes_fibra": _unicos(np.array(self.nombres)[marcadas & self.fuente_fibra]),
+            "fuentes_omega3": _unicos(np.array(self.nombres)[marcadas & self.fuente_omega3]),
+        }
+
+
+def _unicos(nombres):
+    return list(dict.fromkeys(nombres.tolist()))
+
+
+@lru_cache(maxsize=None)
+def tabla():
+    """Tabla compartida del proceso (se lee del disco solo la primera vez)"""
+    return TablaNutrientes()
+
+
+def perfil_nutricional(respuestas):
+    return tabla().perfil(respuestas)
+
+
+def perfiles_cohorte(respuestas):
+    """Perfiles de muchas respuestas en una sola operación vectorizada"""
+    t = tabla()
+    return t.perfiles(t.seleccion(respuestas))
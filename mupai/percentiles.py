@@ -0,0 +1,189 @@
+"""
+Índices de diversidad alimentaria y de antojos de cada cliente, comparados
+contra la cohorte de evaluaciones guardadas.
+
+Por cada índice se guarda una tabla con los valores de toda la cohorte ya
+ordenados (`datos/percentiles.npz`, junto al almacén). Ubicar a un cliente es
+una búsqueda binaria (O(log n)) y al actualizar solo se leen las evaluaciones
+guardadas después de la última revisión, que se intercalan en las tablas sin
+volver a ordenarlas completas.
+
+    python -m mupai.percentiles --almacen datos/evaluaciones.sqlite
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from mupai.almacen import RUTA_ALMACEN, AlmacenEvaluaciones
+from mupai.catalogo import GRUPOS_ALIMENTOS, OPCIONES_NINGUNO
+from mupai.respuestas import Respuestas, normalizar
+
+# Índice → descripción para los mensajes ("top 20% en variedad de vegetales")
+INDICES = {
+    "variedad_total": "variedad total de alimentos",
+    "grupos_cubiertos": "grupos alimentarios cubiertos",
+    "variedad_proteinas": "variedad de proteínas",
+    "variedad_grasas": "variedad de grasas saludables",
+    "variedad_carbohidratos": "variedad de carbohidratos",
+    "variedad_vegetales": "variedad de vegetales",
+    "variedad_frutas": "variedad de frutas",
+    "metodos_coccion": "métodos de cocción disponibles",
+    "antojos": "cantidad de antojos",
+}
+# Grupos del catálogo que cuenta cada índice de variedad
+GRUPOS_INDICE = {
+    "variedad_proteinas": ("Proteínas grasas", "Proteínas magras"),
+    "variedad_grasas": ("Grasas saludables",),
+    "variedad_carbohidratos": ("Carbohidratos",),
+    "variedad_vegetales": ("Vegetales",),
+    "variedad_frutas": ("Frutas",),
+}
+GRUPOS_DIVERSIDAD = tuple(grupo for grupos in GRUPOS_INDICE.values() for grupo in grupos)
+CLAVES_ANTOJOS = ("antojos_dulces", "antojos_salados", "antojos_comida_rapida", "antojos_bebidas", "antojos_picantes")
+# Cortes para "top 20%" / "20% inferior" frente a la cohorte
+PERCENTIL_ALTO = 80
+PERCENTIL_MEDIO = 50
+PERCENTIL_BAJO = 20
+# Con menos evaluaciones que esto un percentil no dice nada todavía
+MIN_COHORTE = 30
+INTERVALO_ACTUALIZACION = 60.0
+
+
+def _seleccion(r, claves):
+    return {opcion for clave in claves for opcion in getattr(r, clave, None) or () if opcion not in OPCIONES_NINGUNO}
+
+
+def indices(r):
+    """Valor de cada índice de INDICES para unas respuestas"""
+    por_grupo = {grupo: _seleccion(r, GRUPOS_ALIMENTOS[grupo]) for grupo in GRUPOS_DIVERSIDAD}
+    valores = {
+        "variedad_total": len(set().union(*por_grupo.values())),
+        "grupos_cubiertos": sum(1 for alimentos in por_grupo.values() if alimentos),
+    }
+    for indice, grupos in GRUPOS_INDICE.items():
+        valores[indice] = len(set().union(*(por_grupo[grupo] for grupo in grupos)))
+    valores["metodos_coccion"] = len(r.metodos_coccion_accesibles or ())
+    valores["antojos"] = sum(len(getattr(r, clave, None) or ()) for clave in CLAVES_ANTOJOS)
+    return valores
+
+
+class TablasPercentiles:
+    """Valores ordenados de la cohorte por índice, actualizados solo con las evaluaciones nuevas"""
+
+    def __init__(self, ruta_almacen=RUTA_ALMACEN, ruta=None):
+        self.ruta_almacen = ruta_almacen
+        self.ruta = ruta or os.path.join(os.path.dirname(ruta_almacen), "percentiles.npz")
+        self._candado = threading.Lock()
+        self.reiniciar()
+        self._leer()
+
+    def reiniciar(self):
+        """Tablas vacías: la siguiente actualización recorre todo el almacén"""
+        self.marca = 0
+        self.valores = {indice: np.empty(0, dtype=np.int32) for indice in INDICES}
+        self._revisado = 0.0
+
+    def _leer(self):
+        if not os.path.exists(self.ruta):
+            return
+        with np.load(self.ruta) as datos:
+            # Tablas de una versión con otros índices se reconstruyen desde cero
+            if set(INDICES) <= set(datos.files):
+                self.marca = int(datos["marca"])
+                self.valores = {indice: datos[indice] for indice in INDICES}
+
+    def _guardar(self):
+        directorio = os.path.dirname(self.ruta) or "."
+        os.makedirs(directorio, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=directorio, suffix=".npz", delete=False) as f:
+            np.savez(f, marca=self.marca, **self.valores)
+        os.replace(f.name, self.ruta)
+
+    def agregar(self, filas):
+        """Intercala los índices de nuevas evaluaciones (lista de dicts de `indices`) en las tablas ordenadas"""
+        for indice in INDICES:
+            nuevos = np.sort(np.array([fila[indice] for fila in filas], dtype=np.int32))
+            tabla = self.valores[indice]
+            self.valores[indice] = np.insert(tabla, np.searchsorted(tabla, nuevos), nuevos)
+
+    def actualizar(self, forzar=False):
+        """Agrega las evaluaciones guardadas desde la última revisión; retorna cuántas se agregaron"""
+        with self._candado:
+            if not forzar and time.monotonic() - self._revisado < INTERVALO_ACTUALIZACION:
+                return 0
+            self._revisado = time.monotonic()
+            if not os.path.exists(self.ruta_almacen):
+                return 0
+            filas, marca = [], self.marca
+            for rowid, datos in AlmacenEvaluaciones(self.ruta_almacen).iterar_nuevas(self.marca):
+                filas.append(indices(Respuestas.desde_mapeo(normalizar(datos))))
+                marca = rowid
+            if filas:
+                self.agregar(filas)
+                self.marca = marca
+                self._guardar()
+            return len(filas)
+
+    def tamano(self):
+        return len(self.valores["variedad_total"])
+
+    def percentil(self, indice, valor):
+        """Porcentaje de la cohorte por debajo del valor (empates cuentan a la mitad); None si la cohorte es chica"""
+        tabla = self.valores[indice]
+        if len(tabla) < MIN_COHORTE:
+            return None
+        debajo = np.searchsorted(tabla, valor, side="left")
+        hasta = np.searchsorted(tabla, valor, side="right")
+        return round(float(100 * (debajo + hasta) / 2 / len(tabla)), 1)
+
+    def posicion(self, r):
+        """{índice: {"valor", "percentil"}} de un cliente frente a la cohorte actual"""
+        self.actualizar()
+        return {
+            indice: {"valor": valor, "percentil": self.percentil(indice, valor)}
+            for indice, valor in indices(r).items()
+        }
+
+
+_tablas = {}
+_candado_tablas = threading.Lock()
+
+
+def tablas(ruta_almacen=RUTA_ALMACEN):
+    """Tablas compartidas del proceso para un almacén"""
+    with _candado_tablas:
+        if ruta_almacen not in _tablas:
+            _tablas[ruta_almacen] = TablasPercentiles(ruta_almacen)
+        return _tablas[ruta_almacen]
+
+
+def posicion_en_cohorte(r, ruta_almacen=RUTA_ALMACEN):
+    return tablas(ruta_almacen).posicion(r)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tablas de percentiles de la cohorte MUPAI")
+    parser.add_argument("--almacen", default=RUTA_ALMACEN)
+    parser.add_argument("--reconstruir", action="store_true", help="Descartar las tablas guardadas y recalcular todo")
+    args = parser.parse_args(argv)
+
+    t = TablasPercentiles(args.almacen)
+    if args.reconstruir:
+        t.reiniciar()
+    agregadas = t.actualizar(forzar=True)
+    print(f"Evaluaciones agregadas: {agregadas} | Cohorte: {t.tamano()}")
+    for indice, descripcion in INDICES.items():
+        tabla = t.valores[indice]
+        if len(tabla):
+            p20, p50, p80 = np.percentile(tabla, [20, 50, 80])
+            print(f"  {descripcion}: p20={p20:g} p50={p50:g} p80={p80:g}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
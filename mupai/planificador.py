@@ -0,0 +1,618 @@
+"""
+Generador de planes de alimentación a partir de las respuestas de un cliente.
+
+Solo usa los alimentos que el cliente marcó, respeta sus alergias,
+intolerancias y condiciones médicas, reparte las calorías según su
+frecuencia de comidas y propone una preparación con sus métodos de cocción.
+
+El problema se resuelve con una heurística local en dos niveles:
+- Porciones: con los alimentos de un día fijos, los gramos se ajustan por
+  mínimos cuadrados acotados (gradiente proyectado acelerado) para acercarse
+  a las metas de energía y macronutrientes sin pasar los topes de sodio y
+  grasa saturada. Las variantes de un día se resuelven juntas, en lote.
+- Selección: búsqueda local que intercambia alimentos del mismo papel
+  (proteína, cereal, vegetal...) mientras mejore el ajuste y la variedad,
+  hasta agotar el tiempo límite.
+
+Un plan previo (del mismo cliente o del anterior en el lote) sirve como punto
+de partida, y los planes se guardan en una caché indexada por el conjunto de
+restricciones, así regenerar un plan con los mismos datos es inmediato.
+
+    python -m mupai.planificador respuestas.jsonl --dias 7 --salida datos/planes
+    python -m mupai.planificador --almacen datos/evaluaciones.sqlite
+"""
+import argparse
+import copy
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+from mupai.alergenos import alimentos_excluidos
+from mupai.nutrientes import NUTRIENTES, tabla
+from mupai.respuestas import Respuestas, normalizar
+
+DIRECTORIO_SALIDA = os.path.join("datos", "planes")
+DIAS = 7
+LIMITE_SEGUNDOS = 0.5
+MAX_CACHE = 256
+TAREAS_POR_PROCESO = 8
+
+# ==================== ESTRUCTURA DEL PLAN ====================
+
+# Papel de cada subgrupo del catálogo dentro de un platillo
+ROLES = {
+    "proteina": (
+        "huevos_embutidos", "carnes_res_grasas", "carnes_cerdo_grasas", "carnes_pollo_grasas",
+        "organos_grasos", "pescados_grasos", "mariscos_grasos", "carnes_res_magras",
+        "carnes_cerdo_magras", "carnes_pollo_magras", "organos_magros", "pescados_magros",
+        "mariscos_magros", "huevos_embutidos_light",
+    ),
+    "lacteo": ("quesos_grasos", "quesos_magros", "lacteos_enteros", "lacteos_light", "proteina_polvo_tipos"),
+    "cereal": ("cereales_integrales", "pastas", "tortillas_panes", "raices_tuberculos", "leguminosas"),
+    "vegetal": ("vegetales_lista",),
+    "fruta": ("frutas_lista",),
+    "grasa": ("grasas_naturales", "frutos_secos_semillas", "mantequillas_vegetales"),
+    "aceite": ("aceites_coccion",),
+}
+
+# Porción mínima y máxima en gramos (o ml) por subgrupo, en crudo o como se compra
+PORCIONES = {
+    "huevos_embutidos": (50, 150), "huevos_embutidos_light": (60, 200),
+    "carnes_res_grasas": (80, 220), "carnes_cerdo_grasas": (80, 220), "carnes_pollo_grasas": (80, 250),
+    "carnes_res_magras": (80, 250), "carnes_cerdo_magras": (80, 250), "carnes_pollo_magras": (80, 250),
+    "organos_grasos": (60, 150), "organos_magros": (80, 180),
+    "pescados_grasos": (80, 220), "pescados_magros": (100, 250),
+    "mariscos_grasos": (80, 220), "mariscos_magros": (100, 250),
+    "quesos_grasos": (20, 60), "quesos_magros": (30, 120),
+    "lacteos_enteros": (100, 250), "lacteos_light": (150, 300), "proteina_polvo_tipos": (20, 40),
+    "cereales_integrales": (30, 90), "pastas": (40, 100), "tortillas_panes": (30, 120),
+    "raices_tuberculos": (80, 300), "leguminosas": (30, 90),
+    "vegetales_lista": (50, 200), "frutas_lista": (80, 250),
+    "grasas_naturales": (20, 80), "frutos_secos_semillas": (10, 35), "mantequillas_vegetales": (10, 32),
+    "aceites_coccion": (3, 15),
+}
+# Condimentos y alimentos que se usan en poca cantidad
+PORCIONES_ALIMENTO = {
+    "🧴 Spray antiadherente sin calorías (aceite de oliva o aguacate)": (0.5, 2),
+    "Chile jalapeño": (5, 40), "Chile serrano": (5, 20), "Chile habanero": (2, 10),
+    "Ajo": (3, 10), "Cilantro": (5, 20), "Perejil": (5, 20), "Epazote": (2, 10), "Cebollín": (5, 30),
+    "Lima": (15, 60), "Limón": (15, 60),
+}
+
+# Componentes de cada tiempo de comida; si el cliente no tiene alimentos
+# para un papel se usa el alterno o se omite
+COMPONENTES = {
+    "Desayuno": ("proteina", "cereal", "fruta", "grasa"),
+    "Comida": ("proteina", "cereal", "vegetal", "vegetal", "aceite"),
+    "Cena": ("proteina", "cereal", "vegetal", "grasa"),
+    "Colación": ("lacteo", "fruta"),
+}
+ALTERNOS = {"lacteo": "grasa", "fruta": "grasa", "grasa": "lacteo"}
+
+# Reparto de la energía del día según la frecuencia de comidas (paso 13)
+FRECUENCIAS = {
+    "Desayuno, comida y cena (3 comidas principales)":
+        (("Desayuno", 0.30), ("Comida", 0.40), ("Cena", 0.30)),
+    "Desayuno, comida, cena y una colación":
+        (("Desayuno", 0.25), ("Colación", 0.10), ("Comida", 0.35), ("Cena", 0.30)),
+    "Desayuno, comida, cena y dos colaciones":
+        (("Desayuno", 0.25), ("Colación", 0.10), ("Comida", 0.30), ("Colación", 0.10), ("Cena", 0.25)),
+    "Solo dos comidas principales al día":
+        (("Comida", 0.55), ("Cena", 0.45)),
+    "Ayuno intermitente con dos comidas principales al día":
+        (("Comida", 0.55), ("Cena", 0.45)),
+    "Ayuno intermitente con tres comidas principales al día":
+        (("Desayuno", 0.30), ("Comida", 0.40), ("Cena", 0.30)),
+    "Ayuno intermitente con tres comidas principales al día y una colación":
+        (("Desayuno", 0.25), ("Comida", 0.35), ("Colación", 0.10), ("Cena", 0.30)),
+}
+FRECUENCIA_PREDETERMINADA = "Desayuno, comida y cena (3 comidas principales)"
+
+METODO_PREDETERMINADO = "🔥 A la plancha"
+METODOS_SIN_ACEITE = frozenset({"💧 Hervido", "♨️ Al vapor", "💨 Air fryer (freidora de aire)", "⚡ Microondas"})
+# Papeles que se cocinan con el método elegido para el tiempo de comida
+ROLES_COCINADOS = frozenset({"proteina", "vegetal"})
+
+# ==================== METAS Y RESTRICCIONES ====================
+
+
+@dataclass(frozen=True, slots=True)
+class Objetivos:
+    """Metas diarias de energía y macronutrientes, y topes de sodio y grasa saturada"""
+    energia_kcal: float
+    proteina_g: float
+    grasa_g: float
+    carbohidratos_g: float
+    sodio_max_mg: float = 2300
+    grasa_saturada_max_g: float = 0
+
+
+ENERGIA_PREDETERMINADA = {"Hombre": 2400, "Mujer": 1900}
+REPARTO_PREDETERMINADO = {"proteina": 0.25, "grasa": 0.30, "carbohidratos": 0.45, "saturada_max": 0.10}
+
+# Ajustes por condición médica (paso 15): reparto de energía y topes
+AJUSTES_CONDICION = {
+    "Diabetes Tipo 1": {"carbohidratos": 0.35},
+    "Diabetes Tipo 2": {"carbohidratos": 0.35},
+    "Prediabetes": {"carbohidratos": 0.35},
+    "Resistencia a la insulina": {"carbohidratos": 0.35},
+    "Síndrome de ovario poliquístico (SOP)": {"carbohidratos": 0.35},
+    "Síndrome metabólico": {"carbohidratos": 0.35, "sodio_max_mg": 2000},
+    "Hipertensión arterial (presión alta)": {"sodio_max_mg": 2000},
+    "Enfermedad cardiovascular": {"sodio_max_mg": 2000, "saturada_max": 0.07},
+    "Colesterol alto (hipercolesterolemia)": {"saturada_max": 0.07},
+    "Triglicéridos altos (hipertrigliceridemia)": {"carbohidratos": 0.40, "saturada_max": 0.07},
+    "Hígado graso (esteatosis hepática)": {"carbohidratos": 0.40, "saturada_max": 0.07},
+    "Enfermedad renal crónica": {"proteina": 0.15, "sodio_max_mg": 1500},
+}
+
+def objetivos_para(r, energia_kcal=None):
+    """Metas diarias según sexo y condiciones médicas; `energia_kcal` fija la energía si la define el nutriólogo"""
+    energia = float(energia_kcal or ENERGIA_PREDETERMINADA.get(r.sexo, 2100))
+    reparto = dict(REPARTO_PREDETERMINADO)
+    sodio = 2300
+    for condicion in r.condiciones_medicas or []:
+        ajuste = AJUSTES_CONDICION.get(condicion, {})
+        for clave in ("proteina", "carbohidratos"):
+            if clave in ajuste:
+                reparto[clave] = min(reparto[clave], ajuste[clave])
+        reparto["saturada_max"] = min(reparto["saturada_max"], ajuste.get("saturada_max", 1))
+        sodio = min(sodio, ajuste.get("sodio_max_mg", sodio))
+    # La energía que se quita a proteína o carbohidratos pasa a grasa
+    reparto["grasa"] = 1 - reparto["proteina"] - reparto["carbohidratos"]
+    return Objetivos(
+        energia_kcal=round(energia),
+        proteina_g=round(energia * reparto["proteina"] / 4),
+        grasa_g=round(energia * reparto["grasa"] / 9),
+        carbohidratos_g=round(energia * reparto["carbohidratos"] / 4),
+        sodio_max_mg=sodio,
+        grasa_saturada_max_g=round(energia * reparto["saturada_max"] / 9),
+    )
+
+
+def restricciones(r, dias=DIAS, energia_kcal=None):
+    """Conjunto de restricciones del plan: candidatos por papel, tiempos de comida, métodos y metas"""
+    t = tabla()
+    marcados = [
+        (clave, opcion)
+        for claves in ROLES.values()
+        for clave in claves
+        for opcion in getattr(r, clave, None) or ()
+        if (clave, opcion) in t.columna
+    ]
+    excluidos = alimentos_excluidos(r)
+    candidatos = {
+        rol: tuple(sorted((clave, opcion) for clave, opcion in marcados
+                          if clave in claves and (clave, opcion) not in excluidos))
+        for rol, claves in ROLES.items()
+    }
+    frecuencia = next((f for f in r.frecuencia_comidas_ck or [] if f in FRECUENCIAS), FRECUENCIA_PREDETERMINADA)
+    metodos = tuple(r.metodos_coccion_accesibles or ()) or (METODO_PREDETERMINADO,)
+    return {
+        "candidatos": candidatos,
+        "comidas": FRECUENCIAS[frecuencia],
+        "metodos": metodos,
+        "objetivos": objetivos_para(r, energia_kcal),
+        "dias": dias,
+        "excluidos": tuple(sorted({opcion for clave, opcion in marcados if (clave, opcion) in excluidos})),
+    }
+
+
+def clave_restricciones(restr):
+    """Huella estable del conjunto de restricciones (llave de la caché)"""
+    datos = {**restr, "objetivos": asdict(restr["objetivos"])}
+    return hashlib.sha1(json.dumps(datos, ensure_ascii=False, sort_keys=True).encode()).hexdigest()
+
+
+# ==================== SOLUCIONADOR ====================
+
+ITERACIONES_PORCIONES = 150
+PESO_MACROS = (3.0, 2.0, 1.0, 1.0)  # energía, proteína, grasa, carbohidratos
+PESO_COMIDA = 0.5
+PESO_TOPE = 4.0
+PESO_VARIEDAD = 0.004
+PESO_REPETIDO_EN_COMIDA = 0.5
+ALTERNATIVAS_POR_PASO = 12
+_INDICES = [NUTRIENTES.index(n) for n in ("energia_kcal", "proteina_g", "grasa_g", "carbohidratos_g")]
+_SODIO = NUTRIENTES.index("sodio_mg")
+_SATURADA = NUTRIENTES.index("grasa_saturada_g")
+
+
+def _sistema(dia_componentes, comidas, objetivos, composicion):
+    """
+    Matrices del ajuste de porciones de un día. Las filas son: 4 macros
+    (meta 1), energía de cada comida (meta = su fracción) y 2 topes (sodio,
+    saturada; solo cuentan si se pasan de 1). Las variables son gramos / 100.
+    """
+    filas = composicion[[c for _, c in dia_componentes]]
+    metas = np.array([objetivos.energia_kcal, objetivos.proteina_g, objetivos.grasa_g, objetivos.carbohidratos_g])
+    a_macros = filas[:, _INDICES].T / metas[:, None]
+    a_comidas = np.zeros((len(comidas), len(dia_componentes)))
+    for j, (m, _) in enumerate(dia_componentes):
+        a_comidas[m, j] = filas[j, _INDICES[0]] / objetivos.energia_kcal
+    a_topes = np.stack([
+        filas[:, _SODIO] / objetivos.sodio_max_mg,
+        filas[:, _SATURADA] / max(objetivos.grasa_saturada_max_g, 1),
+    ])
+    a = np.vstack([a_macros, a_comidas, a_topes])
+    b = np.concatenate([np.ones(4), [fraccion for _, fraccion in comidas], np.ones(2)])
+    w = np.concatenate([PESO_MACROS, np.full(len(comidas), PESO_COMIDA), np.full(2, PESO_TOPE)])
+    return a, b, w
+
+
+def _porciones(a, b, w, lo, hi, x0, iteraciones=ITERACIONES_PORCIONES):
+    """
+    Mínimos cuadrados acotados en lote (FISTA). a: (lote, filas, vars); las
+    últimas 2 filas son topes. Retorna (x, error) con x en cientos de gramos.
+    """
+    escala = np.sqrt(np.einsum("r,brk->bk", w, a * a))
+    escala[escala == 0] = 1.0
+    a_esc = a / escala[:, None, :]
+    lo_esc, hi_esc = lo * escala, hi * escala
+    raiz_w = np.sqrt(w)
+    lipschitz = 2 * np.linalg.norm(raiz_w[None, :, None] * a_esc, ord=2, axis=(1, 2)) ** 2
+    paso = 1.0 / np.maximum(lipschitz, 1e-9)
+
+    y = z = np.clip(x0 * escala, lo_esc, hi_esc)
+    t = 1.0
+    for _ in range(iteraciones):
+        residuo = np.einsum("brk,bk->br", a_esc, z) - b
+        residuo[:, -2:] = np.maximum(residuo[:, -2:], 0)
+        gradiente = 2 * np.einsum("brk,br->bk", a_esc, w * residuo)
+        y_nuevo = np.clip(z - paso[:, None] * gradiente, lo_esc, hi_esc)
+        t_nuevo = (1 + math.sqrt(1 + 4 * t * t)) / 2
+        z = y_nuevo + ((t - 1) / t_nuevo) * (y_nuevo - y)
+        y, t = y_nuevo, t_nuevo
+
+    residuo = np.einsum("brk,bk->br", a_esc, y) - b
+    residuo[:, -2:] = np.maximum(residuo[:, -2:], 0)
+    return y / escala, (w * residuo * residuo).sum(axis=1)
+
+
+def _resolver_dias(variantes, comidas, objetivos, composicion, limites, x_iniciales):
+    """Resuelve las porciones de varias variantes de día a la vez (se rellenan con ceros a la misma longitud)"""
+    n = max(len(v) for v in variantes)
+    filas = 4 + len(comidas) + 2
+    a = np.zeros((len(variantes), filas, n))
+    lo = np.zeros((len(variantes), n))
+    hi = np.zeros((len(variantes), n))
+    x0 = np.zeros((len(variantes), n))
+    for i, variante in enumerate(variantes):
+        a_i, b, w = _sistema(variante, comidas, objetivos, composicion)
+        a[i, :, :len(variante)] = a_i
+        lo[i, :len(variante)] = [limites[c][0] for _, c in variante]
+        hi[i, :len(variante)] = [limites[c][1] for _, c in variante]
+        x0[i, :len(variante)] = x_iniciales[i]
+    if not n:
+        return [np.zeros(0)] * len(variantes), np.full(len(variantes), float(sum(PESO_MACROS)))
+    x, errores = _porciones(a, b, w, lo, hi, x0)
+    return [x[i, :len(v)] for i, v in enumerate(variantes)], errores
+
+
+def _penalizacion_variedad(seleccion, columnas):
+    """Repetir un alimento en el plan cuesta más cuanto más se repite; repetirlo en la misma comida, mucho más"""
+    conteo = Counter(columnas[c][1] for dia in seleccion for _, c in dia)
+    repetidos_en_comida = sum(
+        len(componentes) - len({columnas[c][1] for _, c in componentes})
+        for dia in seleccion
+        for componentes in _por_comida(dia).values()
+    )
+    return (PESO_VARIEDAD * sum(n * (n - 1) / 2 for n in conteo.values())
+            + PESO_REPETIDO_EN_COMIDA * repetidos_en_comida)
+
+
+def _por_comida(dia):
+    comidas = {}
+    for m, c in dia:
+        comidas.setdefault(m, []).append((m, c))
+    return comidas
+
+
+def _estructura(restr):
+    """Lista de (comida, papel, método) por día con papeles alternos y aceite solo si el método lo usa"""
+    candidatos = restr["candidatos"]
+    dias = []
+    contador_metodo = 0
+    for _ in range(restr["dias"]):
+        dia = []
+        for m, (comida, _) in enumerate(restr["comidas"]):
+            metodo = None
+            if comida != "Colación":
+                metodo = restr["metodos"][contador_metodo % len(restr["metodos"])]
+                contador_metodo += 1
+            for rol in COMPONENTES[comida]:
+                if not candidatos[rol] and rol in ALTERNOS:
+                    rol = ALTERNOS[rol]
+                if not candidatos[rol]:
+                    continue
+                if rol == "aceite" and metodo in METODOS_SIN_ACEITE:
+                    continue
+                dia.append((m, rol, metodo))
+        dias.append(dia)
+    return dias
+
+
+def _solucion_previa(previo, estructura, columnas_por_rol):
+    """Alimentos y gramos de un plan previo que siguen siendo válidos en la misma posición"""
+    if not previo:
+        return {}
+    inicial = {}
+    for d, dia in enumerate(previo.get("dias", [])[:len(estructura)]):
+        por_comida = [comida["alimentos"] for comida in dia.get("comidas", [])]
+        posiciones = Counter()
+        for i, (m, rol, _) in enumerate(estructura[d]):
+            if m >= len(por_comida):
+                continue
+            k = posiciones[m]
+            posiciones[m] += 1
+            if k < len(por_comida[m]):
+                alimento = por_comida[m][k]
+                columna = columnas_por_rol[rol].get((alimento["subgrupo"], alimento["alimento"]))
+                if columna is not None:
+                    inicial[(d, i)] = (columna, alimento["gramos"] / 100)
+    return inicial
+
+
+def resolver(restr, limite_segundos=LIMITE_SEGUNDOS, previo=None, semilla=None):
+    """Busca el plan; retorna (selección, gramos, error, pasos). Sin tiempo, se detiene al estancarse."""
+    inicio = time.perf_counter()
+    t = tabla()
+    rng = np.random.default_rng(int((semilla or clave_restricciones(restr))[:8], 16))
+    columnas_por_rol = {
+        rol: {par: t.columna[par] for par in restr["candidatos"][rol]} for rol in ROLES
+    }
+    limites = {}
+    for rol, columnas in columnas_por_rol.items():
+        for (clave, opcion), j in columnas.items():
+            lo, hi = PORCIONES_ALIMENTO.get(opcion, PORCIONES[clave])
+            limites[j] = (lo / 100, hi / 100)
+
+    # Selección inicial: plan previo donde aplique y, en el resto, rotación de candidatos
+    estructura = _estructura(restr)
+    inicial = _solucion_previa(previo, estructura, columnas_por_rol)
+    rotaciones = {rol: list(rng.permutation(list(cols.values()))) for rol, cols in columnas_por_rol.items()}
+    turno = Counter()
+    seleccion, x_iniciales = [], []
+    for d, dia in enumerate(estructura):
+        componentes, x0 = [], []
+        for i, (m, rol, _) in enumerate(dia):
+            if (d, i) in inicial:
+                columna, gramos = inicial[(d, i)]
+            else:
+                columna = rotaciones[rol][turno[rol] % len(rotaciones[rol])]
+                turno[rol] += 1
+                gramos = sum(limites[columna]) / 2
+            componentes.append((m, columna))
+            x0.append(gramos)
+        seleccion.append(componentes)
+        x_iniciales.append(x0)
+
+    comidas, objetivos = restr["comidas"], restr["objetivos"]
+    gramos, errores = _resolver_dias(seleccion, comidas, objetivos, t.composicion, limites, x_iniciales)
+    errores = list(errores)
+    variedad = _penalizacion_variedad(seleccion, t.columnas)
+
+    # Búsqueda local: cambiar un alimento por otro del mismo papel
+    posiciones = [(d, i) for d, dia in enumerate(estructura) for i in range(len(dia))]
+    pasos = sin_mejora = 0
+    while posiciones and time.perf_counter() - inicio < limite_segundos and sin_mejora < 2 * len(posiciones):
+        pasos += 1
+        d, i = posiciones[rng.integers(len(posiciones))]
+        m, columna_actual = seleccion[d][i]
+        rol = estructura[d][i][1]
+        opciones = [c for c in columnas_por_rol[rol].values() if c != columna_actual]
+        if not opciones:
+            sin_mejora += 1
+            continue
+        if len(opciones) > ALTERNATIVAS_POR_PASO:
+            opciones = list(rng.choice(opciones, ALTERNATIVAS_POR_PASO, replace=False))
+        variantes, x0s = [], []
+        for c in opciones:
+            variante = list(seleccion[d])
+            variante[i] = (m, c)
+            variantes.append(variante)
+            x0 = gramos[d].copy()
+            x0[i] = sum(limites[c]) / 2
+            x0s.append(x0)
+        x_var, err_var = _resolver_dias(variantes, comidas, objetivos, t.composicion, limites, x0s)
+        mejor, mejor_total = None, errores[d] + variedad
+        for k, variante in enumerate(variantes):
+            prueba = seleccion[:d] + [variante] + seleccion[d + 1:]
+            total = err_var[k] + _penalizacion_variedad(prueba, t.columnas)
+            if total < mejor_total - 1e-9:
+                mejor, mejor_total = k, total
+        if mejor is None:
+            sin_mejora += 1
+            continue
+        sin_mejora = 0
+        seleccion[d] = variantes[mejor]
+        gramos[d] = x_var[mejor]
+        errores[d] = float(err_var[mejor])
+        variedad = _penalizacion_variedad(seleccion, t.columnas)
+
+    return estructura, seleccion, gramos, sum(errores) + variedad, pasos
+
+
+# ==================== PLAN ====================
+
+_CACHE = OrderedDict()
+_ultimo_plan = None
+
+
+def _redondear(gramos, limite_superior):
+    """Gramos redondeados a 5 g (a 1 g en porciones pequeñas como aceites o proteína en polvo)"""
+    paso = 1 if limite_superior <= 0.4 else 5
+    return max(paso, round(gramos * 100 / paso) * paso)
+
+
+def generar_plan(respuestas, dias=DIAS, energia_kcal=None, limite_segundos=LIMITE_SEGUNDOS, previo=None):
+    """
+    Plan de `dias` días para las respuestas dadas. `previo` (un plan anterior)
+    sirve como punto de partida; planes con las mismas restricciones salen de la caché.
+    """
+    inicio = time.perf_counter()
+    restr = restricciones(respuestas, dias, energia_kcal)
+    llave = clave_restricciones(restr)
+    if llave in _CACHE:
+        _CACHE.move_to_end(llave)
+        plan = copy.deepcopy(_CACHE[llave])
+        plan["desde_cache"] = True
+        plan["segundos"] = round(time.perf_counter() - inicio, 4)
+        return plan
+
+    t = tabla()
+    estructura, seleccion, gramos, error, pasos = resolver(restr, limite_segundos, previo, llave)
+    objetivos = restr["objetivos"]
+    plan_dias = []
+    for d, dia in enumerate(seleccion):
+        comidas = [
+            {"nombre": nombre, "preparacion": None, "alimentos": []}
+            for nombre, _ in restr["comidas"]
+        ]
+        totales = np.zeros(len(NUTRIENTES))
+        for i, (m, columna) in enumerate(dia):
+            clave, opcion = t.columnas[columna]
+            rol, metodo = estructura[d][i][1], estructura[d][i][2]
+            hi = PORCIONES_ALIMENTO.get(opcion, PORCIONES[clave])[1] / 100
+            cantidad = _redondear(float(gramos[d][i]), hi)
+            totales += t.composicion[columna] * cantidad / 100
+            comidas[m]["alimentos"].append({"alimento": opcion, "subgrupo": clave, "gramos": cantidad})
+            if rol in ROLES_COCINADOS and metodo:
+                comidas[m]["preparacion"] = metodo
+        plan_dias.append({
+            "comidas": [c for c in comidas if c["alimentos"]],
+            "totales": dict(zip(NUTRIENTES, totales.round(1).tolist())),
+        })
+
+    plan = {
+        "objetivos": asdict(objetivos),
+        "dias": plan_dias,
+        "excluidos": list(restr["excluidos"]),
+        "error": round(float(error), 5),
+        "pasos": pasos,
+        "desde_cache": False,
+        "segundos": round(time.perf_counter() - inicio, 4),
+    }
+    _CACHE[llave] = copy.deepcopy(plan)
+    if len(_CACHE) > MAX_CACHE:
+        _CACHE.popitem(last=False)
+    return plan
+
+
+def texto_plan(plan, nombre=None):
+    """Plan en texto plano para el nutriólogo"""
+    o = plan["objetivos"]
+    lineas = [
+        "=====================================",
+        f"PLAN DE ALIMENTACIÓN - {nombre or 'Cliente'}",
+        "=====================================",
+        f"Meta diaria: {o['energia_kcal']:.0f} kcal | Proteína {o['proteina_g']:.0f} g | "
+        f"Grasa {o['grasa_g']:.0f} g | Carbohidratos {o['carbohidratos_g']:.0f} g",
+        f"Topes: sodio {o['sodio_max_mg']:.0f} mg | grasa saturada {o['grasa_saturada_max_g']:.0f} g",
+    ]
+    if plan["excluidos"]:
+        lineas.append(f"Excluidos por alergias/intolerancias/condiciones: {', '.join(plan['excluidos'])}")
+    for d, dia in enumerate(plan["dias"], 1):
+        tot = dia["totales"]
+        lineas += [
+            "",
+            f"DÍA {d}: {tot['energia_kcal']:.0f} kcal | P {tot['proteina_g']:.0f} g | "
+            f"G {tot['grasa_g']:.0f} g | C {tot['carbohidratos_g']:.0f} g | Sodio {tot['sodio_mg']:.0f} mg",
+        ]
+        for comida in dia["comidas"]:
+            preparacion = f" ({comida['preparacion']})" if comida["preparacion"] else ""
+            lineas.append(f"  {comida['nombre']}{preparacion}")
+            for alimento in comida["alimentos"]:
+                lineas.append(f"    - {alimento['alimento']}: {alimento['gramos']:g} g")
+    return "\n".join(lineas) + "\n"
+
+
+# ==================== LOTE ====================
+
+def planificar_registro(tarea):
+    """Trabajo de un proceso del pool: genera el plan de un registro partiendo del plan anterior del proceso"""
+    global _ultimo_plan
+    from mupai.lote import _nombre_seguro, cargar_datos
+
+    identificador, origen, datos, directorio, dias, limite_segundos = tarea
+    try:
+        r = Respuestas.desde_mapeo(normalizar(cargar_datos(origen, datos)))
+        plan = generar_plan(r, dias, limite_segundos=limite_segundos, previo=_ultimo_plan)
+    except (OSError, ValueError, TypeError, AttributeError) as e:
+        return {"id": identificador, "origen": origen, "error": str(e)}
+    _ultimo_plan = plan
+
+    ruta = os.path.join(directorio, "planes", f"{_nombre_seguro(identificador)}.txt")
+    with open(ruta, "w", encoding="utf-8") as f:
+        f.write(texto_plan(plan, r.nombre))
+    return {"id": identificador, "origen": origen, "plan": ruta, "error_ajuste": plan["error"],
+            "segundos": plan["segundos"], "desde_cache": plan["desde_cache"]}
+
+
+def _registros_almacen(ruta):
+    from mupai.almacen import AlmacenEvaluaciones
+
+    for identificador, respuestas in AlmacenEvaluaciones(ruta).iterar():
+        yield identificador, ruta, respuestas
+
+
+def planificar_lote(registros, directorio=DIRECTORIO_SALIDA, procesos=None, dias=DIAS,
+                    limite_segundos=LIMITE_SEGUNDOS):
+    """Genera los planes de todos los registros (id, origen, datos) en un pool de procesos. Retorna (total, con_error)."""
+    os.makedirs(os.path.join(directorio, "planes"), exist_ok=True)
+    procesos = procesos or os.cpu_count() or 1
+    max_en_vuelo = procesos * TAREAS_POR_PROCESO
+    total = con_error = 0
+
+    with ProcessPoolExecutor(max_workers=procesos) as pool, \
+            open(os.path.join(directorio, "planes.jsonl"), "w", encoding="utf-8") as salida:
+        def escribir(terminados):
+            nonlocal total, con_error
+            for futuro in terminados:
+                reporte = futuro.result()
+                salida.write(json.dumps(reporte, ensure_ascii=False) + "\n")
+                total += 1
+                con_error += "error" in reporte
+
+        en_vuelo = set()
+        for identificador, origen, datos in registros:
+            tarea = (identificador, origen, datos, directorio, dias, limite_segundos)
+            en_vuelo.add(pool.submit(planificar_registro, tarea))
+            if len(en_vuelo) >= max_en_vuelo:
+                terminados, en_vuelo = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                escribir(terminados)
+        escribir(wait(en_vuelo).done)
+    return total, con_error
+
+
+def main(argv=None):
+    from mupai.lote import leer_registros
+
+    parser = argparse.ArgumentParser(description="Genera planes de alimentación MUPAI a partir de evaluaciones")
+    parser.add_argument("entradas", nargs="*", help="Archivos .json/.jsonl/.csv o directorios que los contengan")
+    parser.add_argument("--almacen", help="Generar planes para todas las evaluaciones de este almacén SQLite")
+    parser.add_argument("--salida", default=DIRECTORIO_SALIDA)
+    parser.add_argument("--dias", type=int, default=DIAS)
+    parser.add_argument("--limite", type=float, default=LIMITE_SEGUNDOS, help="Segundos máximos por plan")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos en paralelo (por defecto, uno por CPU)")
+    args = parser.parse_args(argv)
+    if not args.entradas and not args.almacen:
+        parser.error("indica archivos de entrada o --almacen")
+
+    registros = _registros_almacen(args.almacen) if args.almacen else leer_registros(args.entradas)
+    total, con_error = planificar_lote(registros, args.salida, args.procesos, args.dias, args.limite)
+    print(f"Planes generados: {total - con_error} | Con errores: {con_error}")
+    print(f"Reporte: {os.path.join(args.salida, 'planes.jsonl')}")
+    return 0 if not con_error else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
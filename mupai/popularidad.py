@@ -0,0 +1,233 @@
+"""
+Orden de las listas largas del cuestionario por popularidad, con un
+experimento A/B que mide el tiempo de cada paso.
+
+Al finalizar una evaluación se suman sus selecciones a contadores por opción
+en un almacén SQLite compartido por todos los procesos (una sola transacción
+de incrementos). Cada proceso guarda una instantánea de las listas ya
+ordenadas y la vuelve a leer cada `INTERVALO_ACTUALIZACION` segundos, así que
+ordenar una lista en un rerun es buscar en un dict.
+
+Cada sesión cae en una variante (`catalogo`: orden fijo, `popularidad`: más
+elegidas primero) y al avanzar se registra cuánto tardó en cada paso:
+
+    python -m mupai.popularidad --tiempos
+    python -m mupai.popularidad --reconstruir --almacen datos/evaluaciones.sqlite
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import closing
+
+import numpy as np
+
+from mupai.almacen import RUTA_ALMACEN, AlmacenEvaluaciones
+from mupai.catalogo import GRUPOS_ALIMENTOS, OPCIONES, OPCIONES_NINGUNO
+from mupai.respuestas import Respuestas
+
+logger = logging.getLogger(__name__)
+
+RUTA_POPULARIDAD = os.path.join("datos", "popularidad.sqlite")
+INTERVALO_ACTUALIZACION = 60.0
+# Con menos evaluaciones el orden sería ruido; las listas cortas se revisan de un vistazo
+MIN_EVALUACIONES = 30
+MIN_OPCIONES = 10
+CLAVES_ORDENABLES = tuple(
+    clave for claves in GRUPOS_ALIMENTOS.values() for clave in claves if len(OPCIONES[clave]) >= MIN_OPCIONES
+)
+VARIANTE_CATALOGO = "catalogo"
+VARIANTE_POPULARIDAD = "popularidad"
+VARIANTES = (VARIANTE_CATALOGO, VARIANTE_POPULARIDAD)
+
+
+class ContadoresPopularidad:
+    """Selecciones por opción de las evaluaciones finalizadas y tiempos por paso de cada variante"""
+
+    def __init__(self, ruta=RUTA_POPULARIDAD):
+        self.ruta = ruta
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        with closing(self._conectar()) as con, con:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS conteos (
+                    clave TEXT NOT NULL,
+                    opcion TEXT NOT NULL,
+                    n INTEGER NOT NULL,
+                    PRIMARY KEY (clave, opcion)
+                ) WITHOUT ROWID
+            """)
+            # Una evaluación finalizada dos veces (reintento) se cuenta una sola vez
+            con.execute("CREATE TABLE IF NOT EXISTS contadas (id TEXT PRIMARY KEY, registrado REAL NOT NULL)")
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS tiempos_paso (
+                    variante TEXT NOT NULL,
+                    paso INTEGER NOT NULL,
+                    segundos REAL NOT NULL,
+                    registrado REAL NOT NULL
+                )
+            """)
+
+    def _conectar(self):
+        con = sqlite3.connect(self.ruta, timeout=30)
+        con.execute("PRAGMA synchronous=NORMAL")
+        return con
+
+    @staticmethod
+    def _selecciones(r):
+        return [(clave, opcion) for clave in CLAVES_ORDENABLES for opcion in dict.fromkeys(getattr(r, clave, None) or ())]
+
+    def registrar(self, r, identificador):
+        """Suma las selecciones de una evaluación; retorna False si ya estaba contada"""
+        with closing(self._conectar()) as con, con:
+            nueva = con.execute(
+                "INSERT OR IGNORE INTO contadas (id, registrado) VALUES (?, ?)", (identificador, time.time())
+            ).rowcount
+            if nueva:
+                con.executemany(
+                    "INSERT INTO conteos (clave, opcion, n) VALUES (?, ?, 1) "
+                    "ON CONFLICT (clave, opcion) DO UPDATE SET n = n + 1",
+                    self._selecciones(r)
+                )
+        return bool(nueva)
+
+    def registrar_tiempo(self, variante, paso, segundos):
+        with closing(self._conectar()) as con, con:
+            con.execute(
+                "INSERT INTO tiempos_paso (variante, paso, segundos, registrado) VALUES (?, ?, ?, ?)",
+                (variante, paso, segundos, time.time())
+            )
+
+    def reconstruir(self, ruta_almacen=RUTA_ALMACEN, tamano=500):
+        """Vuelve a contar desde cero todas las evaluaciones del almacén; retorna cuántas contó"""
+        conteos, ids = {}, []
+        for identificador, datos in AlmacenEvaluaciones(ruta_almacen).iterar(tamano):
+            ids.append(identificador)
+            for par in self._selecciones(Respuestas.desde_mapeo(datos)):
+                conteos[par] = conteos.get(par, 0) + 1
+        ahora = time.time()
+        with closing(self._conectar()) as con, con:
+            con.execute("DELETE FROM conteos")
+            con.execute("DELETE FROM contadas")
+            con.executemany("INSERT INTO contadas (id, registrado) VALUES (?, ?)", [(i, ahora) for i in ids])
+            con.executemany(
+                "INSERT INTO conteos (clave, opcion, n) VALUES (?, ?, ?)",
+                [(clave, opcion, n) for (clave, opcion), n in conteos.items()]
+            )
+        return len(ids)
+
+    def conteos(self):
+        """(evaluaciones contadas, {clave: {opción: selecciones}})"""
+        with closing(self._conectar()) as con:
+            total = con.execute("SELECT COUNT(*) FROM contadas").fetchone()[0]
+            por_clave = {}
+            for clave, opcion, n in con.execute("SELECT clave, opcion, n FROM conteos"):
+                por_clave.setdefault(clave, {})[opcion] = n
+        return total, por_clave
+
+    def tiempos(self):
+        """{(variante, paso): arreglo de segundos}"""
+        tiempos = {}
+        with closing(self._conectar()) as con:
+            for variante, paso, segundos in con.execute("SELECT variante, paso, segundos FROM tiempos_paso"):
+                tiempos.setdefault((variante, paso), []).append(segundos)
+        return {llave: np.array(valores) for llave, valores in tiempos.items()}
+
+
+def ordenes(total, por_clave):
+    """{clave: opciones de más a menos elegidas}; "Ninguno" y los empates conservan su lugar del catálogo"""
+    if total < MIN_EVALUACIONES:
+        return {}
+    resultado = {}
+    for clave in CLAVES_ORDENABLES:
+        opciones, conteo = OPCIONES[clave], por_clave.get(clave, {})
+        resultado[clave] = [
+            opciones[i] for i in sorted(
+                range(len(opciones)),
+                key=lambda i: (opciones[i] in OPCIONES_NINGUNO, -conteo.get(opciones[i], 0), i)
+            )
+        ]
+    return resultado
+
+
+_instantaneas = {}
+_candado_instantaneas = threading.Lock()
+
+
+def instantanea(ruta=RUTA_POPULARIDAD):
+    """Órdenes compartidos del proceso; se recalculan desde el almacén cada INTERVALO_ACTUALIZACION"""
+    with _candado_instantaneas:
+        leida, resultado = _instantaneas.get(ruta, (None, {}))
+        if leida is None or time.monotonic() - leida >= INTERVALO_ACTUALIZACION:
+            try:
+                resultado = ordenes(*ContadoresPopularidad(ruta).conteos())
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("No se pudieron leer los contadores de popularidad: %s", e)
+            _instantaneas[ruta] = (time.monotonic(), resultado)
+        return resultado
+
+
+def ordenar(clave, opciones, ruta=RUTA_POPULARIDAD):
+    """Opciones de una lista en orden de popularidad, o tal cual si la lista no se ordena todavía"""
+    return instantanea(ruta).get(clave, opciones)
+
+
+def registrar_evaluacion(r, identificador, ruta=RUTA_POPULARIDAD):
+    """Suma una evaluación finalizada a los contadores; un error aquí nunca interrumpe al cliente"""
+    try:
+        return ContadoresPopularidad(ruta).registrar(r, identificador)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("No se pudo registrar la evaluación en los contadores de popularidad: %s", e)
+        return False
+
+
+def registrar_tiempo_paso(variante, paso, segundos, ruta=RUTA_POPULARIDAD):
+    try:
+        ContadoresPopularidad(ruta).registrar_tiempo(variante, paso, segundos)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("No se pudo registrar el tiempo del paso %s: %s", paso, e)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Contadores de popularidad y experimento de orden de opciones MUPAI")
+    parser.add_argument("--ruta", default=RUTA_POPULARIDAD)
+    parser.add_argument("--reconstruir", action="store_true", help="Volver a contar todas las evaluaciones del almacén")
+    parser.add_argument("--almacen", default=RUTA_ALMACEN)
+    parser.add_argument("--tiempos", action="store_true", help="Comparar el tiempo por paso de cada variante")
+    parser.add_argument("--top", type=int, default=5, help="Opciones más elegidas a mostrar por lista")
+    args = parser.parse_args(argv)
+
+    contadores = ContadoresPopularidad(args.ruta)
+    if args.reconstruir:
+        print(f"Evaluaciones contadas: {contadores.reconstruir(args.almacen)}")
+
+    if args.tiempos:
+        tiempos = contadores.tiempos()
+        print(f"{'paso':>4}  " + "  ".join(f"{v:>24}" for v in VARIANTES) + "  diferencia")
+        for paso in sorted({paso for _, paso in tiempos}):
+            celdas, medianas = [], []
+            for variante in VARIANTES:
+                segundos = tiempos.get((variante, paso), np.empty(0))
+                mediana = float(np.median(segundos)) if len(segundos) else None
+                medianas.append(mediana)
+                celdas.append(f"{'-' if mediana is None else f'{mediana:.1f} s'} (n={len(segundos)})".rjust(24))
+            diferencia = f"{medianas[1] - medianas[0]:+.1f} s" if None not in medianas else "-"
+            print(f"{paso:>4}  " + "  ".join(celdas) + f"  {diferencia}")
+        return 0
+
+    total, por_clave = contadores.conteos()
+    print(f"Evaluaciones contadas: {total}" + ("" if total >= MIN_EVALUACIONES else f" (se ordena a partir de {MIN_EVALUACIONES})"))
+    for clave in CLAVES_ORDENABLES:
+        conteo = por_clave.get(clave, {})
+        mas_elegidas = sorted(conteo.items(), key=lambda par: -par[1])[:args.top]
+        print(f"  {clave}: " + (", ".join(f"{opcion} ({n})" for opcion, n in mas_elegidas) or "-"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
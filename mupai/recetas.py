@@ -0,0 +1,200 @@
+"""
+Recetario local indexado por ingrediente, método de cocción y alérgeno.
+
+Cada receta de `mupai/datos/recetas.csv` usa solo alimentos con el mismo
+nombre que en el catálogo (los condimentos básicos, como sal y especias, se
+dan por hechos). Al cargar, los ingredientes de cada receta se guardan como
+un conjunto de bits sobre los alimentos del catálogo; así "recetas hechas
+solo con alimentos que el cliente consume" es una prueba de subconjunto
+vectorizada (`receta & ~cliente == 0`) sobre todo el recetario a la vez.
+Los métodos de cocción y los motivos de exclusión (alergias, intolerancias y
+condiciones médicas, del índice de `mupai.alergenos`) son máscaras de bits
+por receta. Las recetas compatibles se ordenan por los antojos que ayudan a
+sustituir.
+
+    python -m mupai.recetas respuestas.json --n 10 --tiempo comida
+    python -m mupai.recetas --ingrediente "Camarón"
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+from mupai.alergenos import CLAVES_ALIMENTOS, INDICE, motivos_declarados
+from mupai.catalogo import OPCIONES, OPCIONES_NINGUNO
+from mupai.respuestas import Respuestas, normalizar
+
+RUTA_RECETAS = os.path.join(os.path.dirname(__file__), "datos", "recetas.csv")
+RECETAS_MOSTRADAS = 6
+# Códigos del CSV en el mismo orden que las opciones del paso 10
+CODIGOS_METODO = ("plancha", "parrilla", "hervido", "vapor", "horno", "air_fryer", "microondas", "salteado")
+METODOS = dict(zip(CODIGOS_METODO, OPCIONES["metodos_coccion_accesibles"], strict=True))
+SIN_COCCION = "Sin cocción"
+TIEMPOS = {"desayuno": "Desayuno", "comida": "Comida", "cena": "Cena", "colacion": "Colación"}
+CLAVES_ANTOJOS = ("antojos_dulces", "antojos_salados", "antojos_comida_rapida", "antojos_bebidas", "antojos_picantes")
+BITS_POR_PALABRA = 64
+
+
+def _lista(texto):
+    return [parte.strip() for parte in (texto or "").split(";") if parte.strip()]
+
+
+def _empacar(filas, ancho):
+    """Matriz booleana (n × ancho) → conjuntos de bits (n × palabras de 64 bits)"""
+    palabras = -(-ancho // BITS_POR_PALABRA)
+    bits = np.zeros((len(filas), palabras * BITS_POR_PALABRA), dtype=bool)
+    bits[:, :ancho] = filas
+    return np.packbits(bits, axis=1).view(np.uint64)
+
+
+class Recetario:
+    """Recetas con sus ingredientes como bits e índices por ingrediente, método y motivo"""
+
+    def __init__(self, ruta=RUTA_RECETAS):
+        with open(ruta, newline="", encoding="utf-8") as f:
+            filas = list(csv.DictReader(f))
+        self.nombres = tuple(fila["nombre"] for fila in filas)
+        self.tiempos = np.array([fila["tiempo"] for fila in filas])
+        self.ingredientes = tuple(tuple(_lista(fila["ingredientes"])) for fila in filas)
+        self.metodos = tuple(tuple(_lista(fila["metodos"])) for fila in filas)
+        self.antojos = tuple(tuple(_lista(fila["antojos"])) for fila in filas)
+
+        # Universo de bits: cada alimento o bebida del catálogo, una vez por nombre
+        self.alimentos = tuple(dict.fromkeys(
+            opcion for clave in CLAVES_ALIMENTOS for opcion in OPCIONES[clave] if opcion not in OPCIONES_NINGUNO
+        ))
+        self.bit = {alimento: i for i, alimento in enumerate(self.alimentos)}
+        self.opciones_antojo = tuple(opcion for clave in CLAVES_ANTOJOS for opcion in OPCIONES[clave])
+        self.antojo = {opcion: i for i, opcion in enumerate(self.opciones_antojo)}
+        self.motivos = tuple(INDICE)
+
+        errores = sorted(
+            {f"ingrediente «{i}»" for ingredientes in self.ingredientes for i in ingredientes if i not in self.bit}
+            | {f"método «{m}»" for metodos in self.metodos for m in metodos if m not in METODOS}
+            | {f"antojo «{a}»" for antojos in self.antojos for a in antojos if a not in self.antojo}
+            | {f"tiempo «{t}»" for t in self.tiempos.tolist() if t not in TIEMPOS}
+        )
+        if errores:
+            raise ValueError(f"Valores fuera del catálogo en {ruta}: {', '.join(errores)}")
+
+        usa = np.zeros((len(filas), len(self.alimentos)), dtype=bool)
+        for i, ingredientes in enumerate(self.ingredientes):
+            usa[i, [self.bit[ingrediente] for ingrediente in ingredientes]] = True
+        self.bits_ingredientes = _empacar(usa, len(self.alimentos))
+        self.bits_metodos = np.array(
+            [sum(1 << CODIGOS_METODO.index(m) for m in metodos) for metodos in self.metodos], dtype=np.uint16
+        )
+        # Una receta tiene un motivo si alguno de sus ingredientes está en el índice de alérgenos
+        nombres_por_motivo = [{opcion for _, opcion in INDICE[motivo]} for motivo in self.motivos]
+        self.bits_motivos = np.array([
+            sum(1 << m for m, nombres in enumerate(nombres_por_motivo) if nombres.intersection(ingredientes))
+            for ingredientes in self.ingredientes
+        ], dtype=np.uint32)
+        self.matriz_antojos = np.zeros((len(filas), len(self.opciones_antojo)), dtype=np.int32)
+        for i, antojos in enumerate(self.antojos):
+            self.matriz_antojos[i, [self.antojo[a] for a in antojos]] = 1
+        self.n_ingredientes = usa.sum(axis=1)
+
+        # Índices invertidos: ingrediente → recetas que lo usan
+        self.por_ingrediente = {}
+        for i, ingredientes in enumerate(self.ingredientes):
+            for ingrediente in ingredientes:
+                self.por_ingrediente.setdefault(ingrediente, []).append(i)
+
+    def cliente(self, r):
+        """Bits de lo que el cliente consume y máscaras de sus métodos, motivos declarados y antojos"""
+        consume = np.zeros(len(self.alimentos), dtype=bool)
+        for clave in CLAVES_ALIMENTOS:
+            for opcion in getattr(r, clave, None) or ():
+                if opcion in self.bit:
+                    consume[self.bit[opcion]] = True
+        metodos = sum(
+            1 << i for i, opcion in enumerate(METODOS.values()) if opcion in (r.metodos_coccion_accesibles or ())
+        )
+        motivos = sum(1 << self.motivos.index(motivo) for motivo in motivos_declarados(r))
+        antojos = np.zeros(len(self.opciones_antojo), dtype=np.int32)
+        for clave in CLAVES_ANTOJOS:
+            for opcion in getattr(r, clave, None) or ():
+                if opcion in self.antojo:
+                    antojos[self.antojo[opcion]] = 1
+        return _empacar(consume[None, :], len(self.alimentos))[0], metodos, motivos, antojos
+
+    def compatibles(self, r):
+        """Máscara de recetas hechas solo con lo que el cliente consume, con sus métodos y sin sus alérgenos"""
+        consume, metodos, motivos, _ = self.cliente(r)
+        subconjunto = ~np.any(self.bits_ingredientes & ~consume, axis=1)
+        cocinable = (self.bits_metodos == 0) | ((self.bits_metodos & metodos) != 0)
+        seguro = (self.bits_motivos & motivos) == 0
+        return subconjunto & cocinable & seguro
+
+    def recomendar(self, r, n=RECETAS_MOSTRADAS, tiempo=None):
+        """
+        Hasta `n` recetas compatibles, primero las que sustituyen más antojos
+        del cliente y luego las de más ingredientes.
+        """
+        mascara = self.compatibles(r)
+        if tiempo:
+            mascara &= self.tiempos == tiempo
+        _, metodos, _, antojos = self.cliente(r)
+        puntaje = self.matriz_antojos @ antojos
+        candidatas = np.flatnonzero(mascara)
+        orden = candidatas[np.lexsort((candidatas, -self.n_ingredientes[candidatas], -puntaje[candidatas]))]
+
+        resultado = []
+        for i in orden[:n].tolist():
+            disponibles = [METODOS[m] for m in self.metodos[i] if metodos >> CODIGOS_METODO.index(m) & 1]
+            resultado.append({
+                "nombre": self.nombres[i],
+                "tiempo": TIEMPOS[self.tiempos[i]],
+                "metodo": disponibles[0] if disponibles else SIN_COCCION,
+                "ingredientes": list(self.ingredientes[i]),
+                "antojos": [a for a in self.antojos[i] if antojos[self.antojo[a]]],
+            })
+        return resultado
+
+    def con_ingrediente(self, alimento):
+        """Nombres de las recetas que usan un alimento"""
+        return [self.nombres[i] for i in self.por_ingrediente.get(alimento, ())]
+
+
+@lru_cache(maxsize=None)
+def recetario():
+    """Recetario compartido del proceso (se lee del disco solo la primera vez)"""
+    return Recetario()
+
+
+def recetas_para(r, n=RECETAS_MOSTRADAS, tiempo=None):
+    return recetario().recomendar(r, n, tiempo)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recetas del recetario MUPAI compatibles con un cliente")
+    parser.add_argument("respuestas", nargs="?", help="Archivo .json con las respuestas de un cliente")
+    parser.add_argument("--n", type=int, default=RECETAS_MOSTRADAS)
+    parser.add_argument("--tiempo", choices=TIEMPOS)
+    parser.add_argument("--ingrediente", action="append", default=[], help="Listar las recetas que usan este alimento")
+    args = parser.parse_args(argv)
+
+    for alimento in args.ingrediente:
+        print(f"{alimento}:")
+        for nombre in recetario().con_ingrediente(alimento) or ["(sin recetas)"]:
+            print(f"  - {nombre}")
+    if args.respuestas:
+        with open(args.respuestas, encoding="utf-8") as f:
+            r = Respuestas.desde_mapeo(normalizar(json.load(f)))
+        recetas = recetas_para(r, args.n, args.tiempo)
+        if not recetas:
+            print("Ninguna receta del recetario es compatible con estas respuestas")
+        for receta in recetas:
+            antojos = f" | sustituye: {', '.join(receta['antojos'])}" if receta["antojos"] else ""
+            print(f"- {receta['nombre']} ({receta['tiempo']}, {receta['metodo']}){antojos}")
+            print(f"    {', '.join(receta['ingredientes'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Respuestas de una evaluación como objeto tipado e independiente de Streamlit.
+
+Cada campo se llama igual que su clave en `st.session_state`, así la capa de
+Streamlit solo copia valores y el núcleo (validación, resumen) trabaja sobre
+objetos simples que se pueden procesar en lote o en otros procesos.
+Un campo en None significa "no respondido".
+"""
+from dataclasses import asdict, dataclass, fields
+
+
+@dataclass(slots=True)
+class Respuestas:
+    # Datos personales
+    nombre: str | None = None
+    telefono: str | None = None
+    email_cliente: str | None = None
+    edad: int | str | None = None
+    sexo: str | None = None
+    fecha_llenado: str | None = None
+
+    # Paso 1: Proteína animal con más contenido graso
+    huevos_embutidos: list[str] | None = None
+    carnes_res_grasas: list[str] | None = None
+    carnes_cerdo_grasas: list[str] | None = None
+    carnes_pollo_grasas: list[str] | None = None
+    organos_grasos: list[str] | None = None
+    quesos_grasos: list[str] | None = None
+    lacteos_enteros: list[str] | None = None
+    pescados_grasos: list[str] | None = None
+    mariscos_grasos: list[str] | None = None
+
+    # Paso 2: Proteína animal magra
+    carnes_res_magras: list[str] | None = None
+    carnes_cerdo_magras: list[str] | None = None
+    carnes_pollo_magras: list[str] | None = None
+    organos_magros: list[str] | None = None
+    pescados_magros: list[str] | None = None
+    mariscos_magros: list[str] | None = None
+    quesos_magros: list[str] | None = None
+    lacteos_light: list[str] | None = None
+    huevos_embutidos_light: list[str] | None = None
+
+    # Paso 3: Proteína en polvo
+    proteina_polvo_tipos: list[str] | None = None
+    preferencia_marca_proteina: list[str] | None = None
+    nombre_marca_proteina: str | None = None
+
+    # Paso 4: Grasas saludables
+    grasas_naturales: list[str] | None = None
+    frutos_secos_semillas: list[str] | None = None
+    mantequillas_vegetales: list[str] | None = None
+
+    # Paso 5: Carbohidratos complejos y cereales
+    cereales_integrales: list[str] | None = None
+    pastas: list[str] | None = None
+    tortillas_panes: list[str] | None = None
+    raices_tuberculos: list[str] | None = None
+    leguminosas: list[str] | None = None
+
+    # Pasos 6 a 9: Vegetales, frutas, aceites y bebidas
+    vegetales_lista: list[str] | None = None
+    frutas_lista: list[str] | None = None
+    aceites_coccion: list[str] | None = None
+    bebidas_sin_calorias: list[str] | None = None
+
+    # Paso 10: Métodos de cocción
+    metodos_coccion_accesibles: list[str] | None = None
+    otro_metodo_coccion: str | None = None
+
+    # Paso 11: Alergias e intolerancias
+    alergias_alimentarias: list[str] | None = None
+    otra_alergia: str | None = None
+    intolerancias_digestivas: list[str] | None = None
+    otra_intolerancia: str | None = None
+
+    # Paso 12: Antojos
+    antojos_dulces: list[str] | None = None
+    antojos_salados: list[str] | None = None
+    antojos_comida_rapida: list[str] | None = None
+    antojos_bebidas: list[str] | None = None
+    antojos_picantes: list[str] | None = None
+    otros_antojos: str | None = None
+
+    # Paso 13: Frecuencia de comidas
+    frecuencia_comidas_ck: list[str] | None = None
+    otra_frecuencia: str | None = None
+
+    # Paso 14: Sugerencias de menús
+    sugerencias_menus: str | None = None
+    opcion_rapida_menu: str | None = None
+
+    # Paso 15: Condiciones médicas, medicamentos y suplementos
+    condiciones_medicas: list[str] | None = None
+    condiciones_otras: str | None = None
+    consume_medicamentos: list[str] | None = None
+    medicamentos_lista: str | None = None
+    consume_suplementos: list[str] | None = None
+    suplementos_lista: str | None = None
+
+    @classmethod
+    def desde_mapeo(cls, mapeo):
+        """Crea las respuestas desde cualquier mapeo (session_state, JSON, fila CSV); ignora claves ajenas"""
+        return cls(**{campo: mapeo[campo] for campo in CAMPOS if campo in mapeo})
+
+    def a_dict(self):
+        return asdict(self)
+
+
+CAMPOS = tuple(campo.name for campo in fields(Respuestas))
+CAMPOS_LISTA = frozenset(
+    campo for campo, tipo in Respuestas.__annotations__.items() if str(tipo).startswith("list")
+)
+# En CSV y otros formatos planos, las opciones de selección múltiple se separan con ";"
+SEPARADOR_OPCIONES = ";"
+
+
+class TiposInvalidos(ValueError):
+    """Campos de un registro crudo con un tipo que no corresponde; `errores` es {campo: mensaje}"""
+
+    def __init__(self, errores):
+        super().__init__("Tipos inválidos: " + "; ".join(f"{campo}: {mensaje}" for campo, mensaje in errores.items()))
+        self.errores = errores
+
+
+def _es_entero(valor):
+    return isinstance(valor, int) and not isinstance(valor, bool)
+
+
+def normalizar(datos):
+    """
+    Convierte un registro crudo (JSON/CSV) a los tipos que usa la app. Las
+    listas aceptan una lista de textos o un texto separado por ";", y los
+    demás campos un texto (o un entero, p. ej. teléfono o edad); cualquier
+    otro tipo levanta TiposInvalidos con el error de cada campo.
+    """
+    limpio, errores = {}, {}
+    for campo in CAMPOS:
+        if campo not in datos:
+            continue
+        valor = datos[campo]
+        if campo in CAMPOS_LISTA:
+            if valor is None:
+                valor = []
+            elif isinstance(valor, str):
+                valor = [opcion.strip() for opcion in valor.split(SEPARADOR_OPCIONES) if opcion.strip()]
+            elif isinstance(valor, list) and all(isinstance(opcion, str) for opcion in valor):
+                valor = list(valor)
+            else:
+                errores[campo] = "se esperaba una lista de textos o un texto separado por ';'"
+                continue
+        elif valor is None:
+            valor = ""
+        elif campo == "edad" and (_es_entero(valor) or isinstance(valor, str)):
+            if isinstance(valor, str) and valor.strip().isdigit():
+                valor = int(valor)
+        elif _es_entero(valor):
+            valor = str(valor)
+        elif not isinstance(valor, str):
+            errores[campo] = "se esperaba un texto"
+            continue
+        limpio[campo] = valor
+    if errores:
+        raise TiposInvalidos(errores)
+    return limpio
@@ -0,0 +1,340 @@
+"""
+Resumen en texto plano de una evaluación (el contenido del email a administración).
+Función pura sobre `Respuestas`: no depende de Streamlit.
+"""
+from datetime import datetime
+
+from mupai.alergenos import conflictos
+from mupai.cambios import texto_cambios
+from mupai.interacciones import interacciones
+from mupai.sustituciones import sugerencias
+
+NO_ESPECIFICADO = 'No especificado'
+
+
+def _lista(valores):
+    return ', '.join(valores) if valores else NO_ESPECIFICADO
+
+
+def _primero(valores):
+    return valores[0] if valores else NO_ESPECIFICADO
+
+
+def _texto(valor):
+    return NO_ESPECIFICADO if valor is None else valor
+
+
+def _conflictos(r):
+    lineas = []
+    for conflicto in conflictos(r):
+        lineas.append(f"- {conflicto['motivo']}: {', '.join(conflicto['alimentos'])}")
+        for alimento in conflicto['alimentos']:
+            alternativas = ', '.join(a['alimento'] for a in sugerencias(alimento, r))
+            lineas.append(f"    · Sustitutos de {alimento}: {alternativas or NO_ESPECIFICADO}")
+    return '\n'.join(lineas) if lineas else '- Ninguno detectado'
+
+
+def _interacciones(r):
+    lineas = []
+    for interaccion in interacciones(r):
+        lineas.append(
+            f"- {interaccion['medicamento']} (escrito como \"{interaccion['mencion']}\") – {interaccion['motivo']}: "
+            f"{', '.join(interaccion['alimentos'])}"
+        )
+        lineas.append(f"    · {interaccion['indicacion']}")
+    return '\n'.join(lineas) if lineas else '- Ninguna detectada'
+
+
+def _arquetipo(arquetipo):
+    """Sección del arquetipo del cliente (`mupai.arquetipos.arquetipo_de`), o aviso si no hay modelo"""
+    if arquetipo is None:
+        return '- Sin modelo de arquetipos entrenado todavía'
+    return (
+        f"- Arquetipo {arquetipo['numero']}: {arquetipo['nombre']} (afinidad {arquetipo['afinidad']:.2f}, "
+        f"{arquetipo['participacion']:.0%} de la cohorte)\n"
+        f"- Alimentos distintivos: {_lista(arquetipo['alimentos'])}"
+    )
+
+
+def _cambios(cambios):
+    """Sección de cambios frente a la evaluación anterior (`AlmacenEvaluaciones.cambios`), si la hay"""
+    if cambios is None:
+        return ''
+    fecha = datetime.fromtimestamp(cambios['recibido_anterior']).strftime("%Y-%m-%d") if cambios['recibido_anterior'] else NO_ESPECIFICADO
+    renglones = '\n'.join(texto_cambios(cambios['diferencias']))
+    return f"""
+=====================================
+🔁 CAMBIOS DESDE LA ÚLTIMA EVALUACIÓN ({fecha})
+=====================================
+{renglones}
+"""
+
+
+def crear_resumen(r, generado=None, cambios=None, arquetipo=None):
+    """
+    Arma el resumen completo de la evaluación; `generado` fija la fecha para
+    reprocesos reproducibles, `cambios` agrega la sección de cambios frente a
+    la evaluación anterior del cliente y `arquetipo` es el que le asignó el
+    modelo junto al almacén de quien llama.
+    """
+    generado = generado or datetime.now()
+    tiene_preferencia_si = bool(r.preferencia_marca_proteina) and r.preferencia_marca_proteina[0] == 'Sí'
+    marca_preferida = r.nombre_marca_proteina if tiene_preferencia_si and r.nombre_marca_proteina is not None else 'No aplica'
+
+    resumen = f"""
+=====================================
+CUESTIONARIO DE SELECCIÓN ALIMENTARIA PERSONALIZADA - MUPAI
+=====================================
+Generado: {generado.strftime("%Y-%m-%d %H:%M:%S")}
+Sistema: MUPAI v2.0 - Muscle Up Performance Assessment Intelligence
+
+=====================================
+DATOS DEL CLIENTE:
+=====================================
+- Nombre completo: {_texto(r.nombre)}
+- Edad: {_texto(r.edad)} años
+- Sexo: {_texto(r.sexo)}
+- Teléfono: {_texto(r.telefono)}
+- Email: {_texto(r.email_cliente)}
+- Fecha evaluación: {_texto(r.fecha_llenado)}
+{_cambios(cambios)}
+=====================================
+🥩 GRUPO 1: PROTEÍNA ANIMAL CON MÁS CONTENIDO GRASO
+=====================================
+🍳 Huevos y embutidos:
+- {_lista(r.huevos_embutidos)}
+
+🐄 Carnes de res grasas:
+- {_lista(r.carnes_res_grasas)}
+
+🐷 Carnes de cerdo grasas:
+- {_lista(r.carnes_cerdo_grasas)}
+
+🐔 Carnes de pollo/pavo grasas:
+- {_lista(r.carnes_pollo_grasas)}
+
+🫀 Órganos y vísceras grasas:
+- {_lista(r.organos_grasos)}
+
+🐟 Pescados grasos:
+- {_lista(r.pescados_grasos)}
+
+🦐 Mariscos/comida marina grasos:
+- {_lista(r.mariscos_grasos)}
+
+🧀 Quesos altos en grasa:
+- {_lista(r.quesos_grasos)}
+
+🥛 Lácteos enteros:
+- {_lista(r.lacteos_enteros)}
+
+🐟 Pescados grasos:
+- {_lista(r.pescados_grasos)}
+
+=====================================
+🍗 GRUPO 2: PROTEÍNA ANIMAL MAGRA
+=====================================
+🐄 Carnes de res magras:
+- {_lista(r.carnes_res_magras)}
+
+🐷 Carnes de cerdo magras:
+- {_lista(r.carnes_cerdo_magras)}
+
+🐔 Carnes de pollo/pavo magras:
+- {_lista(r.carnes_pollo_magras)}
+
+🫀 Órganos y vísceras magros:
+- {_lista(r.organos_magros)}
+
+🐟 Pescados magros:
+- {_lista(r.pescados_magros)}
+
+🦐 Mariscos/comida marina magros:
+- {_lista(r.mariscos_magros)}
+
+🧀 Quesos magros:
+- {_lista(r.quesos_magros)}
+
+🥛 Lácteos light o reducidos:
+- {_lista(r.lacteos_light)}
+
+🥚 Huevos y embutidos light:
+- {_lista(r.huevos_embutidos_light)}
+
+=====================================
+🥑 GRUPO 3: FUENTES DE GRASA SALUDABLE
+=====================================
+🥑 Grasas naturales de alimentos:
+- {_lista(r.grasas_naturales)}
+
+🌰 Frutos secos y semillas:
+- {_lista(r.frutos_secos_semillas)}
+
+🧈 Mantequillas y pastas vegetales:
+- {_lista(r.mantequillas_vegetales)}
+
+=====================================
+🍞 GRUPO 4: CARBOHIDRATOS COMPLEJOS Y CEREALES
+=====================================
+🌾 Cereales y granos integrales:
+- {_lista(r.cereales_integrales)}
+
+🍝 Pastas:
+- {_lista(r.pastas)}
+
+🌽 Tortillas y panes:
+- {_lista(r.tortillas_panes)}
+
+🥔 Raíces y tubérculos (forma base):
+- {_lista(r.raices_tuberculos)}
+
+🫘 Leguminosas:
+- {_lista(r.leguminosas)}
+
+=====================================
+🥬 GRUPO 5: VEGETALES
+=====================================
+- {_lista(r.vegetales_lista)}
+
+=====================================
+🍎 GRUPO 6: FRUTAS
+=====================================
+- {_lista(r.frutas_lista)}
+
+=====================================
+🍳 APARTADO EXTRA: GRASA/ACEITE DE COCCIÓN FAVORITA
+=====================================
+- {_lista(r.aceites_coccion)}
+
+=====================================
+🥤 BEBIDAS SIN CALORÍAS PARA HIDRATACIÓN
+=====================================
+- {_lista(r.bebidas_sin_calorias)}
+
+=====================================
+🚨 SECCIÓN FINAL: ALERGIAS, INTOLERANCIAS Y PREFERENCIAS
+=====================================
+❗ 1. Alergias alimentarias:
+- {_lista(r.alergias_alimentarias)}
+- Otra alergia especificada: {_texto(r.otra_alergia)}
+
+⚠️ 2. Intolerancias o malestar digestivo:
+- {_lista(r.intolerancias_digestivas)}
+- Otra intolerancia especificada: {_texto(r.otra_intolerancia)}
+
+🚫 3. Conflictos con alimentos seleccionados:
+{_conflictos(r)}
+
+💊 4. Interacciones de medicamentos y suplementos con alimentos seleccionados:
+{_interacciones(r)}
+
+=====================================
+👨‍🍳 MÉTODOS DE COCCIÓN DISPONIBLES
+=====================================
+🔥 Métodos de cocción más accesibles para el día a día:
+- {_lista(r.metodos_coccion_accesibles)}
+- Otro método especificado: {_texto(r.otro_metodo_coccion)}
+
+=====================================
+😋 SECCIÓN DE ANTOJOS ALIMENTARIOS
+=====================================
+🍫 Alimentos dulces / postres:
+- {_lista(r.antojos_dulces)}
+
+🧂 Alimentos salados / snacks:
+- {_lista(r.antojos_salados)}
+
+🌮 Comidas rápidas / callejeras:
+- {_lista(r.antojos_comida_rapida)}
+
+🍹 Bebidas y postres líquidos:
+- {_lista(r.antojos_bebidas)}
+
+🔥 Alimentos con condimentos estimulantes:
+- {_lista(r.antojos_picantes)}
+
+❓ Otros antojos especificados:
+- {_texto(r.otros_antojos)}
+
+=====================================
+🍽️ FRECUENCIA DE COMIDAS PREFERIDA
+=====================================
+- Frecuencia seleccionada: {_primero(r.frecuencia_comidas_ck)}
+- Especificación adicional: {_texto(r.otra_frecuencia)}
+
+=====================================
+📝 SUGERENCIAS DE MENÚS Y PREFERENCIAS
+=====================================
+- Sugerencias del cliente: {_texto(r.sugerencias_menus)}
+- Opción rápida seleccionada: {_texto(r.opcion_rapida_menu)}
+
+=====================================
+💪 Proteína en Polvo
+=====================================
+🥤 Tipos de proteína en polvo consumidos:
+- {_lista(r.proteina_polvo_tipos)}
+
+🏷️ ¿Tiene preferencia por alguna marca?
+- {_primero(r.preferencia_marca_proteina)}
+
+✍️ Marca preferida:
+- {marca_preferida}
+
+=====================================
+🩺 INFORMACIÓN MÉDICA Y FARMACOLÓGICA
+=====================================
+
+📋 Condiciones Médicas y Fisiológicas Actuales:
+- {_lista(r.condiciones_medicas)}
+- Otra condición especificada: {_texto(r.condiciones_otras)}
+
+💊 Medicamentos de Uso Frecuente:
+- Consume medicamentos: {_primero(r.consume_medicamentos)}
+- Lista de medicamentos detallada: {_texto(r.medicamentos_lista)}
+
+💊 Suplementos Nutricionales Adicionales:
+- Consume suplementos: {_primero(r.consume_suplementos)}
+- Lista de suplementos detallada: {_texto(r.suplementos_lista)}
+
+=====================================
+🧭 ARQUETIPO ALIMENTARIO
+=====================================
+{_arquetipo(arquetipo)}
+
+=====================================
+RESUMEN DE ANÁLISIS IDENTIFICADO:
+=====================================
+Este cuestionario completo de patrones alimentarios proporciona una base integral 
+para el desarrollo de recomendaciones nutricionales altamente personalizadas basadas en:
+
+1. 6 grupos alimentarios principales evaluados
+2. Suplementación con proteína en polvo (tipos y marcas preferidas)
+3. Métodos de cocción disponibles y preferidos
+4. Restricciones específicas (alergias e intolerancias)  
+5. Patrones de preferencias detallados
+6. Análisis de antojos y alimentación emocional
+7. Frecuencia de comidas preferida del cliente
+8. Sugerencias específicas de menús y preferencias adicionales
+9. Contexto personal, familiar y social completo
+10. Condiciones médicas y farmacológicas actuales (CRÍTICO)
+11. Medicamentos de uso frecuente y posibles interacciones
+12. Suplementos nutricionales adicionales
+
+RECOMENDACIONES PARA SEGUIMIENTO:
+- Desarrollar plan nutricional personalizado basado en estos patrones
+- Considerar restricciones y alergias como prioridad absoluta
+- Aprovechar métodos de cocción preferidos y disponibles
+- Integrar estrategias para manejo de antojos identificados
+- Estructurar la frecuencia de comidas según la preferencia del cliente
+- Incorporar sugerencias específicas de menús proporcionadas por el cliente
+- Adaptar recomendaciones al contexto personal y familiar específico
+- Evaluar interacciones entre medicamentos y alimentos
+- Adaptar plan nutricional a condiciones médicas específicas
+- Consultar con médico tratante si hay condiciones médicas complejas
+
+=====================================
+© 2025 MUPAI - Muscle up GYM
+Alimentary Pattern Assessment Intelligence
+=====================================
+"""
+    return resumen
@@ -0,0 +1,230 @@
+"""
+Memoria por sesión y desalojo de sesiones abandonadas.
+
+Cada sesión del cuestionario guarda decenas de listas, una key por casilla de
+cada opción y varios textos, y una sesión abandonada sigue en memoria hasta que
+expira su websocket. La app anota el inicio (`comenzar`) y el fin
+(`terminar`, con el tamaño aproximado del estado) de cada rerun; un hilo en
+segundo plano revisa cada `INTERVALO_REVISION` segundos las que llevan más de
+`TTL_MINUTOS` sin actividad ni rerun en curso, vuelca su cuestionario al
+almacén de borradores y vacía su estado con el candado del registro, para que
+un rerun que empiece justo entonces no lo encuentre a medio vaciar. Así un pico
+de cuestionarios a medias no crece sin límite: cada sesión ocupa memoria a lo
+más TTL minutos después de su última interacción. Las sesiones que el servidor
+ya cerró (pestaña cerrada, websocket expirado) se olvidan en la siguiente
+revisión sin esperar el TTL, para que el registro no retenga un estado que
+nadie más usa.
+
+El módulo no depende de Streamlit: el estado de cada sesión es opaco para el
+registro. Los borradores se administran desde la línea de comandos:
+
+    python -m mupai.sesiones --borradores
+    python -m mupai.sesiones --purgar --dias 15
+"""
+import argparse
+import logging
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+TTL_MINUTOS = 30
+INTERVALO_REVISION = 60.0
+# Claves más pesadas que se reportan por sesión
+MAYORES = 5
+# Antigüedad a partir de la cual `--purgar` elimina un borrador que nadie retomó
+DIAS_BORRADOR = 30
+
+
+def tamano_profundo(valor, vistos=None):
+    """Bytes aproximados de un valor y lo que contiene (sys.getsizeof recursivo, cada objeto una sola vez)"""
+    vistos = set() if vistos is None else vistos
+    if id(valor) in vistos:
+        return 0
+    vistos.add(id(valor))
+    tamano = sys.getsizeof(valor)
+    if isinstance(valor, dict):
+        tamano += sum(tamano_profundo(k, vistos) + tamano_profundo(v, vistos) for k, v in valor.items())
+    elif isinstance(valor, (list, tuple, set, frozenset)):
+        tamano += sum(tamano_profundo(v, vistos) for v in valor)
+    return tamano
+
+
+def contabilizar(estado, tipo_de):
+    """
+    {bytes, claves, por_tipo, mayores} de un dict de estado; `tipo_de(clave,
+    valor)` agrupa las claves (listas, casillas, textos...). Los objetos
+    compartidos con otras sesiones (textos del catálogo) se cuentan en cada
+    una: es lo que costaría retenerla, no lo que libera desalojarla.
+    """
+    vistos, por_tipo, tamanos = set(), {}, {}
+    for clave, valor in estado.items():
+        tamanos[clave] = tamano_profundo(clave, vistos) + tamano_profundo(valor, vistos)
+        grupo = por_tipo.setdefault(tipo_de(clave, valor), {"claves": 0, "bytes": 0})
+        grupo["claves"] += 1
+        grupo["bytes"] += tamanos[clave]
+    return {
+        "bytes": sum(tamanos.values()),
+        "claves": len(tamanos),
+        "por_tipo": por_tipo,
+        "mayores": sorted(tamanos.items(), key=lambda par: par[1], reverse=True)[:MAYORES],
+    }
+
+
+class RegistroSesiones:
+    """Última actividad y memoria de cada sesión viva del proceso"""
+
+    def __init__(self):
+        self._sesiones = {}
+        self._candado = threading.Lock()
+        self.desalojadas = 0
+
+    def comenzar(self, identificador, estado, ahora=None):
+        """
+        Anota que un rerun de la sesión está en curso; mientras lo esté no se
+        desaloja. Si el desalojo la está vaciando, espera a que termine, así el
+        rerun ve el estado ya vacío y no a medias.
+        """
+        with self._candado:
+            sesion = self._sesiones.setdefault(identificador, {"cuenta": None})
+            sesion["estado"] = estado
+            sesion["en_curso"] = True
+            sesion["ultima_actividad"] = time.time() if ahora is None else ahora
+
+    def terminar(self, identificador, cuenta, ahora=None):
+        """Anota el fin del rerun con la contabilidad del estado en que dejó la sesión"""
+        with self._candado:
+            sesion = self._sesiones.get(identificador)
+            if sesion is None:
+                return
+            sesion["en_curso"] = False
+            sesion["cuenta"] = cuenta
+            sesion["ultima_actividad"] = time.time() if ahora is None else ahora
+
+    def cuenta(self, identificador):
+        with self._candado:
+            sesion = self._sesiones.get(identificador)
+        return sesion and sesion["cuenta"]
+
+    def inactivas(self, ttl_segundos, ahora=None):
+        """(identificador, estado, ultima_actividad) de las sesiones sin rerun en curso ni actividad en `ttl_segundos`"""
+        limite = (time.time() if ahora is None else ahora) - ttl_segundos
+        with self._candado:
+            return [
+                (identificador, sesion["estado"], sesion["ultima_actividad"])
+                for identificador, sesion in self._sesiones.items()
+                if not sesion["en_curso"] and sesion["ultima_actividad"] < limite
+            ]
+
+    def cerradas(self, activa):
+        """Olvida las sesiones que `activa(identificador)` ya no reconoce; retorna cuántas"""
+        with self._candado:
+            identificadores = list(self._sesiones)
+        cerradas = [identificador for identificador in identificadores if not activa(identificador)]
+        with self._candado:
+            for identificador in cerradas:
+                self._sesiones.pop(identificador, None)
+        return len(cerradas)
+
+    def totales(self):
+        """{sesiones, bytes, por_tipo, desalojadas} de todas las sesiones seguidas"""
+        with self._candado:
+            sesiones = len(self._sesiones)
+            cuentas = [sesion["cuenta"] for sesion in self._sesiones.values() if sesion["cuenta"]]
+            desalojadas = self.desalojadas
+        por_tipo = {}
+        for cuenta in cuentas:
+            for tipo, grupo in cuenta["por_tipo"].items():
+                total = por_tipo.setdefault(tipo, {"claves": 0, "bytes": 0})
+                total["claves"] += grupo["claves"]
+                total["bytes"] += grupo["bytes"]
+        return {
+            "sesiones": sesiones,
+            "bytes": sum(cuenta["bytes"] for cuenta in cuentas),
+            "por_tipo": por_tipo,
+            "desalojadas": desalojadas,
+        }
+
+    def revisar(self, ttl_segundos, respaldar, vaciar, ahora=None, activa=None):
+        """
+        Desaloja cada sesión inactiva: `respaldar(identificador, estado)` guarda
+        lo que haga falta conservar sin modificar el estado y después, con el
+        candado del registro y solo si la sesión sigue sin rerun en curso ni
+        actividad nueva, `vaciar(identificador, estado)` libera su estado y la
+        sesión se olvida. Si respaldar falla (p. ej. no se pudo guardar el
+        borrador) la sesión se conserva y se reintenta en la siguiente revisión.
+        Con `activa`, antes olvida sin desalojar las sesiones que el servidor ya
+        cerró: si una se reconecta, su siguiente rerun la vuelve a anotar.
+        Retorna cuántas desalojó.
+        """
+        ahora = time.time() if ahora is None else ahora
+        if activa is not None:
+            self.cerradas(activa)
+        total = 0
+        for identificador, estado, ultima_actividad in self.inactivas(ttl_segundos, ahora):
+            try:
+                respaldar(identificador, estado)
+            except Exception:
+                logger.exception("No se pudo desalojar la sesión %s; se reintentará", identificador)
+                continue
+            # Se vacía con el candado tomado: un rerun que empiece ahora espera en `comenzar`
+            with self._candado:
+                sesion = self._sesiones.get(identificador)
+                if sesion is None or sesion["en_curso"] or sesion["ultima_actividad"] != ultima_actividad:
+                    continue
+                vaciar(identificador, estado)
+                del self._sesiones[identificador]
+                self.desalojadas += 1
+            total += 1
+        return total
+
+
+class DesalojadorSesiones(threading.Thread):
+    """
+    Hilo en segundo plano que desaloja las sesiones inactivas cada `intervalo`
+    segundos (ver `RegistroSesiones.revisar`); `activa(identificador)` dice si
+    el servidor aún tiene la sesión
+    """
+
+    def __init__(self, registro, respaldar, vaciar, ttl_minutos=TTL_MINUTOS, intervalo=INTERVALO_REVISION,
+                 activa=None):
+        super().__init__(name="mupai-sesiones", daemon=True)
+        self.registro = registro
+        self.respaldar = respaldar
+        self.vaciar = vaciar
+        self.activa = activa
+        self.ttl = max(float(ttl_minutos), 1.0) * 60
+        self.intervalo = intervalo
+        self._detener = threading.Event()
+
+    def run(self):
+        while not self._detener.wait(self.intervalo):
+            desalojadas = self.registro.revisar(self.ttl, self.respaldar, self.vaciar, activa=self.activa)
+            if desalojadas:
+                logger.info("Sesiones inactivas desalojadas: %d", desalojadas)
+
+    def detener(self):
+        self._detener.set()
+
+
+def main(argv=None):
+    from mupai.almacen import RUTA_ALMACEN, AlmacenEvaluaciones
+
+    parser = argparse.ArgumentParser(description="Borradores de cuestionarios de sesiones MUPAI desalojadas")
+    parser.add_argument("--almacen", default=RUTA_ALMACEN)
+    parser.add_argument("--borradores", action="store_true", help="Contar los borradores guardados")
+    parser.add_argument("--purgar", action="store_true", help="Eliminar los borradores con más de --dias")
+    parser.add_argument("--dias", type=float, default=DIAS_BORRADOR)
+    args = parser.parse_args(argv)
+
+    almacen = AlmacenEvaluaciones(args.almacen)
+    if args.purgar:
+        print(f"Borradores eliminados: {almacen.purgar_borradores(time.time() - args.dias * 86400)}")
+    if args.borradores or not args.purgar:
+        print(f"Borradores guardados: {almacen.contar_borradores()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""
+Índice de similitud entre evaluaciones guardadas ("clientes como tú").
+
+Las selecciones de cada cliente (alimentos, métodos de cocción, antojos,
+alergias, intolerancias y condiciones) forman un conjunto de opciones del
+catálogo. De cada conjunto se guarda una firma MinHash y las firmas se agrupan
+por bandas (LSH): dos clientes son candidatos si coinciden en alguna banda
+completa, así una consulta solo revisa las cubetas de sus bandas (búsqueda
+binaria por banda) en lugar de toda la cohorte. Los candidatos se ordenan por
+su índice de Jaccard exacto, calculado con los conjuntos guardados como bits.
+
+El índice vive en `datos/similares/`: las bandas ordenadas y los conjuntos son
+arreglos `.npy` por generación, con una cola en memoria para las evaluaciones
+nuevas (ver `mupai.generaciones`).
+
+    python -m mupai.similares --actualizar
+    python -m mupai.similares --id 3f2a... --k 10
+    python -m mupai.similares respuestas.json --k 10
+"""
+import argparse
+import hashlib
+import json
+import sys
+
+import numpy as np
+
+from mupai.alergenos import CLAVES_ALIMENTOS
+from mupai.almacen import RUTA_ALMACEN, AlmacenEvaluaciones
+from mupai.catalogo import OPCIONES, OPCIONES_NINGUNO
+from mupai.generaciones import ArreglosPorGeneracion, compartido
+from mupai.respuestas import Respuestas, normalizar
+
+# Preguntas cuyas opciones forman el conjunto de selecciones del cliente
+CLAVES_SIMILITUD = CLAVES_ALIMENTOS + (
+    "metodos_coccion_accesibles", "alergias_alimentarias", "intolerancias_digestivas", "condiciones_medicas",
+    "antojos_dulces", "antojos_salados", "antojos_comida_rapida", "antojos_bebidas", "antojos_picantes",
+)
+# 32 bandas de 4 filas: pares con Jaccard ≥ 0.5 casi siempre son candidatos, con ≤ 0.2 casi nunca
+PERMUTACIONES = 128
+BANDAS = 32
+FILAS_POR_BANDA = PERMUTACIONES // BANDAS
+SEMILLA = 20240517
+MAX_POR_CUBETA = 2000
+SIMILARES_MOSTRADOS = 10
+
+# Universo: cada (pregunta, opción) del catálogo con un identificador estable de 32 bits
+UNIVERSO = tuple(
+    (clave, opcion) for clave in CLAVES_SIMILITUD for opcion in OPCIONES[clave] if opcion not in OPCIONES_NINGUNO
+)
+COLUMNA = {par: j for j, par in enumerate(UNIVERSO)}
+_IDS = np.array([
+    int.from_bytes(hashlib.blake2b(f"{clave}={opcion}".encode(), digest_size=4).digest(), "little")
+    for clave, opcion in UNIVERSO
+], dtype=np.uint64)
+# Un índice guardado con otro catálogo u otros parámetros se reconstruye
+HUELLA = hashlib.blake2b(
+    _IDS.tobytes() + f"{PERMUTACIONES}/{BANDAS}/{SEMILLA}".encode(), digest_size=8
+).hexdigest()
+
+_aleatorio = np.random.default_rng(SEMILLA)
+# Permutaciones por hash multiplica-suma-desplaza: (a·x + b mod 2^64) >> 32
+_A = _aleatorio.integers(1, 2**63, PERMUTACIONES, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_B = _aleatorio.integers(0, 2**63, PERMUTACIONES, dtype=np.uint64)
+_MEZCLA = _aleatorio.integers(1, 2**63, FILAS_POR_BANDA, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+# Hash de cada opción en cada permutación y el universo en el orden de cada permutación
+_HASHES = ((_A[:, None] * _IDS[None, :] + _B[:, None]) >> np.uint64(32)).astype(np.uint32)
+_ORDEN = np.argsort(_HASHES, axis=1, kind="stable")
+_BITS_POR_BYTE = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+
+def seleccion(lista_respuestas):
+    """Matriz booleana (respuestas × universo) de las opciones seleccionadas"""
+    x = np.zeros((len(lista_respuestas), len(UNIVERSO)), dtype=bool)
+    for i, r in enumerate(lista_respuestas):
+        for clave in CLAVES_SIMILITUD:
+            for opcion in getattr(r, clave, None) or ():
+                j = COLUMNA.get((clave, opcion))
+                if j is not None:
+                    x[i, j] = True
+    return x
+
+
+def firmas(x):
+    """
+    Firmas MinHash (filas × PERMUTACIONES, uint32) de una matriz de selección.
+    Para cada permutación se recorre el universo en su orden hasta la primera
+    opción seleccionada; con conjuntos medianos bastan unos cuantos pasos.
+    """
+    resultado = np.full((len(x), PERMUTACIONES), np.iinfo(np.uint32).max, dtype=np.uint32)
+    activos = np.flatnonzero(x.any(axis=1))
+    pendientes = np.ones((len(activos), PERMUTACIONES), dtype=bool)
+    for paso in range(len(UNIVERSO)):
+        if not len(activos):
+            break
+        columnas = _ORDEN[:, paso]
+        hallados = x[activos[:, None], columnas[None, :]] & pendientes
+        filas, k = np.nonzero(hallados)
+        resultado[activos[filas], k] = _HASHES[k, columnas[k]]
+        pendientes &= ~hallados
+        seguir = pendientes.any(axis=1)
+        activos, pendientes = activos[seguir], pendientes[seguir]
+    return resultado
+
+
+def claves_bandas(f):
+    """Clave de 64 bits de cada banda de cada firma (filas × BANDAS)"""
+    filas = f.reshape(len(f), BANDAS, FILAS_POR_BANDA).astype(np.uint64)
+    return (filas * _MEZCLA).sum(axis=2, dtype=np.uint64)
+
+
+def _jaccard(conjuntos, conjunto):
+    """Jaccard exacto entre varios conjuntos empacados (n × bytes) y uno (bytes)"""
+    interseccion = _BITS_POR_BYTE[conjuntos & conjunto].sum(axis=1)
+    union = _BITS_POR_BYTE[conjuntos | conjunto].sum(axis=1)
+    return interseccion / np.maximum(union, 1)
+
+
+class IndiceSimilitud(ArreglosPorGeneracion):
+    """Bandas LSH ordenadas y conjuntos de la cohorte, más una cola de evaluaciones recientes"""
+    SUBDIRECTORIO = "similares"
+    HUELLA = HUELLA
+    ARREGLOS = ("rowids", "conjuntos", "claves", "posiciones")
+    COLA = ("rowids", "conjuntos", "claves")
+
+    def __init__(self, ruta_almacen=RUTA_ALMACEN, directorio=None):
+        self.rowids = np.empty(0, dtype=np.int64)
+        self.conjuntos = np.empty((0, -(-len(UNIVERSO) // 8)), dtype=np.uint8)
+        self.claves = np.empty((BANDAS, 0), dtype=np.uint64)
+        self.posiciones = np.empty((BANDAS, 0), dtype=np.int64)
+        super().__init__(ruta_almacen, directorio)
+
+    def _vaciar_cola(self):
+        self.cola_rowids = np.empty(0, dtype=np.int64)
+        self.cola_conjuntos = np.empty((0, self.conjuntos.shape[1]), dtype=np.uint8)
+        self.cola_claves = np.empty((0, BANDAS), dtype=np.uint64)
+
+    def _escribir(self, generacion, n):
+        # Claves por fila de la generación vigente (deshaciendo su orden) seguidas de las de la cola
+        claves_filas = np.empty((BANDAS, n), dtype=np.uint64)
+        np.put_along_axis(claves_filas[:, :self.n], np.asarray(self.posiciones), np.asarray(self.claves), axis=1)
+        claves_filas[:, self.n:] = self.cola_claves.T
+        posiciones = np.argsort(claves_filas, axis=1, kind="stable")
+        arreglos = {
+            "rowids": np.concatenate([self.rowids, self.cola_rowids]),
+            "conjuntos": np.concatenate([self.conjuntos, self.cola_conjuntos]),
+            "claves": np.take_along_axis(claves_filas, posiciones, axis=1),
+            "posiciones": posiciones,
+        }
+        for nombre, arreglo in arreglos.items():
+            np.save(self._ruta(nombre, generacion), arreglo)
+
+    def agregar(self, rowids, lista_respuestas):
+        """Agrega evaluaciones a la cola (las que no seleccionaron nada no se indexan)"""
+        x = seleccion(lista_respuestas)
+        con_datos = x.any(axis=1)
+        x = x[con_datos]
+        self.cola_rowids = np.concatenate([self.cola_rowids, np.asarray(rowids, dtype=np.int64)[con_datos]])
+        self.cola_conjuntos = np.concatenate([self.cola_conjuntos, np.packbits(x, axis=1)])
+        self.cola_claves = np.concatenate([self.cola_claves, claves_bandas(firmas(x))])
+
+    def _encolar(self, rowids, lote):
+        self.agregar(rowids, lote)
+
+    def similares(self, r, k=SIMILARES_MOSTRADOS):
+        """Hasta `k` evaluaciones más parecidas como [(rowid, Jaccard)], de mayor a menor"""
+        x = seleccion([r])
+        if not x.any():
+            return []
+        claves = claves_bandas(firmas(x))[0]
+        conjunto = np.packbits(x, axis=1)[0]
+        claves_indice, posiciones, rowids, conjuntos, cola_claves, cola_rowids, cola_conjuntos = self._vista(
+            "claves", "posiciones", "rowids", "conjuntos", "cola_claves", "cola_rowids", "cola_conjuntos"
+        )
+
+        candidatos = [np.empty(0, dtype=np.int64)]
+        for b in range(BANDAS):
+            inicio = np.searchsorted(claves_indice[b], claves[b], side="left")
+            fin = np.searchsorted(claves_indice[b], claves[b], side="right")
+            candidatos.append(posiciones[b, inicio:min(fin, inicio + MAX_POR_CUBETA)])
+        candidatos = np.unique(np.concatenate(candidatos))
+        en_cola = np.flatnonzero((cola_claves == claves).any(axis=1))
+
+        rowids = np.concatenate([rowids[candidatos], cola_rowids[en_cola]])
+        similitud = np.concatenate([
+            _jaccard(conjuntos[candidatos], conjunto),
+            _jaccard(cola_conjuntos[en_cola], conjunto),
+        ])
+        orden = np.lexsort((rowids, -similitud))[:k]
+        return [(int(rowids[i]), round(float(similitud[i]), 3)) for i in orden]
+
+
+def indice(ruta_almacen=RUTA_ALMACEN):
+    """Índice compartido del proceso para un almacén"""
+    return compartido(IndiceSimilitud, ruta_almacen)
+
+
+def clientes_similares(r, k=SIMILARES_MOSTRADOS, ruta_almacen=RUTA_ALMACEN, excluir_id=None):
+    """
+    Evaluaciones guardadas más parecidas a unas respuestas, como lista de
+    {id, recibido, origen, nombre, similitud}, poniéndose al día con el almacén antes de buscar.
+    """
+    i = indice(ruta_almacen)
+    i.actualizar()
+    # Se pide uno de más por si la evaluación consultada está en el índice
+    encontrados = i.similares(r, k + 1)
+    encabezados = AlmacenEvaluaciones(ruta_almacen).encabezados([rowid for rowid, _ in encontrados])
+    resultado = [
+        {**encabezados[rowid], "similitud": similitud}
+        for rowid, similitud in encontrados
+        if rowid in encabezados and encabezados[rowid]["id"] != excluir_id
+    ]
+    return resultado[:k]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Clientes con selecciones parecidas (MinHash/LSH) en el almacén MUPAI")
+    parser.add_argument("respuestas", nargs="?", help="Archivo .json con las respuestas a comparar")
+    parser.add_argument("--id", help="Comparar contra una evaluación ya guardada")
+    parser.add_argument("--k", type=int, default=SIMILARES_MOSTRADOS)
+    parser.add_argument("--almacen", default=RUTA_ALMACEN)
+    parser.add_argument("--actualizar", action="store_true", help="Indexar lo nuevo del almacén y compactar")
+    args = parser.parse_args(argv)
+
+    i = indice(args.almacen)
+    if args.actualizar:
+        leidas = i.actualizar()
+        i.compactar()
+        print(f"Evaluaciones nuevas indexadas: {leidas} | Índice: {i.tamano()}")
+
+    if args.id:
+        evaluacion = AlmacenEvaluaciones(args.almacen).obtener(args.id)
+        if evaluacion is None:
+            print(f"Evaluación no encontrada: {args.id}", file=sys.stderr)
+            return 1
+        r = Respuestas.desde_mapeo(evaluacion["respuestas"])
+    elif args.respuestas:
+        with open(args.respuestas, encoding="utf-8") as f:
+            r = Respuestas.desde_mapeo(normalizar(json.load(f)))
+    else:
+        return 0
+
+    for similar in clientes_similares(r, args.k, args.almacen, args.id):
+        print(f"{similar['similitud']:.2f}  {similar['id']}  {similar['nombre'] or '(sin nombre)'}  [{similar['origen']}]")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
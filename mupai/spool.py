@@ -0,0 +1,271 @@
+"""
+Spool local de correos: cada mensaje se guarda como `.eml` en un maildir
+(`tmp/` → `new/` → `cur/`) con un índice de estado en SQLite. Un trabajador
+en segundo plano lo vacía por SMTP cuando el servidor está disponible, con
+concurrencia acotada y sin duplicar envíos.
+
+Reenvío manual de lo pendiente:
+
+    ZOHO_PASSWORD=... python -m mupai.spool
+"""
+import argparse
+import hashlib
+import logging
+import os
+import smtplib
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from email import message_from_binary_file, policy
+from email.utils import formatdate
+
+from mupai.correo import sesion_smtp
+
+logger = logging.getLogger(__name__)
+
+DIRECTORIO_SPOOL = os.path.join("datos", "spool")
+MAX_CONCURRENCIA = 4
+MENSAJES_POR_SESION = 20
+INTERVALO_SEGUNDOS = 30
+# Espera entre reintentos de un mismo mensaje: 1, 2, 4... minutos, hasta 1 hora
+REINTENTO_BASE = 60
+REINTENTO_MAXIMO = 3600
+
+PENDIENTE = "pendiente"
+ENVIANDO = "enviando"
+ENVIADO = "enviado"
+
+
+def clave_mensaje(msg):
+    """Clave de deduplicación derivada del contenido del mensaje"""
+    huella = hashlib.sha256()
+    huella.update(str(msg.get('Subject', '')).encode("utf-8"))
+    for parte in msg.walk():
+        if not parte.is_multipart():
+            huella.update(parte.get_payload(decode=True) or b"")
+    return huella.hexdigest()
+
+
+class SpoolCorreo:
+    """Maildir de mensajes salientes con índice de estado"""
+
+    def __init__(self, directorio=DIRECTORIO_SPOOL):
+        self.directorio = directorio
+        for sub in ("tmp", "new", "cur"):
+            os.makedirs(os.path.join(directorio, sub), exist_ok=True)
+        self.ruta_indice = os.path.join(directorio, "indice.sqlite")
+        with closing(self._conectar()) as con, con:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS envios (
+                    clave TEXT PRIMARY KEY,
+                    archivo TEXT NOT NULL,
+                    asunto TEXT,
+                    estado TEXT NOT NULL,
+                    intentos INTEGER NOT NULL DEFAULT 0,
+                    proximo_intento REAL NOT NULL DEFAULT 0,
+                    error TEXT,
+                    creado REAL NOT NULL,
+                    actualizado REAL NOT NULL
+                )
+            """)
+            con.execute("CREATE INDEX IF NOT EXISTS envios_estado ON envios (estado, proximo_intento)")
+
+    def _conectar(self):
+        return sqlite3.connect(self.ruta_indice, timeout=30)
+
+    def guardar(self, msg, clave=None):
+        """
+        Persiste el mensaje como .eml en `new/` y lo registra como pendiente.
+        Si la clave ya existe no se vuelve a guardar. Retorna la clave.
+        """
+        clave = clave or clave_mensaje(msg)
+        with closing(self._conectar()) as con:
+            if con.execute("SELECT 1 FROM envios WHERE clave = ?", (clave,)).fetchone():
+                return clave
+
+        # Message-ID estable: si un reintento llega a duplicarse, el buzón lo reconoce
+        if msg.get('Message-ID') is None:
+            msg['Message-ID'] = f"<{clave}@mupai.spool>"
+        if msg.get('Date') is None:
+            msg['Date'] = formatdate(localtime=True)
+
+        archivo = f"{clave}.eml"
+        temporal = os.path.join(self.directorio, "tmp", archivo)
+        with open(temporal, "wb") as f:
+            f.write(msg.as_bytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, os.path.join(self.directorio, "new", archivo))
+
+        ahora = time.time()
+        with closing(self._conectar()) as con, con:
+            con.execute(
+                "INSERT OR IGNORE INTO envios (clave, archivo, asunto, estado, creado, actualizado) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (clave, archivo, str(msg.get('Subject', '')), PENDIENTE, ahora, ahora)
+            )
+        return clave
+
+    def leer(self, clave):
+        """Carga el mensaje .eml de una clave"""
+        with closing(self._conectar()) as con:
+            fila = con.execute("SELECT archivo, estado FROM envios WHERE clave = ?", (clave,)).fetchone()
+        if fila is None:
+            return None
+        carpeta = "cur" if fila[1] == ENVIADO else "new"
+        with open(os.path.join(self.directorio, carpeta, fila[0]), "rb") as f:
+            return message_from_binary_file(f, policy=policy.compat32)
+
+    def reclamar(self, limite):
+        """Marca como `enviando` hasta `limite` mensajes listos y retorna sus claves"""
+        ahora = time.time()
+        with closing(self._conectar()) as con, con:
+            con.execute("BEGIN IMMEDIATE")
+            claves = [fila[0] for fila in con.execute(
+                "SELECT clave FROM envios WHERE estado = ? AND proximo_intento <= ? "
+                "ORDER BY creado LIMIT ?", (PENDIENTE, ahora, limite)
+            )]
+            con.executemany(
+                "UPDATE envios SET estado = ?, actualizado = ? WHERE clave = ?",
+                [(ENVIANDO, ahora, clave) for clave in claves]
+            )
+        return claves
+
+    def marcar_enviado(self, clave):
+        with closing(self._conectar()) as con, con:
+            fila = con.execute("SELECT archivo FROM envios WHERE clave = ?", (clave,)).fetchone()
+            con.execute(
+                "UPDATE envios SET estado = ?, error = NULL, actualizado = ? WHERE clave = ?",
+                (ENVIADO, time.time(), clave)
+            )
+        if fila:
+            origen = os.path.join(self.directorio, "new", fila[0])
+            if os.path.exists(origen):
+                os.replace(origen, os.path.join(self.directorio, "cur", fila[0]))
+
+    def marcar_fallido(self, clave, error):
+        """Regresa el mensaje a pendiente con espera exponencial"""
+        ahora = time.time()
+        with closing(self._conectar()) as con, con:
+            fila = con.execute("SELECT intentos FROM envios WHERE clave = ?", (clave,)).fetchone()
+            intentos = (fila[0] if fila else 0) + 1
+            espera = min(REINTENTO_BASE * 2 ** (intentos - 1), REINTENTO_MAXIMO)
+            con.execute(
+                "UPDATE envios SET estado = ?, intentos = ?, proximo_intento = ?, error = ?, actualizado = ? "
+                "WHERE clave = ?",
+                (PENDIENTE, intentos, ahora + espera, str(error)[:500], ahora, clave)
+            )
+
+    def recuperar_en_envio(self):
+        """Devuelve a pendiente lo que quedó `enviando` tras un reinicio"""
+        with closing(self._conectar()) as con, con:
+            con.execute(
+                "UPDATE envios SET estado = ?, actualizado = ? WHERE estado = ?",
+                (PENDIENTE, time.time(), ENVIANDO)
+            )
+
+    def conteos(self):
+        """Número de mensajes por estado"""
+        with closing(self._conectar()) as con:
+            return dict(con.execute("SELECT estado, COUNT(*) FROM envios GROUP BY estado").fetchall())
+
+
+def _enviar_grupo(spool, claves, password):
+    """Envía un grupo de mensajes en una sola sesión SMTP, marcando cada resultado"""
+    enviados = 0
+    procesadas = 0
+    try:
+        with sesion_smtp(password) as server:
+            for clave in claves:
+                try:
+                    server.send_message(spool.leer(clave))
+                except smtplib.SMTPServerDisconnected:
+                    raise
+                except Exception as e:
+                    spool.marcar_fallido(clave, e)
+                else:
+                    spool.marcar_enviado(clave)
+                    enviados += 1
+                procesadas += 1
+    except Exception as e:
+        # Falla de conexión/login: lo que no se alcanzó a procesar vuelve a pendiente
+        for clave in claves[procesadas:]:
+            spool.marcar_fallido(clave, e)
+        logger.warning("SMTP no disponible: %s", e)
+    return enviados
+
+
+def reenviar_pendientes(spool, password, max_concurrencia=MAX_CONCURRENCIA,
+                        mensajes_por_sesion=MENSAJES_POR_SESION):
+    """
+    Vacía el spool: reclama los pendientes y los reparte en a lo más
+    `max_concurrencia` sesiones SMTP simultáneas. Retorna cuántos se enviaron.
+    """
+    total = 0
+    with ThreadPoolExecutor(max_workers=max_concurrencia) as ejecutor:
+        while True:
+            claves = spool.reclamar(max_concurrencia * mensajes_por_sesion)
+            if not claves:
+                break
+            grupos = [claves[i:i + mensajes_por_sesion] for i in range(0, len(claves), mensajes_por_sesion)]
+            enviados = sum(ejecutor.map(lambda grupo: _enviar_grupo(spool, grupo, password), grupos))
+            total += enviados
+            if enviados < len(claves):
+                break  # Hubo fallas: esperar al siguiente ciclo en lugar de insistir
+    return total
+
+
+class TrabajadorReenvio(threading.Thread):
+    """Hilo que vacía el spool periódicamente o cuando se le despierta"""
+
+    def __init__(self, spool, password, intervalo=INTERVALO_SEGUNDOS, max_concurrencia=MAX_CONCURRENCIA):
+        super().__init__(name="mupai-spool", daemon=True)
+        self.spool = spool
+        self.password = password
+        self.intervalo = intervalo
+        self.max_concurrencia = max_concurrencia
+        self._despertar = threading.Event()
+        self._detener = threading.Event()
+
+    def despertar(self):
+        self._despertar.set()
+
+    def detener(self):
+        self._detener.set()
+        self._despertar.set()
+
+    def run(self):
+        self.spool.recuperar_en_envio()
+        while not self._detener.is_set():
+            try:
+                enviados = reenviar_pendientes(self.spool, self.password, self.max_concurrencia)
+                if enviados:
+                    logger.info("Spool: %d mensajes enviados", enviados)
+            except Exception:
+                logger.exception("Error al vaciar el spool de correo")
+            self._despertar.wait(self.intervalo)
+            self._despertar.clear()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reenvía los correos pendientes del spool MUPAI")
+    parser.add_argument("--directorio", default=DIRECTORIO_SPOOL)
+    parser.add_argument("--concurrencia", type=int, default=MAX_CONCURRENCIA)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    password = os.environ.get("ZOHO_PASSWORD")
+    if not password:
+        parser.error("Define la variable de entorno ZOHO_PASSWORD")
+
+    spool = SpoolCorreo(args.directorio)
+    spool.recuperar_en_envio()
+    enviados = reenviar_pendientes(spool, password, args.concurrencia)
+    print(f"Mensajes enviados: {enviados} | Estado del spool: {spool.conteos()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Grafo de sustituciones entre alimentos del catálogo.
+
+La distancia entre dos alimentos combina su perfil nutrimental (reparto de
+energía entre proteína, grasa y carbohidratos, densidad energética, fibra,
+grasa saturada, omega-3 y sodio, estandarizados) con su papel culinario
+(mismo subgrupo, mismo papel en el platillo o papeles afines) y si se
+cocinan o se comen tal cual. Todas las distancias se calculan de una vez con
+operaciones vectorizadas y cada alimento guarda a sus vecinos ya ordenados,
+así encontrar los mejores sustitutos que un cliente acepta es recorrer una
+lista corta. Las respuestas se guardan en caché por perfil de cliente.
+
+    python -m mupai.sustituciones "Camarón" --n 5
+    python -m mupai.sustituciones --exportar datos/sustituciones.csv
+"""
+import argparse
+import csv
+import re
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+from mupai.alergenos import alimentos_excluidos
+from mupai.nutrientes import NUTRIENTES, tabla
+from mupai.planificador import ROLES
+
+VECINOS_EXPORTADOS = 10
+# Peso de cada rasgo nutrimental en la distancia
+PESOS_RASGOS = {
+    "energia_proteina": 3.0, "energia_grasa": 3.0, "energia_carbohidratos": 3.0,
+    "densidad_energetica": 1.5, "fibra": 1.0, "saturada": 1.0, "omega3": 0.5, "sodio": 0.5,
+}
+# Costo extra por diferencias culinarias; papeles sin costo definido no se sustituyen entre sí
+COSTO_MISMO_PAPEL = 0.25
+COSTO_PAPEL_AFIN = 1.0
+PAPELES_AFINES = {("proteina", "lacteo"), ("grasa", "aceite"), ("vegetal", "fruta")}
+COSTO_PREPARACION = 0.25
+# Subgrupos que se cocinan antes de comerse (salvo presentaciones listas, como latas)
+CLAVES_COCINADAS = frozenset({
+    "carnes_res_grasas", "carnes_cerdo_grasas", "carnes_pollo_grasas", "organos_grasos",
+    "pescados_grasos", "mariscos_grasos", "carnes_res_magras", "carnes_cerdo_magras",
+    "carnes_pollo_magras", "organos_magros", "pescados_magros", "mariscos_magros",
+    "pastas", "raices_tuberculos", "leguminosas",
+})
+PRESENTACION_LISTA = re.compile(r"\b(?:lata|enlatad|ahumad|cocid|carnitas|chicharrón)", re.IGNORECASE)
+
+
+def _rasgos(composicion):
+    """Rasgos nutrimentales estandarizados y ponderados (opciones × rasgos)"""
+    n = {nombre: composicion[:, i] for i, nombre in enumerate(NUTRIENTES)}
+    energia_macros = np.maximum(n["proteina_g"] * 4 + n["grasa_g"] * 9 + n["carbohidratos_g"] * 4, 1e-6)
+    por_100_kcal = 100 / np.maximum(n["energia_kcal"], 1)
+    rasgos = {
+        "energia_proteina": n["proteina_g"] * 4 / energia_macros,
+        "energia_grasa": n["grasa_g"] * 9 / energia_macros,
+        "energia_carbohidratos": n["carbohidratos_g"] * 4 / energia_macros,
+        "densidad_energetica": np.log1p(n["energia_kcal"]),
+        "fibra": np.log1p(n["fibra_g"] * por_100_kcal),
+        "saturada": n["grasa_saturada_g"] * 9 / energia_macros,
+        "omega3": np.log1p(n["omega3_g"] * por_100_kcal),
+        "sodio": np.log1p(n["sodio_mg"]),
+    }
+    x = np.column_stack([rasgos[nombre] for nombre in PESOS_RASGOS])
+    desviacion = x.std(axis=0)
+    desviacion[desviacion == 0] = 1.0
+    return (x - x.mean(axis=0)) / desviacion * np.sqrt(list(PESOS_RASGOS.values()))
+
+
+class GrafoSustituciones:
+    """Distancias entre todas las opciones del catálogo y sus vecinos ordenados"""
+
+    def __init__(self, t=None):
+        t = t or tabla()
+        self.columnas = t.columnas
+        self.columna = t.columna
+        self.primera_columna = {}
+        for j, (_, opcion) in enumerate(self.columnas):
+            self.primera_columna.setdefault(opcion, j)
+
+        # Distancia nutrimental: ||a - b||² = |a|² + |b|² - 2 a·b, para todos los pares a la vez
+        x = _rasgos(t.composicion)
+        normas = (x * x).sum(axis=1)
+        distancia = np.sqrt(np.maximum(normas[:, None] + normas[None, :] - 2 * x @ x.T, 0))
+
+        # Costo culinario: mismo subgrupo, mismo papel, papeles afines o sin sustitución
+        papel_de_clave = {clave: papel for papel, claves in ROLES.items() for clave in claves}
+        papeles = list(ROLES)
+        claves = np.array([clave for clave, _ in self.columnas])
+        papel = np.array([papeles.index(papel_de_clave[clave]) for clave in claves])
+        costo_papel = np.full((len(papeles), len(papeles)), np.inf)
+        np.fill_diagonal(costo_papel, COSTO_MISMO_PAPEL)
+        for a, b in PAPELES_AFINES:
+            costo_papel[papeles.index(a), papeles.index(b)] = costo_papel[papeles.index(b), papeles.index(a)] = COSTO_PAPEL_AFIN
+        culinario = costo_papel[papel[:, None], papel[None, :]]
+        culinario[claves[:, None] == claves[None, :]] = 0.0
+
+        cocinado = np.array([
+            clave in CLAVES_COCINADAS and not PRESENTACION_LISTA.search(opcion) for clave, opcion in self.columnas
+        ])
+        culinario = culinario + COSTO_PREPARACION * (cocinado[:, None] != cocinado[None, :])
+
+        self.distancia = distancia + culinario
+        np.fill_diagonal(self.distancia, np.inf)
+        # Un mismo alimento repetido en otro subgrupo no es sustituto de sí mismo
+        nombres = np.array([opcion for _, opcion in self.columnas])
+        self.distancia[nombres[:, None] == nombres[None, :]] = np.inf
+        self.vecinos = np.argsort(self.distancia, axis=1, kind="stable")
+
+    def __contains__(self, alimento):
+        """Si un alimento (nombre o (clave, opción)) tiene columna; las bebidas sin calorías no tienen datos de nutrientes"""
+        return alimento in (self.columna if isinstance(alimento, tuple) else self.primera_columna)
+
+    def nodo(self, alimento):
+        """Columna de un alimento dado por nombre o como (clave, opción)"""
+        j = self.columna.get(alimento) if isinstance(alimento, tuple) else self.primera_columna.get(alimento)
+        if j is None:
+            raise KeyError(f"Alimento fuera del catálogo: {alimento}")
+        return j
+
+    def mejores(self, j, n, aceptados=None, excluidos=frozenset()):
+        """Hasta `n` vecinos de la columna `j` dentro de `aceptados` (None = todo el catálogo) y fuera de `excluidos`"""
+        resultado, vistos = [], set()
+        for k in self.vecinos[j]:
+            if not np.isfinite(self.distancia[j, k]) or len(resultado) == n:
+                break
+            par = self.columnas[k]
+            if par in excluidos or (aceptados is not None and par not in aceptados) or par[1] in vistos:
+                continue
+            vistos.add(par[1])
+            resultado.append({"alimento": par[1], "subgrupo": par[0], "distancia": round(float(self.distancia[j, k]), 3)})
+        return resultado
+
+
+@lru_cache(maxsize=None)
+def grafo():
+    """Grafo compartido del proceso (se construye una sola vez)"""
+    return GrafoSustituciones()
+
+
+def aceptados(r):
+    """Alimentos (clave, opción) que el cliente marcó como consumidos"""
+    g = grafo()
+    claves = dict.fromkeys(clave for clave, _ in g.columnas)
+    return frozenset(
+        (clave, opcion) for clave in claves for opcion in getattr(r, clave, None) or () if (clave, opcion) in g.columna
+    )
+
+
+@lru_cache(maxsize=4096)
+def _sustitutos_en_cache(j, n, aceptados, excluidos):
+    return tuple(grafo().mejores(j, n, aceptados, excluidos))
+
+
+def sustitutos(alimento, r=None, n=5, solo_aceptados=True):
+    """
+    Mejores `n` sustitutos de un alimento. Con respuestas `r`, solo los que el
+    cliente consume (si `solo_aceptados`) y que no chocan con lo que declaró.
+    """
+    g = grafo()
+    j = g.nodo(alimento)
+    if r is None:
+        return list(_sustitutos_en_cache(j, n, None, frozenset()))
+    permitidos = aceptados(r) if solo_aceptados else None
+    return list(_sustitutos_en_cache(j, n, permitidos, alimentos_excluidos(r)))
+
+
+def sugerencias(alimento, r, n=3):
+    """
+    Sustitutos para mostrar al cliente: primero entre lo que ya consume; si no
+    hay, del catálogo completo. Un alimento fuera del grafo no tiene sustitutos.
+    """
+    if alimento not in grafo():
+        return []
+    return sustitutos(alimento, r, n) or sustitutos(alimento, r, n, solo_aceptados=False)
+
+
+def exportar(ruta, vecinos=VECINOS_EXPORTADOS):
+    """Lista de aristas (los vecinos más cercanos de cada alimento) en CSV para revisión del equipo"""
+    g = grafo()
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(["subgrupo", "alimento", "subgrupo_sustituto", "sustituto", "distancia"])
+        for j, (clave, opcion) in enumerate(g.columnas):
+            for vecino in g.mejores(j, vecinos):
+                escritor.writerow([clave, opcion, vecino["subgrupo"], vecino["alimento"], vecino["distancia"]])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sustitutos de alimentos del catálogo MUPAI")
+    parser.add_argument("alimentos", nargs="*", help="Nombres de alimentos tal como aparecen en el catálogo")
+    parser.add_argument("--n", type=int, default=5)
+    parser.add_argument("--exportar", help="Escribir el grafo (vecinos más cercanos) en este CSV")
+    args = parser.parse_args(argv)
+
+    if args.exportar:
+        exportar(args.exportar)
+        print(f"Grafo exportado: {args.exportar}")
+    for alimento in args.alimentos:
+        try:
+            vecinos = sustitutos(alimento, n=args.n)
+        except KeyError as e:
+            print(e.args[0], file=sys.stderr)
+            return 1
+        print(f"{alimento}:")
+        for vecino in vecinos:
+            print(f"  - {vecino['alimento']} ({vecino['subgrupo']}, distancia {vecino['distancia']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Búsqueda de texto completo en las respuestas libres de todas las evaluaciones.
+
+El almacén mantiene un índice SQLite FTS5 de los campos de texto libre
+(medicamentos, otras alergias, sugerencias...) que `guardar_lote` llena en la
+misma transacción que inserta cada evaluación, con los textos antes de
+comprimirlos (un trigger no podría leer las respuestas comprimidas). El
+tokenizador `unicode61` ignora mayúsculas y acentos; cada palabra de la
+consulta se busca como prefijo de su forma singular ("gastritis", "alergias" →
+alergia*), así que no hace falta escribir la palabra completa.
+
+    python -m mupai.textos metformina
+    python -m mupai.textos "colitis nerviosa" --limite 50
+"""
+import argparse
+import sys
+from datetime import datetime
+
+from mupai.busqueda import palabras
+
+CAMPOS_TEXTO_LIBRE = (
+    "sugerencias_menus",
+    "otros_antojos",
+    "otra_alergia",
+    "otra_intolerancia",
+    "condiciones_otras",
+    "medicamentos_lista",
+    "suplementos_lista",
+    "nombre_marca_proteina",
+)
+MAX_RESULTADOS = 20
+
+
+def _raiz(palabra):
+    """Forma singular aproximada, para buscarla como prefijo (alergias → alergia, diabetes → diabet)"""
+    if len(palabra) > 4 and palabra.endswith("es"):
+        return palabra[:-2]
+    if len(palabra) > 3 and palabra.endswith("s"):
+        return palabra[:-1]
+    return palabra
+
+
+def consulta_fts(texto):
+    """Consulta FTS5 segura a partir de lo que escribe el administrador (todas las palabras, como prefijo), o None"""
+    terminos = palabras(texto)
+    if not terminos:
+        return None
+    return " AND ".join(f'"{_raiz(termino)}"*' for termino in terminos)
+
+
+def main(argv=None):
+    from mupai.almacen import RUTA_ALMACEN, AlmacenEvaluaciones
+
+    parser = argparse.ArgumentParser(description="Búsqueda en las respuestas libres de las evaluaciones MUPAI")
+    parser.add_argument("consulta")
+    parser.add_argument("--almacen", default=RUTA_ALMACEN)
+    parser.add_argument("--limite", type=int, default=MAX_RESULTADOS)
+    args = parser.parse_args(argv)
+
+    resultados = AlmacenEvaluaciones(args.almacen).buscar_textos(args.consulta, args.limite)
+    if not resultados:
+        print("Sin resultados")
+    for resultado in resultados:
+        fecha = datetime.fromtimestamp(resultado["recibido"]).strftime("%Y-%m-%d")
+        print(f"{fecha}  {resultado['id']}  {resultado['nombre'] or '-'}")
+        print(f"    {resultado['fragmento']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
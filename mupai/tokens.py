@@ -0,0 +1,121 @@
+"""
+Tokens de acceso firmados (HMAC-SHA256) con vencimiento.
+
+Al validar su código, el cliente recibe un token `carga.firma` que la app
+deja en la URL (`?acceso=...`). La carga es JSON en base64url con la versión,
+el vencimiento y un identificador aleatorio; no lleva datos personales porque
+la URL queda en el historial y en los logs. Verificarlo es recalcular un HMAC
+y comparar, así que cualquier réplica con el mismo secreto lo acepta sin
+estado compartido, y un reinicio o un cambio de réplica no obligan a pedir
+otro código.
+
+Para rotar el secreto sin invalidar los tokens vigentes, el anterior se
+conserva un tiempo solo para verificar (el primero de la lista es el que firma).
+Cambiar el secreto sin conservar el anterior revoca todos los tokens.
+
+    MUPAI_TOKEN_SECRETO=... python -m mupai.tokens --emitir --horas 48
+    MUPAI_TOKEN_SECRETO=... python -m mupai.tokens --verificar TOKEN
+    python -m mupai.tokens --benchmark
+"""
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import os
+import re
+import secrets
+import sys
+import time
+from datetime import datetime
+
+VERSION = 1
+VIGENCIA_HORAS = 24
+FORMATO = re.compile(r"^[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+$")
+
+
+def _b64(datos):
+    return base64.urlsafe_b64encode(datos).rstrip(b"=").decode("ascii")
+
+
+def _desde_b64(texto):
+    return base64.urlsafe_b64decode(texto + "=" * (-len(texto) % 4))
+
+
+def _firma(secreto, carga):
+    return hmac.new(secreto.encode("utf-8"), carga.encode("ascii"), hashlib.sha256).digest()
+
+
+def emitir(secreto, vigencia_segundos=VIGENCIA_HORAS * 3600, ahora=None):
+    """Token firmado con `secreto` que vence en `vigencia_segundos`"""
+    ahora = time.time() if ahora is None else ahora
+    carga = _b64(json.dumps(
+        {"v": VERSION, "exp": int(ahora + vigencia_segundos), "id": secrets.token_hex(8)},
+        separators=(",", ":")
+    ).encode("ascii"))
+    return f"{carga}.{_b64(_firma(secreto, carga))}"
+
+
+def verificar(secretos, token, ahora=None):
+    """Carga de un token firmado por alguno de los `secretos` y aún vigente, o None"""
+    if not token or not FORMATO.match(token):
+        return None
+    carga, firma = token.split(".")
+    try:
+        firma = _desde_b64(firma)
+    except ValueError:
+        return None
+    if not any(hmac.compare_digest(_firma(secreto, carga), firma) for secreto in secretos):
+        return None
+    try:
+        datos = json.loads(_desde_b64(carga))
+    except ValueError:
+        return None
+    if not isinstance(datos, dict) or datos.get("v") != VERSION:
+        return None
+    if not isinstance(datos.get("exp"), int) or datos["exp"] < (time.time() if ahora is None else ahora):
+        return None
+    return datos
+
+
+def benchmark(n=100000):
+    """Microsegundos por emisión y por verificación de un token"""
+    secreto = secrets.token_urlsafe(32)
+    inicio = time.perf_counter()
+    tokens = [emitir(secreto) for _ in range(n)]
+    emision = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    validos = sum(verificar([secreto], token) is not None for token in tokens)
+    verificacion = time.perf_counter() - inicio
+    return {"tokens": n, "validos": validos, "emitir_us": emision / n * 1e6, "verificar_us": verificacion / n * 1e6}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tokens de acceso firmados de la app MUPAI")
+    parser.add_argument("--emitir", action="store_true", help="Emitir un token (p. ej. para enviar un enlace directo)")
+    parser.add_argument("--horas", type=float, default=VIGENCIA_HORAS)
+    parser.add_argument("--verificar", metavar="TOKEN")
+    parser.add_argument("--benchmark", action="store_true", help="Medir emisión y verificación")
+    args = parser.parse_args(argv)
+
+    if args.emitir or args.verificar:
+        secreto = os.environ.get("MUPAI_TOKEN_SECRETO")
+        if not secreto:
+            parser.error("Define la variable de entorno MUPAI_TOKEN_SECRETO (el mismo `token_secreto` de la app)")
+        if args.emitir:
+            print(emitir(secreto, args.horas * 3600))
+        if args.verificar:
+            datos = verificar([secreto], args.verificar)
+            if datos is None:
+                print("Token inválido o vencido")
+                return 1
+            print(f"Token válido hasta {datetime.fromtimestamp(datos['exp']):%Y-%m-%d %H:%M}")
+    if args.benchmark:
+        resultados = benchmark()
+        print(f"{resultados['tokens']} tokens: emitir {resultados['emitir_us']:.1f} µs, "
+              f"verificar {resultados['verificar_us']:.1f} µs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,487 @@
+"""
+Validaciones del cuestionario como funciones puras sobre `Respuestas`.
+
+Cada `validar_paso_N` retorna `(es_valido, faltantes)` con la misma redacción
+que se muestra al usuario; no dependen de Streamlit, por lo que sirven igual
+para la app, el procesamiento en lote o benchmarks.
+"""
+import re
+
+
+def validar_paso_1(r):
+    """Valida que cada subgrupo tenga al menos una selección en proteínas grasas"""
+    subgroups = {
+        'huevos_embutidos': 'Huevos y embutidos',
+        'carnes_res_grasas': 'Carnes de res grasas',
+        'carnes_cerdo_grasas': 'Carnes de cerdo grasas', 
+        'carnes_pollo_grasas': 'Carnes de pollo/pavo grasas',
+        'organos_grasos': 'Órganos y vísceras grasas',
+        'quesos_grasos': 'Quesos altos en grasa',
+        'lacteos_enteros': 'Lácteos enteros',
+        'pescados_grasos': 'Pescados grasos',
+        'mariscos_grasos': 'Mariscos/comida marina grasos'
+    }
+    
+    missing_subgroups = []
+    for key, name in subgroups.items():
+        selections = getattr(r, key) or []
+        if len(selections) == 0:
+            missing_subgroups.append(name)
+    
+    if missing_subgroups:
+        return False, missing_subgroups
+    return True, []
+
+
+def validar_paso_2(r):
+    """Valida que cada subgrupo tenga al menos una selección en proteínas magras"""
+    subgroups = {
+        'carnes_res_magras': 'Carnes de res magras',
+        'carnes_cerdo_magras': 'Carnes de cerdo magras',
+        'carnes_pollo_magras': 'Carnes de pollo/pavo magras',
+        'organos_magros': 'Órganos y vísceras magros',
+        'pescados_magros': 'Pescados magros',
+        'mariscos_magros': 'Mariscos/comida marina magros',
+        'quesos_magros': 'Quesos bajos en grasa',
+        'lacteos_light': 'Lácteos light/descremados',
+        'huevos_embutidos_light': 'Huevos y embutidos light'
+    }
+    
+    missing_subgroups = []
+    for key, name in subgroups.items():
+        selections = getattr(r, key) or []
+        if len(selections) == 0:
+            missing_subgroups.append(name)
+    
+    if missing_subgroups:
+        return False, missing_subgroups
+    return True, []
+
+
+def validar_paso_3(r):
+    """Valida que se haya completado la sección de proteína en polvo"""
+    missing_items = []
+    
+    # Validar que haya al menos una selección de tipos de proteína
+    tipos_proteina = r.proteina_polvo_tipos or []
+    if len(tipos_proteina) == 0:
+        missing_items.append('Tipos de proteína en polvo (debe seleccionar al menos uno, o "Ninguno")')
+    else:
+        # Validar que "Ninguno" sea mutuamente excluyente con otras opciones
+        if "Ninguno (no consumo proteína en polvo)" in tipos_proteina and len(tipos_proteina) > 1:
+            missing_items.append('Si seleccionas "Ninguno", no puedes seleccionar otros tipos de proteína. Por favor, desmarca "Ninguno" o desmarca las otras opciones.')
+    
+    # Validar preferencia de marca
+    preferencia_marca = r.preferencia_marca_proteina or []
+    if len(preferencia_marca) == 0:
+        missing_items.append('Preferencia de marca (debe seleccionar "Sí" o "No")')
+    elif len(preferencia_marca) > 1:
+        missing_items.append('Solo puedes seleccionar UNA opción en preferencia de marca (tienes seleccionadas varias)')
+    elif len(preferencia_marca) == 1 and preferencia_marca[0] == "Sí":
+        # Si seleccionó "Sí", el campo de marca debe tener contenido
+        nombre_marca = (r.nombre_marca_proteina or '').strip()
+        if not nombre_marca:
+            missing_items.append('Nombre de la marca preferida (campo de texto obligatorio si seleccionaste "Sí")')
+    
+    if missing_items:
+        return False, missing_items
+    return True, []
+
+
+def validar_paso_4(r):
+    """Valida que cada subgrupo tenga al menos una selección en grasas saludables"""
+    subgroups = {
+        'grasas_naturales': 'Grasas naturales',
+        'frutos_secos_semillas': 'Frutos secos y semillas',
+        'mantequillas_vegetales': 'Mantequillas vegetales'
+    }
+    
+    missing_subgroups = []
+    for key, name in subgroups.items():
+        selections = getattr(r, key) or []
+        if len(selections) == 0:
+            missing_subgroups.append(name)
+    
+    if missing_subgroups:
+        return False, missing_subgroups
+    return True, []
+
+
+def validar_paso_5(r):
+    """Valida que cada subgrupo tenga al menos una selección en carbohidratos"""
+    subgroups = {
+        'cereales_integrales': 'Cereales integrales',
+        'pastas': 'Pastas',
+        'tortillas_panes': 'Tortillas y panes',
+        'raices_tuberculos': 'Raíces y tubérculos',
+        'leguminosas': 'Leguminosas'
+    }
+    
+    missing_subgroups = []
+    for key, name in subgroups.items():
+        selections = getattr(r, key) or []
+        if len(selections) == 0:
+            missing_subgroups.append(name)
+    
+    if missing_subgroups:
+        return False, missing_subgroups
+    return True, []
+
+
+def validar_paso_6(r):
+    """Valida que se haya seleccionado al menos una opción en vegetales"""
+    selections = r.vegetales_lista or []
+    if len(selections) == 0:
+        return False, ['Vegetales']
+    return True, []
+
+
+def validar_paso_7(r):
+    """Valida que se haya seleccionado al menos una opción en frutas"""
+    selections = r.frutas_lista or []
+    if len(selections) == 0:
+        return False, ['Frutas']
+    return True, []
+
+
+def validar_paso_8(r):
+    """Valida que se haya seleccionado al menos una opción en aceites de cocción"""
+    selections = r.aceites_coccion or []
+    if len(selections) == 0:
+        return False, ['Aceites de cocción']
+    return True, []
+
+
+def validar_paso_9(r):
+    """Valida que se haya seleccionado al menos una opción en bebidas"""
+    selections = r.bebidas_sin_calorias or []
+    if len(selections) == 0:
+        return False, ['Bebidas para hidratación']
+    return True, []
+
+
+def validar_paso_10(r):
+    """Valida que se haya completado la sección de métodos de cocción"""
+    missing_items = []
+    
+    # Validar que haya al menos una selección de métodos de cocción
+    metodos_selections = r.metodos_coccion_accesibles or []
+    if len(metodos_selections) == 0:
+        missing_items.append('Métodos de cocción accesibles')
+    
+    # Validar campo de texto de otro método de cocción
+    otro_metodo = (r.otro_metodo_coccion or '').strip()
+    if not otro_metodo:
+        missing_items.append('Otro método de cocción (campo de texto) - escribir "No aplica" si no aplica')
+    
+    if missing_items:
+        return False, missing_items
+    return True, []
+
+
+def validar_paso_11(r):
+    """Valida que cada subgrupo tenga al menos una selección en alergias/intolerancias y campos de texto completos"""
+    missing_items = []
+    
+    # Validar subgrupos de selección múltiple
+    alergias_selections = r.alergias_alimentarias or []
+    intolerancias_selections = r.intolerancias_digestivas or []
+    
+    if len(alergias_selections) == 0:
+        missing_items.append('Alergias alimentarias')
+    if len(intolerancias_selections) == 0:
+        missing_items.append('Intolerancias digestivas')
+    
+    # Validar campos de texto - deben tener contenido o "No aplica"
+    text_fields = {
+        'otra_alergia': 'Otra alergia (campo de texto)',
+        'otra_intolerancia': 'Otra intolerancia (campo de texto)'
+    }
+    
+    for field_key, field_name in text_fields.items():
+        field_value = (getattr(r, field_key) or '').strip()
+        if not field_value:
+            missing_items.append(f'{field_name} - escribir "No aplica" si no aplica')
+    
+    if missing_items:
+        return False, missing_items
+    return True, []
+
+
+def validar_paso_12(r):
+    """Valida que cada subgrupo tenga al menos una selección en antojos"""
+    subgroups = {
+        'antojos_dulces': 'Antojos de alimentos dulces/postres',
+        'antojos_salados': 'Antojos de alimentos salados/snacks',
+        'antojos_comida_rapida': 'Antojos de comidas rápidas/callejeras',
+        'antojos_bebidas': 'Antojos de bebidas y postres líquidos',
+        'antojos_picantes': 'Antojos de alimentos con condimentos estimulantes'
+    }
+    
+    missing_subgroups = []
+    for key, name in subgroups.items():
+        selections = getattr(r, key) or []
+        if len(selections) == 0:
+            missing_subgroups.append(name)
+    
+    # Validar campo de texto de otros antojos
+    otros_antojos = (r.otros_antojos or '').strip()
+    if not otros_antojos:
+        missing_subgroups.append('Otros antojos (campo de texto) - escribir "No aplica" si no aplica')
+    
+    if missing_subgroups:
+        return False, missing_subgroups
+    return True, []
+
+
+def validar_paso_13(r):
+    """Valida que se haya seleccionado una frecuencia de comidas usando checkboxes"""
+    missing_items = []
+    # CAMBIO: Usar la nueva variable de checkboxes en lugar de radio
+    frecuencia_list = r.frecuencia_comidas_ck or []
+    
+    if not frecuencia_list or len(frecuencia_list) == 0:
+        missing_items.append('Frecuencia de comidas')
+    elif len(frecuencia_list) > 1:
+        missing_items.append('Solo se puede seleccionar UNA frecuencia de comidas (tienes seleccionadas varias)')
+    elif len(frecuencia_list) == 1:
+        frecuencia = frecuencia_list[0]
+        if frecuencia == "Otro (especificar)":
+            otra_frecuencia = (r.otra_frecuencia or '').strip()
+            if not otra_frecuencia:
+                missing_items.append('Especificación de frecuencia (campo de texto)')
+    
+    if missing_items:
+        return False, missing_items
+    return True, []
+
+
+def validar_paso_14(r):
+    """Valida que se haya proporcionado alguna sugerencia de menús"""
+    missing_items = []
+    sugerencias = (r.sugerencias_menus or '').strip()
+    opcion_rapida = r.opcion_rapida_menu or ''
+    
+    # Debe tener texto en sugerencias O una opción rápida válida
+    if not sugerencias and (not opcion_rapida or opcion_rapida == "Seleccionar..."):
+        missing_items.append('Sugerencias de menús (campo de texto) - escribir "No aplica" si prefieres que el equipo decida')
+    
+    if missing_items:
+        return False, missing_items
+    return True, []
+
+
+def validar_paso_15(r):
+    """Valida que se haya completado la sección de condiciones médicas y medicamentos"""
+    missing_items = []
+    
+    # Validar que haya al menos una selección de condiciones médicas
+    condiciones_selections = r.condiciones_medicas or []
+    if len(condiciones_selections) == 0:
+        missing_items.append('Condiciones médicas (debe seleccionar al menos una, o "Ninguna de las anteriores")')
+    else:
+        # Validar que "Ninguna de las anteriores" sea mutuamente excluyente
+        if "Ninguna de las anteriores" in condiciones_selections and len(condiciones_selections) > 1:
+            missing_items.append('Si seleccionas "Ninguna de las anteriores", no puedes seleccionar otras condiciones médicas')
+    
+    # Validar campo de texto de otras condiciones
+    condiciones_otras = (r.condiciones_otras or '').strip()
+    if not condiciones_otras:
+        missing_items.append('Otras condiciones (campo de texto) - escribir "No aplica" si no aplica')
+    
+    # Validar consumo de medicamentos
+    consume_medicamentos = r.consume_medicamentos or []
+    if len(consume_medicamentos) == 0:
+        missing_items.append('Consumo de medicamentos (debe seleccionar "Sí" o "No")')
+    elif len(consume_medicamentos) > 1:
+        missing_items.append('Solo puedes seleccionar UNA opción en consumo de medicamentos')
+    elif len(consume_medicamentos) == 1 and consume_medicamentos[0] == "Sí":
+        # Si seleccionó "Sí", el campo de lista debe tener contenido
+        medicamentos_lista = (r.medicamentos_lista or '').strip()
+        if not medicamentos_lista:
+            missing_items.append('Lista de medicamentos (campo de texto obligatorio si seleccionaste "Sí")')
+    
+    # Validar consumo de suplementos
+    consume_suplementos = r.consume_suplementos or []
+    if len(consume_suplementos) == 0:
+        missing_items.append('Consumo de suplementos (debe seleccionar "Sí" o "No")')
+    elif len(consume_suplementos) > 1:
+        missing_items.append('Solo puedes seleccionar UNA opción en consumo de suplementos')
+    elif len(consume_suplementos) == 1 and consume_suplementos[0] == "Sí":
+        # Si seleccionó "Sí", el campo de lista debe tener contenido
+        suplementos_lista = (r.suplementos_lista or '').strip()
+        if not suplementos_lista:
+            missing_items.append('Lista de suplementos (campo de texto obligatorio si seleccionaste "Sí")')
+    
+    if missing_items:
+        return False, missing_items
+    return True, []
+
+
+VALIDADORES = {
+    1: validar_paso_1,
+    2: validar_paso_2,
+    3: validar_paso_3,
+    4: validar_paso_4,
+    5: validar_paso_5,
+    6: validar_paso_6,
+    7: validar_paso_7,
+    8: validar_paso_8,
+    9: validar_paso_9,
+    10: validar_paso_10,
+    11: validar_paso_11,
+    12: validar_paso_12,
+    13: validar_paso_13,
+    14: validar_paso_14,
+    15: validar_paso_15,
+}
+
+
+def validar_paso(numero, r):
+    """Valida un paso; los números fuera del cuestionario siempre son válidos"""
+    validador = VALIDADORES.get(numero)
+    return validador(r) if validador else (True, [])
+
+
+def paso_valido(numero, r):
+    is_valid, _ = validar_paso(numero, r)
+    return is_valid
+
+
+def datos_faltantes(r):
+    """Datos personales obligatorios que faltan para enviar el resumen"""
+    obligatorios = {
+        "Nombre": r.nombre,
+        "Email": r.email_cliente,
+        "Teléfono": r.telefono,
+        "Edad": r.edad
+    }
+    return [campo for campo, valor in obligatorios.items() if not valor]
+
+
+def grupos_incompletos(r):
+    """Verifica que los grupos obligatorios (1-6) estén completados"""
+    nombres = {
+        1: "Proteínas con más contenido graso",
+        2: "Proteínas magras",
+        3: "Fuentes de grasa saludable",
+        4: "Carbohidratos complejos",
+        5: "Vegetales",
+        6: "Frutas",
+    }
+    return [nombre for paso, nombre in nombres.items() if not paso_valido(paso, r)]
+
+
+def errores_datos_personales(r):
+    """Errores de formato de nombre, teléfono y email (mismas reglas que el formulario de la app)"""
+    errores = []
+    for etiqueta, validador, valor in (
+        ("Nombre", validate_name, r.nombre),
+        ("Teléfono", validate_phone, r.telefono),
+        ("Email", validate_email, r.email_cliente),
+    ):
+        valido, error = validador(str(valor or ""))
+        if not valido:
+            errores.append(f"{etiqueta}: {error}")
+    return errores
+
+
+def reporte_validacion(r):
+    """Todas las validaciones de una evaluación completa; `valido` es True solo si nada falta"""
+    pasos = {}
+    for numero in VALIDADORES:
+        is_valid, missing_items = validar_paso(numero, r)
+        if not is_valid:
+            pasos[str(numero)] = missing_items
+    reporte = {
+        "pasos_incompletos": pasos,
+        "datos_faltantes": datos_faltantes(r),
+        "grupos_incompletos": grupos_incompletos(r),
+        "datos_personales": errores_datos_personales(r),
+    }
+    reporte["valido"] = not any(reporte.values())
+    return reporte
+
+
+# ==================== VALIDACIÓN ESTRICTA DE DATOS PERSONALES ====================
+def validate_name(name):
+    """
+    Valida que el nombre tenga al menos dos palabras.
+    Retorna (es_válido, mensaje_error)
+    """
+    if not name or not name.strip():
+        return False, "El nombre es obligatorio"
+    
+    # Limpiar espacios extra y dividir en palabras
+    words = name.strip().split()
+    
+    if len(words) < 2:
+        return False, "El nombre debe contener al menos dos palabras (nombre y apellido)"
+    
+    # Verificar que cada palabra tenga al menos 2 caracteres y solo contenga letras y espacios
+    for word in words:
+        if len(word) < 2:
+            return False, "Cada palabra del nombre debe tener al menos 2 caracteres"
+        if not re.match(r'^[a-zA-ZáéíóúÁÉÍÓÚüÜñÑ]+$', word):
+            return False, "El nombre solo puede contener letras y espacios"
+    
+    return True, ""
+
+
+def validate_phone(phone):
+    """
+    Valida que el teléfono tenga exactamente 10 dígitos.
+    Retorna (es_válido, mensaje_error)
+    """
+    if not phone or not phone.strip():
+        return False, "El teléfono es obligatorio"
+    
+    # Limpiar espacios y caracteres especiales
+    clean_phone = re.sub(r'[^0-9]', '', phone.strip())
+    
+    if len(clean_phone) != 10:
+        return False, "El teléfono debe tener exactamente 10 dígitos"
+    
+    # Verificar que todos sean dígitos
+    if not clean_phone.isdigit():
+        return False, "El teléfono solo puede contener números"
+    
+    return True, ""
+
+
+def validate_email(email):
+    """
+    Valida que el email tenga formato estándar.
+    Retorna (es_válido, mensaje_error)
+    """
+    if not email or not email.strip():
+        return False, "El email es obligatorio"
+    
+    # Patrón regex para email estándar
+    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    
+    if not re.match(email_pattern, email.strip()):
+        return False, "El email debe tener un formato válido (ejemplo: usuario@dominio.com)"
+    
+    return True, ""
+
+
+def validate_whatsapp(whatsapp):
+    """
+    Valida que el número de WhatsApp tenga exactamente 10 dígitos.
+    Retorna (es_válido, mensaje_error)
+    """
+    if not whatsapp or not whatsapp.strip():
+        return False, "El número de WhatsApp es obligatorio"
+    
+    # Limpiar espacios y caracteres especiales
+    clean_whatsapp = re.sub(r'[^0-9]', '', whatsapp.strip())
+    
+    if len(clean_whatsapp) != 10:
+        return False, "El número de WhatsApp debe tener exactamente 10 dígitos"
+    
+    # Verificar que todos sean dígitos
+    if not clean_whatsapp.isdigit():
+        return False, "El número de WhatsApp solo puede contener números"
+    
+    return True, ""
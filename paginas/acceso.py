@@ -0,0 +1,217 @@
+"""Página de acceso: solicitud de código y validación (usuarios no autenticados)."""
+import time
+
+import streamlit as st
+
+from comun import (
+    PAGINA_DATOS_PERSONALES,
+    emitir_token_acceso,
+    enviar_email_solicitud_acceso,
+    generate_unique_code,
+)
+from mupai.validacion import validate_email, validate_name, validate_whatsapp
+
+# ==================== NUEVA AUTENTICACIÓN SIMPLIFICADA ====================
+# Sistema de autenticación basado en flujo por etapas (access_stage)
+# Etapas: request → form → code_sent → authenticated
+# El router solo muestra esta página mientras el usuario no esté autenticado
+
+# ETAPA 1: "request" - Botón "Solicitar acceso"
+if st.session_state.access_stage == "request":
+    st.markdown("""
+    <div class="content-card" style="max-width: 500px; margin: 2rem auto; text-align: center;">
+        <h2 style="color: var(--mupai-yellow); margin-bottom: 1.5rem;">
+            🔑 Acceso al Sistema MUPAI
+        </h2>
+        <p style="margin-bottom: 2rem; color: #CCCCCC;">
+            Para acceder al sistema de evaluación de patrones alimentarios, 
+            necesitas solicitar un código de acceso único.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        if st.button("📝 Solicitar Acceso", use_container_width=True, key="btn_solicitar_acceso"):
+            st.session_state.access_stage = "form"
+            st.rerun()
+
+# ETAPA 2: "form" - Formulario de datos y generación/envío de código
+elif st.session_state.access_stage == "form":
+    st.markdown("""
+    <div class="content-card" style="max-width: 600px; margin: 2rem auto; text-align: center;">
+        <h2 style="color: var(--mupai-yellow); margin-bottom: 1.5rem;">
+            📝 Datos para Solicitud de Acceso
+        </h2>
+        <p style="margin-bottom: 2rem; color: #CCCCCC;">
+            Completa los siguientes datos para generar tu código de acceso único.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        with st.form("solicitud_acceso"):
+            nombre = st.text_input(
+                "Nombre completo *", 
+                placeholder="Ej: Juan Pérez García",
+                help="Ingresa tu nombre completo"
+            )
+            
+            email = st.text_input(
+                "Correo electrónico *", 
+                placeholder="Ej: juan@ejemplo.com",
+                help="Correo donde recibirás comunicaciones"
+            )
+            
+            whatsapp = st.text_input(
+                "Número de WhatsApp *", 
+                placeholder="Ej: 5551234567",
+                help="Número de WhatsApp de 10 dígitos"
+            )
+            
+            col_form1, col_form2 = st.columns(2)
+            with col_form1:
+                submitted = st.form_submit_button("📤 Enviar Solicitud", use_container_width=True)
+            with col_form2:
+                cancel = st.form_submit_button("❌ Cancelar", use_container_width=True)
+            
+            if cancel:
+                st.session_state.access_stage = "request"
+                st.rerun()
+            
+            if submitted:
+                # Validar todos los campos
+                name_valid, name_error = validate_name(nombre)
+                email_valid, email_error = validate_email(email)
+                whatsapp_valid, whatsapp_error = validate_whatsapp(whatsapp)
+                
+                # Mostrar errores específicos
+                validation_errors = []
+                if not name_valid:
+                    validation_errors.append(f"**Nombre:** {name_error}")
+                if not email_valid:
+                    validation_errors.append(f"**Email:** {email_error}")
+                if not whatsapp_valid:
+                    validation_errors.append(f"**WhatsApp:** {whatsapp_error}")
+                
+                if validation_errors:
+                    st.error("❌ **Errores en el formulario:**\n\n" + "\n\n".join(validation_errors))
+                else:
+                    # Generar código único
+                    codigo = generate_unique_code()
+                    
+                    # Guardar datos en session state con nuevos nombres de variables
+                    st.session_state.access_user_name = nombre
+                    st.session_state.access_user_email = email
+                    st.session_state.access_user_whatsapp = whatsapp
+                    st.session_state.access_code = codigo
+                    
+                    # Enviar email
+                    with st.spinner("📧 Enviando solicitud de acceso..."):
+                        if enviar_email_solicitud_acceso(nombre, email, whatsapp, codigo):
+                            st.session_state.access_request_sent = True
+                            st.session_state.access_stage = "code_sent"
+                            st.success("✅ **Solicitud enviada exitosamente**\n\nTe redirigimos al formulario de acceso. El administrador debe proporcionarte el código de acceso.")
+                            time.sleep(2)  # Dar tiempo para que el usuario lea el mensaje
+                            st.rerun()
+                        else:
+                            st.error("❌ Error al enviar la solicitud. Por favor, intenta nuevamente.")
+
+# ETAPA 3: "code_sent" - Ingreso de código y validación
+elif st.session_state.access_stage == "code_sent":
+    st.markdown("""
+    <div class="content-card" style="max-width: 500px; margin: 2rem auto; text-align: center;">
+        <h2 style="color: var(--mupai-yellow); margin-bottom: 1.5rem;">
+            🔑 Ingresar al Sistema
+        </h2>
+        <p style="margin-bottom: 2rem; color: #CCCCCC;">
+            Ingresa tu correo electrónico y el código de acceso de 6 caracteres 
+            que recibiste del administrador.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Mostrar código generado en modo testing (solo si secrets no está configurado)
+    # NOTA: En producción, este código no se muestra y solo se envía por email
+    if st.secrets.get("zoho_password", "TU_PASSWORD_AQUI") == "TU_PASSWORD_AQUI":
+        generated_code = st.session_state.get("access_code", "")
+        if generated_code:
+            st.warning(f"⚠️ **Modo de desarrollo:** Código para testing: **{generated_code}** (En producción este código solo se envía por email)")
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        with st.form("login_access"):
+            email_login = st.text_input(
+                "Correo electrónico *", 
+                value=st.session_state.get("access_user_email", ""),
+                placeholder="Ej: juan@ejemplo.com",
+                help="El correo que usaste en tu solicitud"
+            )
+            
+            codigo_input = st.text_input(
+                "Código de acceso *", 
+                placeholder="Ej: ABC123",
+                max_chars=6,
+                help="Código de 6 caracteres proporcionado por el administrador"
+            )
+            
+            col_login1, col_login2 = st.columns(2)
+            with col_login1:
+                login_submit = st.form_submit_button("🚀 Acceder", use_container_width=True)
+            with col_login2:
+                new_request = st.form_submit_button("📝 Nueva Solicitud", use_container_width=True)
+            
+            if new_request:
+                # Resetear estado para nueva solicitud
+                st.session_state.access_stage = "request"
+                st.session_state.access_request_sent = False
+                st.session_state.access_user_name = ""
+                st.session_state.access_user_email = ""
+                st.session_state.access_user_whatsapp = ""
+                st.session_state.access_code = ""
+                st.session_state.code_used = False
+                st.rerun()
+            
+            if login_submit:
+                # Validar email y código
+                if not email_login or not email_login.strip():
+                    st.error("❌ Debes ingresar tu correo electrónico.")
+                elif not codigo_input or not codigo_input.strip():
+                    st.error("❌ Debes ingresar el código de acceso.")
+                else:
+                    # Verificar que el email coincida con el registrado
+                    stored_email = st.session_state.get("access_user_email", "")
+                    stored_code = st.session_state.get("access_code", "")
+                    
+                    if email_login.lower().strip() != stored_email.lower().strip():
+                        st.error("❌ El correo electrónico no coincide con el registrado en la solicitud.")
+                    elif codigo_input.upper() != stored_code:
+                        st.error("❌ Código incorrecto. Verifica el código proporcionado por el administrador.")
+                    elif st.session_state.code_used:
+                        st.error("❌ Este código ya ha sido utilizado. Solicita un nuevo código.")
+                    else:
+                        # Acceso autorizado - Si el código es correcto, marcar como autenticado y código usado
+                        st.session_state.authenticated = True
+                        st.session_state.code_used = True
+                        st.session_state.access_stage = "authenticated"
+                        # Token firmado para no volver a pedir código tras un reinicio o al recargar
+                        emitir_token_acceso()
+                        st.success("✅ Acceso autorizado. ¡Bienvenido al sistema MUPAI!")
+                        st.switch_page(PAGINA_DATOS_PERSONALES)
+
+# Mostrar información mientras no esté autenticado
+st.markdown("""
+<div class="content-card" style="margin-top: 3rem; text-align: center; background: #1A1A1A;">
+    <h3 style="color: var(--mupai-yellow);">Sistema de Evaluación de Patrones Alimentarios</h3>
+    <p style="color: #CCCCCC;">
+        MUPAI utiliza metodologías científicas avanzadas para evaluar patrones alimentarios 
+        personalizados, preferencias dietéticas y crear planes nutricionales adaptativos.
+    </p>
+    <p style="color: #999999; font-size: 0.9rem; margin-top: 1.5rem;">
+        © 2025 MUPAI - Muscle up GYM 
+        Digital Nutrition Science
+        Alimentary Pattern Assessment Intelligence
+    </p>
+</div>
+""", unsafe_allow_html=True)
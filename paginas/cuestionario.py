@@ -0,0 +1,1916 @@
+"""Página del cuestionario de selección alimentaria (pasos 1 a 15)."""
+import streamlit as st
+
+from comun import (
+    PAGINA_DATOS_PERSONALES,
+    PAGINA_RESULTADOS,
+    advance_to_next_step,
+    buscador_de_opciones,
+    create_vertical_checkboxes,
+    crear_resumen_email,
+    datos_completos_para_email,
+    entregar_resumen_evaluacion,
+    go_to_previous_step,
+    guardar_evaluacion,
+    iniciar_cronometro_paso,
+    mostrar_pie,
+    ofrecer_evaluacion_previa,
+    registrar_evaluacion_finalizada,
+    respuestas_actuales,
+    verificar_grupos_obligatorios_completos,
+)
+from mupai.alergenos import conflictos
+from mupai.catalogo import OPCIONES
+from mupai.sustituciones import sugerencias
+from mupai.validacion import paso_valido, validar_paso
+
+st.page_link(PAGINA_DATOS_PERSONALES, label="Editar datos personales", icon="✏️")
+
+if st.session_state.inicio_paso is None:
+    iniciar_cronometro_paso()
+
+ofrecer_evaluacion_previa()
+
+# Progress bar mejorado y más prominente
+st.markdown("### 📊 Progreso de tu Evaluación")
+progress = st.progress(0, text="Iniciando evaluación...")
+progress_container = st.container()
+
+# CUESTIONARIO DE SELECCIÓN ALIMENTARIA PERSONALIZADA CON MEJOR DISEÑO
+st.markdown("""
+<div class="content-card" style="background: linear-gradient(135deg, #F4C430 0%, #DAA520 100%); color: #1E1E1E; margin-bottom: 2rem; border: 3px solid #DAA520;">
+    <h2 style="color: #1E1E1E; text-align: center; margin-bottom: 1.5rem;">
+        🧾 CUESTIONARIO DE SELECCIÓN ALIMENTARIA PERSONALIZADA
+    </h2>
+    <div style="text-align: left; font-size: 1.1rem; line-height: 1.6;">
+        <p><strong>📋 Instrucciones importantes:</strong></p>
+        <ul style="margin-left: 1rem;">
+            <li><strong>✅ Selecciona múltiples opciones:</strong> Puedes marcar TODOS los alimentos que consumes o disfrutas en cada categoría</li>
+            <li><strong>🎯 Sé específico:</strong> Entre más alimentos marques, más personalizado será tu plan nutricional</li>
+            <li><strong>⏱️ Tiempo estimado:</strong> 5-8 minutos para completar toda la evaluación</li>
+            <li><strong>💡 Consejo:</strong> Si tienes dudas sobre un alimento, márcalo. Es mejor incluir más opciones</li>
+        </ul>
+    </div>
+</div>
+""", unsafe_allow_html=True)
+
+# Navegación mejorada por pasos - Ahora refleja el progreso real
+current_step = st.session_state.get('current_step', 1)
+max_unlocked = st.session_state.get('max_unlocked_step', 1)
+step_completed = st.session_state.get('step_completed', {})
+
+# Verificar estado de validación en tiempo real
+respuestas = respuestas_actuales()
+step_validators = {paso: paso_valido(paso, respuestas) for paso in range(1, 15)}
+
+st.markdown(f"""
+<div class="content-card" style="background: #2A2A2A; border-left: 5px solid #F4C430;">
+    <h3 style="color: #F4C430; text-align: center; margin-bottom: 1rem;">🗺️ Progreso del Cuestionario</h3>
+    <div style="display: flex; justify-content: space-between; flex-wrap: wrap; gap: 10px;">
+        <div style="text-align: center; flex: 1; min-width: 120px;">
+            <div style="background: {'#F4C430' if current_step == 1 else '#27AE60' if step_validators[1] else '#E74C3C'}; color: #1E1E1E; border-radius: 50%; width: 40px; height: 40px; display: flex; align-items: center; justify-content: center; margin: 0 auto 5px; font-weight: bold;">{'✓' if step_validators[1] else '1'}</div>
+            <small>Proteínas Grasas</small>
+        </div>
+        <div style="text-align: center; flex: 1; min-width: 120px;">
+            <div style="background: {'#F4C430' if current_step == 2 else '#27AE60' if step_validators[2] else '#E74C3C' if max_unlocked >= 2 else '#666'}; color: {'#1E1E1E' if current_step == 2 or step_validators[2] else '#FFF'}; border-radius: 50%; width: 40px; height: 40px; display: flex; align-items: center; justify-content: center; margin: 0 auto 5px; font-weight: bold;">{'✓' if step_validators[2] else '2'}</div>
+            <small>Proteínas Magras</small>
+        </div>
+        <div style="text-align: center; flex: 1; min-width: 120px;">
+            <div style="background: {'#F4C430' if current_step == 3 else '#27AE60' if step_validators[3] else '#E74C3C' if max_unlocked >= 3 else '#666'}; color: {'#1E1E1E' if current_step == 3 or step_validators[3] else '#FFF'}; border-radius: 50%; width: 40px; height: 40px; display: flex; align-items: center; justify-content: center; margin: 0 auto 5px; font-weight: bold;">{'✓' if step_validators[3] else '3'}</div>
+            <small>Grasas Saludables</small>
+        </div>
+        <div style="text-align: center; flex: 1; min-width: 120px;">
+            <div style="background: {'#F4C430' if current_step == 4 else '#27AE60' if step_validators[4] else '#E74C3C' if max_unlocked >= 4 else '#666'}; color: {'#1E1E1E' if current_step == 4 or step_validators[4] else '#FFF'}; border-radius: 50%; width: 40px; height: 40px; display: flex; align-items: center; justify-content: center; margin: 0 auto 5px; font-weight: bold;">{'✓' if step_validators[4] else '4'}</div>
+            <small>Carbohidratos</small>
+        </div>
+        <div style="text-align: center; flex: 1; min-width: 120px;">
+            <div style="background: {'#F4C430' if current_step == 5 else '#27AE60' if step_validators[5] else '#E74C3C' if max_unlocked >= 5 else '#666'}; color: {'#1E1E1E' if current_step == 5 or step_validators[5] else '#FFF'}; border-radius: 50%; width: 40px; height: 40px; display: flex; align-items: center; justify-content: center; margin: 0 auto 5px; font-weight: bold;">{'✓' if step_validators[5] else '5'}</div>
+            <small>Vegetales</small>
+        </div>
+        <div style="text-align: center; flex: 1; min-width: 120px;">
+            <div style="background: {'#F4C430' if current_step == 6 else '#27AE60' if step_validators[6] else '#E74C3C' if max_unlocked >= 6 else '#666'}; color: {'#1E1E1E' if current_step == 6 or step_validators[6] else '#FFF'}; border-radius: 50%; width: 40px; height: 40px; display: flex; align-items: center; justify-content: center; margin: 0 auto 5px; font-weight: bold;">{'✓' if step_validators[6] else '6'}</div>
+            <small>Frutas</small>
+        </div>
+    </div>
+    <div style="text-align: center; margin-top: 1rem; color: #CCCCCC;">
+        <small>Paso {current_step} de 14 - {'✅ Completado' if step_validators.get(current_step, False) else '⏳ En progreso'}</small>
+    </div>
+    <div style="text-align: center; margin-top: 0.5rem; font-size: 0.9rem;">
+        <span style="color: #27AE60;">● Completo</span> | 
+        <span style="color: #F4C430;">● Actual</span> | 
+        <span style="color: #E74C3C;">● Incompleto</span> | 
+        <span style="color: #666;">● Bloqueado</span>
+    </div>
+</div>
+""", unsafe_allow_html=True)
+
+# Mostrar solo el paso actual
+current_step = st.session_state.get('current_step', 1)
+
+# GRUPO 1: PROTEÍNA ANIMAL CON MÁS CONTENIDO GRASO
+if current_step == 1:
+    # Enhanced visual step indicator with orientation info
+    st.markdown("""
+    <div style="
+        background: linear-gradient(135deg, #4CAF50 0%, #45a049 100%);
+        color: white;
+        padding: 2rem 1.5rem;
+        border-radius: 15px;
+        text-align: center;
+        margin-bottom: 2rem;
+        box-shadow: 0 8px 25px rgba(76, 175, 80, 0.3);
+        border: 3px solid #4CAF50;
+    ">
+        <h1 style="margin: 0; font-size: 2.2rem; font-weight: bold; color: white;">
+            🥩 PASO 1: PROTEÍNA ANIMAL CON MÁS CONTENIDO GRASO
+        </h1>
+        <p style="margin: 1rem 0 0.5rem 0; font-size: 1.2rem; opacity: 0.9; color: white;">
+            Paso 1 de 14 en tu evaluación personalizada de patrones alimentarios
+        </p>
+        <div style="background: rgba(255,255,255,0.2); padding: 1rem; border-radius: 10px; margin-top: 1.5rem;">
+            <p style="margin: 0; font-size: 1rem; color: white; font-weight: 500;">
+                🎯 <strong>Objetivo:</strong> Identificar las proteínas animales con mayor contenido graso que consumes habitualmente
+            </p>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Informational content box for orientation
+    st.info("""
+    ### 📋 Información importante para este paso:
+    
+    **¿Por qué evaluamos estas proteínas?**
+    - Las proteínas grasas aportan aminoácidos esenciales y grasas saturadas
+    - Son importantes para la saciedad y absorción de vitaminas liposolubles
+    - Nos ayudan a calcular tu perfil nutricional completo
+    
+    **¿Cómo completar este paso?**
+    - Revisa cada categoría de alimentos verticalmente
+    -Marca TODOS los alimentos que consumas con facilidad, incluso ocasionalmente, estos alimentos se utilizarán para personalizar al máximo tu plan de alimentación.
+    - Si no consumes ningún alimento de una categoría, marca "Ninguno"
+    
+    **💡 Consejo:** Es mejor marcar más opciones que menos. Si ocasionalmente comes algo, inclúyelo.
+    """)
+    
+
+    # Actualizar progreso
+    progress.progress(7, text="Paso 1 de 14: Proteínas con más contenido graso")
+
+    st.markdown('<div class="content-card">', unsafe_allow_html=True)
+    
+    buscador_de_opciones(1)
+    
+    st.markdown("#### 🍳 Huevos y embutidos")
+    huevos_embutidos = create_vertical_checkboxes(
+        "¿Cuáles de estos huevos y embutidos consumes?",
+        OPCIONES["huevos_embutidos"],
+        "huevos_embutidos",
+        "Marca todos los que consumes. Si no consumes ninguno, marca 'Ninguno'."
+    )
+    
+    st.markdown("#### 🥩 Carnes de res grasas")
+    carnes_res_grasas = create_vertical_checkboxes(
+        "¿Cuáles de estas carnes de res grasas consumes?",
+        OPCIONES["carnes_res_grasas"],
+        "carnes_res_grasas",
+        "Marca todos los cortes que consumes. Si no consumes ninguno, marca 'Ninguno'."
+    )
+    
+    st.markdown("#### 🐷 Carnes de cerdo grasas")
+    carnes_cerdo_grasas = create_vertical_checkboxes(
+        "¿Cuáles de estas carnes de cerdo grasas consumes?",
+        OPCIONES["carnes_cerdo_grasas"],
+        "carnes_cerdo_grasas",
+        "Marca todos los cortes que consumes. Si no consumes ninguno, marca 'Ninguno'."
+    )
+    
+    st.markdown("#### 🐔 Carnes de pollo/pavo grasas")
+    carnes_pollo_grasas = create_vertical_checkboxes(
+        "¿Cuáles de estas carnes de pollo/pavo grasas consumes?",
+        OPCIONES["carnes_pollo_grasas"],
+        "carnes_pollo_grasas",
+        "Marca todas las que consumes. Si no consumes ninguno, marca 'Ninguno'."
+    )
+    
+    st.markdown("#### 🫀 Órganos y vísceras grasas")
+    organos_grasos = create_vertical_checkboxes(
+        "¿Cuáles de estos órganos y vísceras grasas consumes?",
+        OPCIONES["organos_grasos"],
+        "organos_grasos",
+        "Marca todos los que consumes. Si no consumes ninguno, marca 'Ninguno'."
+    )
+    
+    st.markdown("#### 🧀 Quesos altos en grasa")
+    quesos_grasos = create_vertical_checkboxes(
+        "¿Cuáles de estos quesos altos en grasa consumes?",
+        OPCIONES["quesos_grasos"],
+        "quesos_grasos",
+        "Marca todos los quesos que consumes. Si no consumes ninguno, marca 'Ninguno'."
+    )
+    
+    st.markdown("#### 🥛 Lácteos enteros")
+    lacteos_enteros = create_vertical_checkboxes(
+        "¿Cuáles de estos lácteos enteros consumes?",
+        OPCIONES["lacteos_enteros"],
+        "lacteos_enteros",
+        "Marca todos los lácteos enteros que consumes. Si no consumes ninguno, marca 'Ninguno'."
+    )
+    
+    st.markdown("#### 🐟 Pescados grasos")
+    pescados_grasos = create_vertical_checkboxes(
+        "¿Cuáles de estos pescados grasos consumes?",
+        OPCIONES["pescados_grasos"],
+        "pescados_grasos",
+        "Marca todos los pescados grasos que consumes. Si no consumes ninguno, marca 'Ninguno'."
+    )
+    
+    st.markdown("#### 🦐 Mariscos/comida marina grasos")
+    mariscos_grasos = create_vertical_checkboxes(
+        "¿Cuáles de estos mariscos/comida marina grasos consumes?",
+        OPCIONES["mariscos_grasos"],
+        "mariscos_grasos",
+        "Marca todos los que consumes. Si no consumes ninguno, marca 'Ninguno'."
+    )
+
+    # Resumen del paso actual
+    total_seleccionados = (len(st.session_state.get('huevos_embutidos', [])) + 
+                          len(st.session_state.get('carnes_res_grasas', [])) + 
+                          len(st.session_state.get('carnes_cerdo_grasas', [])) + 
+                          len(st.session_state.get('carnes_pollo_grasas', [])) + 
+                          len(st.session_state.get('organos_grasos', [])) + 
+                          len(st.session_state.get('quesos_grasos', [])) + 
+                          len(st.session_state.get('lacteos_enteros', [])) + 
+                          len(st.session_state.get('pescados_grasos', [])) + 
+                          len(st.session_state.get('mariscos_grasos', [])))
+    if total_seleccionados > 0:
+        st.success(f"✅ **¡Excelente!** Has seleccionado {total_seleccionados} alimentos en este grupo. Esto nos ayudará a personalizar mejor tu plan.")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Botones de navegación
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("⬅️ Anterior", disabled=True):
+            pass
+    with col3:
+        if st.button("Siguiente ➡️"):
+            advance_to_next_step()
+
+# GRUPO 2: PROTEÍNA ANIMAL MAGRA
+elif current_step == 2:
+    # Enhanced visual step indicator with orientation info
+    st.markdown("""
+    <div style="
+        background: linear-gradient(135deg, #2196F3 0%, #1976D2 100%);
+        color: white;
+        padding: 2rem 1.5rem;
+        border-radius: 15px;
+        text-align: center;
+        margin-bottom: 2rem;
+        box-shadow: 0 8px 25px rgba(33, 150, 243, 0.3);
+        border: 3px solid #2196F3;
+    ">
+        <h1 style="margin: 0; font-size: 2.2rem; font-weight: bold; color: white;">
+            🍗 PASO 2: PROTEÍNA ANIMAL MAGRA
+        </h1>
+        <p style="margin: 1rem 0 0.5rem 0; font-size: 1.2rem; opacity: 0.9; color: white;">
+            Paso 2 de 14 en tu evaluación personalizada de patrones alimentarios
+        </p>
+        <div style="background: rgba(255,255,255,0.2); padding: 1rem; border-radius: 10px; margin-top: 1.5rem;">
+            <p style="margin: 0; font-size: 1rem; color: white; font-weight: 500;">
+                🎯 <strong>Objetivo:</strong> Identificar las proteínas animales magras que consumes habitualmente
+            </p>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Informational content box for orientation
+    st.info("""
+    ### 📋 Información importante para este paso:
+    
+    **¿Por qué evaluamos estas proteínas?**
+    - Las proteínas magras aportan aminoácidos esenciales con menor contenido graso
+    - Son ideales para construir masa muscular y controlar calorías
+    - Proporcionan saciedad sin exceso de grasas saturadas
+    
+   **¿Cómo completar este paso?**
+    - Revisa cada categoría de alimentos verticalmente
+    -Marca TODOS los alimentos que consumas con facilidad, incluso ocasionalmente, estos alimentos se utilizarán para personalizar al máximo tu plan de alimentación.
+    - Si no consumes ningún alimento de una categoría, marca "Ninguno"
+    
+    **💡 Consejo:** Es mejor marcar más opciones que menos. Si ocasionalmente comes algo, inclúyelo.
+    """)
+    # Actualizar progreso
+    progress.progress(14, text="Paso 2 de 14: Proteínas animales magras")
+
+    st.markdown('<div class="content-card">', unsafe_allow_html=True)
+    
+    buscador_de_opciones(2)
+    
+    st.markdown("#### 🐄 Carnes de res magras")
+    carnes_res_magras = create_vertical_checkboxes(
+        "¿Cuáles de estas carnes de res magras consumes?",
+        OPCIONES["carnes_res_magras"],
+        "carnes_res_magras",
+        "Marca todas las carnes de res magras que consumes. Si no consumes ninguna, marca 'Ninguno'."
+    )
+    
+    st.markdown("#### 🐷 Carnes de cerdo magras")
+    carnes_cerdo_magras = create_vertical_checkboxes(
+        "¿Cuáles de estas carnes de cerdo magras consumes?",
+        OPCIONES["carnes_cerdo_magras"],
+        "carnes_cerdo_magras",
+        "Marca todas las que consumes. Si no consumes ninguna, marca 'Ninguno'."
+    )
+    
+    st.markdown("#### 🐔 Carnes de pollo/pavo magras")
+    carnes_pollo_magras = create_vertical_checkboxes(
+        "¿Cuáles de estas carnes de pollo/pavo magras consumes?",
+        OPCIONES["carnes_pollo_magras"],
+        "carnes_pollo_magras",
+        "Marca todas las que consumes. Si no consumes ninguna, marca 'Ninguno'."
+    )
+    
+    st.markdown("#### 🫀 Órganos y vísceras magros")
+    organos_magros = create_vertical_checkboxes(
+        "¿Cuáles de estos órganos y vísceras magros consumes?",
+        OPCIONES["organos_magros"],
+        "organos_magros",
+        "Marca todos los que consumes. Si no consumes ninguno, marca 'Ninguno'."
+    )
+    
+    st.markdown("#### 🐟 Pescados magros")
+    pescados_magros = create_vertical_checkboxes(
+        "¿Cuáles de estos pescados magros consumes?",
+        OPCIONES["pescados_magros"],
+        "pescados_magros",
+        "Marca todos los pescados magros que consumes. Si no consumes ninguno, marca 'Ninguno'."
+    )
+    
+    st.markdown("#### 🦐 Mariscos/comida marina magros")
+    mariscos_magros = create_vertical_checkboxes(
+        "¿Cuáles de estos mariscos/comida marina magros consumes?",
+        OPCIONES["mariscos_magros"],
+        "mariscos_magros",
+        "Marca todos los que consumes. Si no consumes ninguno, marca 'Ninguno'."
+    )
+    
+    st.markdown("#### 🧀 Quesos magros")
+    quesos_magros = create_vertical_checkboxes(
+        "¿Cuáles de estos quesos magros consumes?",
+        OPCIONES["quesos_magros"],
+        "quesos_magros",
+        "Marca todos los que consumes. Si no consumes ninguno, marca 'Ninguno'."
+    )
+    
+    st.markdown("#### 🥛 Lácteos light o reducidos")
+    lacteos_light = create_vertical_checkboxes(
+        "¿Cuáles de estos lácteos light o reducidos consumes?",
+        OPCIONES["lacteos_light"],
+        "lacteos_light",
+        "Marca todos los lácteos light que uses. Si no consumes ninguno, marca 'Ninguno'."
+    )
+    
+    st.markdown("#### 🥚 Huevos y embutidos light")
+    huevos_embutidos_light = create_vertical_checkboxes(
+        "¿Cuáles de estos huevos y embutidos light consumes?",
+        OPCIONES["huevos_embutidos_light"],
+        "huevos_embutidos_light",
+        "Marca todos los que consumes. Si no consumes ninguno, marca 'Ninguno'."
+    )
+    # Resumen del paso actual
+    total_seleccionados = (len(st.session_state.get('carnes_res_magras', [])) + 
+                          len(st.session_state.get('carnes_cerdo_magras', [])) + 
+                          len(st.session_state.get('carnes_pollo_magras', [])) + 
+                          len(st.session_state.get('organos_magros', [])) + 
+                          len(st.session_state.get('pescados_magros', [])) + 
+                          len(st.session_state.get('mariscos_magros', [])) + 
+                          len(st.session_state.get('quesos_magros', [])) + 
+                          len(st.session_state.get('lacteos_light', [])) + 
+                          len(st.session_state.get('huevos_embutidos_light', [])))
+    if total_seleccionados > 0:
+        st.success(f"✅ **¡Excelente!** Has seleccionado {total_seleccionados} alimentos en este grupo. Las proteínas magras son fundamentales para tu plan.")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Botones de navegación
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("⬅️ Anterior"):
+            go_to_previous_step()
+    with col3:
+        if st.button("Siguiente ➡️"):
+            advance_to_next_step()
+
+# PASO 3: PROTEÍNA EN POLVO
+elif current_step == 3:
+    # Add prominent visual step indicator with pink/magenta gradient
+    st.markdown("""
+    <div style="
+        background: linear-gradient(135deg, #E91E63 0%, #C2185B 100%);
+        color: white;
+        padding: 1.5rem;
+        border-radius: 15px;
+        text-align: center;
+        margin-bottom: 2rem;
+        box-shadow: 0 8px 25px rgba(233, 30, 99, 0.3);
+        border: 3px solid #E91E63;
+        animation: slideIn 0.5s ease-out;
+    ">
+        <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
+            💪 PASO 3: Proteína en Polvo
+        </h2>
+        <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
+            Paso 3 de 14 en tu evaluación personalizada
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Información importante
+    st.info("""
+### 📋 Información importante para este paso:
+
+**¿Por qué evaluamos esto?**
+- Las proteínas en polvo son suplementos nutricionales para complementar la dieta
+- Cada tipo tiene características específicas (absorción, perfil de aminoácidos, digestibilidad)
+- Conocer tus preferencias nos permite considerar su aporte en tu plan alimentario
+
+**¿Cómo completar este paso?**
+- Marca TODOS los tipos de proteína en polvo que consumes
+- Si no consumes ninguna, marca "Ninguno"
+- Indica si tienes preferencia por alguna marca específica
+
+**💡 Consejo:** Si consumes proteína ocasionalmente, inclúyela también.
+    """)
+    
+    # Actualizar progreso
+    progress.progress(21, text="Paso 3 de 14: Proteína en polvo")
+    
+    st.markdown('<div class="content-card">', unsafe_allow_html=True)
+    
+    # Sección de tipos de proteína
+    st.markdown("### 🥤 Tipos de Proteína en Polvo")
+    
+    buscador_de_opciones(3)
+    
+    proteina_polvo_tipos = create_vertical_checkboxes(
+        "Selecciona TODOS los tipos de proteína en polvo que consumes:",
+        OPCIONES["proteina_polvo_tipos"],
+        "proteina_polvo_tipos",
+        "Marca todas las opciones que apliquen. Si no consumes proteína en polvo, marca 'Ninguno'."
+    )
+    
+    # Validación UI: "Ninguno" es mutuamente excluyente
+    if "Ninguno (no consumo proteína en polvo)" in proteina_polvo_tipos and len(proteina_polvo_tipos) > 1:
+        st.error("⚠️ **Error:** Si seleccionas 'Ninguno', no puedes seleccionar otros tipos de proteína. Por favor, desmarca 'Ninguno' o desmarca las otras opciones.")
+    
+    st.markdown("---")
+    
+    # Sección de preferencia de marca
+    st.markdown("### 🏷️ Preferencia de Marca")
+    
+    preferencia_marca_proteina = create_vertical_checkboxes(
+        "¿Tienes preferencia por alguna marca específica?",
+        OPCIONES["preferencia_marca_proteina"],
+        "preferencia_marca_proteina",
+        "Selecciona SOLO UNA opción"
+    )
+    
+    # Validación: solo una opción en preferencia de marca
+    if len(preferencia_marca_proteina) > 1:
+        st.error("⚠️ **Error:** Solo puedes seleccionar UNA opción (Sí o No). Por favor, desmarca una de las opciones.")
+    
+    # Campo de texto condicional para nombre de marca
+    if preferencia_marca_proteina and len(preferencia_marca_proteina) == 1:
+        if preferencia_marca_proteina[0] == "Sí":
+            nombre_marca_proteina = st.text_input(
+                "✍️ ¿Cuál es tu marca preferida?",
+                value=st.session_state.get('nombre_marca_proteina', ''),
+                placeholder="Ej: Optimum Nutrition, Dymatize, MyProtein, Isopure, Vega, Muscletech, BSN, etc.",
+                help="Escribe el nombre de la marca de proteína en polvo que prefieres"
+            )
+            st.session_state.nombre_marca_proteina = nombre_marca_proteina
+        else:
+            # Si seleccionó "No", limpiar automáticamente el campo de marca
+            st.session_state.nombre_marca_proteina = ""
+    
+    # Resumen del paso
+    st.markdown("### 📊 Resumen de tu selección")
+    
+    if proteina_polvo_tipos:
+        if "Ninguno (no consumo proteína en polvo)" in proteina_polvo_tipos:
+            st.info("ℹ️ **No consumes proteína en polvo**")
+        else:
+            st.success(f"✅ **Tipos de proteína seleccionados:** {len(proteina_polvo_tipos)}")
+            for tipo in proteina_polvo_tipos:
+                st.write(f"  • {tipo}")
+    
+    if preferencia_marca_proteina and len(preferencia_marca_proteina) == 1:
+        if preferencia_marca_proteina[0] == "Sí":
+            marca = st.session_state.get('nombre_marca_proteina', '').strip()
+            if marca:
+                st.success(f"🏷️ **Marca preferida:** {marca}")
+            else:
+                st.warning("⚠️ **Recuerda:** Debes escribir el nombre de tu marca preferida")
+        else:
+            st.info("ℹ️ **Sin preferencia de marca específica**")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Botones de navegación
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("⬅️ Anterior"):
+            go_to_previous_step()
+    with col3:
+        if st.button("Siguiente ➡️"):
+            advance_to_next_step()
+
+# GRUPO 4: FUENTES DE GRASA SALUDABLE
+elif current_step == 4:
+    # Enhanced visual step indicator with orientation info
+    st.markdown("""
+    <div style="
+        background: linear-gradient(135deg, #FF9800 0%, #F57C00 100%);
+        color: white;
+        padding: 2rem 1.5rem;
+        border-radius: 15px;
+        text-align: center;
+        margin-bottom: 2rem;
+        box-shadow: 0 8px 25px rgba(255, 152, 0, 0.3);
+        border: 3px solid #FF9800;
+    ">
+        <h1 style="margin: 0; font-size: 2.2rem; font-weight: bold; color: white;">
+            🥑 PASO 4: FUENTES DE GRASA SALUDABLE
+        </h1>
+        <p style="margin: 1rem 0 0.5rem 0; font-size: 1.2rem; opacity: 0.9; color: white;">
+            Paso 4 de 14 en tu evaluación personalizada de patrones alimentarios
+        </p>
+        <div style="background: rgba(255,255,255,0.2); padding: 1rem; border-radius: 10px; margin-top: 1.5rem;">
+            <p style="margin: 0; font-size: 1rem; color: white; font-weight: 500;">
+                🎯 <strong>Objetivo:</strong> Identificar las fuentes de grasas saludables que incluyes en tu dieta
+            </p>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Informational content box for orientation
+    st.info("""
+    ### 📋 Información importante para este paso:
+    
+    **¿Por qué evaluamos estas grasas?**
+    - Las grasas saludables son esenciales para la absorción de vitaminas liposolubles (A, D, E, K)
+    - Favorecen el funcionamiento hormonal y la salud cardiovascular
+    - Proporcionan saciedad y mejoran el sabor de los alimentos
+    
+    **¿Cómo completar este paso?**
+    - Revisa cada categoría de alimentos verticalmente
+    -Marca TODOS los alimentos que consumas con facilidad, incluso ocasionalmente, estos alimentos se utilizarán para personalizar al máximo tu plan de alimentación.
+    - Si no consumes ningún alimento de una categoría, marca "Ninguno"
+    
+    **💡 Consejo:** Es mejor marcar más opciones que menos. Si ocasionalmente comes algo, inclúyelo.
+    """)
+    
+
+    # Actualizar progreso
+    progress.progress(28, text="Paso 4 de 14: Fuentes de grasa saludable")
+
+    st.markdown('<div class="content-card">', unsafe_allow_html=True)
+    
+    buscador_de_opciones(4)
+    
+    st.markdown("#### 🥑 Grasas naturales de alimentos")
+    grasas_naturales = create_vertical_checkboxes(
+        "¿Cuáles de estas grasas naturales consumes?",
+        OPCIONES["grasas_naturales"],
+        "grasas_naturales",
+        "Marca todas las grasas naturales que consumes. Si no consumes ninguna, marca 'Ninguno'."
+    )
+    
+    st.markdown("#### 🌰 Frutos secos y semillas")
+    frutos_secos_semillas = create_vertical_checkboxes(
+        "¿Cuáles de estos frutos secos y semillas consumes?",
+        OPCIONES["frutos_secos_semillas"],
+        "frutos_secos_semillas",
+        "Marca todos los frutos secos y semillas que consumes. Si no consumes ninguno, marca 'Ninguno'."
+    )
+    
+    st.markdown("#### 🧈 Mantequillas y pastas vegetales")
+    mantequillas_vegetales = create_vertical_checkboxes(
+        "¿Cuáles de estas mantequillas y pastas vegetales consumes?",
+        OPCIONES["mantequillas_vegetales"],
+        "mantequillas_vegetales",
+        "Marca todas las que consumes. Si no consumes ninguna, marca 'Ninguno'."
+    )
+
+    # Resumen del paso actual
+    total_seleccionados = (len(st.session_state.get('grasas_naturales', [])) + 
+                          len(st.session_state.get('frutos_secos_semillas', [])) + 
+                          len(st.session_state.get('mantequillas_vegetales', [])))
+    if total_seleccionados > 0:
+        st.success(f"✅ **¡Excelente!** Has seleccionado {total_seleccionados} fuentes de grasa saludable. Estas son clave para un plan equilibrado.")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Botones de navegación
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("⬅️ Anterior"):
+            go_to_previous_step()
+    with col3:
+        if st.button("Siguiente ➡️"):
+            advance_to_next_step()
+
+# GRUPO 5: CARBOHIDRATOS COMPLEJOS Y CEREALES
+elif current_step == 5:
+    # Add prominent visual step indicator
+    st.markdown("""
+    <div style="
+        background: linear-gradient(135deg, #9C27B0 0%, #7B1FA2 100%);
+        color: white;
+        padding: 1.5rem;
+        border-radius: 15px;
+        text-align: center;
+        margin-bottom: 2rem;
+        box-shadow: 0 8px 25px rgba(156, 39, 176, 0.3);
+        border: 3px solid #9C27B0;
+        animation: slideIn 0.5s ease-out;
+    ">
+        <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
+            🍞 PASO 5: CARBOHIDRATOS COMPLEJOS Y CEREALES
+        </h2>
+        <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
+            Estás en el paso 5 de 14 - Selecciona los carbohidratos que consumes
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+
+    
+    st.markdown("""
+    <div class="content-card" style="background: linear-gradient(135deg, #F4C430 0%, #DAA520 100%); color: #1E1E1E; margin-bottom: 2rem; border: 3px solid #DAA520;">
+        <h2 style="color: #1E1E1E; text-align: center; margin-bottom: 1rem;">
+            🍞 PASO 5: CARBOHIDRATOS COMPLEJOS Y CEREALES
+        </h2>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Actualizar progreso
+    progress.progress(36, text="Paso 5 de 14: Carbohidratos complejos y cereales")
+    
+    # Actualizar indicador visual
+    st.markdown("""
+    <div style="text-align: center; margin-bottom: 1rem;">
+        <div style="background: #F4C430; color: #1E1E1E; border-radius: 50%; width: 50px; height: 50px; display: flex; align-items: center; justify-content: center; margin: 0 auto; font-weight: bold; font-size: 1.2rem;">4</div>
+        <h4 style="color: #F4C430; margin-top: 0.5rem;">PASO ACTUAL</h4>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.markdown('<div class="content-card">', unsafe_allow_html=True)
+    st.markdown("""
+    ### 🎯 ¿Qué necesitamos saber?
+    En este paso evaluaremos los **carbohidratos complejos y cereales** que consumes. 
+    Estos alimentos proporcionan energía sostenida y fibra importante para tu digestión.
+    
+    **💡 Instrucción:** - Revisa cada categoría de alimentos verticalmente
+    -Marca TODOS los alimentos que consumas con facilidad, incluso ocasionalmente, estos alimentos se utilizarán para personalizar al máximo tu plan de alimentación.
+    - Si no consumes ningún alimento de una categoría, marca "Ninguno"
+    
+    **💡 Consejo:** Es mejor marcar más opciones que menos. Si ocasionalmente comes algo, inclúyelo.
+    """)
+    
+    buscador_de_opciones(5)
+    
+    st.markdown("#### 🌾 Cereales y granos integrales")
+    cereales_integrales = create_vertical_checkboxes(
+        "¿Cuáles de estos cereales y granos integrales consumes? (Puedes seleccionar varios)",
+        OPCIONES["cereales_integrales"],
+        "cereales_integrales",
+        "Preferentemente elige al menos uno de esta lista. Se pueden seleccionar más de uno. Si no consumes ninguno, selecciona 'Ninguno'."
+    )
+    
+    st.markdown("#### 🍝 Pastas")
+    pastas = create_vertical_checkboxes(
+        "¿Cuáles de estas pastas consumes? (Puedes seleccionar varios)",
+        OPCIONES["pastas"],
+        "pastas",
+        "Preferentemente elige al menos uno de esta lista. Se pueden seleccionar más de uno. Si no consumes ninguno, selecciona 'Ninguno'."
+    )
+    
+    st.markdown("#### 🌽 Tortillas y panes")
+    tortillas_panes = create_vertical_checkboxes(
+        "¿Cuáles de estas tortillas y panes consumes? (Puedes seleccionar varios)",
+        OPCIONES["tortillas_panes"],
+        "tortillas_panes",
+        "Preferentemente elige al menos uno de esta lista. Se pueden seleccionar más de uno. Si no consumes ninguno, selecciona 'Ninguno'."
+    )
+    
+    st.markdown("#### 🥔 Raíces y tubérculos (forma base)")
+    raices_tuberculos = create_vertical_checkboxes(
+        "¿Cuáles de estas raíces y tubérculos consumes? (Puedes seleccionar varios)",
+        OPCIONES["raices_tuberculos"],
+        "raices_tuberculos",
+        "Preferentemente elige al menos uno de esta lista. Se pueden seleccionar más de uno. Si no consumes ninguno, selecciona 'Ninguno'."
+    )
+    
+    st.markdown("#### 🫘 Leguminosas")
+    leguminosas = create_vertical_checkboxes(
+        "¿Cuáles de estas leguminosas consumes? (Puedes seleccionar varios)",
+        OPCIONES["leguminosas"],
+        "leguminosas",
+        "Preferentemente elige al menos uno de esta lista. Se pueden seleccionar más de uno. Si no consumes ninguno, selecciona 'Ninguno'."
+    )
+
+    # Resumen del paso actual
+    total_seleccionados = (len(st.session_state.get('cereales_integrales', [])) + 
+                          len(st.session_state.get('pastas', [])) + 
+                          len(st.session_state.get('tortillas_panes', [])) + 
+                          len(st.session_state.get('raices_tuberculos', [])) + 
+                          len(st.session_state.get('leguminosas', [])))
+    if total_seleccionados > 0:
+        st.success(f"✅ **¡Excelente!** Has seleccionado {total_seleccionados} fuentes de carbohidratos. Estos proporcionarán energía para tu plan.")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Botones de navegación
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("⬅️ Anterior"):
+            go_to_previous_step()
+    with col3:
+        if st.button("Siguiente ➡️"):
+            advance_to_next_step()
+
+# GRUPO 6: VEGETALES
+elif current_step == 6:
+    # Add prominent visual step indicator
+    st.markdown("""
+    <div style="
+        background: linear-gradient(135deg, #4CAF50 0%, #388E3C 100%);
+        color: white;
+        padding: 1.5rem;
+        border-radius: 15px;
+        text-align: center;
+        margin-bottom: 2rem;
+        box-shadow: 0 8px 25px rgba(76, 175, 80, 0.3);
+        border: 3px solid #4CAF50;
+        animation: slideIn 0.5s ease-out;
+    ">
+        <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
+            🥬 PASO 6: VEGETALES
+        </h2>
+        <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
+            Estás en el paso 6 de 14 - Selecciona los vegetales que consumes
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+
+    
+    st.markdown("""
+    <div class="content-card" style="background: linear-gradient(135deg, #F4C430 0%, #DAA520 100%); color: #1E1E1E; margin-bottom: 2rem; border: 3px solid #DAA520;">
+        <h2 style="color: #1E1E1E; text-align: center; margin-bottom: 1rem;">
+            🥬 PASO 6: VEGETALES
+        </h2>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Actualizar progreso
+    progress.progress(43, text="Paso 6 de 14: Vegetales")
+    
+    # Actualizar indicador visual
+    st.markdown("""
+    <div style="text-align: center; margin-bottom: 1rem;">
+        <div style="background: #F4C430; color: #1E1E1E; border-radius: 50%; width: 50px; height: 50px; display: flex; align-items: center; justify-content: center; margin: 0 auto; font-weight: bold; font-size: 1.2rem;">5</div>
+        <h4 style="color: #F4C430; margin-top: 0.5rem;">PASO ACTUAL</h4>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.markdown('<div class="content-card">', unsafe_allow_html=True)
+    st.markdown("""
+    ### 🎯 ¿Qué necesitamos saber?
+    En este paso evaluaremos los **vegetales** que consumes o toleras fácilmente. 
+    Los vegetales aportan vitaminas, minerales, fibra y antioxidantes esenciales para tu salud.
+    
+   **💡 Instrucción:** - Revisa cada categoría de alimentos verticalmente
+    -Marca TODOS los alimentos que consumas con facilidad, incluso ocasionalmente, estos alimentos se utilizarán para personalizar al máximo tu plan de alimentación.
+    - Si no consumes ningún alimento de una categoría, marca "Ninguno"
+    
+    **💡 Consejo:** Es mejor marcar más opciones que menos. Si ocasionalmente comes algo, inclúyelo.
+    """)
+    
+    buscador_de_opciones(6)
+    
+    vegetales_lista = create_vertical_checkboxes(
+        "¿Cuáles de estos vegetales consumes o toleras fácilmente? (Puedes seleccionar varios)",
+        OPCIONES["vegetales_lista"],
+        "vegetales_lista",
+        "Incluye vegetales que consumas crudos, cocidos, al vapor, salteados o en cualquier preparación. Entre más vegetales selecciones, más variado será tu plan."
+    )
+
+    # Resumen del paso actual con categorización
+    vegetales_count = len(st.session_state.get('vegetales_lista', []))
+    if vegetales_count >= 15:
+        st.success(f"✅ **¡Excelente diversidad!** Has seleccionado {vegetales_count} vegetales. Esto permitirá crear un plan muy variado y nutritivo.")
+    elif vegetales_count >= 8:
+        st.success(f"✅ **¡Buena variedad!** Has seleccionado {vegetales_count} vegetales. Tu plan tendrá buena diversidad nutricional.")
+    elif vegetales_count >= 3:
+        st.info(f"ℹ️ **Variedad básica:** Has seleccionado {vegetales_count} vegetales. Considera probar otros vegetales para enriquecer tu plan.")
+    elif vegetales_count > 0:
+        st.warning(f"⚠️ **Poca variedad:** Solo has seleccionado {vegetales_count} vegetales. Te recomendamos incluir más opciones.")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Botones de navegación
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("⬅️ Anterior"):
+            go_to_previous_step()
+    with col3:
+        if st.button("Siguiente ➡️"):
+            advance_to_next_step()
+
+# GRUPO 7: FRUTAS
+elif current_step == 7:
+    # Add prominent visual step indicator
+    st.markdown("""
+    <div style="
+        background: linear-gradient(135deg, #E91E63 0%, #C2185B 100%);
+        color: white;
+        padding: 1.5rem;
+        border-radius: 15px;
+        text-align: center;
+        margin-bottom: 2rem;
+        box-shadow: 0 8px 25px rgba(233, 30, 99, 0.3);
+        border: 3px solid #E91E63;
+        animation: slideIn 0.5s ease-out;
+    ">
+        <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
+            🍎 PASO 7: FRUTAS
+        </h2>
+        <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
+            Estás en el paso 7 de 14 - Selecciona las frutas que consumes
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+
+    
+    st.markdown("""
+    <div class="content-card" style="background: linear-gradient(135deg, #F4C430 0%, #DAA520 100%); color: #1E1E1E; margin-bottom: 2rem; border: 3px solid #DAA520;">
+        <h2 style="color: #1E1E1E; text-align: center; margin-bottom: 1rem;">
+            🍎 PASO 7: FRUTAS
+        </h2>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Actualizar progreso
+    progress.progress(50, text="Paso 7 de 14: Frutas - ¡Completando grupos principales!")
+    
+    # Actualizar indicador visual
+    st.markdown("""
+    <div style="text-align: center; margin-bottom: 1rem;">
+        <div style="background: #F4C430; color: #1E1E1E; border-radius: 50%; width: 50px; height: 50px; display: flex; align-items: center; justify-content: center; margin: 0 auto; font-weight: bold; font-size: 1.2rem;">6</div>
+        <h4 style="color: #F4C430; margin-top: 0.5rem;">¡ÚLTIMO GRUPO PRINCIPAL!</h4>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.markdown('<div class="content-card">', unsafe_allow_html=True)
+    st.markdown("""
+    ### 🎯 ¿Qué necesitamos saber?
+    En este último paso de los grupos principales evaluaremos las **frutas** que disfrutas o toleras bien. 
+    Las frutas aportan vitaminas, antioxidantes, fibra y azúcares naturales para energía.
+    
+  **💡 Instrucción:** - Revisa cada categoría de alimentos verticalmente
+    -Marca TODOS los alimentos que consumas con facilidad, incluso ocasionalmente, estos alimentos se utilizarán para personalizar al máximo tu plan de alimentación.
+    - Si no consumes ningún alimento de una categoría, marca "Ninguno"
+    
+    **💡 Consejo:** Es mejor marcar más opciones que menos. Si ocasionalmente comes algo, inclúyelo.
+    """)
+    
+    buscador_de_opciones(7)
+    
+    frutas_lista = create_vertical_checkboxes(
+        "¿Cuáles de estas frutas disfrutas o toleras bien? (Puedes seleccionar varios)",
+        OPCIONES["frutas_lista"],
+        "frutas_lista",
+        "Incluye frutas que consumas solas, en licuados, ensaladas, postres naturales o cualquier preparación. La variedad de frutas enriquecerá tu plan nutricional."
+    )
+
+    # Resumen del paso actual con categorización
+    frutas_count = len(st.session_state.get('frutas_lista', []))
+    if frutas_count >= 12:
+        st.success(f"🎉 **¡Fantástica variedad!** Has seleccionado {frutas_count} frutas. Tu plan tendrá una excelente diversidad de sabores y nutrientes.")
+    elif frutas_count >= 6:
+        st.success(f"✅ **¡Buena selección!** Has seleccionado {frutas_count} frutas. Esto permitirá variedad en tu plan alimentario.")
+    elif frutas_count >= 3:
+        st.info(f"ℹ️ **Selección básica:** Has seleccionado {frutas_count} frutas. Considera incluir más opciones para mayor variedad.")
+    elif frutas_count > 0:
+        st.warning(f"⚠️ **Poca variedad:** Solo has seleccionado {frutas_count} frutas. Te sugerimos probar más opciones.")
+    
+    # Mensaje de finalización de grupos principales
+    st.markdown("""
+    ---
+    ### 🎊 ¡Felicitaciones!
+    Has completado la evaluación de los **6 grupos alimentarios principales**. 
+    A continuación encontrarás secciones adicionales para complementar tu perfil nutricional.
+    """)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Botones de navegación
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("⬅️ Anterior"):
+            go_to_previous_step()
+    with col3:
+        if st.button("Siguiente ➡️"):
+            advance_to_next_step()
+
+# APARTADO EXTRA 1: ACEITES DE COCCIÓN (PASO 8)
+elif current_step == 8:
+    # Add prominent visual step indicator
+    st.markdown("""
+    <div style="
+        background: linear-gradient(135deg, #795548 0%, #5D4037 100%);
+        color: white;
+        padding: 1.5rem;
+        border-radius: 15px;
+        text-align: center;
+        margin-bottom: 2rem;
+        box-shadow: 0 8px 25px rgba(121, 85, 72, 0.3);
+        border: 3px solid #795548;
+        animation: slideIn 0.5s ease-out;
+    ">
+        <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
+            🍳 PASO 7: ACEITES DE COCCIÓN PREFERIDOS
+        </h2>
+        <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
+            Estás en el paso 8 de 14 - Información Adicional (Opcional)
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+
+    
+    st.markdown("""
+    <div class="content-card" style="background: linear-gradient(135deg, #27AE60 0%, #2ECC71 100%); color: #1E1E1E; margin-bottom: 2rem; border: 3px solid #27AE60;">
+        <h2 style="color: #1E1E1E; text-align: center; margin-bottom: 1rem;">
+            🍳 PASO 7: ACEITES DE COCCIÓN PREFERIDOS
+        </h2>
+        <p style="text-align: center; margin: 0; font-weight: bold;">Información Adicional - Opcional</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Actualizar progreso
+    progress.progress(57, text="Paso 8 de 14: Aceites de cocción (Opcional)")
+    
+    st.markdown('<div class="content-card">', unsafe_allow_html=True)
+    st.markdown("""
+    ### 🎯 ¿Qué necesitamos saber?
+    Queremos conocer los **aceites y grasas** que utilizas para cocinar, freír, hornear o saltear tus alimentos.
+    Esto nos ayuda a adaptar las recetas a tus preferencias y métodos disponibles.
+    
+    **💡 Instrucción:** Selecciona TODAS las opciones que sueles usar en tu cocina. (Este paso es opcional)
+    """)
+    
+    st.info("💡 **Ayuda:** Incluye cualquier grasa o aceite que uses para cocinar, desde aceites vegetales hasta mantequilla o manteca.")
+    
+    aceites_coccion = create_vertical_checkboxes(
+        "¿Cuáles de estas grasas/aceites usas para cocinar?",
+        OPCIONES["aceites_coccion"],
+        "aceites_coccion",
+        "Marca todos los aceites y grasas que usas en tu cocina. Si no usas ninguno, marca 'Ninguno'."
+    )
+
+    # Resumen
+    aceites_count = len(st.session_state.get('aceites_coccion', []))
+    if aceites_count > 0:
+        st.success(f"✅ **Perfecto!** Has seleccionado {aceites_count} opciones. Esto nos ayuda a personalizar las recetas según tus métodos de cocción.")
+    else:
+        st.info("ℹ️ **Nota:** Si no seleccionas ningún aceite, asumiremos métodos de cocción sin grasa añadida.")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Botones de navegación
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("⬅️ Anterior"):
+            go_to_previous_step()
+    with col3:
+        if st.button("Siguiente ➡️"):
+            advance_to_next_step()
+
+# APARTADO EXTRA 2: BEBIDAS (PASO 9)
+elif current_step == 9:
+    # Add prominent visual step indicator
+    st.markdown("""
+    <div style="
+        background: linear-gradient(135deg, #00BCD4 0%, #0097A7 100%);
+        color: white;
+        padding: 1.5rem;
+        border-radius: 15px;
+        text-align: center;
+        margin-bottom: 2rem;
+        box-shadow: 0 8px 25px rgba(0, 188, 212, 0.3);
+        border: 3px solid #00BCD4;
+        animation: slideIn 0.5s ease-out;
+    ">
+        <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
+            🥤 PASO 8: BEBIDAS PARA HIDRATACIÓN
+        </h2>
+        <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
+            Estás en el paso 9 de 14 - Información Adicional (Opcional)
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+
+    
+    st.markdown("""
+    <div class="content-card" style="background: linear-gradient(135deg, #27AE60 0%, #2ECC71 100%); color: #1E1E1E; margin-bottom: 2rem; border: 3px solid #27AE60;">
+        <h2 style="color: #1E1E1E; text-align: center; margin-bottom: 1rem;">
+            🥤 PASO 8: BEBIDAS PARA HIDRATACIÓN
+        </h2>
+        <p style="text-align: center; margin: 0; font-weight: bold;">Información Adicional - Opcional</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Actualizar progreso
+    progress.progress(64, text="Paso 9 de 14: Bebidas para hidratación (Opcional)")
+    
+    st.markdown('<div class="content-card">', unsafe_allow_html=True)
+    st.markdown("""
+    ### 🎯 ¿Qué necesitamos saber?
+    Queremos conocer las **bebidas sin calorías** que consumes regularmente para mantenerte hidratado.
+    Esto nos ayuda a incluir opciones de hidratación que realmente disfrutes en tu plan.
+    
+    **💡 Instrucción:** Marca TODAS las bebidas que acostumbres tomar para hidratarte. (Este paso es opcional)
+    """)
+    
+    st.info("💡 **Ayuda:** Incluye cualquier bebida sin calorías o muy bajas en calorías que tomes durante el día.")
+    
+    bebidas_sin_calorias = create_vertical_checkboxes(
+        "¿Cuáles de estas bebidas sin calorías consumes regularmente?",
+        OPCIONES["bebidas_sin_calorias"],
+        "bebidas_sin_calorias",
+        "Marca todas las bebidas sin calorías que acostumbres. Si no consumes ninguna, marca 'Ninguno'."
+    )
+
+    # Resumen
+    bebidas_count = len(st.session_state.get('bebidas_sin_calorias', []))
+    if bebidas_count > 0:
+        st.success(f"✅ **Excelente!** Has seleccionado {bebidas_count} opciones de hidratación. Esto enriquece las recomendaciones de tu plan.")
+    else:
+        st.info("ℹ️ **Nota:** La hidratación es fundamental. Te recomendamos incluir al menos agua natural en tu rutina diaria.")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Botones de navegación
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("⬅️ Anterior"):
+            go_to_previous_step()
+    with col3:
+        if st.button("Siguiente ➡️"):
+            advance_to_next_step()
+
+# APARTADO EXTRA 3: MÉTODOS DE COCCIÓN (PASO 10)
+elif current_step == 10:
+    # Add prominent visual step indicator
+    st.markdown("""
+    <div style="
+        background: linear-gradient(135deg, #FF9800 0%, #F57C00 100%);
+        color: white;
+        padding: 1.5rem;
+        border-radius: 15px;
+        text-align: center;
+        margin-bottom: 2rem;
+        box-shadow: 0 8px 25px rgba(255, 152, 0, 0.3);
+        border: 3px solid #FF9800;
+        animation: slideIn 0.5s ease-out;
+    ">
+        <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
+            👨‍🍳 PASO 9: MÉTODOS DE COCCIÓN DISPONIBLES
+        </h2>
+        <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
+            Estás en el paso 10 de 14 - Optimización de Recetas
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.markdown("""
+    <div class="content-card" style="background: linear-gradient(135deg, #FF9800 0%, #F57C00 100%); color: #FFFFFF; margin-bottom: 2rem; border: 3px solid #FF9800;">
+        <h2 style="color: #FFFFFF; text-align: center; margin-bottom: 1rem;">
+            👨‍🍳 PASO 9: MÉTODOS DE COCCIÓN DISPONIBLES
+        </h2>
+        <p style="text-align: center; margin: 0; font-weight: bold;">Personalización de Recetas Según tus Recursos</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Actualizar progreso
+    progress.progress(71, text="Paso 10 de 14: Métodos de cocción disponibles")
+    
+    st.markdown('<div class="content-card">', unsafe_allow_html=True)
+    st.markdown("""
+    ### 🎯 ¿Por qué necesitamos esta información?
+    Conocer los **métodos de cocción** que tienes disponibles nos permite:
+    - Sugerir recetas que realmente puedas preparar en tu cocina
+    - Optimizar las preparaciones según tus herramientas y equipos
+    - Adaptar las técnicas de cocción a tus recursos disponibles
+    - Maximizar sabores y texturas con los métodos que prefieres
+    
+    **💡 Instrucción:** Selecciona TODOS los métodos de cocción que uses regularmente o que tengas disponibles en tu cocina.
+    """)
+    
+    st.markdown("### 👨‍🍳 ¿Cuáles son tus métodos de cocción más accesibles?")
+    st.info("💡 **Ayuda:** Selecciona los métodos de cocción que más usas o que tienes disponibles en tu cocina. Esto nos ayuda a sugerir recetas que puedas preparar fácilmente.")
+    
+    metodos_coccion_accesibles = create_vertical_checkboxes(
+        "Selecciona los métodos de cocción que más usas o prefieres:",
+        OPCIONES["metodos_coccion_accesibles"],
+        "metodos_coccion_accesibles",
+        "Incluye todos los métodos que uses regularmente o que tengas disponibles"
+    )
+    
+    otro_metodo_coccion = st.text_input(
+        "¿Otro método de cocción? Especifica aquí:",
+        value=st.session_state.get('otro_metodo_coccion', ''),
+        placeholder="Ej: cocina de leña, olla de presión, wok, etc.",
+        help="Especifica cualquier otro método de cocción que uses"
+    )
+
+    # Guardar en session state (solo text input)
+    st.session_state.otro_metodo_coccion = otro_metodo_coccion
+    
+    # Resumen de métodos de cocción
+    metodos_count = len(st.session_state.get('metodos_coccion_accesibles', []))
+    if metodos_count > 0:
+        st.success(f"✅ **Excelente!** Has seleccionado {metodos_count} métodos de cocción. Esto nos permite personalizar las recetas según tus recursos disponibles.")
+    else:
+        st.info("ℹ️ **Nota:** Te recomendamos seleccionar al menos un método de cocción para poder adaptar las recetas a tus posibilidades.")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Botones de navegación
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("⬅️ Anterior"):
+            go_to_previous_step()
+    with col3:
+        if st.button("Siguiente ➡️"):
+            advance_to_next_step()
+
+# APARTADO EXTRA 4: ALERGIAS/INTOLERANCIAS (PASO 11)
+elif current_step == 11:
+    # Add prominent visual step indicator
+    st.markdown("""
+    <div style="
+        background: linear-gradient(135deg, #F44336 0%, #D32F2F 100%);
+        color: white;
+        padding: 1.5rem;
+        border-radius: 15px;
+        text-align: center;
+        margin-bottom: 2rem;
+        box-shadow: 0 8px 25px rgba(244, 67, 54, 0.3);
+        border: 3px solid #F44336;
+        animation: slideIn 0.5s ease-out;
+    ">
+        <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
+            🚨 PASO 10: ALERGIAS E INTOLERANCIAS ALIMENTARIAS
+        </h2>
+        <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
+            Estás en el paso 11 de 14 - Información Crítica para tu Seguridad
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+
+    
+    st.markdown("""
+    <div class="content-card" style="background: linear-gradient(135deg, #E74C3C 0%, #C0392B 100%); color: #FFFFFF; margin-bottom: 2rem; border: 3px solid #E74C3C;">
+        <h2 style="color: #FFFFFF; text-align: center; margin-bottom: 1rem;">
+            🚨 PASO 10: ALERGIAS E INTOLERANCIAS ALIMENTARIAS
+        </h2>
+        <p style="text-align: center; margin: 0; font-weight: bold;">Información Crítica para tu Seguridad</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Actualizar progreso
+    progress.progress(79, text="Paso 11 de 14: Alergias e intolerancias (Crítico)")
+    
+    st.markdown('<div class="content-card">', unsafe_allow_html=True)
+    
+    st.markdown("""
+    ### ⚠️ Información Crítica para tu Seguridad Alimentaria
+    Esta sección es **fundamental** para crear un plan alimentario seguro y adecuado para ti.
+    Por favor, sé muy específico y honesto con tus respuestas.
+    """)
+    
+    st.markdown("### ❗ 1. ¿Tienes alguna alergia alimentaria?")
+    st.error("🚨 **IMPORTANTE:** Las alergias alimentarias pueden ser graves. Marca todas las que tengas, aunque sean leves.")
+    st.info("💡 **Instrucción:** Debes seleccionar al menos una opción. Si no tienes alergias, selecciona 'Ninguna'.")
+    alergias_alimentarias = create_vertical_checkboxes(
+        "Selecciona TODAS las alergias alimentarias que tienes:",
+        OPCIONES["alergias_alimentarias"],
+        "alergias_alimentarias",
+        "Incluye cualquier alergia, desde leve hasta severa. Si no tienes alergias, selecciona 'Ninguna'."
+    )
+    
+    otra_alergia = st.text_input(
+        "¿Otra alergia no mencionada? Especifica aquí:",
+        value=st.session_state.get('otra_alergia', ''),
+        placeholder="Ej: alergia al apio, maní, sulfitos, etc.",
+        help="Especifica cualquier otra alergia alimentaria que tengas, en caso de que no tengas escribe ninguna"
+    )
+    
+    st.markdown("---")
+    st.markdown("### ⚠️ 2. ¿Tienes alguna intolerancia o malestar digestivo?")
+    st.warning("💡 **Ayuda:** Las intolerancias causan malestar pero no son tan graves como las alergias. Incluye cualquier alimento que te cause gases, hinchazón, dolor abdominal, etc.")
+    st.info("💡 **Instrucción:** Debes seleccionar al menos una opción. Si no tienes intolerancias, selecciona 'Ninguna'.")
+    intolerancias_digestivas = create_vertical_checkboxes(
+        "Selecciona las intolerancias o malestares digestivos que experimentas:",
+        OPCIONES["intolerancias_digestivas"],
+        "intolerancias_digestivas",
+        "Incluye alimentos que te causen malestar digestivo. Si no tienes intolerancias, marca 'Ninguna'."
+    )
+    
+    otra_intolerancia = st.text_input(
+        "¿Otra intolerancia no mencionada? Especifica aquí:",
+        value=st.session_state.get('otra_intolerancia', ''),
+        placeholder="Ej: intolerancia a la fructosa, sorbitol, etc.",
+        help="Especifica cualquier otra intolerancia o malestar digestivo derivado de alimentos que tengas, en caso de que no tengas escribe ninguna"
+    )
+    
+
+
+    # Guardar en session state (solo text inputs)
+    st.session_state.otra_alergia = otra_alergia
+    st.session_state.otra_intolerancia = otra_intolerancia
+    
+    # Alimentos marcados en los pasos anteriores que chocan con lo declarado aquí
+    respuestas_paso = respuestas_actuales()
+    for conflicto in conflictos(respuestas_paso):
+        st.error(f"🚫 **Posible conflicto con {conflicto['motivo']}:** en los pasos anteriores marcaste {', '.join(conflicto['alimentos'])}. Regresa a desmarcarlos o confirma con tu nutriólogo si sí los toleras.")
+        for alimento in conflicto["alimentos"]:
+            alternativas = sugerencias(alimento, respuestas_paso)
+            if alternativas:
+                st.caption(f"🔄 En lugar de {alimento} podrías usar: {', '.join(a['alimento'] for a in alternativas)}")
+    
+    # Resumen de restricciones
+    alergias_count = len(st.session_state.get('alergias_alimentarias', []))
+    intolerancias_count = len(st.session_state.get('intolerancias_digestivas', []))
+    total_restricciones = alergias_count + intolerancias_count
+    if otra_alergia:
+        total_restricciones += 1
+    if otra_intolerancia:
+        total_restricciones += 1
+        
+    if total_restricciones > 0:
+        st.warning(f"⚠️ **Restricciones identificadas:** {total_restricciones} restricciones alimentarias. Tu plan será cuidadosamente adaptado para evitar estos alimentos.")
+    else:
+        st.success("✅ **Sin restricciones:** No has reportado alergias o intolerancias. Esto nos da mayor flexibilidad para tu plan alimentario.")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Botones de navegación
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("⬅️ Anterior"):
+            go_to_previous_step()
+    with col3:
+        if st.button("Siguiente ➡️"):
+            advance_to_next_step()
+
+# APARTADO EXTRA 5: ANTOJOS (PASO 12)
+elif current_step == 12:
+    # Add prominent visual step indicator
+    st.markdown("""
+    <div style="
+        background: linear-gradient(135deg, #673AB7 0%, #512DA8 100%);
+        color: white;
+        padding: 1.5rem;
+        border-radius: 15px;
+        text-align: center;
+        margin-bottom: 2rem;
+        box-shadow: 0 8px 25px rgba(103, 58, 183, 0.3);
+        border: 3px solid #673AB7;
+        animation: slideIn 0.5s ease-out;
+    ">
+        <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
+            😋 PASO 12: EVALUACIÓN DE ANTOJOS ALIMENTARIOS
+        </h2>
+        <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
+            Estás en el paso 12 de 14 - Información para Estrategias
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+
+    
+    st.markdown("""
+    <div class="content-card" style="background: linear-gradient(135deg, #9B59B6 0%, #8E44AD 100%); color: #FFFFFF; margin-bottom: 2rem; border: 3px solid #9B59B6;">
+        <h2 style="color: #FFFFFF; text-align: center; margin-bottom: 1rem;">
+            😋 PASO 12: EVALUACIÓN DE ANTOJOS ALIMENTARIOS
+        </h2>
+        <p style="text-align: center; margin: 0; font-weight: bold;">Información para Estrategias</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Actualizar progreso
+    progress.progress(86, text="Paso 12 de 14: Antojos alimentarios")
+    
+    st.markdown('<div class="content-card">', unsafe_allow_html=True)
+    st.markdown("""
+    ### 🧠 ¿Por qué evaluamos tus antojos?
+    Conocer tus **antojos frecuentes** nos ayuda a:
+    - Crear estrategias para manejarlos de forma saludable
+    - Incluir alternativas satisfactorias en tu plan
+    - Desarrollar un plan realista y sostenible a largo plazo
+    
+    **💡 Instrucción:** Debes seleccionar al menos una opción en cualquiera de las categorías de antojos. 
+    Si no tienes antojos frecuentes, selecciona 'Ninguno' en al menos una categoría.
+    """)
+    
+    buscador_de_opciones(12)
+    
+    st.markdown("---")
+    st.markdown("### 🍫 Antojos de alimentos dulces / postres")
+    antojos_dulces = create_vertical_checkboxes(
+        "¿Cuáles de estos alimentos dulces se te antojan frecuentemente? (Puedes seleccionar varios)",
+        OPCIONES["antojos_dulces"],
+        "antojos_dulces",
+        "Incluye cualquier dulce, postre o alimento azucarado que se te antoje frecuentemente. Si no tienes antojos dulces, selecciona 'Ninguno'."
+    )
+    
+    st.markdown("---")
+    st.markdown("### 🧂 Antojos de alimentos salados / snacks")
+    antojos_salados = create_vertical_checkboxes(
+        "¿Cuáles de estos alimentos salados se te antojan frecuentemente? (Puedes seleccionar varios)",
+        OPCIONES["antojos_salados"],
+        "antojos_salados",
+        "Incluye botanas, frituras o alimentos salados que se te antojen. Si no tienes antojos salados, selecciona 'Ninguno'."
+    )
+    
+    st.markdown("---")
+    st.markdown("### 🌮 Antojos de comidas rápidas / callejeras")
+    antojos_comida_rapida = create_vertical_checkboxes(
+        "¿Cuáles de estas comidas rápidas se te antojan frecuentemente? (Puedes seleccionar varios)",
+        OPCIONES["antojos_comida_rapida"],
+        "antojos_comida_rapida",
+        "Incluye comida rápida, platillos callejeros o preparaciones que se te antojen. Si no tienes antojos de comida rápida, selecciona 'Ninguno'."
+    )
+    
+    st.markdown("---")
+    st.markdown("### 🍹 Antojos de bebidas y postres líquidos")
+    antojos_bebidas = create_vertical_checkboxes(
+        "¿Cuáles de estas bebidas se te antojan frecuentemente? (Puedes seleccionar varios)",
+        OPCIONES["antojos_bebidas"],
+        "antojos_bebidas",
+        "Incluye bebidas azucaradas, alcohólicas o postres líquidos que se te antojen. Si no tienes antojos de bebidas, selecciona 'Ninguno'."
+    )
+    
+    st.markdown("---")
+    st.markdown("### 🔥 Antojos de alimentos con condimentos estimulantes")
+    antojos_picantes = create_vertical_checkboxes(
+        "¿Cuáles de estos alimentos picantes se te antojan frecuentemente? (Puedes seleccionar varios)",
+        OPCIONES["antojos_picantes"],
+        "antojos_picantes",
+        "Incluye alimentos picantes, con chile o condimentos intensos que se te antojen. Si no tienes antojos picantes, selecciona 'Ninguno'."
+    )
+    
+    st.markdown("---")
+    st.markdown("### ❓ Otros antojos no mencionados")
+    st.info("💡 **Ayuda:** Especifica cualquier otro antojo que no aparezca en las listas anteriores.")
+    otros_antojos = st.text_area(
+        "¿Qué otros alimentos o preparaciones se te antojan mucho?",
+        value=st.session_state.get('otros_antojos', ''),
+        placeholder="Ej: palomitas con mantequilla, raspados, gelatinas comerciales, etc.",
+        help="Describe cualquier otro antojo que no esté en las listas anteriores"
+    )
+
+    # Guardar en session state (solo text input)
+    st.session_state.otros_antojos = otros_antojos
+    
+    # Análisis de antojos
+    antojos_dulces_count = len(st.session_state.get('antojos_dulces', []))
+    antojos_salados_count = len(st.session_state.get('antojos_salados', []))
+    antojos_comida_rapida_count = len(st.session_state.get('antojos_comida_rapida', []))
+    antojos_bebidas_count = len(st.session_state.get('antojos_bebidas', []))
+    antojos_picantes_count = len(st.session_state.get('antojos_picantes', []))
+    
+    total_antojos = (antojos_dulces_count + antojos_salados_count + 
+                    antojos_comida_rapida_count + antojos_bebidas_count + antojos_picantes_count)
+    
+    if total_antojos >= 15:
+        st.warning(f"⚠️ **Muchos antojos identificados:** {total_antojos} tipos de antojos. Será importante desarrollar estrategias específicas de manejo.")
+    elif total_antojos >= 8:
+        st.info(f"ℹ️ **Antojos moderados:** {total_antojos} tipos de antojos. Incluiremos alternativas saludables en tu plan.")
+    elif total_antojos >= 3:
+        st.success(f"✅ **Pocos antojos:** {total_antojos} tipos de antojos. Esto facilitará mantener un plan alimentario saludable.")
+    elif total_antojos > 0:
+        st.success(f"✅ **Muy pocos antojos:** Solo {total_antojos} tipos. Tu autocontrol alimentario parece ser muy bueno.")
+    else:
+        st.success("🎉 **Sin antojos frecuentes:** Excelente autocontrol alimentario. Esto será una gran ventaja para tu plan.")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Botones de navegación
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("⬅️ Anterior"):
+            go_to_previous_step()
+    with col3:
+        if st.button("Siguiente ➡️"):
+            advance_to_next_step()
+
+# PASO 13: FRECUENCIA DE COMIDAS
+elif current_step == 13:
+    # CAMBIO: Limpiar antigua variable de radio button para evitar conflictos
+    if 'frecuencia_comidas' in st.session_state:
+        del st.session_state['frecuencia_comidas']
+        
+    # Add prominent visual step indicator
+    st.markdown("""
+    <div style="
+        background: linear-gradient(135deg, #FF9800 0%, #F57C00 100%);
+        color: white;
+        padding: 1.5rem;
+        border-radius: 15px;
+        text-align: center;
+        margin-bottom: 2rem;
+        box-shadow: 0 8px 25px rgba(255, 152, 0, 0.3);
+        border: 3px solid #FF9800;
+        animation: slideIn 0.5s ease-out;
+    ">
+        <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
+            🍽️ PASO 13: FRECUENCIA DE COMIDAS PREFERIDA
+        </h2>
+        <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
+            Estás en el paso 13 de 14 - Adaptación a tu Estilo de Vida
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+
+    
+    # Actualizar progreso
+    progress.progress(93, text="Paso 13 de 14: Frecuencia de comidas preferida")
+    
+    st.markdown('<div class="content-card">', unsafe_allow_html=True)
+    st.markdown("""
+    ### 🎯 ¿Cuál es tu frecuencia de comidas ideal?
+    Queremos conocer la **frecuencia de comidas** que mejor se adapta a tu agenda diaria y estilo de vida.
+    Esto nos ayudará a estructurar tu plan alimentario de manera que sea práctico y sostenible para ti.
+    
+    **💡 Instrucción:** Selecciona la opción que mejor describa tu rutina alimentaria preferida o más realista para tu día a día.
+    """)
+    
+    st.info("💡 **Ayuda:** Piensa en tu horario de trabajo, actividades y preferencias personales para elegir la frecuencia más conveniente.")
+    
+    # CAMBIO: Usar checkboxes verticales en lugar de radio buttons para consistencia con otros pasos
+    # y para resolver problemas de persistencia
+    frecuencia_comidas_ck = create_vertical_checkboxes(
+        "¿Cuál es la frecuencia de comidas que mejor se adapta a tu agenda diaria?",
+        OPCIONES["frecuencia_comidas_ck"],
+        "frecuencia_comidas_ck",
+        "Selecciona UNA SOLA opción que mejor se ajuste a tu rutina diaria. Si seleccionas más de una, se mostrará un error."
+    )
+    
+    # Validación para asegurar que solo se seleccione UNA opción
+    if len(frecuencia_comidas_ck) > 1:
+        st.error("❌ **Error:** Solo puedes seleccionar UNA frecuencia de comidas. Por favor, desmarca las opciones adicionales.")
+    elif len(frecuencia_comidas_ck) == 0:
+        st.warning("⚠️ **Atención:** Debes seleccionar una frecuencia de comidas para continuar.")
+    
+    # Obtener la opción seleccionada (si hay exactamente una)
+    frecuencia_seleccionada = frecuencia_comidas_ck[0] if len(frecuencia_comidas_ck) == 1 else ""
+    
+    # Campo adicional si selecciona "Otro"
+    otra_frecuencia = ""
+    if frecuencia_seleccionada == "Otro (especificar)":
+        otra_frecuencia = st.text_input(
+            "Especifica tu frecuencia de comidas preferida:",
+            value=st.session_state.get('otra_frecuencia', ''),
+            placeholder="Ej: Ayuno intermitente 16:8, una comida al día, 5 comidas pequeñas, etc.",
+            help="Describe tu rutina alimentaria ideal con el mayor detalle posible"
+        )
+        st.session_state.otra_frecuencia = otra_frecuencia
+    else:
+        # Limpiar el campo otra_frecuencia si se selecciona una opción diferente
+        st.session_state.otra_frecuencia = ""
+    
+    # Resumen de la selección
+    if frecuencia_seleccionada and len(frecuencia_comidas_ck) == 1:
+        if frecuencia_seleccionada == "Otro (especificar)" and otra_frecuencia:
+            st.success(f"✅ **Frecuencia seleccionada:** {otra_frecuencia}")
+        elif frecuencia_seleccionada != "Otro (especificar)":
+            st.success(f"✅ **Frecuencia seleccionada:** {frecuencia_seleccionada}")
+        
+        # Información adicional según la selección
+        if "3 comidas principales" in frecuencia_seleccionada:
+            st.info("🍽️ **Estructura clásica:** Ideal para horarios regulares y control de porciones.")
+        elif "una colación" in frecuencia_seleccionada:
+            st.info("🥪 **Con una colación:** Excelente para mantener energía estable durante el día.")
+        elif "dos colaciones" in frecuencia_seleccionada:
+            st.info("🍎 **Con dos colaciones:** Perfecta para personas con horarios largos o alta actividad física.")
+        elif "dos comidas principales" in frecuencia_seleccionada:
+            st.info("⏰ **Ayuno intermitente:** Ideal para quienes prefieren ventanas de alimentación más concentradas.")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Botones de navegación
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("⬅️ Anterior"):
+            go_to_previous_step()
+    with col3:
+        if st.button("Siguiente ➡️"):
+            advance_to_next_step()
+
+# PASO 14: SUGERENCIAS DE MENÚS (antes paso 13)
+elif current_step == 14:
+    # Add prominent visual step indicator
+    st.markdown("""
+    <div style="
+        background: linear-gradient(135deg, #4CAF50 0%, #388E3C 100%);
+        color: white;
+        padding: 1.5rem;
+        border-radius: 15px;
+        text-align: center;
+        margin-bottom: 2rem;
+        box-shadow: 0 8px 25px rgba(76, 175, 80, 0.3);
+        border: 3px solid #4CAF50;
+        animation: slideIn 0.5s ease-out;
+    ">
+        <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
+            📝 PASO 14: SUGERENCIAS DE MENÚS
+        </h2>
+        <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
+            Paso 14 de 15 en tu evaluación personalizada
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+
+    
+    # Actualizar progreso
+    progress.progress(93, text="Paso 14 de 15: Sugerencias de menús")
+    
+    st.markdown('<div class="content-card">', unsafe_allow_html=True)
+    st.markdown("""
+    ### 💭 Sugerencias de Menús y Preferencias Adicionales
+    Para finalizar tu evaluación, nos gustaría conocer si tienes **sugerencias específicas de menús** que te gustaría que adaptemos a tu plan nutricional, o si prefieres que nuestro equipo de nutrición se encargue de crear las propuestas basándose en toda la información que has proporcionado.
+    
+    **💡 Instrucción:** Puedes escribir menús específicos, platos favoritos, recetas que te gustan, o simplemente indicar que confías en nuestro criterio profesional.
+    """)
+    
+    st.info("💡 **Ayuda:** Puedes mencionar platos específicos, combinaciones que te gustan, recetas familiares, o cualquier idea que tengas. También puedes dejar que nuestro equipo decida completamente.")
+    
+    sugerencias_menus = st.text_area(
+        "¿Tienes alguna sugerencia de menús que quisieras que adaptemos, o prefieres que el equipo decida por ti?",
+        value=st.session_state.get('sugerencias_menus', ''),
+        placeholder="""Ejemplos:
+- Me gustan los desayunos con avena y frutas
+- Prefiero pollo a la plancha con verduras para la cena
+- Me encantan las ensaladas coloridas para el almuerzo
+- Que el equipo decida completamente basándose en mi evaluación
+- Quiero incluir comida mexicana tradicional saludable
+- Prefiero menús sencillos y fáciles de preparar""",
+        height=120,
+        help="Escribe todas las ideas, preferencias o sugerencias que tengas, o indica si prefieres que decidamos nosotros"
+    )
+    
+    # Guardar en session state
+    st.session_state.sugerencias_menus = sugerencias_menus
+    
+    # Opciones predefinidas rápidas
+    st.markdown("### 🎯 Opciones Rápidas (Opcional)")
+    st.markdown("Si no sabes qué escribir, puedes seleccionar una de estas opciones:")
+    
+    opcion_rapida = st.selectbox(
+        "Selecciona una opción si no tienes sugerencias específicas:",
+        [
+            "Seleccionar...",
+            "Que el equipo decida completamente por mí",
+            "Prefiero comida mexicana saludable",
+            "Quiero menús sencillos y fáciles de preparar", 
+            "Me gusta variar mucho los sabores",
+            "Prefiero preparaciones al vapor y a la plancha",
+            "Quiero incluir más recetas internacionales saludables"
+        ],
+        key='opcion_rapida_menu',
+        help="Estas son opciones generales que puedes usar si no tienes ideas específicas"
+    )
+    
+    # Auto-llenar si selecciona una opción rápida
+    if opcion_rapida and opcion_rapida != "Seleccionar..." and not sugerencias_menus:
+        st.session_state.sugerencias_menus = opcion_rapida
+        st.rerun()
+    
+    # Mostrar resumen de la entrada
+    if sugerencias_menus:
+        palabra_count = len(sugerencias_menus.split())
+        if palabra_count > 0:
+            st.success(f"✅ **Sugerencias recibidas:** {palabra_count} palabras. Excelente, esto nos ayudará mucho a personalizar tu plan.")
+        
+        # Análisis rápido del contenido
+        if "equipo decida" in sugerencias_menus.lower() or "decidan por mí" in sugerencias_menus.lower():
+            st.info("👨‍🍳 **Perfecto:** Nuestro equipo de nutrición creará menús completamente personalizados basándose en toda tu evaluación.")
+        elif len(sugerencias_menus) > 50:
+            st.info("📝 **Excelente:** Has proporcionado sugerencias detalladas que nos ayudarán a crear un plan muy específico para ti.")
+        else:
+            st.info("💡 **Recibido:** Tus preferencias han sido registradas y las consideraremos en tu plan personalizado.")
+    else:
+        st.info("ℹ️ **Nota:** Si no escribes nada, nuestro equipo creará menús basándose en todos los alimentos que seleccionaste en los pasos anteriores.")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Botones de navegación - Ya no es el último paso, ahora tiene un paso más
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("⬅️ Anterior"):
+            go_to_previous_step()
+    with col3:
+        if st.button("Siguiente ➡️"):
+            advance_to_next_step()
+
+# PASO 15: CONDICIONES MÉDICAS Y MEDICAMENTOS
+elif current_step == 15:
+    # Add prominent visual step indicator
+    st.markdown("""
+    <div style="
+        background: linear-gradient(135deg, #FF5722 0%, #E64A19 100%);
+        color: white;
+        padding: 1.5rem;
+        border-radius: 15px;
+        text-align: center;
+        margin-bottom: 2rem;
+        box-shadow: 0 8px 25px rgba(255, 87, 34, 0.3);
+        border: 3px solid #FF5722;
+        animation: slideIn 0.5s ease-out;
+    ">
+        <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
+            🩺 PASO 15: CONDICIONES MÉDICAS Y MEDICAMENTOS
+        </h2>
+        <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
+            Paso 15 de 15 - Información Crítica para tu Seguridad
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Actualizar progreso
+    progress.progress(100, text="Paso 15 de 15: Condiciones médicas y medicamentos (CRÍTICO)")
+    
+    st.markdown('<div class="content-card">', unsafe_allow_html=True)
+    
+    st.markdown("""
+    ### 🎯 ¿Por qué necesitamos esta información?
+    Esta sección es **fundamental y crítica** para tu seguridad. Conocer tus condiciones médicas, 
+    medicamentos y suplementos nos permite:
+    
+    - 🎯 **Adaptar** el plan nutricional a tus condiciones médicas específicas
+    - ⚠️ **Evitar** interacciones negativas entre alimentos y medicamentos
+    - 🛡️ **Garantizar** que el plan sea seguro y efectivo para tu salud
+    - 💊 **Proporcionar** recomendaciones personalizadas considerando tu contexto médico completo
+    
+    **💡 Instrucción:** Por favor completa TODA esta sección con la mayor precisión posible. 
+    La información médica es confidencial y será tratada con total privacidad.
+    """)
+    
+    st.error("🚨 **IMPORTANTE:** Esta información es CRÍTICA para tu seguridad. Sé completamente honesto y específico.")
+    
+    # Sección 1: Condiciones Médicas y Fisiológicas
+    st.markdown("---")
+    st.markdown("### 📋 1. Condiciones Médicas y Fisiológicas Actuales")
+    st.warning("⚠️ **Instrucción:** Selecciona TODAS las condiciones médicas que tengas actualmente. Si no tienes ninguna, selecciona 'Ninguna de las anteriores'.")
+    
+    buscador_de_opciones(15)
+    
+    condiciones_medicas = create_vertical_checkboxes(
+        "¿Cuáles de estas condiciones médicas o fisiológicas tienes actualmente?",
+        OPCIONES["condiciones_medicas"],
+        "condiciones_medicas",
+        "Marca TODAS las condiciones que tengas. Si no tienes ninguna, marca 'Ninguna de las anteriores'."
+    )
+    
+    # Validar exclusividad de "Ninguna de las anteriores"
+    if "Ninguna de las anteriores" in condiciones_medicas and len(condiciones_medicas) > 1:
+        st.error("❌ **Error:** Si seleccionas 'Ninguna de las anteriores', no puedes seleccionar otras condiciones médicas. Por favor, desmarca 'Ninguna de las anteriores' o desmarca las otras opciones.")
+    
+    condiciones_otras = st.text_input(
+        "¿Otra condición médica no mencionada? Especifica aquí:",
+        value=st.session_state.get('condiciones_otras', ''),
+        placeholder="Ej: fibromialgia, lupus, etc. Si no aplica, escribe 'No aplica'",
+        help="Especifica cualquier otra condición médica que tengas. Campo obligatorio - escribe 'No aplica' si no tienes otras condiciones"
+    )
+    st.session_state.condiciones_otras = condiciones_otras
+    
+    # Sección 2: Medicamentos de Uso Frecuente
+    st.markdown("---")
+    st.markdown("### 💊 2. Medicamentos de Uso Frecuente")
+    st.info("💡 **Ayuda:** Incluye TODOS los medicamentos que tomes regularmente (recetados, de venta libre, etc.)")
+    
+    consume_medicamentos = create_vertical_checkboxes(
+        "¿Consumes medicamentos de forma regular?",
+        OPCIONES["consume_medicamentos"],
+        "consume_medicamentos",
+        "Selecciona SOLO UNA opción: Sí o No"
+    )
+    
+    # Validar que solo se seleccione una opción
+    if len(consume_medicamentos) > 1:
+        st.error("❌ **Error:** Solo puedes seleccionar UNA opción (Sí o No). Por favor, desmarca la opción adicional.")
+    elif len(consume_medicamentos) == 0:
+        st.warning("⚠️ **Atención:** Debes seleccionar si consumes medicamentos o no.")
+    
+    # Mostrar campo de lista si selecciona "Sí"
+    medicamentos_lista = ""
+    if len(consume_medicamentos) == 1 and consume_medicamentos[0] == "Sí":
+        st.markdown("#### 📝 Lista detallada de medicamentos")
+        st.warning("⚠️ **Obligatorio:** Proporciona la lista completa de medicamentos con nombre, dosis y frecuencia.")
+        medicamentos_lista = st.text_area(
+            "Lista de medicamentos que consumes regularmente:",
+            value=st.session_state.get('medicamentos_lista', ''),
+            placeholder="""Ejemplo:
+- Metformina 850mg - 2 veces al día (desayuno y cena)
+- Levotiroxina 100mcg - 1 vez al día (en ayunas)
+- Losartán 50mg - 1 vez al día (por la mañana)
+- Omeprazol 20mg - 1 vez al día (antes del desayuno)
+- Atorvastatina 20mg - 1 vez al día (por la noche)
+
+Por favor especifica: Nombre del medicamento, dosis y frecuencia de consumo""",
+            height=150,
+            help="Especifica TODOS tus medicamentos con nombre completo, dosis y frecuencia. Esta información es crítica."
+        )
+        st.session_state.medicamentos_lista = medicamentos_lista
+        
+        if not medicamentos_lista.strip():
+            st.error("❌ **Campo obligatorio:** Si consumes medicamentos, debes especificar la lista completa.")
+    else:
+        # Limpiar el campo si selecciona "No"
+        st.session_state.medicamentos_lista = ""
+    
+    # Sección 3: Suplementos Nutricionales
+    st.markdown("---")
+    st.markdown("### 💊 3. Suplementos Nutricionales Adicionales")
+    st.info("💡 **Ayuda:** Además de la proteína en polvo que ya evaluamos, ¿consumes otros suplementos?")
+    
+    consume_suplementos = create_vertical_checkboxes(
+        "¿Consumes otros suplementos nutricionales además de proteína en polvo?",
+        OPCIONES["consume_suplementos"],
+        "consume_suplementos",
+        "Selecciona SOLO UNA opción: Sí o No"
+    )
+    
+    # Validar que solo se seleccione una opción
+    if len(consume_suplementos) > 1:
+        st.error("❌ **Error:** Solo puedes seleccionar UNA opción (Sí o No). Por favor, desmarca la opción adicional.")
+    elif len(consume_suplementos) == 0:
+        st.warning("⚠️ **Atención:** Debes seleccionar si consumes suplementos adicionales o no.")
+    
+    # Mostrar campo de lista si selecciona "Sí"
+    suplementos_lista = ""
+    if len(consume_suplementos) == 1 and consume_suplementos[0] == "Sí":
+        st.markdown("#### 📝 Lista de suplementos nutricionales")
+        st.info("💡 **Opcional:** Si consumes suplementos, especifica cuáles y con qué frecuencia.")
+        suplementos_lista = st.text_area(
+            "Lista de suplementos que consumes además de proteína en polvo:",
+            value=st.session_state.get('suplementos_lista', ''),
+            placeholder="""Ejemplos comunes:
+- Multivitamínico - 1 vez al día
+- Omega 3 (aceite de pescado) - 2 cápsulas al día
+- Vitamina D3 - 1000 UI al día
+- Magnesio - 400mg antes de dormir
+- Creatina monohidrato - 5g al día
+- BCAA - durante el entrenamiento
+- Cafeína - pre-entreno
+- Probióticos - 1 cápsula al día
+
+Especifica: Nombre del suplemento, dosis y frecuencia""",
+            height=150,
+            help="Lista TODOS los suplementos que consumes además de la proteína en polvo"
+        )
+        st.session_state.suplementos_lista = suplementos_lista
+        
+        if not suplementos_lista.strip():
+            st.error("❌ **Campo obligatorio:** Si consumes suplementos, debes especificar la lista.")
+    else:
+        # Limpiar el campo si selecciona "No"
+        st.session_state.suplementos_lista = ""
+    
+    # Resumen visual de la sección
+    st.markdown("---")
+    st.markdown("### 📊 Resumen de Información Médica Registrada")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Condiciones médicas
+        condiciones_count = len(st.session_state.get('condiciones_medicas', []))
+        if condiciones_count > 0:
+            if "Ninguna de las anteriores" in st.session_state.get('condiciones_medicas', []):
+                st.success("✅ **Condiciones médicas:** Sin condiciones médicas reportadas")
+            else:
+                st.warning(f"⚠️ **Condiciones médicas:** {condiciones_count} condiciones reportadas")
+                st.write("**Condiciones seleccionadas:**")
+                for condicion in st.session_state.get('condiciones_medicas', []):
+                    st.write(f"  - {condicion}")
+        
+        # Medicamentos
+        if len(consume_medicamentos) == 1:
+            if consume_medicamentos[0] == "Sí":
+                if medicamentos_lista and medicamentos_lista.strip():
+                    med_count = len([line for line in medicamentos_lista.split('\n') if line.strip()])
+                    st.info(f"💊 **Medicamentos:** Consume medicamentos ({med_count} líneas registradas)")
+                else:
+                    st.error("❌ **Medicamentos:** Debe completar la lista de medicamentos")
+            else:
+                st.success("✅ **Medicamentos:** No consume medicamentos regulares")
+    
+    with col2:
+        # Otras condiciones
+        if condiciones_otras and condiciones_otras.strip() and condiciones_otras.strip().lower() != "no aplica":
+            st.info(f"📝 **Otra condición:** {condiciones_otras[:50]}{'...' if len(condiciones_otras) > 50 else ''}")
+        
+        # Suplementos
+        if len(consume_suplementos) == 1:
+            if consume_suplementos[0] == "Sí":
+                if suplementos_lista and suplementos_lista.strip():
+                    sup_count = len([line for line in suplementos_lista.split('\n') if line.strip()])
+                    st.info(f"💊 **Suplementos:** Consume suplementos adicionales ({sup_count} líneas registradas)")
+                else:
+                    st.error("❌ **Suplementos:** Debe completar la lista de suplementos")
+            else:
+                st.success("✅ **Suplementos:** No consume suplementos adicionales")
+    
+    # Advertencia importante
+    st.markdown("---")
+    st.error("""
+    ### ⚠️ ADVERTENCIA IMPORTANTE
+    
+    La información médica que has proporcionado será revisada cuidadosamente por nuestro equipo de nutrición.
+    
+    **Recuerda que:**
+    - Esta evaluación NO reemplaza una consulta médica profesional
+    - Si tienes condiciones médicas complejas, te recomendamos trabajar con tu médico tratante
+    - El plan nutricional será adaptado a tu contexto médico, pero siempre bajo supervisión profesional
+    - Cualquier duda sobre interacciones medicamento-alimento, consulta con tu médico
+    
+    **🔒 Privacidad:** Tu información médica es confidencial y será tratada con la máxima seguridad.
+    """)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Botones de navegación - Último paso, mostrar anterior y finalizar
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("⬅️ Anterior"):
+            go_to_previous_step()
+    with col3:
+        # Botón obligatorio para terminar y enviar email
+        if not st.session_state.get("correo_enviado", False):
+            if st.button("📧 Terminar y enviar mi evaluación por email", key="finalizar_con_email"):
+                # Validar el paso 15 primero
+                is_valid_15, missing_15 = validar_paso(15, respuestas_actuales())
+                faltantes = datos_completos_para_email()
+                grupos_incompletos = verificar_grupos_obligatorios_completos()
+                
+                if not is_valid_15:
+                    if len(missing_15) == 1:
+                        st.error(f"⚠️ **No se puede finalizar. Debes completar:** {missing_15[0]}")
+                    else:
+                        missing_list = "\n".join([f"• {item}" for item in missing_15])
+                        st.error(f"⚠️ **No se puede finalizar. Completa los siguientes campos del Paso 15:**\n\n{missing_list}")
+                    st.info("💡 **Recuerda:** Todos los campos del Paso 15 son obligatorios por tu seguridad.")
+                elif faltantes:
+                    st.error(f"❌ No se puede finalizar. Faltan datos personales: {', '.join(faltantes)}")
+                elif grupos_incompletos:
+                    st.error(f"""
+                    ❌ **No se puede finalizar. Grupos alimentarios incompletos:**
+                    
+                    Los siguientes grupos requieren al menos una selección (puedes marcar 'Ninguno' si no consumes ninguno):
+                    
+                    {chr(10).join([f'• {grupo}' for grupo in grupos_incompletos])}
+                    
+                    Por favor, completa estos grupos antes de finalizar la evaluación.
+                    """)
+                else:
+                    with st.spinner("📧 Finalizando evaluación y enviando resumen por email..."):
+                        guardar_evaluacion()
+                        resumen_completo = crear_resumen_email()
+                        ok = entregar_resumen_evaluacion(resumen_completo)
+                        if ok:
+                            registrar_evaluacion_finalizada(resumen_completo)
+                            st.session_state["correo_enviado"] = True
+                            st.session_state.step_completed[15] = True
+                            # La página de resultados muestra la confirmación y la celebración
+                            st.session_state.evaluacion_recien_enviada = True
+                            st.switch_page(PAGINA_RESULTADOS)
+                        else:
+                            st.error("❌ Error al registrar tu evaluación. Intenta nuevamente y contacta a soporte técnico si el problema persiste.")
+        else:
+            st.success("🎊 ¡Felicitaciones! Has completado toda la evaluación de patrones alimentarios.")
+            st.info("✅ Tu evaluación ya fue registrada y enviada a nuestro equipo.")
+
+mostrar_pie()
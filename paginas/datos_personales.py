@@ -0,0 +1,129 @@
+"""Página de datos personales: misión, descargo de responsabilidad y registro del cliente."""
+from datetime import datetime
+
+import streamlit as st
+
+from comun import (
+    PAGINA_CUESTIONARIO,
+    buscar_evaluacion_previa,
+    cargar_secciones_estaticas,
+    mostrar_pie,
+)
+from mupai.validacion import validate_email, validate_name, validate_phone
+
+# ==================== VISUALES INICIALES ====================
+secciones_estaticas = cargar_secciones_estaticas()
+
+# Misión, Visión y Compromiso con diseño mejorado
+# Expanders con carga diferida: el contenido solo se envía cuando están abiertos
+with st.expander("🎯 **Misión, Visión y Compromiso MUPAI**", expanded=False, key="expander_mision", on_change="rerun") as expander_mision:
+    if expander_mision.open:
+        for columna, tarjeta in zip(st.columns(3), secciones_estaticas["mision"]):
+            with columna:
+                st.markdown(tarjeta, unsafe_allow_html=True)
+
+# === DESCARGO DE RESPONSABILIDAD PROFESIONAL ===
+with st.expander("⚖️ **Descargo de Responsabilidad Profesional** (Requerido)", expanded=False, key="expander_descargo", on_change="rerun") as expander_descargo:
+    if expander_descargo.open:
+        for columna, tarjeta in zip(st.columns(4), secciones_estaticas["descargo"]):
+            with columna:
+                st.markdown(tarjeta, unsafe_allow_html=True)
+
+        # Checkbox destacado dentro del expander
+        st.markdown(secciones_estaticas["confirmacion_descargo"], unsafe_allow_html=True)
+
+    # El checkbox se dibuja siempre para que su estado no se pierda al cerrar el expander
+    acepto_descargo = st.checkbox(
+        "✅ **He leído y entiendo completamente el descargo de responsabilidad profesional**",
+        key="acepto_descargo",
+        help="Debes confirmar que has leído y entiendes las limitaciones de esta evaluación"
+    )
+
+# BLOQUE 0: Datos personales con diseño mejorado
+st.markdown('<div class="content-card">', unsafe_allow_html=True)
+st.markdown("### 👤 Información Personal")
+st.markdown("Por favor, completa todos los campos para comenzar tu evaluación de patrones alimentarios personalizada.")
+
+col1, col2 = st.columns(2)
+with col1:
+    nombre = st.text_input("Nombre completo*", value=st.session_state.get('nombre', ''), placeholder="Ej: Juan Pérez García", help="Tu nombre legal completo")
+    telefono = st.text_input("Teléfono*", value=st.session_state.get('telefono', ''), placeholder="Ej: 8661234567", help="10 dígitos sin espacios")
+    email_cliente = st.text_input("Email*", value=st.session_state.get('email_cliente', ''), placeholder="correo@ejemplo.com", help="Email válido para recibir resultados")
+
+with col2:
+    # Fix edad type issue by ensuring it's an integer
+    edad_value = st.session_state.get('edad', 25)
+    if isinstance(edad_value, str):
+        try:
+            edad_value = int(edad_value)
+        except (ValueError, TypeError):
+            edad_value = 25
+    
+    edad = st.number_input("Edad (años)*", min_value=15, max_value=80, value=edad_value, help="Tu edad actual")
+    sexo = st.selectbox("Sexo biológico*", options=["Hombre", "Mujer"], index=0 if st.session_state.get('sexo', 'Hombre') == 'Hombre' else 1, placeholder="Selecciona una opción", help="Necesario para análisis nutricionales precisos")
+    fecha_llenado = datetime.now().strftime("%Y-%m-%d")
+    st.info(f"📅 Fecha de evaluación: {fecha_llenado}")
+
+# Checkbox principal con diseño destacado (solo se habilita si se acepta el descargo)
+st.markdown(f"""
+<div class="content-card" style="border-left-color: var(--mupai-warning); margin: 1.5rem 0; background: linear-gradient(135deg, #1E1E1E 0%, #252525 100%); border: 2px solid var(--mupai-yellow); box-shadow: 0 8px 25px rgba(244, 196, 48, 0.15);">
+    <div style="display: flex; align-items: center; margin-bottom: 1rem;">
+        <span class="badge badge-warning" style="margin-right: 0.8rem; font-size: 0.9rem;">✅ ACEPTACIÓN REQUERIDA</span>
+        <h4 style="margin: 0; color: #FFF; font-size: 1.1rem;">Confirmación Final de Términos</h4>
+    </div>
+    <div style="background: rgba(244, 196, 48, 0.1); padding: 1rem; border-radius: 10px; border-left: 4px solid var(--mupai-yellow); margin-bottom: 1rem;">
+        <p style="color: #FFF; margin: 0; font-weight: 500; font-size: 1.05rem;">
+            <strong style="color: var(--mupai-yellow);">⚠️ IMPORTANTE:</strong> 
+            Para continuar con tu evaluación personalizada, debes confirmar que has leído y aceptas completamente nuestros términos y el descargo de responsabilidad profesional.
+        </p>
+    </div>
+</div>
+""", unsafe_allow_html=True)
+
+acepto_terminos = st.checkbox(
+    "✅ **He leído y acepto la política de privacidad y el descargo de responsabilidad**",
+    disabled=not st.session_state.get("acepto_descargo", False),
+    help="Primero debes leer y aceptar el descargo de responsabilidad profesional arriba" if not st.session_state.get("acepto_descargo", False) else "Acepto los términos para continuar con la evaluación"
+)
+
+if st.button("🚀 COMENZAR EVALUACIÓN", disabled=not (acepto_terminos and st.session_state.get("acepto_descargo", False))):
+    # Validación estricta de cada campo
+    name_valid, name_error = validate_name(nombre)
+    phone_valid, phone_error = validate_phone(telefono)
+    email_valid, email_error = validate_email(email_cliente)
+    
+    # Mostrar errores específicos para cada campo que falle
+    validation_errors = []
+    if not name_valid:
+        validation_errors.append(f"**Nombre:** {name_error}")
+    if not phone_valid:
+        validation_errors.append(f"**Teléfono:** {phone_error}")
+    if not email_valid:
+        validation_errors.append(f"**Email:** {email_error}")
+    
+    # Solo proceder si todas las validaciones pasan
+    if name_valid and phone_valid and email_valid:
+        st.session_state.datos_completos = True
+        st.session_state.nombre = nombre
+        st.session_state.telefono = telefono
+        st.session_state.email_cliente = email_cliente
+        st.session_state.edad = edad
+        st.session_state.sexo = sexo
+        st.session_state.fecha_llenado = fecha_llenado
+        st.session_state.acepto_terminos = acepto_terminos
+        buscar_evaluacion_previa()
+        st.success("✅ Datos registrados correctamente. ¡Continuemos con tu evaluación de patrones alimentarios!")
+        st.switch_page(PAGINA_CUESTIONARIO)
+    else:
+        # Mostrar todos los errores de validación
+        error_message = "⚠️ **Por favor corrige los siguientes errores:**\n\n" + "\n\n".join(validation_errors)
+        st.error(error_message)
+
+st.markdown('</div>', unsafe_allow_html=True)
+
+if not st.session_state.datos_completos:
+    st.markdown(secciones_estaticas["bienvenida"], unsafe_allow_html=True)
+else:
+    st.page_link(PAGINA_CUESTIONARIO, label="➡️ Continuar con el cuestionario", icon="🧾")
+
+mostrar_pie()
@@ -0,0 +1,346 @@
+"""Página de resultados: perfil alimentario final y opciones de email para administración."""
+import uuid
+
+import streamlit as st
+
+from comun import (
+    PAGINA_CUESTIONARIO,
+    crear_resumen_email,
+    datos_completos_para_email,
+    encolar_email_resumen,
+    mostrar_pie,
+    respuestas_actuales,
+    verificar_grupos_obligatorios_completos,
+)
+from mupai.nutrientes import perfil_nutricional
+from mupai.percentiles import (
+    GRUPOS_INDICE,
+    INDICES,
+    PERCENTIL_ALTO,
+    PERCENTIL_BAJO,
+    PERCENTIL_MEDIO,
+    posicion_en_cohorte,
+)
+from mupai.recetas import recetas_para
+
+
+def _top(percentil):
+    return f"top {max(1, round(100 - percentil))}%"
+
+
+def _inferior(percentil):
+    return f"{max(1, round(percentil))}% inferior"
+
+
+if st.session_state.pop("evaluacion_recien_enviada", False):
+    st.success("✅ ¡Evaluación completada exitosamente! Tu resumen fue registrado y se enviará por email a nuestro equipo.")
+    st.balloons()
+
+st.page_link(PAGINA_CUESTIONARIO, label="Volver al cuestionario", icon="🧾")
+st.progress(100, text="Análisis completo: Generando tu perfil alimentario personalizado")
+
+# RESULTADO FINAL: el router solo permite esta página después de enviar el email
+with st.expander("📈 **RESULTADO FINAL: Tu Perfil Alimentario Completo**", expanded=True):
+    st.markdown('<div class="content-card">', unsafe_allow_html=True)
+    
+    st.markdown("### 🎯 Tu Perfil Alimentario Personalizado")
+    
+    # Crear resumen del perfil por grupos actuales
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### 👤 Información Personal")
+        st.write(f"• **Nombre:** {st.session_state.get('nombre', 'No especificado')}")
+        st.write(f"• **Edad:** {st.session_state.get('edad', 'No especificado')} años")
+        st.write(f"• **Sexo:** {st.session_state.get('sexo', 'No especificado')}")
+        st.write(f"• **Fecha evaluación:** {st.session_state.get('fecha_llenado', 'No especificado')}")
+        
+        st.markdown("#### 🥩 Grupo 1: Proteínas Grasas")
+        total_proteinas_grasas = len(st.session_state.get('huevos_embutidos', [])) + len(st.session_state.get('carnes_res_grasas', [])) + len(st.session_state.get('carnes_cerdo_grasas', [])) + len(st.session_state.get('carnes_pollo_grasas', [])) + len(st.session_state.get('organos_grasos', [])) + len(st.session_state.get('quesos_grasos', [])) + len(st.session_state.get('lacteos_enteros', [])) + len(st.session_state.get('pescados_grasos', [])) + len(st.session_state.get('mariscos_grasos', []))
+        st.write(f"• **Total alimentos seleccionados:** {total_proteinas_grasas}")
+        if st.session_state.get('huevos_embutidos'):
+            st.write(f"• **Huevos/embutidos:** {len(st.session_state.get('huevos_embutidos', []))}")
+        if st.session_state.get('carnes_res_grasas'):
+            st.write(f"• **Carnes de res grasas:** {len(st.session_state.get('carnes_res_grasas', []))}")
+        if st.session_state.get('carnes_cerdo_grasas'):
+            st.write(f"• **Carnes de cerdo grasas:** {len(st.session_state.get('carnes_cerdo_grasas', []))}")
+        if st.session_state.get('carnes_pollo_grasas'):
+            st.write(f"• **Carnes de pollo/pavo grasas:** {len(st.session_state.get('carnes_pollo_grasas', []))}")
+        
+        st.markdown("#### 🍗 Grupo 2: Proteínas Magras")
+        total_proteinas_magras = len(st.session_state.get('carnes_res_magras', [])) + len(st.session_state.get('carnes_cerdo_magras', [])) + len(st.session_state.get('carnes_pollo_magras', [])) + len(st.session_state.get('organos_magros', [])) + len(st.session_state.get('pescados_magros', [])) + len(st.session_state.get('mariscos_magros', [])) + len(st.session_state.get('quesos_magros', [])) + len(st.session_state.get('lacteos_light', [])) + len(st.session_state.get('huevos_embutidos_light', []))
+        st.write(f"• **Total alimentos seleccionados:** {total_proteinas_magras}")
+        if st.session_state.get('carnes_res_magras'):
+            st.write(f"• **Carnes de res magras:** {len(st.session_state.get('carnes_res_magras', []))}")
+        if st.session_state.get('pescados_magros'):
+            st.write(f"• **Pescados magros:** {len(st.session_state.get('pescados_magros', []))}")
+    
+    with col2:
+        st.markdown("#### 🥑 Grupo 3: Grasas Saludables")
+        total_grasas = len(st.session_state.get('grasas_naturales', [])) + len(st.session_state.get('frutos_secos_semillas', [])) + len(st.session_state.get('mantequillas_vegetales', []))
+        st.write(f"• **Total alimentos seleccionados:** {total_grasas}")
+        if st.session_state.get('grasas_naturales'):
+            st.write(f"• **Grasas naturales:** {len(st.session_state.get('grasas_naturales', []))}")
+        if st.session_state.get('frutos_secos_semillas'):
+            st.write(f"• **Frutos secos/semillas:** {len(st.session_state.get('frutos_secos_semillas', []))}")
+        
+        st.markdown("#### 🍞 Grupo 4: Carbohidratos")
+        total_carbohidratos = len(st.session_state.get('cereales_integrales', [])) + len(st.session_state.get('pastas', [])) + len(st.session_state.get('tortillas_panes', [])) + len(st.session_state.get('raices_tuberculos', [])) + len(st.session_state.get('leguminosas', []))
+        st.write(f"• **Total alimentos seleccionados:** {total_carbohidratos}")
+        if st.session_state.get('cereales_integrales'):
+            st.write(f"• **Cereales:** {len(st.session_state.get('cereales_integrales', []))}")
+        if st.session_state.get('tortillas_panes'):
+            st.write(f"• **Tortillas/panes:** {len(st.session_state.get('tortillas_panes', []))}")
+        
+        st.markdown("#### 🥬 Grupos 5 y 6: Vegetales y Frutas")
+        st.write(f"• **Vegetales:** {len(st.session_state.get('vegetales_lista', []))} seleccionados")
+        st.write(f"• **Frutas:** {len(st.session_state.get('frutas_lista', []))} seleccionadas")
+    
+    # Perfil nutricional de los alimentos disponibles (valores promedio por 100 g)
+    perfil = perfil_nutricional(respuestas_actuales())
+    if perfil["por_grupo"]:
+        st.markdown("### 🔬 Perfil Nutricional de tus Alimentos Disponibles")
+        st.caption("Promedio por 100 g (o 100 ml) de los alimentos que marcaste en cada grupo.")
+        st.dataframe(
+            {
+                "Grupo": list(perfil["por_grupo"]),
+                "Alimentos": [g["alimentos"] for g in perfil["por_grupo"].values()],
+                "Energía (kcal)": [g["energia_kcal"] for g in perfil["por_grupo"].values()],
+                "Proteína (g)": [g["proteina_g"] for g in perfil["por_grupo"].values()],
+                "Grasa (g)": [g["grasa_g"] for g in perfil["por_grupo"].values()],
+                "Carbohidratos (g)": [g["carbohidratos_g"] for g in perfil["por_grupo"].values()],
+                "Fibra (g)": [g["fibra_g"] for g in perfil["por_grupo"].values()],
+            },
+            hide_index=True,
+            width="stretch",
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("#### 🌾 Fuentes de Fibra")
+            if perfil["fuentes_fibra"]:
+                st.write(", ".join(perfil["fuentes_fibra"]))
+            else:
+                st.write("• Ninguno de tus alimentos es alto en fibra (≥ 6 g por 100 g)")
+        with col2:
+            st.markdown("#### 🐟 Fuentes de Omega-3")
+            if perfil["fuentes_omega3"]:
+                st.write(", ".join(perfil["fuentes_omega3"]))
+            else:
+                st.write("• Ninguno de tus alimentos es fuente de omega-3")
+    
+    # Sección de información adicional
+    st.markdown("### 🍳 Información Adicional")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### 🧈 Aceites de Cocción")
+        if st.session_state.get('aceites_coccion'):
+            st.write(f"• **Aceites preferidos:** {len(st.session_state.get('aceites_coccion', []))} seleccionados")
+            aceites_top = st.session_state.get('aceites_coccion', [])[:3]
+            for aceite in aceites_top:
+                st.write(f"  - {aceite}")
+        
+        st.markdown("#### 🥤 Bebidas Sin Calorías")
+        if st.session_state.get('bebidas_sin_calorias'):
+            st.write(f"• **Bebidas preferidas:** {len(st.session_state.get('bebidas_sin_calorias', []))} seleccionadas")
+            bebidas_top = st.session_state.get('bebidas_sin_calorias', [])[:3]
+            for bebida in bebidas_top:
+                st.write(f"  - {bebida}")
+    
+    with col2:
+        st.markdown("#### 👨‍🍳 Métodos de Cocción")
+        if st.session_state.get('metodos_coccion_accesibles'):
+            st.write(f"• **Métodos preferidos:** {len(st.session_state.get('metodos_coccion_accesibles', []))} seleccionados")
+            metodos_top = st.session_state.get('metodos_coccion_accesibles', [])[:3]
+            for metodo in metodos_top:
+                st.write(f"  - {metodo}")
+        
+        if st.session_state.get('otro_metodo_coccion'):
+            st.write(f"• **Otro método:** {st.session_state.get('otro_metodo_coccion', 'No especificado')}")
+
+    # Restricciones importantes
+    if st.session_state.get('alergias_alimentarias') or st.session_state.get('intolerancias_digestivas'):
+        st.markdown("### ⚠️ Restricciones Importantes")
+        if st.session_state.get('alergias_alimentarias'):
+            st.warning(f"**Alergias alimentarias:** {', '.join(st.session_state.get('alergias_alimentarias', []))}")
+            if st.session_state.get('otra_alergia'):
+                st.write(f"• **Otra alergia:** {st.session_state.get('otra_alergia')}")
+        
+        if st.session_state.get('intolerancias_digestivas'):
+            st.info(f"**Intolerancias digestivas:** {', '.join(st.session_state.get('intolerancias_digestivas', []))}")
+            if st.session_state.get('otra_intolerancia'):
+                st.write(f"• **Otra intolerancia:** {st.session_state.get('otra_intolerancia')}")
+
+    # Antojos alimentarios
+    st.markdown("### 😋 Patrones de Antojos Alimentarios")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if st.session_state.get('antojos_dulces'):
+            st.write(f"• **Antojos dulces:** {len(st.session_state.get('antojos_dulces', []))} tipos")
+        if st.session_state.get('antojos_salados'):
+            st.write(f"• **Antojos salados:** {len(st.session_state.get('antojos_salados', []))} tipos")
+        if st.session_state.get('antojos_comida_rapida'):
+            st.write(f"• **Comida rápida:** {len(st.session_state.get('antojos_comida_rapida', []))} tipos")
+    
+    with col2:
+        if st.session_state.get('antojos_bebidas'):
+            st.write(f"• **Bebidas con calorías:** {len(st.session_state.get('antojos_bebidas', []))} tipos")
+        if st.session_state.get('antojos_picantes'):
+            st.write(f"• **Condimentos picantes:** {len(st.session_state.get('antojos_picantes', []))} tipos")
+        if st.session_state.get('otros_antojos'):
+            st.write(f"• **Otros antojos especificados:** Sí")
+
+    # Recetas del recetario hechas solo con alimentos, métodos y restricciones del cliente
+    recetas = recetas_para(respuestas_actuales())
+    st.markdown("### 🥘 Recetas que Puedes Preparar")
+    if recetas:
+        st.caption("Solo usan alimentos que marcaste y métodos de cocción que tienes; primero las que sustituyen tus antojos.")
+        for receta in recetas:
+            st.write(f"• **{receta['nombre']}** ({receta['tiempo']}, {receta['metodo']})")
+            st.caption(", ".join(receta["ingredientes"]))
+            if receta["antojos"]:
+                st.caption(f"😋 Alternativa para: {', '.join(receta['antojos'])}")
+    else:
+        st.info("Ninguna receta de nuestro recetario usa solo los alimentos y métodos que marcaste; tu coach te compartirá opciones a tu medida.")
+
+    # Información de frecuencia de comidas
+    # CAMBIO: Usar nueva variable de checkboxes
+    frecuencia_list = st.session_state.get('frecuencia_comidas_ck', [])
+    if frecuencia_list and len(frecuencia_list) > 0:
+        st.markdown("### 🍽️ Frecuencia de Comidas Preferida")
+        frecuencia = frecuencia_list[0]  # Tomar la primera (debería ser la única)
+        if frecuencia == "Otro (especificar)" and st.session_state.get('otra_frecuencia'):
+            st.info(f"**Frecuencia personalizada:** {st.session_state.get('otra_frecuencia')}")
+        else:
+            st.info(f"**Frecuencia seleccionada:** {frecuencia}")
+
+    # Sugerencias de menús
+    if st.session_state.get('sugerencias_menus'):
+        st.markdown("### 📝 Sugerencias de Menús")
+        sugerencias = st.session_state.get('sugerencias_menus', '')
+        palabra_count = len(sugerencias.split()) if sugerencias else 0
+        st.info(f"**Sugerencias del cliente:** {sugerencias[:200]}{'...' if len(sugerencias) > 200 else ''}")
+        if palabra_count > 0:
+            st.success(f"**Detalle:** {palabra_count} palabras de sugerencias específicas proporcionadas")
+
+    # Proteína en Polvo
+    st.markdown("### 💪 Proteína en Polvo")
+    if st.session_state.get('proteina_polvo_tipos'):
+        tipos_proteina = st.session_state.get('proteina_polvo_tipos', [])
+        if "Ninguno (no consumo proteína en polvo)" in tipos_proteina:
+            st.info("ℹ️ **No consume proteína en polvo**")
+        else:
+            st.write(f"• **Tipos consumidos:** {len(tipos_proteina)} seleccionados")
+            for tipo in tipos_proteina:
+                st.write(f"  - {tipo}")
+            
+            # Mostrar preferencia de marca
+            preferencia = st.session_state.get('preferencia_marca_proteina', [])
+            if preferencia and len(preferencia) > 0 and preferencia[0] == "Sí":
+                marca = st.session_state.get('nombre_marca_proteina', 'No especificada')
+                st.success(f"🏷️ **Marca preferida:** {marca}")
+
+    # Recomendaciones personalizadas basadas en datos reales
+    st.markdown("### 💡 Recomendaciones Personalizadas Iniciales")
+    
+    # Posición del cliente frente a la cohorte de evaluaciones guardadas (percentiles)
+    posicion = posicion_en_cohorte(respuestas_actuales())
+    recomendaciones = []
+    
+    # Verificar diversidad de alimentos frente a otros clientes
+    variedad = posicion["variedad_total"]
+    if variedad["percentil"] is None:
+        recomendaciones.append(f"📋 **Variedad registrada:** Marcaste {variedad['valor']} alimentos distintos. Aún no hay suficientes evaluaciones para compararte con otros clientes.")
+    elif variedad["percentil"] >= PERCENTIL_ALTO:
+        recomendaciones.append(f"✅ **Diversidad nutricional excelente:** Estás en el {_top(variedad['percentil'])} de variedad de alimentos entre nuestros clientes.")
+    elif variedad["percentil"] >= PERCENTIL_BAJO:
+        recomendaciones.append(f"🔄 **Diversidad nutricional moderada:** Estás en el {_top(variedad['percentil'])} de variedad de alimentos; considera ampliar algunos grupos alimentarios.")
+    else:
+        recomendaciones.append(f"📈 **Oportunidad de mejora:** Tu variedad de alimentos está en el {_inferior(variedad['percentil'])} de nuestros clientes; ampliarla puede enriquecer tu plan nutricional.")
+    
+    # Grupo más fuerte y más débil comparado con la cohorte
+    grupos = {indice: posicion[indice]["percentil"] for indice in GRUPOS_INDICE if posicion[indice]["percentil"] is not None}
+    if grupos:
+        fuerte, debil = max(grupos, key=grupos.get), min(grupos, key=grupos.get)
+        if grupos[fuerte] >= PERCENTIL_ALTO:
+            recomendaciones.append(f"🌟 **Fortaleza:** {_top(grupos[fuerte]).capitalize()} en {INDICES[fuerte]}.")
+        if grupos[debil] < PERCENTIL_BAJO:
+            recomendaciones.append(f"🔍 **Área a ampliar:** Tu {INDICES[debil]} está en el {_inferior(grupos[debil])} de nuestros clientes.")
+    
+    # Verificar métodos de cocción
+    metodos = posicion["metodos_coccion"]
+    if metodos["percentil"] is not None and metodos["percentil"] >= PERCENTIL_ALTO:
+        recomendaciones.append(f"👨‍🍳 **Versatilidad culinaria:** Tienes más métodos de cocción que la mayoría ({_top(metodos['percentil'])}), ideal para variedad en preparaciones.")
+    elif metodos["valor"]:
+        recomendaciones.append("🔧 **Métodos básicos:** Con tus métodos de cocción actuales puedes crear preparaciones nutritivas y variadas.")
+    
+    # Verificar restricciones
+    if st.session_state.get('alergias_alimentarias') or st.session_state.get('intolerancias_digestivas'):
+        recomendaciones.append("⚠️ **Plan especializado:** Tus restricciones alimentarias requerirán un plan personalizado cuidadoso.")
+    
+    # Verificar antojos frente a la cohorte
+    antojos = posicion["antojos"]
+    if antojos["percentil"] is not None and antojos["percentil"] >= PERCENTIL_ALTO:
+        recomendaciones.append(f"🧠 **Manejo de antojos:** Marcaste más antojos que la mayoría de nuestros clientes ({_top(antojos['percentil'])}); se recomienda desarrollar estrategias específicas para controlarlos.")
+    elif antojos["valor"] and (antojos["percentil"] is None or antojos["percentil"] >= PERCENTIL_MEDIO):
+        recomendaciones.append("⚖️ **Equilibrio:** Incluir alternativas saludables para satisfacer antojos ocasionales.")
+    
+    if not recomendaciones:
+        recomendaciones.append("📋 **Perfil base establecido:** Se requiere más información para recomendaciones específicas.")
+    
+    for i, rec in enumerate(recomendaciones, 1):
+        st.write(f"{i}. {rec}")
+
+    st.success(f"""
+    ### ✅ Análisis de patrones alimentarios completado exitosamente
+    
+    **Tu perfil nutricional personalizado está listo** y incluye información detallada sobre:
+    - 6 grupos alimentarios principales evaluados
+    - Suplementación con proteína en polvo (tipos y marcas preferidas)
+    - Métodos de cocción disponibles y preferidos  
+    - Restricciones, alergias e intolerancias específicas
+    - Patrones de antojos alimentarios identificados
+    - Aceites de cocción y bebidas sin calorías preferidas
+    
+    **Este análisis integral permitirá crear un plan nutricional completamente adaptado** 
+    a tus gustos, tolerancias y necesidades específicas.
+    
+    La información será enviada a nuestro equipo de nutrición para desarrollar tu plan personalizado.
+    """)
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+# Opción para reenviar manualmente
+st.markdown("---")
+st.markdown("### 📧 Opciones de Email")
+if st.button("📧 Reenviar Email", key="reenviar_email"):
+    faltantes = datos_completos_para_email()
+    grupos_incompletos = verificar_grupos_obligatorios_completos()
+    
+    if faltantes:
+        st.error(f"❌ No se puede reenviar el email. Faltan datos personales: {', '.join(faltantes)}")
+    elif grupos_incompletos:
+        st.error(f"""
+        ❌ **No se puede reenviar el email. Grupos incompletos:**
+        
+        Los siguientes grupos alimentarios requieren al menos una selección:
+        
+        {chr(10).join([f'• {grupo}' for grupo in grupos_incompletos])}
+        """)
+    else:
+        with st.spinner("📧 Reenviando resumen por email..."):
+            resumen_completo = crear_resumen_email()
+            ok = encolar_email_resumen(
+                resumen_completo,
+                st.session_state.get('nombre', ''),
+                st.session_state.get('fecha_llenado', ''),
+                clave=f"reenvio-{uuid.uuid4().hex}"
+            )
+            if ok:
+                st.session_state["correo_enviado"] = True
+                st.success("✅ Reenvío registrado. El email llegará a administración en breve.")
+            else:
+                st.error("❌ Error al reenviar email. Contacta a soporte técnico.")
+
+mostrar_pie()
@@ -1,854 +1,23 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-from datetime import datetime
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-import time
-import re
-import random
-import string
 
-# ==================== FUNCIÓN PARA CREAR RESUMEN DE EMAIL ====================
-
-def crear_resumen_email():
-    # Extract variables for complex conditionals
-    preferencia_marca = st.session_state.get('preferencia_marca_proteina', [])
-    tiene_preferencia_si = preferencia_marca and len(preferencia_marca) > 0 and preferencia_marca[0] == 'Sí'
-    marca_preferida = st.session_state.get('nombre_marca_proteina', 'No aplica') if tiene_preferencia_si else 'No aplica'
-    
-    resumen = f"""
-=====================================
-CUESTIONARIO DE SELECCIÓN ALIMENTARIA PERSONALIZADA - MUPAI
-=====================================
-Generado: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-Sistema: MUPAI v2.0 - Muscle Up Performance Assessment Intelligence
-
-=====================================
-DATOS DEL CLIENTE:
-=====================================
-- Nombre completo: {st.session_state.get('nombre', 'No especificado')}
-- Edad: {st.session_state.get('edad', 'No especificado')} años
-- Sexo: {st.session_state.get('sexo', 'No especificado')}
-- Teléfono: {st.session_state.get('telefono', 'No especificado')}
-- Email: {st.session_state.get('email_cliente', 'No especificado')}
-- Fecha evaluación: {st.session_state.get('fecha_llenado', 'No especificado')}
-
-=====================================
-🥩 GRUPO 1: PROTEÍNA ANIMAL CON MÁS CONTENIDO GRASO
-=====================================
-🍳 Huevos y embutidos:
-- {', '.join(st.session_state.get('huevos_embutidos', [])) if st.session_state.get('huevos_embutidos') else 'No especificado'}
-
-🐄 Carnes de res grasas:
-- {', '.join(st.session_state.get('carnes_res_grasas', [])) if st.session_state.get('carnes_res_grasas') else 'No especificado'}
-
-🐷 Carnes de cerdo grasas:
-- {', '.join(st.session_state.get('carnes_cerdo_grasas', [])) if st.session_state.get('carnes_cerdo_grasas') else 'No especificado'}
-
-🐔 Carnes de pollo/pavo grasas:
-- {', '.join(st.session_state.get('carnes_pollo_grasas', [])) if st.session_state.get('carnes_pollo_grasas') else 'No especificado'}
-
-🫀 Órganos y vísceras grasas:
-- {', '.join(st.session_state.get('organos_grasos', [])) if st.session_state.get('organos_grasos') else 'No especificado'}
-
-🐟 Pescados grasos:
-- {', '.join(st.session_state.get('pescados_grasos', [])) if st.session_state.get('pescados_grasos') else 'No especificado'}
-
-🦐 Mariscos/comida marina grasos:
-- {', '.join(st.session_state.get('mariscos_grasos', [])) if st.session_state.get('mariscos_grasos') else 'No especificado'}
-
-🧀 Quesos altos en grasa:
-- {', '.join(st.session_state.get('quesos_grasos', [])) if st.session_state.get('quesos_grasos') else 'No especificado'}
-
-🥛 Lácteos enteros:
-- {', '.join(st.session_state.get('lacteos_enteros', [])) if st.session_state.get('lacteos_enteros') else 'No especificado'}
-
-🐟 Pescados grasos:
-- {', '.join(st.session_state.get('pescados_grasos', [])) if st.session_state.get('pescados_grasos') else 'No especificado'}
-
-=====================================
-🍗 GRUPO 2: PROTEÍNA ANIMAL MAGRA
-=====================================
-🐄 Carnes de res magras:
-- {', '.join(st.session_state.get('carnes_res_magras', [])) if st.session_state.get('carnes_res_magras') else 'No especificado'}
-
-🐷 Carnes de cerdo magras:
-- {', '.join(st.session_state.get('carnes_cerdo_magras', [])) if st.session_state.get('carnes_cerdo_magras') else 'No especificado'}
-
-🐔 Carnes de pollo/pavo magras:
-- {', '.join(st.session_state.get('carnes_pollo_magras', [])) if st.session_state.get('carnes_pollo_magras') else 'No especificado'}
-
-🫀 Órganos y vísceras magros:
-- {', '.join(st.session_state.get('organos_magros', [])) if st.session_state.get('organos_magros') else 'No especificado'}
-
-🐟 Pescados magros:
-- {', '.join(st.session_state.get('pescados_magros', [])) if st.session_state.get('pescados_magros') else 'No especificado'}
-
-🦐 Mariscos/comida marina magros:
-- {', '.join(st.session_state.get('mariscos_magros', [])) if st.session_state.get('mariscos_magros') else 'No especificado'}
-
-🧀 Quesos magros:
-- {', '.join(st.session_state.get('quesos_magros', [])) if st.session_state.get('quesos_magros') else 'No especificado'}
-
-🥛 Lácteos light o reducidos:
-- {', '.join(st.session_state.get('lacteos_light', [])) if st.session_state.get('lacteos_light') else 'No especificado'}
-
-🥚 Huevos y embutidos light:
-- {', '.join(st.session_state.get('huevos_embutidos_light', [])) if st.session_state.get('huevos_embutidos_light') else 'No especificado'}
-
-=====================================
-🥑 GRUPO 3: FUENTES DE GRASA SALUDABLE
-=====================================
-🥑 Grasas naturales de alimentos:
-- {', '.join(st.session_state.get('grasas_naturales', [])) if st.session_state.get('grasas_naturales') else 'No especificado'}
-
-🌰 Frutos secos y semillas:
-- {', '.join(st.session_state.get('frutos_secos_semillas', [])) if st.session_state.get('frutos_secos_semillas') else 'No especificado'}
-
-🧈 Mantequillas y pastas vegetales:
-- {', '.join(st.session_state.get('mantequillas_vegetales', [])) if st.session_state.get('mantequillas_vegetales') else 'No especificado'}
-
-=====================================
-🍞 GRUPO 4: CARBOHIDRATOS COMPLEJOS Y CEREALES
-=====================================
-🌾 Cereales y granos integrales:
-- {', '.join(st.session_state.get('cereales_integrales', [])) if st.session_state.get('cereales_integrales') else 'No especificado'}
-
-🍝 Pastas:
-- {', '.join(st.session_state.get('pastas', [])) if st.session_state.get('pastas') else 'No especificado'}
-
-🌽 Tortillas y panes:
-- {', '.join(st.session_state.get('tortillas_panes', [])) if st.session_state.get('tortillas_panes') else 'No especificado'}
-
-🥔 Raíces y tubérculos (forma base):
-- {', '.join(st.session_state.get('raices_tuberculos', [])) if st.session_state.get('raices_tuberculos') else 'No especificado'}
-
-🫘 Leguminosas:
-- {', '.join(st.session_state.get('leguminosas', [])) if st.session_state.get('leguminosas') else 'No especificado'}
-
-=====================================
-🥬 GRUPO 5: VEGETALES
-=====================================
-- {', '.join(st.session_state.get('vegetales_lista', [])) if st.session_state.get('vegetales_lista') else 'No especificado'}
-
-=====================================
-🍎 GRUPO 6: FRUTAS
-=====================================
-- {', '.join(st.session_state.get('frutas_lista', [])) if st.session_state.get('frutas_lista') else 'No especificado'}
-
-=====================================
-🍳 APARTADO EXTRA: GRASA/ACEITE DE COCCIÓN FAVORITA
-=====================================
-- {', '.join(st.session_state.get('aceites_coccion', [])) if st.session_state.get('aceites_coccion') else 'No especificado'}
-
-=====================================
-🥤 BEBIDAS SIN CALORÍAS PARA HIDRATACIÓN
-=====================================
-- {', '.join(st.session_state.get('bebidas_sin_calorias', [])) if st.session_state.get('bebidas_sin_calorias') else 'No especificado'}
-
-=====================================
-🚨 SECCIÓN FINAL: ALERGIAS, INTOLERANCIAS Y PREFERENCIAS
-=====================================
-❗ 1. Alergias alimentarias:
-- {', '.join(st.session_state.get('alergias_alimentarias', [])) if st.session_state.get('alergias_alimentarias') else 'No especificado'}
-- Otra alergia especificada: {st.session_state.get('otra_alergia', 'No especificado')}
-
-⚠️ 2. Intolerancias o malestar digestivo:
-- {', '.join(st.session_state.get('intolerancias_digestivas', [])) if st.session_state.get('intolerancias_digestivas') else 'No especificado'}
-- Otra intolerancia especificada: {st.session_state.get('otra_intolerancia', 'No especificado')}
-
-=====================================
-👨‍🍳 MÉTODOS DE COCCIÓN DISPONIBLES
-=====================================
-🔥 Métodos de cocción más accesibles para el día a día:
-- {', '.join(st.session_state.get('metodos_coccion_accesibles', [])) if st.session_state.get('metodos_coccion_accesibles') else 'No especificado'}
-- Otro método especificado: {st.session_state.get('otro_metodo_coccion', 'No especificado')}
-
-=====================================
-😋 SECCIÓN DE ANTOJOS ALIMENTARIOS
-=====================================
-🍫 Alimentos dulces / postres:
-- {', '.join(st.session_state.get('antojos_dulces', [])) if st.session_state.get('antojos_dulces') else 'No especificado'}
-
-🧂 Alimentos salados / snacks:
-- {', '.join(st.session_state.get('antojos_salados', [])) if st.session_state.get('antojos_salados') else 'No especificado'}
-
-🌮 Comidas rápidas / callejeras:
-- {', '.join(st.session_state.get('antojos_comida_rapida', [])) if st.session_state.get('antojos_comida_rapida') else 'No especificado'}
-
-🍹 Bebidas y postres líquidos:
-- {', '.join(st.session_state.get('antojos_bebidas', [])) if st.session_state.get('antojos_bebidas') else 'No especificado'}
-
-🔥 Alimentos con condimentos estimulantes:
-- {', '.join(st.session_state.get('antojos_picantes', [])) if st.session_state.get('antojos_picantes') else 'No especificado'}
-
-❓ Otros antojos especificados:
-- {st.session_state.get('otros_antojos', 'No especificado')}
-
-=====================================
-🍽️ FRECUENCIA DE COMIDAS PREFERIDA
-=====================================
-- Frecuencia seleccionada: {st.session_state.get('frecuencia_comidas_ck', ['No especificado'])[0] if st.session_state.get('frecuencia_comidas_ck') else 'No especificado'}
-- Especificación adicional: {st.session_state.get('otra_frecuencia', 'No especificado')}
-
-=====================================
-📝 SUGERENCIAS DE MENÚS Y PREFERENCIAS
-=====================================
-- Sugerencias del cliente: {st.session_state.get('sugerencias_menus', 'No especificado')}
-- Opción rápida seleccionada: {st.session_state.get('opcion_rapida_menu', 'No especificado')}
-
-=====================================
-💪 Proteína en Polvo
-=====================================
-🥤 Tipos de proteína en polvo consumidos:
-- {', '.join(st.session_state.get('proteina_polvo_tipos', [])) if st.session_state.get('proteina_polvo_tipos') else 'No especificado'}
-
-🏷️ ¿Tiene preferencia por alguna marca?
-- {st.session_state.get('preferencia_marca_proteina', ['No especificado'])[0] if st.session_state.get('preferencia_marca_proteina') else 'No especificado'}
-
-✍️ Marca preferida:
-- {marca_preferida}
-
-=====================================
-🩺 INFORMACIÓN MÉDICA Y FARMACOLÓGICA
-=====================================
-
-📋 Condiciones Médicas y Fisiológicas Actuales:
-- {', '.join(st.session_state.get('condiciones_medicas', [])) if st.session_state.get('condiciones_medicas') else 'No especificado'}
-- Otra condición especificada: {st.session_state.get('condiciones_otras', 'No especificado')}
-
-💊 Medicamentos de Uso Frecuente:
-- Consume medicamentos: {st.session_state.get('consume_medicamentos', ['No especificado'])[0] if st.session_state.get('consume_medicamentos') else 'No especificado'}
-- Lista de medicamentos detallada: {st.session_state.get('medicamentos_lista', 'No especificado')}
-
-💊 Suplementos Nutricionales Adicionales:
-- Consume suplementos: {st.session_state.get('consume_suplementos', ['No especificado'])[0] if st.session_state.get('consume_suplementos') else 'No especificado'}
-- Lista de suplementos detallada: {st.session_state.get('suplementos_lista', 'No especificado')}
-
-=====================================
-RESUMEN DE ANÁLISIS IDENTIFICADO:
-=====================================
-Este cuestionario completo de patrones alimentarios proporciona una base integral 
-para el desarrollo de recomendaciones nutricionales altamente personalizadas basadas en:
-
-1. 6 grupos alimentarios principales evaluados
-2. Suplementación con proteína en polvo (tipos y marcas preferidas)
-3. Métodos de cocción disponibles y preferidos
-4. Restricciones específicas (alergias e intolerancias)  
-5. Patrones de preferencias detallados
-6. Análisis de antojos y alimentación emocional
-7. Frecuencia de comidas preferida del cliente
-8. Sugerencias específicas de menús y preferencias adicionales
-9. Contexto personal, familiar y social completo
-10. Condiciones médicas y farmacológicas actuales (CRÍTICO)
-11. Medicamentos de uso frecuente y posibles interacciones
-12. Suplementos nutricionales adicionales
-
-RECOMENDACIONES PARA SEGUIMIENTO:
-- Desarrollar plan nutricional personalizado basado en estos patrones
-- Considerar restricciones y alergias como prioridad absoluta
-- Aprovechar métodos de cocción preferidos y disponibles
-- Integrar estrategias para manejo de antojos identificados
-- Estructurar la frecuencia de comidas según la preferencia del cliente
-- Incorporar sugerencias específicas de menús proporcionadas por el cliente
-- Adaptar recomendaciones al contexto personal y familiar específico
-- Evaluar interacciones entre medicamentos y alimentos
-- Adaptar plan nutricional a condiciones médicas específicas
-- Consultar con médico tratante si hay condiciones médicas complejas
-
-=====================================
-© 2025 MUPAI - Muscle up GYM
-Alimentary Pattern Assessment Intelligence
-=====================================
-"""
-    return resumen
-
-# ==================== FUNCIONES DE VALIDACIÓN PROGRESIVA ====================
-
-def validate_step_1():
-    """Valida que cada subgrupo tenga al menos una selección en proteínas grasas"""
-    subgroups = {
-        'huevos_embutidos': 'Huevos y embutidos',
-        'carnes_res_grasas': 'Carnes de res grasas',
-        'carnes_cerdo_grasas': 'Carnes de cerdo grasas', 
-        'carnes_pollo_grasas': 'Carnes de pollo/pavo grasas',
-        'organos_grasos': 'Órganos y vísceras grasas',
-        'quesos_grasos': 'Quesos altos en grasa',
-        'lacteos_enteros': 'Lácteos enteros',
-        'pescados_grasos': 'Pescados grasos',
-        'mariscos_grasos': 'Mariscos/comida marina grasos'
-    }
-    
-    missing_subgroups = []
-    for key, name in subgroups.items():
-        selections = st.session_state.get(key, [])
-        if len(selections) == 0:
-            missing_subgroups.append(name)
-    
-    if missing_subgroups:
-        return False, missing_subgroups
-    return True, []
-
-def validate_step_2():
-    """Valida que cada subgrupo tenga al menos una selección en proteínas magras"""
-    subgroups = {
-        'carnes_res_magras': 'Carnes de res magras',
-        'carnes_cerdo_magras': 'Carnes de cerdo magras',
-        'carnes_pollo_magras': 'Carnes de pollo/pavo magras',
-        'organos_magros': 'Órganos y vísceras magros',
-        'pescados_magros': 'Pescados magros',
-        'mariscos_magros': 'Mariscos/comida marina magros',
-        'quesos_magros': 'Quesos bajos en grasa',
-        'lacteos_light': 'Lácteos light/descremados',
-        'huevos_embutidos_light': 'Huevos y embutidos light'
-    }
-    
-    missing_subgroups = []
-    for key, name in subgroups.items():
-        selections = st.session_state.get(key, [])
-        if len(selections) == 0:
-            missing_subgroups.append(name)
-    
-    if missing_subgroups:
-        return False, missing_subgroups
-    return True, []
-
-def validate_step_3():
-    """Valida que se haya completado la sección de proteína en polvo"""
-    missing_items = []
-    
-    # Validar que haya al menos una selección de tipos de proteína
-    tipos_proteina = st.session_state.get('proteina_polvo_tipos', [])
-    if len(tipos_proteina) == 0:
-        missing_items.append('Tipos de proteína en polvo (debe seleccionar al menos uno, o "Ninguno")')
-    else:
-        # Validar que "Ninguno" sea mutuamente excluyente con otras opciones
-        if "Ninguno (no consumo proteína en polvo)" in tipos_proteina and len(tipos_proteina) > 1:
-            missing_items.append('Si seleccionas "Ninguno", no puedes seleccionar otros tipos de proteína. Por favor, desmarca "Ninguno" o desmarca las otras opciones.')
-    
-    # Validar preferencia de marca
-    preferencia_marca = st.session_state.get('preferencia_marca_proteina', [])
-    if len(preferencia_marca) == 0:
-        missing_items.append('Preferencia de marca (debe seleccionar "Sí" o "No")')
-    elif len(preferencia_marca) > 1:
-        missing_items.append('Solo puedes seleccionar UNA opción en preferencia de marca (tienes seleccionadas varias)')
-    elif len(preferencia_marca) == 1 and preferencia_marca[0] == "Sí":
-        # Si seleccionó "Sí", el campo de marca debe tener contenido
-        nombre_marca = st.session_state.get('nombre_marca_proteina', '').strip()
-        if not nombre_marca:
-            missing_items.append('Nombre de la marca preferida (campo de texto obligatorio si seleccionaste "Sí")')
-    
-    if missing_items:
-        return False, missing_items
-    return True, []
-
-def validate_step_4():
-    """Valida que cada subgrupo tenga al menos una selección en grasas saludables"""
-    subgroups = {
-        'grasas_naturales': 'Grasas naturales',
-        'frutos_secos_semillas': 'Frutos secos y semillas',
-        'mantequillas_vegetales': 'Mantequillas vegetales'
-    }
-    
-    missing_subgroups = []
-    for key, name in subgroups.items():
-        selections = st.session_state.get(key, [])
-        if len(selections) == 0:
-            missing_subgroups.append(name)
-    
-    if missing_subgroups:
-        return False, missing_subgroups
-    return True, []
-
-def validate_step_5():
-    """Valida que cada subgrupo tenga al menos una selección en carbohidratos"""
-    subgroups = {
-        'cereales_integrales': 'Cereales integrales',
-        'pastas': 'Pastas',
-        'tortillas_panes': 'Tortillas y panes',
-        'raices_tuberculos': 'Raíces y tubérculos',
-        'leguminosas': 'Leguminosas'
-    }
-    
-    missing_subgroups = []
-    for key, name in subgroups.items():
-        selections = st.session_state.get(key, [])
-        if len(selections) == 0:
-            missing_subgroups.append(name)
-    
-    if missing_subgroups:
-        return False, missing_subgroups
-    return True, []
-
-def validate_step_6():
-    """Valida que se haya seleccionado al menos una opción en vegetales"""
-    selections = st.session_state.get('vegetales_lista', [])
-    if len(selections) == 0:
-        return False, ['Vegetales']
-    return True, []
-
-def validate_step_7():
-    """Valida que se haya seleccionado al menos una opción en frutas"""
-    selections = st.session_state.get('frutas_lista', [])
-    if len(selections) == 0:
-        return False, ['Frutas']
-    return True, []
-
-def validate_step_8():
-    """Valida que se haya seleccionado al menos una opción en aceites de cocción"""
-    selections = st.session_state.get('aceites_coccion', [])
-    if len(selections) == 0:
-        return False, ['Aceites de cocción']
-    return True, []
-
-def validate_step_9():
-    """Valida que se haya seleccionado al menos una opción en bebidas"""
-    selections = st.session_state.get('bebidas_sin_calorias', [])
-    if len(selections) == 0:
-        return False, ['Bebidas para hidratación']
-    return True, []
-
-def validate_step_10():
-    """Valida que se haya completado la sección de métodos de cocción"""
-    missing_items = []
-    
-    # Validar que haya al menos una selección de métodos de cocción
-    metodos_selections = st.session_state.get('metodos_coccion_accesibles', [])
-    if len(metodos_selections) == 0:
-        missing_items.append('Métodos de cocción accesibles')
-    
-    # Validar campo de texto de otro método de cocción
-    otro_metodo = st.session_state.get('otro_metodo_coccion', '').strip()
-    if not otro_metodo:
-        missing_items.append('Otro método de cocción (campo de texto) - escribir "No aplica" si no aplica')
-    
-    if missing_items:
-        return False, missing_items
-    return True, []
-
-def validate_step_11():
-    """Valida que cada subgrupo tenga al menos una selección en alergias/intolerancias y campos de texto completos"""
-    missing_items = []
-    
-    # Validar subgrupos de selección múltiple
-    alergias_selections = st.session_state.get('alergias_alimentarias', [])
-    intolerancias_selections = st.session_state.get('intolerancias_digestivas', [])
-    
-    if len(alergias_selections) == 0:
-        missing_items.append('Alergias alimentarias')
-    if len(intolerancias_selections) == 0:
-        missing_items.append('Intolerancias digestivas')
-    
-    # Validar campos de texto - deben tener contenido o "No aplica"
-    text_fields = {
-        'otra_alergia': 'Otra alergia (campo de texto)',
-        'otra_intolerancia': 'Otra intolerancia (campo de texto)'
-    }
-    
-    for field_key, field_name in text_fields.items():
-        field_value = st.session_state.get(field_key, '').strip()
-        if not field_value:
-            missing_items.append(f'{field_name} - escribir "No aplica" si no aplica')
-    
-    if missing_items:
-        return False, missing_items
-    return True, []
-
-def validate_step_12():
-    """Valida que cada subgrupo tenga al menos una selección en antojos"""
-    subgroups = {
-        'antojos_dulces': 'Antojos de alimentos dulces/postres',
-        'antojos_salados': 'Antojos de alimentos salados/snacks',
-        'antojos_comida_rapida': 'Antojos de comidas rápidas/callejeras',
-        'antojos_bebidas': 'Antojos de bebidas y postres líquidos',
-        'antojos_picantes': 'Antojos de alimentos con condimentos estimulantes'
-    }
-    
-    missing_subgroups = []
-    for key, name in subgroups.items():
-        selections = st.session_state.get(key, [])
-        if len(selections) == 0:
-            missing_subgroups.append(name)
-    
-    # Validar campo de texto de otros antojos
-    otros_antojos = st.session_state.get('otros_antojos', '').strip()
-    if not otros_antojos:
-        missing_subgroups.append('Otros antojos (campo de texto) - escribir "No aplica" si no aplica')
-    
-    if missing_subgroups:
-        return False, missing_subgroups
-    return True, []
-
-def validate_step_13():
-    """Valida que se haya seleccionado una frecuencia de comidas usando checkboxes"""
-    missing_items = []
-    # CAMBIO: Usar la nueva variable de checkboxes en lugar de radio
-    frecuencia_list = st.session_state.get('frecuencia_comidas_ck', [])
-    
-    if not frecuencia_list or len(frecuencia_list) == 0:
-        missing_items.append('Frecuencia de comidas')
-    elif len(frecuencia_list) > 1:
-        missing_items.append('Solo se puede seleccionar UNA frecuencia de comidas (tienes seleccionadas varias)')
-    elif len(frecuencia_list) == 1:
-        frecuencia = frecuencia_list[0]
-        if frecuencia == "Otro (especificar)":
-            otra_frecuencia = st.session_state.get('otra_frecuencia', '').strip()
-            if not otra_frecuencia:
-                missing_items.append('Especificación de frecuencia (campo de texto)')
-    
-    if missing_items:
-        return False, missing_items
-    return True, []
-
-def validate_step_14():
-    """Valida que se haya proporcionado alguna sugerencia de menús"""
-    missing_items = []
-    sugerencias = st.session_state.get('sugerencias_menus', '').strip()
-    opcion_rapida = st.session_state.get('opcion_rapida_menu', '')
-    
-    # Debe tener texto en sugerencias O una opción rápida válida
-    if not sugerencias and (not opcion_rapida or opcion_rapida == "Seleccionar..."):
-        missing_items.append('Sugerencias de menús (campo de texto) - escribir "No aplica" si prefieres que el equipo decida')
-    
-    if missing_items:
-        return False, missing_items
-    return True, []
-
-def validate_step_15():
-    """Valida que se haya completado la sección de condiciones médicas y medicamentos"""
-    missing_items = []
-    
-    # Validar que haya al menos una selección de condiciones médicas
-    condiciones_selections = st.session_state.get('condiciones_medicas', [])
-    if len(condiciones_selections) == 0:
-        missing_items.append('Condiciones médicas (debe seleccionar al menos una, o "Ninguna de las anteriores")')
-    else:
-        # Validar que "Ninguna de las anteriores" sea mutuamente excluyente
-        if "Ninguna de las anteriores" in condiciones_selections and len(condiciones_selections) > 1:
-            missing_items.append('Si seleccionas "Ninguna de las anteriores", no puedes seleccionar otras condiciones médicas')
-    
-    # Validar campo de texto de otras condiciones
-    condiciones_otras = st.session_state.get('condiciones_otras', '').strip()
-    if not condiciones_otras:
-        missing_items.append('Otras condiciones (campo de texto) - escribir "No aplica" si no aplica')
-    
-    # Validar consumo de medicamentos
-    consume_medicamentos = st.session_state.get('consume_medicamentos', [])
-    if len(consume_medicamentos) == 0:
-        missing_items.append('Consumo de medicamentos (debe seleccionar "Sí" o "No")')
-    elif len(consume_medicamentos) > 1:
-        missing_items.append('Solo puedes seleccionar UNA opción en consumo de medicamentos')
-    elif len(consume_medicamentos) == 1 and consume_medicamentos[0] == "Sí":
-        # Si seleccionó "Sí", el campo de lista debe tener contenido
-        medicamentos_lista = st.session_state.get('medicamentos_lista', '').strip()
-        if not medicamentos_lista:
-            missing_items.append('Lista de medicamentos (campo de texto obligatorio si seleccionaste "Sí")')
-    
-    # Validar consumo de suplementos
-    consume_suplementos = st.session_state.get('consume_suplementos', [])
-    if len(consume_suplementos) == 0:
-        missing_items.append('Consumo de suplementos (debe seleccionar "Sí" o "No")')
-    elif len(consume_suplementos) > 1:
-        missing_items.append('Solo puedes seleccionar UNA opción en consumo de suplementos')
-    elif len(consume_suplementos) == 1 and consume_suplementos[0] == "Sí":
-        # Si seleccionó "Sí", el campo de lista debe tener contenido
-        suplementos_lista = st.session_state.get('suplementos_lista', '').strip()
-        if not suplementos_lista:
-            missing_items.append('Lista de suplementos (campo de texto obligatorio si seleccionaste "Sí")')
-    
-    if missing_items:
-        return False, missing_items
-    return True, []
-
-def create_vertical_checkboxes(title, options, key, help_text=""):
-    """
-    Create vertical checkboxes for short option lists.
-    Returns the selected options as a list.
-    """
-    st.markdown(f"**{title}**")
-    if help_text:
-        st.info(f"💡 **Instrucción:** {help_text}")
-    
-    # Initialize session state for this key if it doesn't exist
-    if key not in st.session_state:
-        st.session_state[key] = []
-    
-    selected_options = []
-    
-    # Create checkboxes in a clean vertical layout
-    for option in options:
-        checkbox_key = f"{key}_{option.replace(' ', '_').replace('(', '').replace(')', '').replace('/', '_')}"
-        is_checked = st.checkbox(
-            option, 
-            key=checkbox_key, 
-            value=(option in st.session_state.get(key, []))
-        )
-        if is_checked:
-            selected_options.append(option)
-    
-    # Update session state
-    st.session_state[key] = selected_options
-    return selected_options
-
-def create_multiselect_with_bullet_list(title, options, key, help_text=""):
-    """
-    Create a multiselect with a bullet list above it for longer option lists.
-    Returns the selected options as a list.
-    """
-    st.markdown(f"**{title}**")
-    if help_text:
-        st.info(f"💡 **Instrucción:** {help_text}")
-    
-    # Display available options as a bullet list
-    st.markdown("**Opciones disponibles:**")
-    with st.expander("Ver todas las opciones disponibles", expanded=False):
-        for option in options:
-            st.markdown(f"• {option}")
-    
-    # Create the multiselect
-    selected = st.multiselect(
-        f"Selecciona de la lista de {len(options)} opciones:",
-        options,
-        key=key,
-        default=st.session_state.get(key, []),
-        placeholder=f"🔽 Haz clic para seleccionar de {len(options)} opciones disponibles"
-    )
-    
-    return selected
-
-def get_step_validator(step_number):
-    """Obtiene la función de validación para un paso específico"""
-    validators = {
-        1: validate_step_1,
-        2: validate_step_2, 
-        3: validate_step_3,
-        4: validate_step_4,
-        5: validate_step_5,
-        6: validate_step_6,
-        7: validate_step_7,
-        8: validate_step_8,
-        9: validate_step_9,
-        10: validate_step_10,
-        11: validate_step_11,
-        12: validate_step_12,
-        13: validate_step_13,
-        14: validate_step_14,
-        15: validate_step_15
-    }
-    return validators.get(step_number, lambda: (True, []))
-
-def validate_step_legacy(step_number):
-    """Función de compatibilidad que devuelve solo True/False para la UI de progreso"""
-    validator = get_step_validator(step_number)
-    is_valid, _ = validator()
-    return is_valid
-
-def advance_to_next_step():
-    """Avanza al siguiente paso si la validación es exitosa"""
-    current_step = st.session_state.get('current_step', 1)
-    validator = get_step_validator(current_step)
-    
-    is_valid, missing_items = validator()
-    
-    if is_valid:
-        # Marcar el paso actual como completado
-        st.session_state.step_completed[current_step] = True
-        # Avanzar al siguiente paso
-        if current_step < 15:
-            st.session_state.current_step = current_step + 1
-            st.session_state.max_unlocked_step = max(st.session_state.max_unlocked_step, current_step + 1)
-        return True
-    else:
-        # Mostrar mensaje de error específico sobre los subgrupos/campos faltantes
-        if len(missing_items) == 1:
-            st.error(f"⚠️ **Para continuar, debes completar:** {missing_items[0]}")
-        else:
-            missing_list = "\n".join([f"• {item}" for item in missing_items])
-            st.error(f"⚠️ **Para continuar, debes completar los siguientes subgrupos/campos:**\n\n{missing_list}")
-        
-        st.info("💡 **Recuerda:** Si no consumes algo de una categoría, marca 'Ninguno'. Si un campo de texto no aplica, escribe 'No aplica'.")
-        return False
-
-def go_to_previous_step():
-    """Retrocede al paso anterior"""
-    current_step = st.session_state.get('current_step', 1)
-    if current_step > 1:
-        st.session_state.current_step = current_step - 1
-
-# ==================== FUNCIONES DE VALIDACIÓN ESTRICTA ====================
-def validate_name(name):
-    """
-    Valida que el nombre tenga al menos dos palabras.
-    Retorna (es_válido, mensaje_error)
-    """
-    if not name or not name.strip():
-        return False, "El nombre es obligatorio"
-    
-    # Limpiar espacios extra y dividir en palabras
-    words = name.strip().split()
-    
-    if len(words) < 2:
-        return False, "El nombre debe contener al menos dos palabras (nombre y apellido)"
-    
-    # Verificar que cada palabra tenga al menos 2 caracteres y solo contenga letras y espacios
-    for word in words:
-        if len(word) < 2:
-            return False, "Cada palabra del nombre debe tener al menos 2 caracteres"
-        if not re.match(r'^[a-zA-ZáéíóúÁÉÍÓÚüÜñÑ]+$', word):
-            return False, "El nombre solo puede contener letras y espacios"
-    
-    return True, ""
-
-def validate_phone(phone):
-    """
-    Valida que el teléfono tenga exactamente 10 dígitos.
-    Retorna (es_válido, mensaje_error)
-    """
-    if not phone or not phone.strip():
-        return False, "El teléfono es obligatorio"
-    
-    # Limpiar espacios y caracteres especiales
-    clean_phone = re.sub(r'[^0-9]', '', phone.strip())
-    
-    if len(clean_phone) != 10:
-        return False, "El teléfono debe tener exactamente 10 dígitos"
-    
-    # Verificar que todos sean dígitos
-    if not clean_phone.isdigit():
-        return False, "El teléfono solo puede contener números"
-    
-    return True, ""
-
-def validate_email(email):
-    """
-    Valida que el email tenga formato estándar.
-    Retorna (es_válido, mensaje_error)
-    """
-    if not email or not email.strip():
-        return False, "El email es obligatorio"
-    
-    # Patrón regex para email estándar
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    
-    if not re.match(email_pattern, email.strip()):
-        return False, "El email debe tener un formato válido (ejemplo: usuario@dominio.com)"
-    
-    return True, ""
-
-def validate_whatsapp(whatsapp):
-    """
-    Valida que el número de WhatsApp tenga exactamente 10 dígitos.
-    Retorna (es_válido, mensaje_error)
-    """
-    if not whatsapp or not whatsapp.strip():
-        return False, "El número de WhatsApp es obligatorio"
-    
-    # Limpiar espacios y caracteres especiales
-    clean_whatsapp = re.sub(r'[^0-9]', '', whatsapp.strip())
-    
-    if len(clean_whatsapp) != 10:
-        return False, "El número de WhatsApp debe tener exactamente 10 dígitos"
-    
-    # Verificar que todos sean dígitos
-    if not clean_whatsapp.isdigit():
-        return False, "El número de WhatsApp solo puede contener números"
-    
-    return True, ""
-
-def generate_unique_code():
-    """Genera un código único de 6 caracteres alfanuméricos"""
-    return ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-
-def enviar_email_solicitud_acceso(nombre, email, whatsapp, codigo):
-    """Envía email al administrador con la solicitud de acceso"""
-    try:
-        email_origen = "administracion@muscleupgym.fitness"
-        email_destino = "administracion@muscleupgym.fitness"
-        password = st.secrets.get("zoho_password", "TU_PASSWORD_AQUI")
-        
-        # Para desarrollo/testing, si no hay contraseña configurada, simular envío exitoso
-        if password == "TU_PASSWORD_AQUI":
-            import time
-            time.sleep(1)  # Simular tiempo de envío
-            st.warning("⚠️ **Modo de desarrollo:** Email simulado - configurar secrets para envío real")
-            return True
-
-        msg = MIMEMultipart()
-        msg['From'] = email_origen
-        msg['To'] = email_destino
-        msg['Subject'] = f"Solicitud de acceso MUPAI - {nombre}"
-
-        contenido = f"""
-NUEVA SOLICITUD DE ACCESO AL SISTEMA MUPAI
-==========================================
-
-Datos del solicitante:
-- Nombre: {nombre}
-- Correo electrónico: {email}
-- Número de WhatsApp: {whatsapp}
-- Código generado: {codigo}
-- Fecha de solicitud: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-
-Este código es de un solo uso y debe ser proporcionado al usuario para acceder al sistema.
-
-Sistema: MUPAI - Muscle Up Performance Assessment Intelligence
-"""
-
-        msg.attach(MIMEText(contenido, 'plain'))
-
-        server = smtplib.SMTP('smtp.zoho.com', 587)
-        server.starttls()
-        server.login(email_origen, password)
-        server.send_message(msg)
-        server.quit()
-
-        return True
-    except Exception as e:
-        st.error(f"Error al enviar solicitud: {str(e)}")
-        return False
-
-# Función para verificar datos completos
-def datos_completos_para_email():
-    obligatorios = {
-        "Nombre": st.session_state.get('nombre'),
-        "Email": st.session_state.get('email_cliente'), 
-        "Teléfono": st.session_state.get('telefono'),
-        "Edad": st.session_state.get('edad')
-    }
-    faltantes = [campo for campo, valor in obligatorios.items() if not valor]
-    return faltantes
-
-def verificar_grupos_obligatorios_completos():
-    """Verifica que los grupos obligatorios (1-6) estén completados"""
-    grupos_incompletos = []
-    
-    # Grupo 1: Proteínas grasas
-    if not validate_step_legacy(1):
-        grupos_incompletos.append("Proteínas con más contenido graso")
-    
-    # Grupo 2: Proteínas magras  
-    if not validate_step_legacy(2):
-        grupos_incompletos.append("Proteínas magras")
-        
-    # Grupo 3: Grasas saludables
-    if not validate_step_legacy(3):
-        grupos_incompletos.append("Fuentes de grasa saludable")
-        
-    # Grupo 4: Carbohidratos
-    if not validate_step_legacy(4):
-        grupos_incompletos.append("Carbohidratos complejos")
-        
-    # Grupo 5: Vegetales
-    if not validate_step_legacy(5):
-        grupos_incompletos.append("Vegetales")
-        
-    # Grupo 6: Frutas
-    if not validate_step_legacy(6):
-        grupos_incompletos.append("Frutas")
-        
-    return grupos_incompletos
+from comun import (
+    ORDEN_PAGINAS,
+    PAGINA_ACCESO,
+    PAGINA_CUESTIONARIO,
+    PAGINA_DATOS_PERSONALES,
+    PAGINA_RESULTADOS,
+    aplicar_estilos,
+    autenticar_con_token,
+    avisar_sesion_desalojada,
+    iniciar_servicios_correo,
+    iniciar_servicios_sesion,
+    inicializar_estado,
+    mostrar_panel_instrumentacion,
+    pagina_de_etapa,
+    pagina_permitida,
+    panel_instrumentacion_activo,
+    terminar_rerun,
+)
 
 # ==================== CONFIGURACIÓN DE PÁGINA Y CSS MEJORADO ====================
 st.set_page_config(
@@ -858,3374 +27,40 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# CSS principal para ocultar elementos de UI y establecer espaciado profesional
-st.markdown("""
-<style>
-/* Hide Streamlit header, toolbar, and GitHub/Fork elements */
-#MainMenu {visibility: hidden !important;}
-header[data-testid="stHeader"] {visibility: hidden !important;}
-.stApp > header {visibility: hidden !important;}
-[data-testid="stToolbar"] {display: none !important;}
-[data-testid="stDecoration"] {display: none !important;}
-[data-testid="stStatusWidget"] {display: none !important;}
-section[data-testid="stToolbar"] {display: none !important;}
-div[data-testid="stToolbar"] {display: none !important;}
-.stToolbar {display: none !important;}
-.stDeployButton {display: none !important;}
-.stActionButton {display: none !important;}
-button[title="View fullscreen"] {visibility: hidden !important;}
-footer {visibility: hidden !important;}
-
-/* Hide hamburger menu */
-.css-14xtw13.e8zbici0 {display: none !important;}
-.css-vk3wp9 {display: none !important;}
-.css-1544g2n {display: none !important;}
-
-/* Hide any GitHub/Fork related elements */
-a[href*="github"] {display: none !important;}
-a[href*="fork"] {display: none !important;}
-button[data-baseweb="button"]:has-text("Fork") {display: none !important;}
-*[title*="GitHub"] {display: none !important;}
-*[title*="Fork"] {display: none !important;}
-*[alt*="GitHub"] {display: none !important;}
-*[alt*="Fork"] {display: none !important;}
-
-/* Professional spacing for main container */
-.main .block-container {
-    padding-top: 64px !important;
-    padding-bottom: 2rem !important;
-}
-
-/* Additional spacing adjustments */
-.css-hi6a2p {padding-top: 64px !important;}
-#root > div:nth-child(1) > div > div > div > div > section > div {padding-top: 64px !important;}
-
-/* Ensure proper margin for header containers and footer elements */
-.header-container {
-    margin-top: 1rem !important;
-    margin-bottom: 2rem !important;
-}
-
-.footer-mupai {
-    margin-top: 3rem !important;
-}
-</style>
-""", unsafe_allow_html=True)
-
-st.markdown("""
-<style>
-:root {
-    --mupai-yellow: #F4C430;
-    --mupai-dark-yellow: #DAA520;
-    --mupai-black: #181A1B;
-    --mupai-gray: #232425;
-    --mupai-light-gray: #EDEDED;
-    --mupai-white: #FFFFFF;
-    --mupai-success: #27AE60;
-    --mupai-warning: #F39C12;
-    --mupai-danger: #E74C3C;
-}
-/* Fondo general */
-.stApp {
-    background: linear-gradient(135deg, #1E1E1E 0%, #232425 100%);
-}
-.main-header {
-    background: linear-gradient(135deg, var(--mupai-yellow) 0%, var(--mupai-dark-yellow) 100%);
-    color: #181A1B;
-    padding: 2rem 1rem;
-    border-radius: 18px;
-    text-align: center;
-    margin-bottom: 2rem;
-    box-shadow: 0 10px 30px rgba(244, 196, 48, 0.20);
-    animation: fadeIn 0.5s ease-out;
-}
-.content-card {
-    background: #1E1E1E;
-    padding: 2rem 1.3rem;
-    border-radius: 16px;
-    box-shadow: 0 5px 22px 0px rgba(244,196,48,0.07), 0 1.5px 8px rgba(0,0,0,0.11);
-    margin-bottom: 1.7rem;
-    border-left: 5px solid var(--mupai-yellow);
-    animation: slideIn 0.5s;
-}
-.card-psmf {
-    border-left-color: var(--mupai-warning)!important;
-}
-.card-success {
-    border-left-color: var(--mupai-success)!important;
-}
-.content-card, .content-card * {
-    color: #FFF !important;
-    font-weight: 500;
-    letter-spacing: 0.02em;
-}
-.stButton > button {
-    background: linear-gradient(135deg, var(--mupai-yellow) 0%, var(--mupai-dark-yellow) 100%);
-    color: #232425;
-    border: none;
-    padding: 0.85rem 2.3rem;
-    font-weight: bold;
-    border-radius: 28px;
-    transition: all 0.3s;
-    box-shadow: 0 4px 16px rgba(244, 196, 48, 0.18);
-    text-transform: uppercase;
-    letter-spacing: 1.5px;
-    font-size: 1.15rem;
-}
-.stButton > button:hover {
-    filter: brightness(1.04);
-    box-shadow: 0 7px 22px rgba(244, 196, 48, 0.24);
-}
-.stTextInput > div > div > input,
-.stNumberInput > div > div > input,
-.stSelectbox > div > div > select {
-    border: 2px solid var(--mupai-yellow)!important;
-    border-radius: 11px!important;
-    padding: 0.7rem 0.9rem!important;
-    background: #232425!important;
-    color: #fff!important;
-    font-size: 1.13rem!important;
-    font-weight: 600!important;
-}
-/* Special styling for selectboxes */
-.stSelectbox[data-testid="stSelectbox"] > div > div > select {
-    background: #F8F9FA!important;
-    color: #1E1E1E!important;
-    border: 2px solid #DAA520!important;
-    font-weight: bold!important;
-}
-.stSelectbox[data-testid="stSelectbox"] option {
-    background: #FFFFFF!important;
-    color: #1E1E1E!important;
-    font-weight: bold!important;
-}
-.stTextInput label, .stNumberInput label, .stSelectbox label,
-.stRadio label, .stCheckbox label, .stDateInput label, .stMarkdown,
-.stExpander .streamlit-expanderHeader, .stExpander label, .stExpander p, .stExpander div {
-    color: #FFD600 !important;
-    opacity: 1 !important;
-    font-weight: 700 !important;
-    font-size: 1.04rem !important;
-    text-shadow: 1px 1px 2px rgba(0, 0, 0, 0.8) !important;
-}
-/* Enhanced styling for multiselect labels and info messages */
-.stMultiSelect label, 
-div[data-testid="stAlert"] p,
-div[data-testid="stInfo"] p {
-    color: #FFD600 !important;
-    font-weight: 700 !important;
-    text-shadow: 1px 1px 2px rgba(0, 0, 0, 0.8) !important;
-}
-.stTextInput input::placeholder,
-.stNumberInput input::placeholder {
-    color: #e0e0e0 !important;
-    opacity: 1 !important;
-}
-.stAlert > div {
-    border-radius: 11px;
-    padding: 1.1rem;
-    border-left: 5px solid;
-    background: #222326 !important;
-    color: #FFF !important;
-}
-[data-testid="metric-container"] {
-    background: linear-gradient(125deg, #252525 0%, #303030 100%);
-    padding: 1.1rem 1rem;
-    border-radius: 12px;
-    border-left: 4px solid var(--mupai-yellow);
-    box-shadow: 0 2.5px 11px rgba(0,0,0,0.11);
-    color: #fff !important;
-}
-.streamlit-expanderHeader {
-    background: linear-gradient(135deg, var(--mupai-gray) 70%, #242424 100%);
-    border-radius: 12px;
-    font-weight: bold;
-    color: #FFF !important;
-    border: 2px solid var(--mupai-yellow);
-    font-size: 1.16rem;
-}
-.stRadio > div {
-    background: #181A1B !important;
-    padding: 1.1rem 0.5rem;
-    border-radius: 10px;
-    border: 2px solid transparent;
-    transition: all 0.3s;
-    color: #FFF !important;
-}
-.stRadio > div:hover {
-    border-color: var(--mupai-yellow);
-}
-.stCheckbox > label, .stCheckbox > span {
-    color: #FFF !important;
-    opacity: 1 !important;
-    font-size: 1.05rem;
-}
-.stProgress > div > div > div {
-    background: linear-gradient(135deg, var(--mupai-yellow) 0%, var(--mupai-dark-yellow) 100%)!important;
-    border-radius: 10px;
-    animation: pulse 1.2s infinite;
-}
-@keyframes pulse {
-    0% { opacity: 1; }
-    50% { opacity: 0.92; }
-    100% { opacity: 1; }
-}
-@keyframes fadeIn { from { opacity: 0; transform: translateY(20px);} to { opacity: 1; transform: translateY(0);} }
-@keyframes slideIn { from { opacity: 0; transform: translateX(-18px);} to { opacity: 1; transform: translateX(0);} }
-.badge {
-    display: inline-block;
-    padding: 0.32rem 0.98rem;
-    border-radius: 18px;
-    font-size: 0.97rem;
-    font-weight: 800;
-    margin: 0.27rem;
-    color: #FFF;
-    background: #313131;
-    border: 1px solid #555;
-}
-.badge-success { background: var(--mupai-success); }
-.badge-warning { background: var(--mupai-warning); color: #222; border: 1px solid #b78a09;}
-.badge-danger { background: var(--mupai-danger); }
-.badge-info { background: var(--mupai-yellow); color: #1E1E1E;}
-.dataframe {
-    border-radius: 10px !important;
-    overflow: hidden;
-    box-shadow: 0 2px 10px rgba(0,0,0,0.08);
-    background: #2A2A2A!important;
-    color: #FFF!important;
-}
-hr {
-    border: none;
-    height: 2.5px;
-    background: linear-gradient(to right, transparent, var(--mupai-yellow), transparent);
-    margin: 2.1rem 0;
-}
-@media (max-width: 768px) {
-    .main-header { padding: 1.2rem;}
-    .content-card { padding: 1.1rem;}
-    .stButton > button { padding: 0.5rem 1.1rem; font-size: 0.96rem;}
-}
-.content-card:hover {
-    transform: translateY(-1.5px);
-    box-shadow: 0 8px 27px rgba(0,0,0,0.17);
-    transition: all 0.25s;
-}
-.gradient-text {
-    background: linear-gradient(135deg, var(--mupai-yellow) 0%, var(--mupai-dark-yellow) 100%);
-    -webkit-background-clip: text;
-    -webkit-text-fill-color: transparent;
-    font-weight: 900;
-    font-size: 1.11rem;
-}
-.footer-mupai {
-    text-align: center;
-    padding: 2.2rem 0.3rem 2.2rem 0.3rem;
-    background: linear-gradient(135deg, #202021 0%, #232425 100%);
-    border-radius: 15px;
-    color: #FFF;
-    margin-top: 2.2rem;
-}
-.footer-mupai h4 { color: var(--mupai-yellow); margin-bottom: 1.1rem;}
-.footer-mupai a {
-    color: var(--mupai-yellow);
-    text-decoration: none;
-    margin: 0 1.2rem;
-    font-weight: 600;
-    font-size: 1.01rem;
-}
-
-/* Enhanced styling for important checkboxes */
-.stCheckbox:has(span:contains("He leído y acepto la política de privacidad")) {
-    background: rgba(244, 196, 48, 0.05) !important;
-    border: 2px solid var(--mupai-yellow) !important;
-    border-radius: 12px !important;
-    padding: 1rem !important;
-    margin: 0.8rem 0 !important;
-    transition: all 0.3s ease !important;
-}
-.stCheckbox:has(span:contains("He leído y acepto la política de privacidad")):hover {
-    background: rgba(244, 196, 48, 0.1) !important;
-    box-shadow: 0 4px 15px rgba(244, 196, 48, 0.2) !important;
-}
-.stCheckbox:has(span:contains("He leído y acepto la política de privacidad")) label {
-    font-weight: 600 !important;
-    font-size: 1.1rem !important;
-}
-/* Enhanced styling for disclaimer checkbox inside expander */
-.stCheckbox:has(span:contains("He leído y entiendo completamente el descargo")) {
-    background: rgba(244, 196, 48, 0.03) !important;
-    border: 1px solid rgba(244, 196, 48, 0.4) !important;
-    border-radius: 8px !important;
-    padding: 0.8rem !important;
-    margin: 0.5rem 0 !important;
-    transition: all 0.3s ease !important;
-}
-.stCheckbox:has(span:contains("He leído y entiendo completamente el descargo")):hover {
-    background: rgba(244, 196, 48, 0.08) !important;
-    border-color: var(--mupai-yellow) !important;
-}
-.stCheckbox:has(span:contains("He leído y entiendo completamente el descargo")) label {
-    font-weight: 500 !important;
-    font-size: 1.05rem !important;
-}
-
-</style>
-""", unsafe_allow_html=True)
-
-# JavaScript para ocultar elementos de GitHub/Fork que puedan aparecer dinámicamente
-github_hide_js = """
-<script>
-// Function to hide GitHub/Fork related elements
-function hideGitHubElements() {
-    // Hide elements by text content
-    const elementsToHide = [
-        'a[href*="github"]',
-        'a[href*="fork"]', 
-        'button:contains("Fork")',
-        'button:contains("GitHub")',
-        'button:contains("Share")',
-        'button:contains("Deploy")',
-        '[data-testid="stToolbar"]',
-        '[data-testid="stHeader"]',
-        '.stDeployButton',
-        '.stActionButton'
-    ];
-    
-    elementsToHide.forEach(selector => {
-        try {
-            const elements = document.querySelectorAll(selector);
-            elements.forEach(el => {
-                if (el) {
-                    el.style.display = 'none !important';
-                    el.style.visibility = 'hidden !important';
-                }
-            });
-        } catch (e) {
-            console.log('Could not hide element:', selector);
-        }
-    });
-    
-    // Hide elements by text content (more aggressive)
-    const allElements = document.querySelectorAll('*');
-    allElements.forEach(el => {
-        if (el.textContent && (
-            el.textContent.toLowerCase().includes('fork') ||
-            el.textContent.toLowerCase().includes('github') ||
-            el.textContent.toLowerCase().includes('deploy') ||
-            el.textContent.toLowerCase().includes('share')
-        )) {
-            // Only hide if it's a button or link
-            if (el.tagName === 'BUTTON' || el.tagName === 'A') {
-                el.style.display = 'none !important';
-            }
-        }
-    });
-}
-
-// Run immediately and also on DOM changes
-hideGitHubElements();
-
-// Observer for dynamic content
-const observer = new MutationObserver(function(mutations) {
-    mutations.forEach(function(mutation) {
-        if (mutation.addedNodes.length > 0) {
-            hideGitHubElements();
-        }
-    });
-});
-
-observer.observe(document.body, {
-    childList: true,
-    subtree: true
-});
-
-// Run again after page load
-window.addEventListener('load', hideGitHubElements);
-</script>
-"""
-
-st.markdown(github_hide_js, unsafe_allow_html=True)
-
-# Header principal visual con logos
-import base64
-
-# Cargar y codificar los logos desde la raíz del repo
+# El rerun se anota antes de tocar el estado: mientras esté en curso, el
+# desalojo de sesiones inactivas no vacía esta sesión
+iniciar_servicios_sesion()
 try:
-    with open('LOGO MUPAI.png', 'rb') as f:
-        logo_mupai_b64 = base64.b64encode(f.read()).decode()
-except FileNotFoundError:
-    logo_mupai_b64 = ""
-
-try:
-    with open('LOGO MUP.png', 'rb') as f:
-        logo_gym_b64 = base64.b64encode(f.read()).decode()
-except FileNotFoundError:
-    logo_gym_b64 = ""
-
-st.markdown(f"""
-<style>
-.header-container {{
-    background: #000000;
-    padding: 2rem 1rem;
-    border-radius: 18px;
-    margin-bottom: 2rem;
-    box-shadow: 0 10px 30px rgba(0, 0, 0, 0.3);
-    animation: fadeIn 0.5s ease-out;
-    display: flex;
-    align-items: center;
-    justify-content: space-between;
-    position: relative;
-}}
-
-.logo-left, .logo-right {{
-    flex: 0 0 auto;
-    display: flex;
-    align-items: center;
-    max-width: 150px;
-}}
-
-.logo-left img, .logo-right img {{
-    max-height: 80px;
-    max-width: 100%;
-    height: auto;
-    width: auto;
-    object-fit: contain;
-}}
-
-.header-center {{
-    flex: 1;
-    text-align: center;
-    padding: 0 2rem;
-}}
-
-.header-title {{
-    color: #FFB300;
-    font-size: 2.2rem;
-    font-weight: 900;
-    margin: 0;
-    text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
-    line-height: 1.2;
-}}
-
-.header-subtitle {{
-    color: #FFFFFF;
-    font-size: 1rem;
-    margin: 0.5rem 0 0 0;
-    opacity: 0.9;
-}}
-
-@media (max-width: 768px) {{
-    .header-container {{
-        flex-direction: column;
-        text-align: center;
-    }}
-    
-    .logo-left, .logo-right {{
-        margin-bottom: 1rem;
-    }}
-    
-    .header-center {{
-        padding: 0;
-    }}
-    
-    .header-title {{
-        font-size: 1.8rem;
-    }}
-}}
-</style>
-
-<div class="header-container">
-    <div class="logo-left">
-        <img src="data:image/png;base64,{logo_mupai_b64}" alt="LOGO MUPAI" />
-    </div>
-    <div class="header-center">
-        <h1 class="header-title">TEST MUPAI: PATRONES ALIMENTARIOS</h1>
-        <p class="header-subtitle">Tu evaluación personalizada de hábitos y preferencias alimentarias basada en ciencia</p>
-    </div>
-    <div class="logo-right">
-        <img src="data:image/png;base64,{logo_gym_b64}" alt="LOGO MUSCLE UP GYM" />
-    </div>
-</div>
-""", unsafe_allow_html=True)
-
-# --- Inicialización de estado de sesión robusta (solo una vez)
-defaults = {
-    "datos_completos": False,
-    "correo_enviado": False,
-    "preferencias_alimentarias": {},
-    "restricciones_dieteticas": {},
-    "nombre": "",
-    "telefono": "",
-    "email_cliente": "",
-    "edad": "",
-    "sexo": "Hombre",
-    "fecha_llenado": datetime.now().strftime("%Y-%m-%d"),
-    "acepto_terminos": False,
-    # ============ NUEVA AUTENTICACIÓN SIMPLIFICADA - Variables ============
-    "authenticated": False,  # Usuario autenticado para acceder al cuestionario
-    "access_request_sent": False,  # Solicitud de acceso enviada
-    "access_code": "",  # Código único generado
-    "access_user_name": "",  # Nombre del usuario que solicita acceso
-    "access_user_email": "",  # Email del usuario que solicita acceso
-    "access_user_whatsapp": "",  # WhatsApp del usuario que solicita acceso
-    "code_used": False,  # Código ya utilizado
-    "access_stage": "request",  # Etapa actual: "request", "form", "code_sent", "authenticated"
-    # ============ FIN NUEVA AUTENTICACIÓN SIMPLIFICADA - Variables ============
-    # Variables para el flujo progresivo
-    "current_step": 1,
-    "step_completed": {
-        1: False,  # Proteínas grasas
-        2: False,  # Proteínas magras
-        3: False,  # Proteína en polvo
-        4: False,  # Grasas saludables (antes paso 3)
-        5: False,  # Carbohidratos (antes paso 4)
-        6: False,  # Vegetales (antes paso 5)
-        7: False,  # Frutas (antes paso 6)
-        8: False,  # Aceites de cocción (antes paso 7)
-        9: False,  # Bebidas (antes paso 8)
-        10: False,  # Métodos de cocción (antes paso 9)
-        11: False,  # Alergias/intolerancias (antes paso 10)
-        12: False,  # Antojos (antes paso 11)
-        13: False,  # Frecuencia de comidas (antes paso 12)
-        14: False,  # Sugerencias de menús (antes paso 13)
-        15: False   # Condiciones médicas y medicamentos
-    },
-    "max_unlocked_step": 1,
-    # Paso 15: Condiciones médicas y medicamentos
-    "condiciones_medicas": [],
-    "condiciones_otras": "",
-    "consume_medicamentos": [],
-    "medicamentos_lista": "",
-    "consume_suplementos": [],
-    "suplementos_lista": ""
-}
-for k, v in defaults.items():
-    if k not in st.session_state:
-        st.session_state[k] = v
-
-# ==================== NUEVA AUTENTICACIÓN SIMPLIFICADA ====================
-# Sistema de autenticación basado en flujo por etapas (access_stage)
-# Etapas: request → form → code_sent → authenticated
-# Bloquea el acceso al cuestionario hasta completar autenticación exitosamente
-
-# Si no está autenticado, mostrar el flujo de acceso basado en access_stage
-if not st.session_state.authenticated:
-    
-    # ETAPA 1: "request" - Botón "Solicitar acceso"
-    if st.session_state.access_stage == "request":
-        st.markdown("""
-        <div class="content-card" style="max-width: 500px; margin: 2rem auto; text-align: center;">
-            <h2 style="color: var(--mupai-yellow); margin-bottom: 1.5rem;">
-                🔑 Acceso al Sistema MUPAI
-            </h2>
-            <p style="margin-bottom: 2rem; color: #CCCCCC;">
-                Para acceder al sistema de evaluación de patrones alimentarios, 
-                necesitas solicitar un código de acceso único.
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col2:
-            if st.button("📝 Solicitar Acceso", use_container_width=True, key="btn_solicitar_acceso"):
-                st.session_state.access_stage = "form"
-                st.rerun()
-    
-    # ETAPA 2: "form" - Formulario de datos y generación/envío de código
-    elif st.session_state.access_stage == "form":
-        st.markdown("""
-        <div class="content-card" style="max-width: 600px; margin: 2rem auto; text-align: center;">
-            <h2 style="color: var(--mupai-yellow); margin-bottom: 1.5rem;">
-                📝 Datos para Solicitud de Acceso
-            </h2>
-            <p style="margin-bottom: 2rem; color: #CCCCCC;">
-                Completa los siguientes datos para generar tu código de acceso único.
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col2:
-            with st.form("solicitud_acceso"):
-                nombre = st.text_input(
-                    "Nombre completo *", 
-                    placeholder="Ej: Juan Pérez García",
-                    help="Ingresa tu nombre completo"
-                )
-                
-                email = st.text_input(
-                    "Correo electrónico *", 
-                    placeholder="Ej: juan@ejemplo.com",
-                    help="Correo donde recibirás comunicaciones"
-                )
-                
-                whatsapp = st.text_input(
-                    "Número de WhatsApp *", 
-                    placeholder="Ej: 5551234567",
-                    help="Número de WhatsApp de 10 dígitos"
-                )
-                
-                col_form1, col_form2 = st.columns(2)
-                with col_form1:
-                    submitted = st.form_submit_button("📤 Enviar Solicitud", use_container_width=True)
-                with col_form2:
-                    cancel = st.form_submit_button("❌ Cancelar", use_container_width=True)
-                
-                if cancel:
-                    st.session_state.access_stage = "request"
-                    st.rerun()
-                
-                if submitted:
-                    # Validar todos los campos
-                    name_valid, name_error = validate_name(nombre)
-                    email_valid, email_error = validate_email(email)
-                    whatsapp_valid, whatsapp_error = validate_whatsapp(whatsapp)
-                    
-                    # Mostrar errores específicos
-                    validation_errors = []
-                    if not name_valid:
-                        validation_errors.append(f"**Nombre:** {name_error}")
-                    if not email_valid:
-                        validation_errors.append(f"**Email:** {email_error}")
-                    if not whatsapp_valid:
-                        validation_errors.append(f"**WhatsApp:** {whatsapp_error}")
-                    
-                    if validation_errors:
-                        st.error("❌ **Errores en el formulario:**\n\n" + "\n\n".join(validation_errors))
-                    else:
-                        # Generar código único
-                        codigo = generate_unique_code()
-                        
-                        # Guardar datos en session state con nuevos nombres de variables
-                        st.session_state.access_user_name = nombre
-                        st.session_state.access_user_email = email
-                        st.session_state.access_user_whatsapp = whatsapp
-                        st.session_state.access_code = codigo
-                        
-                        # Enviar email
-                        with st.spinner("📧 Enviando solicitud de acceso..."):
-                            if enviar_email_solicitud_acceso(nombre, email, whatsapp, codigo):
-                                st.session_state.access_request_sent = True
-                                st.session_state.access_stage = "code_sent"
-                                st.success("✅ **Solicitud enviada exitosamente**\n\nTe redirigimos al formulario de acceso. El administrador debe proporcionarte el código de acceso.")
-                                time.sleep(2)  # Dar tiempo para que el usuario lea el mensaje
-                                st.rerun()
-                            else:
-                                st.error("❌ Error al enviar la solicitud. Por favor, intenta nuevamente.")
-    
-    # ETAPA 3: "code_sent" - Ingreso de código y validación
-    elif st.session_state.access_stage == "code_sent":
-        st.markdown("""
-        <div class="content-card" style="max-width: 500px; margin: 2rem auto; text-align: center;">
-            <h2 style="color: var(--mupai-yellow); margin-bottom: 1.5rem;">
-                🔑 Ingresar al Sistema
-            </h2>
-            <p style="margin-bottom: 2rem; color: #CCCCCC;">
-                Ingresa tu correo electrónico y el código de acceso de 6 caracteres 
-                que recibiste del administrador.
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Mostrar código generado en modo testing (solo si secrets no está configurado)
-        # NOTA: En producción, este código no se muestra y solo se envía por email
-        if st.secrets.get("zoho_password", "TU_PASSWORD_AQUI") == "TU_PASSWORD_AQUI":
-            generated_code = st.session_state.get("access_code", "")
-            if generated_code:
-                st.warning(f"⚠️ **Modo de desarrollo:** Código para testing: **{generated_code}** (En producción este código solo se envía por email)")
-        
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col2:
-            with st.form("login_access"):
-                email_login = st.text_input(
-                    "Correo electrónico *", 
-                    value=st.session_state.get("access_user_email", ""),
-                    placeholder="Ej: juan@ejemplo.com",
-                    help="El correo que usaste en tu solicitud"
-                )
-                
-                codigo_input = st.text_input(
-                    "Código de acceso *", 
-                    placeholder="Ej: ABC123",
-                    max_chars=6,
-                    help="Código de 6 caracteres proporcionado por el administrador"
-                )
-                
-                col_login1, col_login2 = st.columns(2)
-                with col_login1:
-                    login_submit = st.form_submit_button("🚀 Acceder", use_container_width=True)
-                with col_login2:
-                    new_request = st.form_submit_button("📝 Nueva Solicitud", use_container_width=True)
-                
-                if new_request:
-                    # Resetear estado para nueva solicitud
-                    st.session_state.access_stage = "request"
-                    st.session_state.access_request_sent = False
-                    st.session_state.access_user_name = ""
-                    st.session_state.access_user_email = ""
-                    st.session_state.access_user_whatsapp = ""
-                    st.session_state.access_code = ""
-                    st.session_state.code_used = False
-                    st.rerun()
-                
-                if login_submit:
-                    # Validar email y código
-                    if not email_login or not email_login.strip():
-                        st.error("❌ Debes ingresar tu correo electrónico.")
-                    elif not codigo_input or not codigo_input.strip():
-                        st.error("❌ Debes ingresar el código de acceso.")
-                    else:
-                        # Verificar que el email coincida con el registrado
-                        stored_email = st.session_state.get("access_user_email", "")
-                        stored_code = st.session_state.get("access_code", "")
-                        
-                        if email_login.lower().strip() != stored_email.lower().strip():
-                            st.error("❌ El correo electrónico no coincide con el registrado en la solicitud.")
-                        elif codigo_input.upper() != stored_code:
-                            st.error("❌ Código incorrecto. Verifica el código proporcionado por el administrador.")
-                        elif st.session_state.code_used:
-                            st.error("❌ Este código ya ha sido utilizado. Solicita un nuevo código.")
-                        else:
-                            # Acceso autorizado - Si el código es correcto, marcar como autenticado y código usado
-                            st.session_state.authenticated = True
-                            st.session_state.code_used = True
-                            st.session_state.access_stage = "authenticated"
-                            st.success("✅ Acceso autorizado. ¡Bienvenido al sistema MUPAI!")
-                            st.rerun()
-    
-    # Mostrar información mientras no esté autenticado
-    st.markdown("""
-    <div class="content-card" style="margin-top: 3rem; text-align: center; background: #1A1A1A;">
-        <h3 style="color: var(--mupai-yellow);">Sistema de Evaluación de Patrones Alimentarios</h3>
-        <p style="color: #CCCCCC;">
-            MUPAI utiliza metodologías científicas avanzadas para evaluar patrones alimentarios 
-            personalizados, preferencias dietéticas y crear planes nutricionales adaptativos.
-        </p>
-        <p style="color: #999999; font-size: 0.9rem; margin-top: 1.5rem;">
-            © 2025 MUPAI - Muscle up GYM 
-            Digital Nutrition Science
-            Alimentary Pattern Assessment Intelligence
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Bloquear acceso al cuestionario hasta que se autentique
-    st.stop()
-
-# ==================== FIN NUEVA AUTENTICACIÓN SIMPLIFICADA ====================
-
-# Tarjetas visuales robustas
-def crear_tarjeta(titulo, contenido, tipo="info"):
-    colores = {
-        "info": "var(--mupai-yellow)",
-        "success": "var(--mupai-success)",
-        "warning": "var(--mupai-warning)",
-        "danger": "var(--mupai-danger)"
+    inicializar_estado()
+    autenticar_con_token()
+    iniciar_servicios_correo()
+
+    # ==================== NAVEGACIÓN ENTRE PÁGINAS ====================
+    # Cada página es un script independiente en paginas/; en cada rerun solo se
+    # ejecuta la página activa. Todas se registran para poder usar st.switch_page,
+    # y la página por defecto es la que corresponde a la etapa del usuario.
+    etapa = pagina_de_etapa()
+    titulos = {
+        PAGINA_ACCESO: ("Acceso", "🔑"),
+        PAGINA_DATOS_PERSONALES: ("Datos personales", "👤"),
+        PAGINA_CUESTIONARIO: ("Cuestionario", "🧾"),
+        PAGINA_RESULTADOS: ("Resultados", "📈"),
     }
-    color = colores.get(tipo, "var(--mupai-yellow)")
-    return f"""
-    <div class="content-card" style="border-left-color: {color};">
-        <h3 style="margin-bottom: 1rem;">{titulo}</h3>
-        <div>{contenido}</div>
-    </div>
-    """
-
-def enviar_email_resumen(contenido, nombre_cliente, email_cliente, fecha, edad, telefono):
-    """Envía el email con el resumen completo de la evaluación de patrones alimentarios."""
-    try:
-        email_origen = "administracion@muscleupgym.fitness"
-        email_destino = "administracion@muscleupgym.fitness"
-        password = st.secrets.get("zoho_password", "TU_PASSWORD_AQUI")
-
-        msg = MIMEMultipart()
-        msg['From'] = email_origen
-        msg['To'] = email_destino
-        msg['Subject'] = f"Evaluación patrones alimentarios MUPAI - {nombre_cliente} ({fecha})"
-
-        msg.attach(MIMEText(contenido, 'plain'))
-
-        server = smtplib.SMTP('smtp.zoho.com', 587)
-        server.starttls()
-        server.login(email_origen, password)
-        server.send_message(msg)
-        server.quit()
-
-        return True
-    except Exception as e:
-        st.error(f"Error al enviar email: {str(e)}")
-        return False
-
-# ==================== VISUALES INICIALES ====================
-
-# Misión, Visión y Compromiso con diseño mejorado
-with st.expander("🎯 **Misión, Visión y Compromiso MUPAI**", expanded=False):
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.markdown(crear_tarjeta(
-            "🎯 Misión",
-            "Hacer accesible la evaluación nutricional basada en ciencia, ofreciendo análisis de patrones alimentarios personalizados que se adaptan a todos los estilos de vida.",
-            "info"
-        ), unsafe_allow_html=True)
-    with col2:
-        st.markdown(crear_tarjeta(
-            "👁️ Visión",
-            "Ser el referente global en evaluación de patrones alimentarios digitales, uniendo investigación nutricional con experiencia práctica personalizada.",
-            "success"
-        ), unsafe_allow_html=True)
-    with col3:
-        st.markdown(crear_tarjeta(
-            "🤝 Compromiso",
-            "Nos guiamos por la ética, transparencia y precisión científica para ofrecer recomendaciones nutricionales reales, medibles y sostenibles.",
-            "warning"
-        ), unsafe_allow_html=True)
-
-# === DESCARGO DE RESPONSABILIDAD PROFESIONAL ===
-with st.expander("⚖️ **Descargo de Responsabilidad Profesional** (Requerido)", expanded=False):
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.markdown(crear_tarjeta(
-            "🔬 Naturaleza Científica",
-            "Esta herramienta proporciona estimaciones basadas en algoritmos científicos validados. Los resultados son orientativos y no constituyen un diagnóstico médico o nutricional.",
-            "info"
-        ), unsafe_allow_html=True)
-    with col2:
-        st.markdown(crear_tarjeta(
-            "⚕️ Limitaciones",
-            "No reemplaza la consulta con profesionales de la salud. Los cálculos pueden tener margen de error según la precisión de los datos ingresados.",
-            "warning"
-        ), unsafe_allow_html=True)
-    with col3:
-        st.markdown(crear_tarjeta(
-            "🎯 Uso Recomendado",
-            "Utiliza estos resultados como punto de partida informativo. Consulta con profesionales certificados antes de implementar cambios significativos.",
-            "success"
-        ), unsafe_allow_html=True)
-    with col4:
-        st.markdown(crear_tarjeta(
-            "📞 Responsabilidad",
-            "MUPAI y Muscle Up GYM no se hacen responsables por el uso inadecuado de esta información. El usuario asume la responsabilidad.",
-            "danger"
-        ), unsafe_allow_html=True)
-    
-    # Checkbox destacado dentro del expander
-    st.markdown("""
-    <div style="background: rgba(244, 196, 48, 0.08); padding: 1rem; border-radius: 10px; border: 1px solid rgba(244, 196, 48, 0.3); margin: 1rem 0;">
-        <div style="display: flex; align-items: center; margin-bottom: 0.5rem;">
-            <span style="color: var(--mupai-yellow); font-size: 1.1rem; margin-right: 0.5rem;">📋</span>
-            <strong style="color: var(--mupai-yellow); font-size: 1rem;">CONFIRMACIÓN REQUERIDA</strong>
-        </div>
-        <p style="color: #CCCCCC; margin: 0; font-size: 0.95rem;">
-            Marca la siguiente casilla para confirmar que has leído y comprendes completamente el descargo de responsabilidad.
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    acepto_descargo = st.checkbox(
-        "✅ **He leído y entiendo completamente el descargo de responsabilidad profesional**",
-        key="acepto_descargo",
-        help="Debes confirmar que has leído y entiendes las limitaciones de esta evaluación"
-    )
-
-# BLOQUE 0: Datos personales con diseño mejorado
-st.markdown('<div class="content-card">', unsafe_allow_html=True)
-st.markdown("### 👤 Información Personal")
-st.markdown("Por favor, completa todos los campos para comenzar tu evaluación de patrones alimentarios personalizada.")
-
-col1, col2 = st.columns(2)
-with col1:
-    nombre = st.text_input("Nombre completo*", value=st.session_state.get('nombre', ''), placeholder="Ej: Juan Pérez García", help="Tu nombre legal completo")
-    telefono = st.text_input("Teléfono*", value=st.session_state.get('telefono', ''), placeholder="Ej: 8661234567", help="10 dígitos sin espacios")
-    email_cliente = st.text_input("Email*", value=st.session_state.get('email_cliente', ''), placeholder="correo@ejemplo.com", help="Email válido para recibir resultados")
-
-with col2:
-    # Fix edad type issue by ensuring it's an integer
-    edad_value = st.session_state.get('edad', 25)
-    if isinstance(edad_value, str):
-        try:
-            edad_value = int(edad_value)
-        except (ValueError, TypeError):
-            edad_value = 25
-    
-    edad = st.number_input("Edad (años)*", min_value=15, max_value=80, value=edad_value, help="Tu edad actual")
-    sexo = st.selectbox("Sexo biológico*", options=["Hombre", "Mujer"], index=0 if st.session_state.get('sexo', 'Hombre') == 'Hombre' else 1, placeholder="Selecciona una opción", help="Necesario para análisis nutricionales precisos")
-    fecha_llenado = datetime.now().strftime("%Y-%m-%d")
-    st.info(f"📅 Fecha de evaluación: {fecha_llenado}")
-
-# Checkbox principal con diseño destacado (solo se habilita si se acepta el descargo)
-st.markdown(f"""
-<div class="content-card" style="border-left-color: var(--mupai-warning); margin: 1.5rem 0; background: linear-gradient(135deg, #1E1E1E 0%, #252525 100%); border: 2px solid var(--mupai-yellow); box-shadow: 0 8px 25px rgba(244, 196, 48, 0.15);">
-    <div style="display: flex; align-items: center; margin-bottom: 1rem;">
-        <span class="badge badge-warning" style="margin-right: 0.8rem; font-size: 0.9rem;">✅ ACEPTACIÓN REQUERIDA</span>
-        <h4 style="margin: 0; color: #FFF; font-size: 1.1rem;">Confirmación Final de Términos</h4>
-    </div>
-    <div style="background: rgba(244, 196, 48, 0.1); padding: 1rem; border-radius: 10px; border-left: 4px solid var(--mupai-yellow); margin-bottom: 1rem;">
-        <p style="color: #FFF; margin: 0; font-weight: 500; font-size: 1.05rem;">
-            <strong style="color: var(--mupai-yellow);">⚠️ IMPORTANTE:</strong> 
-            Para continuar con tu evaluación personalizada, debes confirmar que has leído y aceptas completamente nuestros términos y el descargo de responsabilidad profesional.
-        </p>
-    </div>
-</div>
-""", unsafe_allow_html=True)
-
-acepto_terminos = st.checkbox(
-    "✅ **He leído y acepto la política de privacidad y el descargo de responsabilidad**",
-    disabled=not st.session_state.get("acepto_descargo", False),
-    help="Primero debes leer y aceptar el descargo de responsabilidad profesional arriba" if not st.session_state.get("acepto_descargo", False) else "Acepto los términos para continuar con la evaluación"
-)
-
-if st.button("🚀 COMENZAR EVALUACIÓN", disabled=not (acepto_terminos and st.session_state.get("acepto_descargo", False))):
-    # Validación estricta de cada campo
-    name_valid, name_error = validate_name(nombre)
-    phone_valid, phone_error = validate_phone(telefono)
-    email_valid, email_error = validate_email(email_cliente)
-    
-    # Mostrar errores específicos para cada campo que falle
-    validation_errors = []
-    if not name_valid:
-        validation_errors.append(f"**Nombre:** {name_error}")
-    if not phone_valid:
-        validation_errors.append(f"**Teléfono:** {phone_error}")
-    if not email_valid:
-        validation_errors.append(f"**Email:** {email_error}")
-    
-    # Solo proceder si todas las validaciones pasan
-    if name_valid and phone_valid and email_valid:
-        st.session_state.datos_completos = True
-        st.session_state.nombre = nombre
-        st.session_state.telefono = telefono
-        st.session_state.email_cliente = email_cliente
-        st.session_state.edad = edad
-        st.session_state.sexo = sexo
-        st.session_state.fecha_llenado = fecha_llenado
-        st.session_state.acepto_terminos = acepto_terminos
-        st.success("✅ Datos registrados correctamente. ¡Continuemos con tu evaluación de patrones alimentarios!")
-    else:
-        # Mostrar todos los errores de validación
-        error_message = "⚠️ **Por favor corrige los siguientes errores:**\n\n" + "\n\n".join(validation_errors)
-        st.error(error_message)
-
-st.markdown('</div>', unsafe_allow_html=True)
-
-if not st.session_state.datos_completos:
-    st.markdown("""
-    <div class="content-card" style="margin-top:2rem; padding:3rem; background: #181A1B; color: #F5F5F5; border-left: 5px solid #F4C430;">
-        <div style="text-align:center;">
-            <h2 style="color: #F5C430; font-weight:900; margin:0;">
-                🍽️ Bienvenido a MUPAI Patrones Alimentarios
-            </h2>
-            <p style="color: #F5F5F5;font-size:1.1rem;font-weight:600;margin-top:1.5rem;">
-                <span style="font-size:1.15rem; font-weight:700;">¿Cómo funciona la evaluación?</span>
-            </p>
-            <div style="text-align:left;display:inline-block;max-width:650px;">
-                <ul style="list-style:none;padding:0;">
-                    <li style="margin-bottom:1.1em;">
-                        <span style="font-size:1.3rem;">📝</span> <b>Paso 1:</b> Información personal<br>
-                        <span style="color:#F5F5F5;font-size:1rem;">
-                            Recopilamos tu información básica para personalizar la evaluación nutricional.
-                        </span>
-                    </li>
-                    <li style="margin-bottom:1.1em;">
-                        <span style="font-size:1.3rem;">🥩</span> <b>Paso 2:</b> Proteínas animales con más contenido graso<br>
-                        <span style="color:#F5F5F5;font-size:1rem;">
-                            Identificamos huevos, embutidos, carnes grasas, quesos altos en grasa y pescados grasos.
-                        </span>
-                    </li>
-                    <li style="margin-bottom:1.1em;">
-                        <span style="font-size:1.3rem;">🍗</span> <b>Paso 3:</b> Proteínas animales magras<br>
-                        <span style="color:#F5F5F5;font-size:1rem;">
-                            Evaluamos carnes magras, pescados blancos, quesos bajos en grasa y lácteos light.
-                        </span>
-                    </li>
-                    <li style="margin-bottom:1.1em;">
-                        <span style="font-size:1.3rem;">🥑</span> <b>Paso 4:</b> Fuentes de grasa saludable<br>
-                        <span style="color:#F5F5F5;font-size:1rem;">
-                            Analizamos grasas naturales, frutos secos, semillas y mantequillas vegetales.
-                        </span>
-                    </li>
-                    <li style="margin-bottom:1.1em;">
-                        <span style="font-size:1.3rem;">🍞</span> <b>Paso 5:</b> Carbohidratos complejos y cereales<br>
-                        <span style="color:#F5F5F5;font-size:1rem;">
-                            Evaluamos cereales integrales, tortillas, panes, raíces, tubérculos y leguminosas.
-                        </span>
-                    </li>
-                    <li style="margin-bottom:1.1em;">
-                        <span style="font-size:1.3rem;">🥬</span> <b>Paso 6:</b> Vegetales y frutas<br>
-                        <span style="color:#F5F5F5;font-size:1rem;">
-                            Identificamos todos los vegetales y frutas que consumes o toleras fácilmente.
-                        </span>
-                    </li>
-                    <li style="margin-bottom:1.1em;">
-                        <span style="font-size:1.3rem;">🍳</span> <b>Paso 7:</b> Aceites de cocción y bebidas<br>
-                        <span style="color:#F5F5F5;font-size:1rem;">
-                            Evaluamos tus preferencias de aceites para cocinar y bebidas sin calorías.
-                        </span>
-                    </li>
-                    <li style="margin-bottom:1.1em;">
-                        <span style="font-size:1.3rem;">👨‍🍳</span> <b>Paso 9:</b> Métodos de cocción disponibles<br>
-                        <span style="color:#F5F5F5;font-size:1rem;">
-                            Identificamos los métodos de cocción que tienes accesibles para personalizar recetas.
-                        </span>
-                    </li>
-                    <li style="margin-bottom:1.1em;">
-                        <span style="font-size:1.3rem;">🚨</span> <b>Paso 10:</b> Alergias e intolerancias alimentarias<br>
-                        <span style="color:#F5F5F5;font-size:1rem;">
-                            Identificamos restricciones alimentarias críticas para tu seguridad.
-                        </span>
-                    </li>
-                    <li style="margin-bottom:1.1em;">
-                        <span style="font-size:1.3rem;">😋</span> <b>Paso 11:</b> Patrones de antojos alimentarios<br>
-                        <span style="color:#F5F5F5;font-size:1rem;">
-                            Analizamos antojos dulces, salados, comida rápida y condimentos estimulantes.
-                        </span>
-                    </li>
-                    <li style="margin-bottom:1.1em;">
-                        <span style="font-size:1.3rem;">🍽️</span> <b>Paso 12:</b> Frecuencia de comidas preferida<br>
-                        <span style="color:#F5F5F5;font-size:1rem;">
-                            Adaptamos el plan a tu rutina diaria y estilo de vida.
-                        </span>
-                    </li>
-                    <li style="margin-bottom:1.1em;">
-                        <span style="font-size:1.3rem;">📈</span> <b>Resultado final:</b> Perfil alimentario completo<br>
-                        <span style="color:#F5F5F5;font-size:1rem;">
-                            Recibes un análisis detallado de tus patrones alimentarios y recomendaciones personalizadas.
-                        </span>
-                    </li>
-                </ul>
-                <div style="margin-top:1.2em; font-size:1rem; color:#F4C430;">
-                    <b>Finalidad:</b> Esta evaluación integra principios de nutrición personalizada para ofrecerte recomendaciones alimentarias que se ajusten a tu estilo de vida y preferencias específicas. <br>
-                    <b>Tiempo estimado:</b> Menos de 10 minutos.
-                </div>
-            </div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-
-# VALIDACIÓN DATOS PERSONALES PARA CONTINUAR
-datos_personales_completos = all([nombre, telefono, email_cliente]) and acepto_terminos and st.session_state.get("acepto_descargo", False)
-
-if datos_personales_completos and st.session_state.datos_completos:
-    # Progress bar mejorado y más prominente
-    st.markdown("### 📊 Progreso de tu Evaluación")
-    progress = st.progress(0, text="Iniciando evaluación...")
-    progress_container = st.container()
-    
-    # CUESTIONARIO DE SELECCIÓN ALIMENTARIA PERSONALIZADA CON MEJOR DISEÑO
-    st.markdown("""
-    <div class="content-card" style="background: linear-gradient(135deg, #F4C430 0%, #DAA520 100%); color: #1E1E1E; margin-bottom: 2rem; border: 3px solid #DAA520;">
-        <h2 style="color: #1E1E1E; text-align: center; margin-bottom: 1.5rem;">
-            🧾 CUESTIONARIO DE SELECCIÓN ALIMENTARIA PERSONALIZADA
-        </h2>
-        <div style="text-align: left; font-size: 1.1rem; line-height: 1.6;">
-            <p><strong>📋 Instrucciones importantes:</strong></p>
-            <ul style="margin-left: 1rem;">
-                <li><strong>✅ Selecciona múltiples opciones:</strong> Puedes marcar TODOS los alimentos que consumes o disfrutas en cada categoría</li>
-                <li><strong>🎯 Sé específico:</strong> Entre más alimentos marques, más personalizado será tu plan nutricional</li>
-                <li><strong>⏱️ Tiempo estimado:</strong> 5-8 minutos para completar toda la evaluación</li>
-                <li><strong>💡 Consejo:</strong> Si tienes dudas sobre un alimento, márcalo. Es mejor incluir más opciones</li>
-            </ul>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-
-    # Navegación mejorada por pasos - Ahora refleja el progreso real
-    current_step = st.session_state.get('current_step', 1)
-    max_unlocked = st.session_state.get('max_unlocked_step', 1)
-    step_completed = st.session_state.get('step_completed', {})
-    
-    # Verificar estado de validación en tiempo real
-    step_validators = {
-        1: validate_step_legacy(1),
-        2: validate_step_legacy(2),
-        3: validate_step_legacy(3),
-        4: validate_step_legacy(4),
-        5: validate_step_legacy(5),
-        6: validate_step_legacy(6),
-        7: validate_step_legacy(7),
-        8: validate_step_legacy(8),
-        9: validate_step_legacy(9),
-        10: validate_step_legacy(10),
-        11: validate_step_legacy(11),
-        12: validate_step_legacy(12),
-        13: validate_step_legacy(13),
-        14: validate_step_legacy(14)
+    paginas = {
+        ruta: st.Page(ruta, title=titulos[ruta][0], icon=titulos[ruta][1], default=(ruta == etapa))
+        for ruta in ORDEN_PAGINAS
     }
-    
-    st.markdown(f"""
-    <div class="content-card" style="background: #2A2A2A; border-left: 5px solid #F4C430;">
-        <h3 style="color: #F4C430; text-align: center; margin-bottom: 1rem;">🗺️ Progreso del Cuestionario</h3>
-        <div style="display: flex; justify-content: space-between; flex-wrap: wrap; gap: 10px;">
-            <div style="text-align: center; flex: 1; min-width: 120px;">
-                <div style="background: {'#F4C430' if current_step == 1 else '#27AE60' if step_validators[1] else '#E74C3C'}; color: #1E1E1E; border-radius: 50%; width: 40px; height: 40px; display: flex; align-items: center; justify-content: center; margin: 0 auto 5px; font-weight: bold;">{'✓' if step_validators[1] else '1'}</div>
-                <small>Proteínas Grasas</small>
-            </div>
-            <div style="text-align: center; flex: 1; min-width: 120px;">
-                <div style="background: {'#F4C430' if current_step == 2 else '#27AE60' if step_validators[2] else '#E74C3C' if max_unlocked >= 2 else '#666'}; color: {'#1E1E1E' if current_step == 2 or step_validators[2] else '#FFF'}; border-radius: 50%; width: 40px; height: 40px; display: flex; align-items: center; justify-content: center; margin: 0 auto 5px; font-weight: bold;">{'✓' if step_validators[2] else '2'}</div>
-                <small>Proteínas Magras</small>
-            </div>
-            <div style="text-align: center; flex: 1; min-width: 120px;">
-                <div style="background: {'#F4C430' if current_step == 3 else '#27AE60' if step_validators[3] else '#E74C3C' if max_unlocked >= 3 else '#666'}; color: {'#1E1E1E' if current_step == 3 or step_validators[3] else '#FFF'}; border-radius: 50%; width: 40px; height: 40px; display: flex; align-items: center; justify-content: center; margin: 0 auto 5px; font-weight: bold;">{'✓' if step_validators[3] else '3'}</div>
-                <small>Grasas Saludables</small>
-            </div>
-            <div style="text-align: center; flex: 1; min-width: 120px;">
-                <div style="background: {'#F4C430' if current_step == 4 else '#27AE60' if step_validators[4] else '#E74C3C' if max_unlocked >= 4 else '#666'}; color: {'#1E1E1E' if current_step == 4 or step_validators[4] else '#FFF'}; border-radius: 50%; width: 40px; height: 40px; display: flex; align-items: center; justify-content: center; margin: 0 auto 5px; font-weight: bold;">{'✓' if step_validators[4] else '4'}</div>
-                <small>Carbohidratos</small>
-            </div>
-            <div style="text-align: center; flex: 1; min-width: 120px;">
-                <div style="background: {'#F4C430' if current_step == 5 else '#27AE60' if step_validators[5] else '#E74C3C' if max_unlocked >= 5 else '#666'}; color: {'#1E1E1E' if current_step == 5 or step_validators[5] else '#FFF'}; border-radius: 50%; width: 40px; height: 40px; display: flex; align-items: center; justify-content: center; margin: 0 auto 5px; font-weight: bold;">{'✓' if step_validators[5] else '5'}</div>
-                <small>Vegetales</small>
-            </div>
-            <div style="text-align: center; flex: 1; min-width: 120px;">
-                <div style="background: {'#F4C430' if current_step == 6 else '#27AE60' if step_validators[6] else '#E74C3C' if max_unlocked >= 6 else '#666'}; color: {'#1E1E1E' if current_step == 6 or step_validators[6] else '#FFF'}; border-radius: 50%; width: 40px; height: 40px; display: flex; align-items: center; justify-content: center; margin: 0 auto 5px; font-weight: bold;">{'✓' if step_validators[6] else '6'}</div>
-                <small>Frutas</small>
-            </div>
-        </div>
-        <div style="text-align: center; margin-top: 1rem; color: #CCCCCC;">
-            <small>Paso {current_step} de 14 - {'✅ Completado' if step_validators.get(current_step, False) else '⏳ En progreso'}</small>
-        </div>
-        <div style="text-align: center; margin-top: 0.5rem; font-size: 0.9rem;">
-            <span style="color: #27AE60;">● Completo</span> | 
-            <span style="color: #F4C430;">● Actual</span> | 
-            <span style="color: #E74C3C;">● Incompleto</span> | 
-            <span style="color: #666;">● Bloqueado</span>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-
-    # Mostrar solo el paso actual
-    current_step = st.session_state.get('current_step', 1)
-
-    # GRUPO 1: PROTEÍNA ANIMAL CON MÁS CONTENIDO GRASO
-    if current_step == 1:
-        # Enhanced visual step indicator with orientation info
-        st.markdown("""
-        <div style="
-            background: linear-gradient(135deg, #4CAF50 0%, #45a049 100%);
-            color: white;
-            padding: 2rem 1.5rem;
-            border-radius: 15px;
-            text-align: center;
-            margin-bottom: 2rem;
-            box-shadow: 0 8px 25px rgba(76, 175, 80, 0.3);
-            border: 3px solid #4CAF50;
-        ">
-            <h1 style="margin: 0; font-size: 2.2rem; font-weight: bold; color: white;">
-                🥩 PASO 1: PROTEÍNA ANIMAL CON MÁS CONTENIDO GRASO
-            </h1>
-            <p style="margin: 1rem 0 0.5rem 0; font-size: 1.2rem; opacity: 0.9; color: white;">
-                Paso 1 de 14 en tu evaluación personalizada de patrones alimentarios
-            </p>
-            <div style="background: rgba(255,255,255,0.2); padding: 1rem; border-radius: 10px; margin-top: 1.5rem;">
-                <p style="margin: 0; font-size: 1rem; color: white; font-weight: 500;">
-                    🎯 <strong>Objetivo:</strong> Identificar las proteínas animales con mayor contenido graso que consumes habitualmente
-                </p>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Informational content box for orientation
-        st.info("""
-        ### 📋 Información importante para este paso:
-        
-        **¿Por qué evaluamos estas proteínas?**
-        - Las proteínas grasas aportan aminoácidos esenciales y grasas saturadas
-        - Son importantes para la saciedad y absorción de vitaminas liposolubles
-        - Nos ayudan a calcular tu perfil nutricional completo
-        
-        **¿Cómo completar este paso?**
-        - Revisa cada categoría de alimentos verticalmente
-        -Marca TODOS los alimentos que consumas con facilidad, incluso ocasionalmente, estos alimentos se utilizarán para personalizar al máximo tu plan de alimentación.
-        - Si no consumes ningún alimento de una categoría, marca "Ninguno"
-        
-        **💡 Consejo:** Es mejor marcar más opciones que menos. Si ocasionalmente comes algo, inclúyelo.
-        """)
-        
-
-        # Actualizar progreso
-        progress.progress(7, text="Paso 1 de 14: Proteínas con más contenido graso")
-
-        st.markdown('<div class="content-card">', unsafe_allow_html=True)
-        
-        st.markdown("#### 🍳 Huevos y embutidos")
-        huevos_embutidos = create_vertical_checkboxes(
-            "¿Cuáles de estos huevos y embutidos consumes?",
-            ["Huevo entero", "Chorizo", "Salchicha (Viena, alemana, parrillera)", "Longaniza", "Tocino", "Jamón serrano", "Jamón ibérico", "Salami", "Mortadela", "Pastrami", "Pepperoni", "Ninguno"],
-            "huevos_embutidos",
-            "Marca todos los que consumes. Si no consumes ninguno, marca 'Ninguno'."
-        )
-        
-        st.markdown("#### 🥩 Carnes de res grasas")
-        carnes_res_grasas = create_vertical_checkboxes(
-            "¿Cuáles de estas carnes de res grasas consumes?",
-            ["Aguja norteña", "Diezmillo marmoleado", "Costilla/Costillar", "Ribeye", "New York", "T-bone", "Porterhouse", "Prime rib", "Arrachera", "Picaña", "Suadero", "Brisket/Pecho de res", "Chamberete con tuétano", "Falda marmoleada", "Molida 80/20", "Molida 85/15", "Carne para asar con grasa", "Chuck roast (diezmillo graso)", "Paleta con grasa", "Retazo con grasa", "Short ribs", "Cowboy steak", "Tomahawk", "Matambre", "Entraña", "Ninguno"],
-            "carnes_res_grasas",
-            "Marca todos los cortes que consumes. Si no consumes ninguno, marca 'Ninguno'."
-        )
-        
-        st.markdown("#### 🐷 Carnes de cerdo grasas")
-        carnes_cerdo_grasas = create_vertical_checkboxes(
-            "¿Cuáles de estas carnes de cerdo grasas consumes?",
-            ["Costilla de cerdo", "Panceta (belly)", "Chuleta con grasa", "Carnitas", "Chicharrón prensado", "Codillo", "Espalda (Boston butt)", "Picnic shoulder", "Pata de cerdo", "Ninguno"],
-            "carnes_cerdo_grasas",
-            "Marca todos los cortes que consumes. Si no consumes ninguno, marca 'Ninguno'."
-        )
-        
-        st.markdown("#### 🐔 Carnes de pollo/pavo grasas")
-        carnes_pollo_grasas = create_vertical_checkboxes(
-            "¿Cuáles de estas carnes de pollo/pavo grasas consumes?",
-            ["Muslo de pollo con piel", "Pierna de pollo con piel", "Alitas de pollo", "Pollo entero con piel", "Pavo con piel", "Muslo de pavo", "Ninguno"],
-            "carnes_pollo_grasas",
-            "Marca todas las que consumes. Si no consumes ninguno, marca 'Ninguno'."
-        )
-        
-        st.markdown("#### 🫀 Órganos y vísceras grasas")
-        organos_grasos = create_vertical_checkboxes(
-            "¿Cuáles de estos órganos y vísceras grasas consumes?",
-            ["Sesos de res", "Tuétano de res", "Molleja de res", "Hígado de res", "Riñón de res", "Ninguno"],
-            "organos_grasos",
-            "Marca todos los que consumes. Si no consumes ninguno, marca 'Ninguno'."
-        )
-        
-        st.markdown("#### 🧀 Quesos altos en grasa")
-        quesos_grasos = create_vertical_checkboxes(
-            "¿Cuáles de estos quesos altos en grasa consumes?",
-            ["Queso manchego", "Queso doble crema", "Queso oaxaca", "Queso gouda", "Queso crema", "Queso cheddar", "Queso roquefort", "Queso brie", "Queso camembert", "Queso parmesano", "Queso gruyere", "Queso de cabra maduro", "Ninguno"],
-            "quesos_grasos",
-            "Marca todos los quesos que consumes. Si no consumes ninguno, marca 'Ninguno'."
-        )
-        
-        st.markdown("#### 🥛 Lácteos enteros")
-        lacteos_enteros = create_vertical_checkboxes(
-            "¿Cuáles de estos lácteos enteros consumes?",
-            ["Leche entera", "Yogur entero azucarado", "Yogur tipo griego entero", "Yogur de frutas azucarado", "Yogur bebible regular", "Crema", "Queso para untar (tipo Philadelphia original)", "Nata", "Crema agria", "Ninguno"],
-            "lacteos_enteros",
-            "Marca todos los lácteos enteros que consumes. Si no consumes ninguno, marca 'Ninguno'."
-        )
-        
-        st.markdown("#### 🐟 Pescados grasos")
-        pescados_grasos = create_vertical_checkboxes(
-            "¿Cuáles de estos pescados grasos consumes?",
-            ["Atún en aceite", "Salmón", "Salmón en agua (enlatado)","Sardinas en aceite (enlatadas, escurridas)","Sardinas en agua (enlatadas, escurridas)","Sardinas en salsa de tomate (enlatadas, escurridas)", "Macarela", "Trucha", "Arenque", "Anchovetas", "Pez espada", "Anguila", "Ninguno"],
-            "pescados_grasos",
-            "Marca todos los pescados grasos que consumes. Si no consumes ninguno, marca 'Ninguno'."
-        )
-        
-        st.markdown("#### 🦐 Mariscos/comida marina grasos")
-        mariscos_grasos = create_vertical_checkboxes(
-            "¿Cuáles de estos mariscos/comida marina grasos consumes?",
-            ["Pulpo", "Pulpo al ajillo (lata, escurrido)", "Calamar", "Calamar en su tinta (lata, escurrido)", "Mejillones", "Mejillones en escabeche (lata, escurrido)", "Ostras", "Ostiones ahumados en aceite (lata, escurrido)", "Cangrejo", "Langosta", "Caracol de mar", "Ninguno"],
-            "mariscos_grasos",
-            "Marca todos los que consumes. Si no consumes ninguno, marca 'Ninguno'."
-        )
-
-        # Resumen del paso actual
-        total_seleccionados = (len(st.session_state.get('huevos_embutidos', [])) + 
-                              len(st.session_state.get('carnes_res_grasas', [])) + 
-                              len(st.session_state.get('carnes_cerdo_grasas', [])) + 
-                              len(st.session_state.get('carnes_pollo_grasas', [])) + 
-                              len(st.session_state.get('organos_grasos', [])) + 
-                              len(st.session_state.get('quesos_grasos', [])) + 
-                              len(st.session_state.get('lacteos_enteros', [])) + 
-                              len(st.session_state.get('pescados_grasos', [])) + 
-                              len(st.session_state.get('mariscos_grasos', [])))
-        if total_seleccionados > 0:
-            st.success(f"✅ **¡Excelente!** Has seleccionado {total_seleccionados} alimentos en este grupo. Esto nos ayudará a personalizar mejor tu plan.")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Botones de navegación
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col1:
-            if st.button("⬅️ Anterior", disabled=True):
-                pass
-        with col3:
-            if st.button("Siguiente ➡️"):
-                advance_to_next_step()
-
-    # GRUPO 2: PROTEÍNA ANIMAL MAGRA
-    elif current_step == 2:
-        # Enhanced visual step indicator with orientation info
-        st.markdown("""
-        <div style="
-            background: linear-gradient(135deg, #2196F3 0%, #1976D2 100%);
-            color: white;
-            padding: 2rem 1.5rem;
-            border-radius: 15px;
-            text-align: center;
-            margin-bottom: 2rem;
-            box-shadow: 0 8px 25px rgba(33, 150, 243, 0.3);
-            border: 3px solid #2196F3;
-        ">
-            <h1 style="margin: 0; font-size: 2.2rem; font-weight: bold; color: white;">
-                🍗 PASO 2: PROTEÍNA ANIMAL MAGRA
-            </h1>
-            <p style="margin: 1rem 0 0.5rem 0; font-size: 1.2rem; opacity: 0.9; color: white;">
-                Paso 2 de 14 en tu evaluación personalizada de patrones alimentarios
-            </p>
-            <div style="background: rgba(255,255,255,0.2); padding: 1rem; border-radius: 10px; margin-top: 1.5rem;">
-                <p style="margin: 0; font-size: 1rem; color: white; font-weight: 500;">
-                    🎯 <strong>Objetivo:</strong> Identificar las proteínas animales magras que consumes habitualmente
-                </p>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Informational content box for orientation
-        st.info("""
-        ### 📋 Información importante para este paso:
-        
-        **¿Por qué evaluamos estas proteínas?**
-        - Las proteínas magras aportan aminoácidos esenciales con menor contenido graso
-        - Son ideales para construir masa muscular y controlar calorías
-        - Proporcionan saciedad sin exceso de grasas saturadas
-        
-       **¿Cómo completar este paso?**
-        - Revisa cada categoría de alimentos verticalmente
-        -Marca TODOS los alimentos que consumas con facilidad, incluso ocasionalmente, estos alimentos se utilizarán para personalizar al máximo tu plan de alimentación.
-        - Si no consumes ningún alimento de una categoría, marca "Ninguno"
-        
-        **💡 Consejo:** Es mejor marcar más opciones que menos. Si ocasionalmente comes algo, inclúyelo.
-        """)
-        # Actualizar progreso
-        progress.progress(14, text="Paso 2 de 14: Proteínas animales magras")
-
-        st.markdown('<div class="content-card">', unsafe_allow_html=True)
-        
-        st.markdown("#### 🐄 Carnes de res magras")
-        carnes_res_magras = create_vertical_checkboxes(
-            "¿Cuáles de estas carnes de res magras consumes?",
-            ["Filete (lomo fino)", "Lomo bajo (striploin limpio)", "Centro de diezmillo limpio", "Sirloin limpio/Aguayón", "Bola/Pulpa bola", "Cuete", "Pulpa negra", "Pulpa blanca", "Espaldilla limpia", "Milanesa de bola", "Bistec de pierna", "Molida 90/10", "Molida 95/5", "Molida 97/3", "Falda limpia", "Chamorro limpio", "Tampiqueña magra", "Medallones de res magros", "Top round", "Bottom round", "Flank steak limpio", "Maciza limpia", "Ninguno"],
-            "carnes_res_magras",
-            "Marca todas las carnes de res magras que consumes. Si no consumes ninguna, marca 'Ninguno'."
-        )
-        
-        st.markdown("#### 🐷 Carnes de cerdo magras")
-        carnes_cerdo_magras = create_vertical_checkboxes(
-            "¿Cuáles de estas carnes de cerdo magras consumes?",
-            ["Lomo de cerdo", "Filete de cerdo", "Chuleta magra sin grasa", "Solomillo de cerdo", "Tenderloin", "Pierna de cerdo magra (pulpa, sin grasa visible)", "Ninguno"],
-            "carnes_cerdo_magras",
-            "Marca todas las que consumes. Si no consumes ninguna, marca 'Ninguno'."
-        )
-        
-        st.markdown("#### 🐔 Carnes de pollo/pavo magras")
-        carnes_pollo_magras = create_vertical_checkboxes(
-            "¿Cuáles de estas carnes de pollo/pavo magras consumes?",
-            ["Pechuga de pollo sin piel", "Pechuga de pavo sin piel", "Muslo de pollo sin piel","Pierna de pollo sin piel", "Pierna de pavo sin piel","Molida de pollo magra", "Molida de pechuga de pavo", "Ninguno"],
-            "carnes_pollo_magras",
-            "Marca todas las que consumes. Si no consumes ninguna, marca 'Ninguno'."
-        )
-        
-        st.markdown("#### 🫀 Órganos y vísceras magros")
-        organos_magros = create_vertical_checkboxes(
-            "¿Cuáles de estos órganos y vísceras magros consumes?",
-            ["Corazón de res", "Lengua de res", "Hígado de ternera", "Riñones de ternera", "Corazón de pollo", "Hígado de pollo", "Molleja de ternera", "Ninguno"],
-            "organos_magros",
-            "Marca todos los que consumes. Si no consumes ninguno, marca 'Ninguno'."
-        )
-        
-        st.markdown("#### 🐟 Pescados magros")
-        pescados_magros = create_vertical_checkboxes(
-            "¿Cuáles de estos pescados magros consumes?",
-            ["Tilapia", "Basa", "Huachinango", "Merluza", "Robalo", "Corvina", "Cazón","Atún fresco (filete/medallón)", "Atún en agua (enlatado, escurrido)","Bacalao", "Lenguado", "Mero", "Dorado", "Pargo", "Ninguno"],
-            "pescados_magros",
-            "Marca todos los pescados magros que consumes. Si no consumes ninguno, marca 'Ninguno'."
-        )
-        
-        st.markdown("#### 🦐 Mariscos/comida marina magros")
-        mariscos_magros = create_vertical_checkboxes(
-            "¿Cuáles de estos mariscos/comida marina magros consumes?",
-            ["Camarón", "Callo de hacha", "Almeja", "Langostino", "Jaiba", "Ninguno"],
-            "mariscos_magros",
-            "Marca todos los que consumes. Si no consumes ninguno, marca 'Ninguno'."
-        )
-        
-        st.markdown("#### 🧀 Quesos magros")
-        quesos_magros = create_vertical_checkboxes(
-            "¿Cuáles de estos quesos magros consumes?",
-            ["Queso panela regular","Queso panela light", "requesón", "Queso cottage regular", "Queso cottage light","Queso ricotta", "Queso oaxaca reducido en grasa", "Queso mozzarella light", "Ninguno"],
-            "quesos_magros",
-            "Marca todos los que consumes. Si no consumes ninguno, marca 'Ninguno'."
-        )
-        
-        st.markdown("#### 🥛 Lácteos light o reducidos")
-        lacteos_light = create_vertical_checkboxes(
-            "¿Cuáles de estos lácteos light o reducidos consumes?",
-            ["Leche descremada", "Leche deslactosada light", "Leche de almendra sin azúcar", "Leche de coco sin azúcar", "Leche de soya sin azúcar", "Yogur griego natural sin azúcar", "Yogur griego light", "Yogur bebible bajo en grasa", "Yogur sin azúcar añadida", "Yogur de frutas bajo en grasa y sin azúcar añadida", "Queso crema light", "Crema light", "Ninguno"],
-            "lacteos_light",
-            "Marca todos los lácteos light que uses. Si no consumes ninguno, marca 'Ninguno'."
-        )
-        
-        st.markdown("#### 🥚 Huevos y embutidos light")
-        huevos_embutidos_light = create_vertical_checkboxes(
-            "¿Cuáles de estos huevos y embutidos light consumes?",
-            ["Clara de huevo", "Jamón de pechuga de pavo", "Jamón de pierna bajo en grasa", "Salchicha de pechuga de pavo (light)", "Pechuga de pavo rebanada", "Jamón serrano magro", "Ninguno"],
-            "huevos_embutidos_light",
-            "Marca todos los que consumes. Si no consumes ninguno, marca 'Ninguno'."
-        )
-        # Resumen del paso actual
-        total_seleccionados = (len(st.session_state.get('carnes_res_magras', [])) + 
-                              len(st.session_state.get('carnes_cerdo_magras', [])) + 
-                              len(st.session_state.get('carnes_pollo_magras', [])) + 
-                              len(st.session_state.get('organos_magros', [])) + 
-                              len(st.session_state.get('pescados_magros', [])) + 
-                              len(st.session_state.get('mariscos_magros', [])) + 
-                              len(st.session_state.get('quesos_magros', [])) + 
-                              len(st.session_state.get('lacteos_light', [])) + 
-                              len(st.session_state.get('huevos_embutidos_light', [])))
-        if total_seleccionados > 0:
-            st.success(f"✅ **¡Excelente!** Has seleccionado {total_seleccionados} alimentos en este grupo. Las proteínas magras son fundamentales para tu plan.")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Botones de navegación
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col1:
-            if st.button("⬅️ Anterior"):
-                go_to_previous_step()
-        with col3:
-            if st.button("Siguiente ➡️"):
-                advance_to_next_step()
-
-    # PASO 3: PROTEÍNA EN POLVO
-    elif current_step == 3:
-        # Add prominent visual step indicator with pink/magenta gradient
-        st.markdown("""
-        <div style="
-            background: linear-gradient(135deg, #E91E63 0%, #C2185B 100%);
-            color: white;
-            padding: 1.5rem;
-            border-radius: 15px;
-            text-align: center;
-            margin-bottom: 2rem;
-            box-shadow: 0 8px 25px rgba(233, 30, 99, 0.3);
-            border: 3px solid #E91E63;
-            animation: slideIn 0.5s ease-out;
-        ">
-            <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
-                💪 PASO 3: Proteína en Polvo
-            </h2>
-            <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
-                Paso 3 de 14 en tu evaluación personalizada
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Información importante
-        st.info("""
-### 📋 Información importante para este paso:
-
-**¿Por qué evaluamos esto?**
-- Las proteínas en polvo son suplementos nutricionales para complementar la dieta
-- Cada tipo tiene características específicas (absorción, perfil de aminoácidos, digestibilidad)
-- Conocer tus preferencias nos permite considerar su aporte en tu plan alimentario
-
-**¿Cómo completar este paso?**
-- Marca TODOS los tipos de proteína en polvo que consumes
-- Si no consumes ninguna, marca "Ninguno"
-- Indica si tienes preferencia por alguna marca específica
-
-**💡 Consejo:** Si consumes proteína ocasionalmente, inclúyela también.
-        """)
-        
-        # Actualizar progreso
-        progress.progress(21, text="Paso 3 de 14: Proteína en polvo")
-        
-        st.markdown('<div class="content-card">', unsafe_allow_html=True)
-        
-        # Sección de tipos de proteína
-        st.markdown("### 🥤 Tipos de Proteína en Polvo")
-        
-        # Preparar todas las opciones de proteínas
-        opciones_proteinas = [
-            # Proteínas de Suero de Leche (Whey)
-            "Whey Protein Concentrate / Concentrado de suero (WPC 80)",
-            "Whey Protein Isolate / Aislado de suero (WPI 90+)",
-            "Whey Protein Hydrolyzed / Hidrolizado de suero (WPH)",
-            "Whey Blend / Mezcla de concentrado + aislado",
-            # Proteínas de Caseína
-            "Caseína Micelar",
-            "Caseinato de Calcio",
-            "Caseína Hidrolizada",
-            # Proteínas Vegetales
-            "Proteína de Soya Aislada",
-            "Proteína de Guisante (Pea Protein Isolate)",
-            "Proteína de Arroz Integral",
-            "Proteína de Cáñamo (Hemp Protein)",
-            "Proteína de Semilla de Calabaza",
-            "Blend Vegetal (mezcla de varias plantas)",
-            # Proteínas de Otras Fuentes
-            "Proteína de Carne (Beef Protein Isolate)",
-            "Proteína de Claras de Huevo",
-            "Albúmina de Huevo",
-            "Proteína de Colágeno Hidrolizado",
-            # Opción especial
-            "Ninguno (no consumo proteína en polvo)"
-        ]
-        
-        proteina_polvo_tipos = create_vertical_checkboxes(
-            "Selecciona TODOS los tipos de proteína en polvo que consumes:",
-            opciones_proteinas,
-            "proteina_polvo_tipos",
-            "Marca todas las opciones que apliquen. Si no consumes proteína en polvo, marca 'Ninguno'."
-        )
-        
-        # Validación UI: "Ninguno" es mutuamente excluyente
-        if "Ninguno (no consumo proteína en polvo)" in proteina_polvo_tipos and len(proteina_polvo_tipos) > 1:
-            st.error("⚠️ **Error:** Si seleccionas 'Ninguno', no puedes seleccionar otros tipos de proteína. Por favor, desmarca 'Ninguno' o desmarca las otras opciones.")
-        
-        st.markdown("---")
-        
-        # Sección de preferencia de marca
-        st.markdown("### 🏷️ Preferencia de Marca")
-        
-        preferencia_marca_proteina = create_vertical_checkboxes(
-            "¿Tienes preferencia por alguna marca específica?",
-            ["Sí", "No"],
-            "preferencia_marca_proteina",
-            "Selecciona SOLO UNA opción"
-        )
-        
-        # Validación: solo una opción en preferencia de marca
-        if len(preferencia_marca_proteina) > 1:
-            st.error("⚠️ **Error:** Solo puedes seleccionar UNA opción (Sí o No). Por favor, desmarca una de las opciones.")
-        
-        # Campo de texto condicional para nombre de marca
-        if preferencia_marca_proteina and len(preferencia_marca_proteina) == 1:
-            if preferencia_marca_proteina[0] == "Sí":
-                nombre_marca_proteina = st.text_input(
-                    "✍️ ¿Cuál es tu marca preferida?",
-                    value=st.session_state.get('nombre_marca_proteina', ''),
-                    placeholder="Ej: Optimum Nutrition, Dymatize, MyProtein, Isopure, Vega, Muscletech, BSN, etc.",
-                    help="Escribe el nombre de la marca de proteína en polvo que prefieres"
-                )
-                st.session_state.nombre_marca_proteina = nombre_marca_proteina
-            else:
-                # Si seleccionó "No", limpiar automáticamente el campo de marca
-                st.session_state.nombre_marca_proteina = ""
-        
-        # Resumen del paso
-        st.markdown("### 📊 Resumen de tu selección")
-        
-        if proteina_polvo_tipos:
-            if "Ninguno (no consumo proteína en polvo)" in proteina_polvo_tipos:
-                st.info("ℹ️ **No consumes proteína en polvo**")
-            else:
-                st.success(f"✅ **Tipos de proteína seleccionados:** {len(proteina_polvo_tipos)}")
-                for tipo in proteina_polvo_tipos:
-                    st.write(f"  • {tipo}")
-        
-        if preferencia_marca_proteina and len(preferencia_marca_proteina) == 1:
-            if preferencia_marca_proteina[0] == "Sí":
-                marca = st.session_state.get('nombre_marca_proteina', '').strip()
-                if marca:
-                    st.success(f"🏷️ **Marca preferida:** {marca}")
-                else:
-                    st.warning("⚠️ **Recuerda:** Debes escribir el nombre de tu marca preferida")
-            else:
-                st.info("ℹ️ **Sin preferencia de marca específica**")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Botones de navegación
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col1:
-            if st.button("⬅️ Anterior"):
-                go_to_previous_step()
-        with col3:
-            if st.button("Siguiente ➡️"):
-                advance_to_next_step()
-
-    # GRUPO 4: FUENTES DE GRASA SALUDABLE
-    elif current_step == 4:
-        # Enhanced visual step indicator with orientation info
-        st.markdown("""
-        <div style="
-            background: linear-gradient(135deg, #FF9800 0%, #F57C00 100%);
-            color: white;
-            padding: 2rem 1.5rem;
-            border-radius: 15px;
-            text-align: center;
-            margin-bottom: 2rem;
-            box-shadow: 0 8px 25px rgba(255, 152, 0, 0.3);
-            border: 3px solid #FF9800;
-        ">
-            <h1 style="margin: 0; font-size: 2.2rem; font-weight: bold; color: white;">
-                🥑 PASO 4: FUENTES DE GRASA SALUDABLE
-            </h1>
-            <p style="margin: 1rem 0 0.5rem 0; font-size: 1.2rem; opacity: 0.9; color: white;">
-                Paso 4 de 14 en tu evaluación personalizada de patrones alimentarios
-            </p>
-            <div style="background: rgba(255,255,255,0.2); padding: 1rem; border-radius: 10px; margin-top: 1.5rem;">
-                <p style="margin: 0; font-size: 1rem; color: white; font-weight: 500;">
-                    🎯 <strong>Objetivo:</strong> Identificar las fuentes de grasas saludables que incluyes en tu dieta
-                </p>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Informational content box for orientation
-        st.info("""
-        ### 📋 Información importante para este paso:
-        
-        **¿Por qué evaluamos estas grasas?**
-        - Las grasas saludables son esenciales para la absorción de vitaminas liposolubles (A, D, E, K)
-        - Favorecen el funcionamiento hormonal y la salud cardiovascular
-        - Proporcionan saciedad y mejoran el sabor de los alimentos
-        
-        **¿Cómo completar este paso?**
-        - Revisa cada categoría de alimentos verticalmente
-        -Marca TODOS los alimentos que consumas con facilidad, incluso ocasionalmente, estos alimentos se utilizarán para personalizar al máximo tu plan de alimentación.
-        - Si no consumes ningún alimento de una categoría, marca "Ninguno"
-        
-        **💡 Consejo:** Es mejor marcar más opciones que menos. Si ocasionalmente comes algo, inclúyelo.
-        """)
-        
-
-        # Actualizar progreso
-        progress.progress(28, text="Paso 4 de 14: Fuentes de grasa saludable")
-
-        st.markdown('<div class="content-card">', unsafe_allow_html=True)
-        
-        st.markdown("#### 🥑 Grasas naturales de alimentos")
-        grasas_naturales = create_vertical_checkboxes(
-            "¿Cuáles de estas grasas naturales consumes?",
-            ["Aguacate","Aceitunas (negras, verdes)", "Coco rallado natural", "Coco fresco", "Leche de coco sin azúcar", "Ninguno"],
-            "grasas_naturales",
-            "Marca todas las grasas naturales que consumes. Si no consumes ninguna, marca 'Ninguno'."
-        )
-        
-        st.markdown("#### 🌰 Frutos secos y semillas")
-        frutos_secos_semillas = create_vertical_checkboxes(
-            "¿Cuáles de estos frutos secos y semillas consumes?",
-            ["Almendras", "Nueces", "Nuez de la India", "Pistaches", "Cacahuates naturales (sin sal)", "Semillas de chía", "Semillas de linaza", "Semillas de girasol", "Semillas de calabaza (pepitas)", "Ninguno"],
-            "frutos_secos_semillas",
-            "Marca todos los frutos secos y semillas que consumes. Si no consumes ninguno, marca 'Ninguno'."
-        )
-        
-        st.markdown("#### 🧈 Mantequillas y pastas vegetales")
-        mantequillas_vegetales = create_vertical_checkboxes(
-            "¿Cuáles de estas mantequillas y pastas vegetales consumes?",
-            ["Mantequilla de maní natural", "Mantequilla de almendra", "Tahini (pasta de ajonjolí)", "Mantequilla de nuez de la India", "Ninguno"],
-            "mantequillas_vegetales",
-            "Marca todas las que consumes. Si no consumes ninguna, marca 'Ninguno'."
-        )
-
-        # Resumen del paso actual
-        total_seleccionados = (len(st.session_state.get('grasas_naturales', [])) + 
-                              len(st.session_state.get('frutos_secos_semillas', [])) + 
-                              len(st.session_state.get('mantequillas_vegetales', [])))
-        if total_seleccionados > 0:
-            st.success(f"✅ **¡Excelente!** Has seleccionado {total_seleccionados} fuentes de grasa saludable. Estas son clave para un plan equilibrado.")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Botones de navegación
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col1:
-            if st.button("⬅️ Anterior"):
-                go_to_previous_step()
-        with col3:
-            if st.button("Siguiente ➡️"):
-                advance_to_next_step()
-
-    # GRUPO 5: CARBOHIDRATOS COMPLEJOS Y CEREALES
-    elif current_step == 5:
-        # Add prominent visual step indicator
-        st.markdown("""
-        <div style="
-            background: linear-gradient(135deg, #9C27B0 0%, #7B1FA2 100%);
-            color: white;
-            padding: 1.5rem;
-            border-radius: 15px;
-            text-align: center;
-            margin-bottom: 2rem;
-            box-shadow: 0 8px 25px rgba(156, 39, 176, 0.3);
-            border: 3px solid #9C27B0;
-            animation: slideIn 0.5s ease-out;
-        ">
-            <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
-                🍞 PASO 5: CARBOHIDRATOS COMPLEJOS Y CEREALES
-            </h2>
-            <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
-                Estás en el paso 5 de 14 - Selecciona los carbohidratos que consumes
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-
-        
-        st.markdown("""
-        <div class="content-card" style="background: linear-gradient(135deg, #F4C430 0%, #DAA520 100%); color: #1E1E1E; margin-bottom: 2rem; border: 3px solid #DAA520;">
-            <h2 style="color: #1E1E1E; text-align: center; margin-bottom: 1rem;">
-                🍞 PASO 5: CARBOHIDRATOS COMPLEJOS Y CEREALES
-            </h2>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Actualizar progreso
-        progress.progress(36, text="Paso 5 de 14: Carbohidratos complejos y cereales")
-        
-        # Actualizar indicador visual
-        st.markdown("""
-        <div style="text-align: center; margin-bottom: 1rem;">
-            <div style="background: #F4C430; color: #1E1E1E; border-radius: 50%; width: 50px; height: 50px; display: flex; align-items: center; justify-content: center; margin: 0 auto; font-weight: bold; font-size: 1.2rem;">4</div>
-            <h4 style="color: #F4C430; margin-top: 0.5rem;">PASO ACTUAL</h4>
-        </div>
-        """, unsafe_allow_html=True)
-
-        st.markdown('<div class="content-card">', unsafe_allow_html=True)
-        st.markdown("""
-        ### 🎯 ¿Qué necesitamos saber?
-        En este paso evaluaremos los **carbohidratos complejos y cereales** que consumes. 
-        Estos alimentos proporcionan energía sostenida y fibra importante para tu digestión.
-        
-        **💡 Instrucción:** - Revisa cada categoría de alimentos verticalmente
-        -Marca TODOS los alimentos que consumas con facilidad, incluso ocasionalmente, estos alimentos se utilizarán para personalizar al máximo tu plan de alimentación.
-        - Si no consumes ningún alimento de una categoría, marca "Ninguno"
-        
-        **💡 Consejo:** Es mejor marcar más opciones que menos. Si ocasionalmente comes algo, inclúyelo.
-        """)
-        
-        st.markdown("#### 🌾 Cereales y granos integrales")
-        cereales_integrales = create_vertical_checkboxes(
-            "¿Cuáles de estos cereales y granos integrales consumes? (Puedes seleccionar varios)",
-            [ "Avena (hojuelas/tradicional)",
-        "Avena instantánea natural sin azúcar",
-        "Arroz integral",
-        "Arroz blanco",
-        "Arroz precocido (marca, preparación rápida)",
-        "Arroz jazmín",
-        "Arroz basmati",
-        "Trigo bulgur",
-        "Cuscús",
-        "Quinoa",
-        "Amaranto",
-        "Cereal de maíz sin azúcar",
-        "Cereal integral alto en fibra",
-        "Granola sin azúcar añadida",
-        "Galletas de arroz integrales",
-        "Ninguno"],
-            "cereales_integrales",
-            "Preferentemente elige al menos uno de esta lista. Se pueden seleccionar más de uno. Si no consumes ninguno, selecciona 'Ninguno'."
-        )
-        
-        st.markdown("#### 🍝 Pastas")
-        pastas = create_vertical_checkboxes(
-            "¿Cuáles de estas pastas consumes? (Puedes seleccionar varios)",
-            ["Espagueti (pasta de trigo regular)",
-        "Macarrones (pasta de trigo regular)",
-        "Pluma/Penne (pasta de trigo regular)",
-        "Coditos (pasta de trigo regular)",
-        "Lasaña (pasta de trigo regular)",
-        "Espagueti integral (pasta)",
-        "Pluma/Penne integral (pasta)",
-        "Pasta sin gluten (maíz/arroz)",
-        "Pasta de legumbres (lenteja roja)",
-        "Pasta de legumbres (garbanzo)",
-        "Fideos de arroz (secos)",
-        "Ramen (seco)",
-        "Konjac (fideos shirataki)",
-        "Pasta de palmito (Palmini)",
-        "Ninguno"],
-            "pastas",
-            "Preferentemente elige al menos uno de esta lista. Se pueden seleccionar más de uno. Si no consumes ninguno, selecciona 'Ninguno'."
-        )
-        
-        st.markdown("#### 🌽 Tortillas y panes")
-        tortillas_panes = create_vertical_checkboxes(
-            "¿Cuáles de estas tortillas y panes consumes? (Puedes seleccionar varios)",
-            [ "Tortilla de maíz (regular, empacada)",
-        "Tortilla de maíz ligera (light/delgada)",
-        "Tortilla de maíz con nopal",
-        "Tortilla de nopal (hecha con nopal fresco)",
-        "Tortilla de harina (regular)",
-        "Tortilla de harina integral",
-        "Tortilla de harina con avena",
-        "Pan rebanado sin azúcar añadida",
-        "Pan rebanado multigrano (sin azúcar)",
-        "Pan pita integral / pan árabe integral",
-        "Pan para hamburguesa regular",
-        "Pan para hamburguesa sin azúcar añadida",
-        "Pan para hot dog regular",
-        "Pan para hot dog sin azúcar añadida",
-        "Tostadas horneadas",
-        "Totopos",
-        "Ninguno"],
-            "tortillas_panes",
-            "Preferentemente elige al menos uno de esta lista. Se pueden seleccionar más de uno. Si no consumes ninguno, selecciona 'Ninguno'."
-        )
-        
-        st.markdown("#### 🥔 Raíces y tubérculos (forma base)")
-        raices_tuberculos = create_vertical_checkboxes(
-            "¿Cuáles de estas raíces y tubérculos consumes? (Puedes seleccionar varios)",
-            ["Papa", "Camote", "Yuca", "Plátano macho", "Jícama", "Zanahoria", "Betabel", "Ninguno"],
-            "raices_tuberculos",
-            "Preferentemente elige al menos uno de esta lista. Se pueden seleccionar más de uno. Si no consumes ninguno, selecciona 'Ninguno'."
-        )
-        
-        st.markdown("#### 🫘 Leguminosas")
-        leguminosas = create_vertical_checkboxes(
-            "¿Cuáles de estas leguminosas consumes? (Puedes seleccionar varios)",
-            ["Frijoles negros", "Frijoles bayos", "Frijoles pintos", "Lentejas", "Garbanzos", 
-             "Habas cocidas", "Soya texturizada", "Edamames (grano de soya)", "Hummus (puré de garbanzo)", "Ninguno"],
-            "leguminosas",
-            "Preferentemente elige al menos uno de esta lista. Se pueden seleccionar más de uno. Si no consumes ninguno, selecciona 'Ninguno'."
-        )
-
-        # Resumen del paso actual
-        total_seleccionados = (len(st.session_state.get('cereales_integrales', [])) + 
-                              len(st.session_state.get('pastas', [])) + 
-                              len(st.session_state.get('tortillas_panes', [])) + 
-                              len(st.session_state.get('raices_tuberculos', [])) + 
-                              len(st.session_state.get('leguminosas', [])))
-        if total_seleccionados > 0:
-            st.success(f"✅ **¡Excelente!** Has seleccionado {total_seleccionados} fuentes de carbohidratos. Estos proporcionarán energía para tu plan.")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Botones de navegación
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col1:
-            if st.button("⬅️ Anterior"):
-                go_to_previous_step()
-        with col3:
-            if st.button("Siguiente ➡️"):
-                advance_to_next_step()
-
-    # GRUPO 6: VEGETALES
-    elif current_step == 6:
-        # Add prominent visual step indicator
-        st.markdown("""
-        <div style="
-            background: linear-gradient(135deg, #4CAF50 0%, #388E3C 100%);
-            color: white;
-            padding: 1.5rem;
-            border-radius: 15px;
-            text-align: center;
-            margin-bottom: 2rem;
-            box-shadow: 0 8px 25px rgba(76, 175, 80, 0.3);
-            border: 3px solid #4CAF50;
-            animation: slideIn 0.5s ease-out;
-        ">
-            <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
-                🥬 PASO 6: VEGETALES
-            </h2>
-            <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
-                Estás en el paso 6 de 14 - Selecciona los vegetales que consumes
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-
-        
-        st.markdown("""
-        <div class="content-card" style="background: linear-gradient(135deg, #F4C430 0%, #DAA520 100%); color: #1E1E1E; margin-bottom: 2rem; border: 3px solid #DAA520;">
-            <h2 style="color: #1E1E1E; text-align: center; margin-bottom: 1rem;">
-                🥬 PASO 6: VEGETALES
-            </h2>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Actualizar progreso
-        progress.progress(43, text="Paso 6 de 14: Vegetales")
-        
-        # Actualizar indicador visual
-        st.markdown("""
-        <div style="text-align: center; margin-bottom: 1rem;">
-            <div style="background: #F4C430; color: #1E1E1E; border-radius: 50%; width: 50px; height: 50px; display: flex; align-items: center; justify-content: center; margin: 0 auto; font-weight: bold; font-size: 1.2rem;">5</div>
-            <h4 style="color: #F4C430; margin-top: 0.5rem;">PASO ACTUAL</h4>
-        </div>
-        """, unsafe_allow_html=True)
-
-        st.markdown('<div class="content-card">', unsafe_allow_html=True)
-        st.markdown("""
-        ### 🎯 ¿Qué necesitamos saber?
-        En este paso evaluaremos los **vegetales** que consumes o toleras fácilmente. 
-        Los vegetales aportan vitaminas, minerales, fibra y antioxidantes esenciales para tu salud.
-        
-       **💡 Instrucción:** - Revisa cada categoría de alimentos verticalmente
-        -Marca TODOS los alimentos que consumas con facilidad, incluso ocasionalmente, estos alimentos se utilizarán para personalizar al máximo tu plan de alimentación.
-        - Si no consumes ningún alimento de una categoría, marca "Ninguno"
-        
-        **💡 Consejo:** Es mejor marcar más opciones que menos. Si ocasionalmente comes algo, inclúyelo.
-        """)
-        
-        vegetales_lista = create_vertical_checkboxes(
-            "¿Cuáles de estos vegetales consumes o toleras fácilmente? (Puedes seleccionar varios)",
-            ["Espinaca", "Acelga", "Kale", "Lechuga (romana, italiana, orejona, iceberg)", 
-             "Col morada", "Col verde", "Repollo", "Brócoli", "Coliflor", "Ejote", "Chayote", 
-             "Calabacita", "Nopal", "Betabel", "Zanahoria", "Jitomate saladet", "Jitomate bola", 
-             "Tomate verde", "Cebolla blanca", "Cebolla morada", "Cebollín", "Puerro (poro)","Pimiento morrón (rojo, verde, amarillo, naranja)", 
-             "Chile jalapeño", "Chile serrano", "Chile poblano", "Chile habanero","Pepino", "Apio", "Rábano", "Ajo", "Berenjena", "Champiñones", "Guisantes (chícharos)", 
-             "Verdolaga", "Habas tiernas", "Germen de alfalfa", "Germen de soya", "Flor de calabaza","Jícama", "Espárragos", "Rúcula (arúgula)", "Berros", "Cilantro", "Perejil", "Epazote", "Ninguno"],
-            "vegetales_lista",
-            "Incluye vegetales que consumas crudos, cocidos, al vapor, salteados o en cualquier preparación. Entre más vegetales selecciones, más variado será tu plan."
-        )
-
-        # Resumen del paso actual con categorización
-        vegetales_count = len(st.session_state.get('vegetales_lista', []))
-        if vegetales_count >= 15:
-            st.success(f"✅ **¡Excelente diversidad!** Has seleccionado {vegetales_count} vegetales. Esto permitirá crear un plan muy variado y nutritivo.")
-        elif vegetales_count >= 8:
-            st.success(f"✅ **¡Buena variedad!** Has seleccionado {vegetales_count} vegetales. Tu plan tendrá buena diversidad nutricional.")
-        elif vegetales_count >= 3:
-            st.info(f"ℹ️ **Variedad básica:** Has seleccionado {vegetales_count} vegetales. Considera probar otros vegetales para enriquecer tu plan.")
-        elif vegetales_count > 0:
-            st.warning(f"⚠️ **Poca variedad:** Solo has seleccionado {vegetales_count} vegetales. Te recomendamos incluir más opciones.")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Botones de navegación
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col1:
-            if st.button("⬅️ Anterior"):
-                go_to_previous_step()
-        with col3:
-            if st.button("Siguiente ➡️"):
-                advance_to_next_step()
-
-    # GRUPO 7: FRUTAS
-    elif current_step == 7:
-        # Add prominent visual step indicator
-        st.markdown("""
-        <div style="
-            background: linear-gradient(135deg, #E91E63 0%, #C2185B 100%);
-            color: white;
-            padding: 1.5rem;
-            border-radius: 15px;
-            text-align: center;
-            margin-bottom: 2rem;
-            box-shadow: 0 8px 25px rgba(233, 30, 99, 0.3);
-            border: 3px solid #E91E63;
-            animation: slideIn 0.5s ease-out;
-        ">
-            <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
-                🍎 PASO 7: FRUTAS
-            </h2>
-            <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
-                Estás en el paso 7 de 14 - Selecciona las frutas que consumes
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-
-        
-        st.markdown("""
-        <div class="content-card" style="background: linear-gradient(135deg, #F4C430 0%, #DAA520 100%); color: #1E1E1E; margin-bottom: 2rem; border: 3px solid #DAA520;">
-            <h2 style="color: #1E1E1E; text-align: center; margin-bottom: 1rem;">
-                🍎 PASO 7: FRUTAS
-            </h2>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Actualizar progreso
-        progress.progress(50, text="Paso 7 de 14: Frutas - ¡Completando grupos principales!")
-        
-        # Actualizar indicador visual
-        st.markdown("""
-        <div style="text-align: center; margin-bottom: 1rem;">
-            <div style="background: #F4C430; color: #1E1E1E; border-radius: 50%; width: 50px; height: 50px; display: flex; align-items: center; justify-content: center; margin: 0 auto; font-weight: bold; font-size: 1.2rem;">6</div>
-            <h4 style="color: #F4C430; margin-top: 0.5rem;">¡ÚLTIMO GRUPO PRINCIPAL!</h4>
-        </div>
-        """, unsafe_allow_html=True)
-
-        st.markdown('<div class="content-card">', unsafe_allow_html=True)
-        st.markdown("""
-        ### 🎯 ¿Qué necesitamos saber?
-        En este último paso de los grupos principales evaluaremos las **frutas** que disfrutas o toleras bien. 
-        Las frutas aportan vitaminas, antioxidantes, fibra y azúcares naturales para energía.
-        
-      **💡 Instrucción:** - Revisa cada categoría de alimentos verticalmente
-        -Marca TODOS los alimentos que consumas con facilidad, incluso ocasionalmente, estos alimentos se utilizarán para personalizar al máximo tu plan de alimentación.
-        - Si no consumes ningún alimento de una categoría, marca "Ninguno"
-        
-        **💡 Consejo:** Es mejor marcar más opciones que menos. Si ocasionalmente comes algo, inclúyelo.
-        """)
-        
-        frutas_lista = create_vertical_checkboxes(
-            "¿Cuáles de estas frutas disfrutas o toleras bien? (Puedes seleccionar varios)",
-            ["Manzana (roja/verde/gala/fuji)",
-        "Pera",
-        "Naranja",
-        "Mandarina",
-        "Toronja",
-        "Mango (petacón/ataulfo)",
-        "Papaya",
-        "Sandía",
-        "Melón",
-        "Piña",
-        "Plátano (tabasco/dominico/macho)",
-        "Uvas",
-        "Fresas",
-        "Arándano azul (blueberry)",
-        "Zarzamoras",
-        "Frambuesas",
-        "Higo",
-        "Kiwi",
-        "Durazno",
-        "Nectarina",
-        "Ciruela",
-        "Granada",
-        "Cereza",
-        "Chabacano",
-        "Guayaba",
-        "Tuna",
-        "Níspero",
-        "Mamey",
-        "Pitahaya (dragon fruit)",
-        "Guanábana",
-        "Maracuyá",
-        "Caqui (persimón)",
-        "Tamarindo (pulpa natural, sin azúcar)",
-        "Coco (pulpa fresca)",
-        "Coco rallado sin azúcar",
-        "Lima",
-        "Limón",
-        "Puré de manzana sin azúcar",
-        "Fruta enlatada en agua/jugo",
-        "Fruta enlatada en almíbar (escurrida)",
-        "Ninguno"],
-            "frutas_lista",
-            "Incluye frutas que consumas solas, en licuados, ensaladas, postres naturales o cualquier preparación. La variedad de frutas enriquecerá tu plan nutricional."
-        )
-
-        # Resumen del paso actual con categorización
-        frutas_count = len(st.session_state.get('frutas_lista', []))
-        if frutas_count >= 12:
-            st.success(f"🎉 **¡Fantástica variedad!** Has seleccionado {frutas_count} frutas. Tu plan tendrá una excelente diversidad de sabores y nutrientes.")
-        elif frutas_count >= 6:
-            st.success(f"✅ **¡Buena selección!** Has seleccionado {frutas_count} frutas. Esto permitirá variedad en tu plan alimentario.")
-        elif frutas_count >= 3:
-            st.info(f"ℹ️ **Selección básica:** Has seleccionado {frutas_count} frutas. Considera incluir más opciones para mayor variedad.")
-        elif frutas_count > 0:
-            st.warning(f"⚠️ **Poca variedad:** Solo has seleccionado {frutas_count} frutas. Te sugerimos probar más opciones.")
-        
-        # Mensaje de finalización de grupos principales
-        st.markdown("""
-        ---
-        ### 🎊 ¡Felicitaciones!
-        Has completado la evaluación de los **6 grupos alimentarios principales**. 
-        A continuación encontrarás secciones adicionales para complementar tu perfil nutricional.
-        """)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Botones de navegación
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col1:
-            if st.button("⬅️ Anterior"):
-                go_to_previous_step()
-        with col3:
-            if st.button("Siguiente ➡️"):
-                advance_to_next_step()
-
-    # APARTADO EXTRA 1: ACEITES DE COCCIÓN (PASO 8)
-    elif current_step == 8:
-        # Add prominent visual step indicator
-        st.markdown("""
-        <div style="
-            background: linear-gradient(135deg, #795548 0%, #5D4037 100%);
-            color: white;
-            padding: 1.5rem;
-            border-radius: 15px;
-            text-align: center;
-            margin-bottom: 2rem;
-            box-shadow: 0 8px 25px rgba(121, 85, 72, 0.3);
-            border: 3px solid #795548;
-            animation: slideIn 0.5s ease-out;
-        ">
-            <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
-                🍳 PASO 7: ACEITES DE COCCIÓN PREFERIDOS
-            </h2>
-            <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
-                Estás en el paso 8 de 14 - Información Adicional (Opcional)
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-
-        
-        st.markdown("""
-        <div class="content-card" style="background: linear-gradient(135deg, #27AE60 0%, #2ECC71 100%); color: #1E1E1E; margin-bottom: 2rem; border: 3px solid #27AE60;">
-            <h2 style="color: #1E1E1E; text-align: center; margin-bottom: 1rem;">
-                🍳 PASO 7: ACEITES DE COCCIÓN PREFERIDOS
-            </h2>
-            <p style="text-align: center; margin: 0; font-weight: bold;">Información Adicional - Opcional</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Actualizar progreso
-        progress.progress(57, text="Paso 8 de 14: Aceites de cocción (Opcional)")
-        
-        st.markdown('<div class="content-card">', unsafe_allow_html=True)
-        st.markdown("""
-        ### 🎯 ¿Qué necesitamos saber?
-        Queremos conocer los **aceites y grasas** que utilizas para cocinar, freír, hornear o saltear tus alimentos.
-        Esto nos ayuda a adaptar las recetas a tus preferencias y métodos disponibles.
-        
-        **💡 Instrucción:** Selecciona TODAS las opciones que sueles usar en tu cocina. (Este paso es opcional)
-        """)
-        
-        st.info("💡 **Ayuda:** Incluye cualquier grasa o aceite que uses para cocinar, desde aceites vegetales hasta mantequilla o manteca.")
-        
-        aceites_coccion = create_vertical_checkboxes(
-            "¿Cuáles de estas grasas/aceites usas para cocinar?",
-            ["🫒 Aceite de oliva extra virgen", "🥑 Aceite de aguacate", "🥥 Aceite de coco virgen", "🧈 Mantequilla con sal", "🧈 Mantequilla sin sal", "🧈 Mantequilla clarificada (ghee)", "🐷 Manteca de cerdo (casera o artesanal)", "🧴 Spray antiadherente sin calorías (aceite de oliva o aguacate)", "❌ Prefiero cocinar sin aceite o con agua", "Ninguno"],
-            "aceites_coccion",
-            "Marca todos los aceites y grasas que usas en tu cocina. Si no usas ninguno, marca 'Ninguno'."
-        )
-
-        # Resumen
-        aceites_count = len(st.session_state.get('aceites_coccion', []))
-        if aceites_count > 0:
-            st.success(f"✅ **Perfecto!** Has seleccionado {aceites_count} opciones. Esto nos ayuda a personalizar las recetas según tus métodos de cocción.")
-        else:
-            st.info("ℹ️ **Nota:** Si no seleccionas ningún aceite, asumiremos métodos de cocción sin grasa añadida.")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Botones de navegación
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col1:
-            if st.button("⬅️ Anterior"):
-                go_to_previous_step()
-        with col3:
-            if st.button("Siguiente ➡️"):
-                advance_to_next_step()
-
-    # APARTADO EXTRA 2: BEBIDAS (PASO 9)
-    elif current_step == 9:
-        # Add prominent visual step indicator
-        st.markdown("""
-        <div style="
-            background: linear-gradient(135deg, #00BCD4 0%, #0097A7 100%);
-            color: white;
-            padding: 1.5rem;
-            border-radius: 15px;
-            text-align: center;
-            margin-bottom: 2rem;
-            box-shadow: 0 8px 25px rgba(0, 188, 212, 0.3);
-            border: 3px solid #00BCD4;
-            animation: slideIn 0.5s ease-out;
-        ">
-            <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
-                🥤 PASO 8: BEBIDAS PARA HIDRATACIÓN
-            </h2>
-            <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
-                Estás en el paso 9 de 14 - Información Adicional (Opcional)
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-
-        
-        st.markdown("""
-        <div class="content-card" style="background: linear-gradient(135deg, #27AE60 0%, #2ECC71 100%); color: #1E1E1E; margin-bottom: 2rem; border: 3px solid #27AE60;">
-            <h2 style="color: #1E1E1E; text-align: center; margin-bottom: 1rem;">
-                🥤 PASO 8: BEBIDAS PARA HIDRATACIÓN
-            </h2>
-            <p style="text-align: center; margin: 0; font-weight: bold;">Información Adicional - Opcional</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Actualizar progreso
-        progress.progress(64, text="Paso 9 de 14: Bebidas para hidratación (Opcional)")
-        
-        st.markdown('<div class="content-card">', unsafe_allow_html=True)
-        st.markdown("""
-        ### 🎯 ¿Qué necesitamos saber?
-        Queremos conocer las **bebidas sin calorías** que consumes regularmente para mantenerte hidratado.
-        Esto nos ayuda a incluir opciones de hidratación que realmente disfrutes en tu plan.
-        
-        **💡 Instrucción:** Marca TODAS las bebidas que acostumbres tomar para hidratarte. (Este paso es opcional)
-        """)
-        
-        st.info("💡 **Ayuda:** Incluye cualquier bebida sin calorías o muy bajas en calorías que tomes durante el día.")
-        
-        bebidas_sin_calorias = create_vertical_checkboxes(
-            "¿Cuáles de estas bebidas sin calorías consumes regularmente?",
-            ["💧 Agua natural", "💦 Agua mineral", "⚡ Bebidas con electrolitos sin azúcar (Electrolit Zero, SueroX, LMNT, etc.)", "🍋 Agua infusionada con frutas naturales (limón, pepino, menta, etc.)", "🍵 Té de hierbas sin azúcar (manzanilla, menta, jengibre, etc.)", "🍃 Té verde o té negro sin azúcar", "☕ Café negro sin azúcar", "🥤 Refrescos sin calorías (Coca Cola Zero, Pepsi Light, etc.)", "Ninguno"],
-            "bebidas_sin_calorias",
-            "Marca todas las bebidas sin calorías que acostumbres. Si no consumes ninguna, marca 'Ninguno'."
-        )
-
-        # Resumen
-        bebidas_count = len(st.session_state.get('bebidas_sin_calorias', []))
-        if bebidas_count > 0:
-            st.success(f"✅ **Excelente!** Has seleccionado {bebidas_count} opciones de hidratación. Esto enriquece las recomendaciones de tu plan.")
-        else:
-            st.info("ℹ️ **Nota:** La hidratación es fundamental. Te recomendamos incluir al menos agua natural en tu rutina diaria.")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Botones de navegación
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col1:
-            if st.button("⬅️ Anterior"):
-                go_to_previous_step()
-        with col3:
-            if st.button("Siguiente ➡️"):
-                advance_to_next_step()
-
-    # APARTADO EXTRA 3: MÉTODOS DE COCCIÓN (PASO 10)
-    elif current_step == 10:
-        # Add prominent visual step indicator
-        st.markdown("""
-        <div style="
-            background: linear-gradient(135deg, #FF9800 0%, #F57C00 100%);
-            color: white;
-            padding: 1.5rem;
-            border-radius: 15px;
-            text-align: center;
-            margin-bottom: 2rem;
-            box-shadow: 0 8px 25px rgba(255, 152, 0, 0.3);
-            border: 3px solid #FF9800;
-            animation: slideIn 0.5s ease-out;
-        ">
-            <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
-                👨‍🍳 PASO 9: MÉTODOS DE COCCIÓN DISPONIBLES
-            </h2>
-            <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
-                Estás en el paso 10 de 14 - Optimización de Recetas
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("""
-        <div class="content-card" style="background: linear-gradient(135deg, #FF9800 0%, #F57C00 100%); color: #FFFFFF; margin-bottom: 2rem; border: 3px solid #FF9800;">
-            <h2 style="color: #FFFFFF; text-align: center; margin-bottom: 1rem;">
-                👨‍🍳 PASO 9: MÉTODOS DE COCCIÓN DISPONIBLES
-            </h2>
-            <p style="text-align: center; margin: 0; font-weight: bold;">Personalización de Recetas Según tus Recursos</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Actualizar progreso
-        progress.progress(71, text="Paso 10 de 14: Métodos de cocción disponibles")
-        
-        st.markdown('<div class="content-card">', unsafe_allow_html=True)
-        st.markdown("""
-        ### 🎯 ¿Por qué necesitamos esta información?
-        Conocer los **métodos de cocción** que tienes disponibles nos permite:
-        - Sugerir recetas que realmente puedas preparar en tu cocina
-        - Optimizar las preparaciones según tus herramientas y equipos
-        - Adaptar las técnicas de cocción a tus recursos disponibles
-        - Maximizar sabores y texturas con los métodos que prefieres
-        
-        **💡 Instrucción:** Selecciona TODOS los métodos de cocción que uses regularmente o que tengas disponibles en tu cocina.
-        """)
-        
-        st.markdown("### 👨‍🍳 ¿Cuáles son tus métodos de cocción más accesibles?")
-        st.info("💡 **Ayuda:** Selecciona los métodos de cocción que más usas o que tienes disponibles en tu cocina. Esto nos ayuda a sugerir recetas que puedas preparar fácilmente.")
-        
-        metodos_coccion_accesibles = create_vertical_checkboxes(
-            "Selecciona los métodos de cocción que más usas o prefieres:",
-            ["🔥 A la plancha", "🔥 A la parrilla", "💧 Hervido", "♨️ Al vapor", "🔥 Horneado / al horno", 
-             "💨 Air fryer (freidora de aire)", "⚡ Microondas", "🥄 Salteado (con poco aceite)"],
-            "metodos_coccion_accesibles",
-            "Incluye todos los métodos que uses regularmente o que tengas disponibles"
-        )
-        
-        otro_metodo_coccion = st.text_input(
-            "¿Otro método de cocción? Especifica aquí:",
-            value=st.session_state.get('otro_metodo_coccion', ''),
-            placeholder="Ej: cocina de leña, olla de presión, wok, etc.",
-            help="Especifica cualquier otro método de cocción que uses"
-        )
-
-        # Guardar en session state (solo text input)
-        st.session_state.otro_metodo_coccion = otro_metodo_coccion
-        
-        # Resumen de métodos de cocción
-        metodos_count = len(st.session_state.get('metodos_coccion_accesibles', []))
-        if metodos_count > 0:
-            st.success(f"✅ **Excelente!** Has seleccionado {metodos_count} métodos de cocción. Esto nos permite personalizar las recetas según tus recursos disponibles.")
-        else:
-            st.info("ℹ️ **Nota:** Te recomendamos seleccionar al menos un método de cocción para poder adaptar las recetas a tus posibilidades.")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Botones de navegación
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col1:
-            if st.button("⬅️ Anterior"):
-                go_to_previous_step()
-        with col3:
-            if st.button("Siguiente ➡️"):
-                advance_to_next_step()
-
-    # APARTADO EXTRA 4: ALERGIAS/INTOLERANCIAS (PASO 11)
-    elif current_step == 11:
-        # Add prominent visual step indicator
-        st.markdown("""
-        <div style="
-            background: linear-gradient(135deg, #F44336 0%, #D32F2F 100%);
-            color: white;
-            padding: 1.5rem;
-            border-radius: 15px;
-            text-align: center;
-            margin-bottom: 2rem;
-            box-shadow: 0 8px 25px rgba(244, 67, 54, 0.3);
-            border: 3px solid #F44336;
-            animation: slideIn 0.5s ease-out;
-        ">
-            <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
-                🚨 PASO 10: ALERGIAS E INTOLERANCIAS ALIMENTARIAS
-            </h2>
-            <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
-                Estás en el paso 11 de 14 - Información Crítica para tu Seguridad
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-
-        
-        st.markdown("""
-        <div class="content-card" style="background: linear-gradient(135deg, #E74C3C 0%, #C0392B 100%); color: #FFFFFF; margin-bottom: 2rem; border: 3px solid #E74C3C;">
-            <h2 style="color: #FFFFFF; text-align: center; margin-bottom: 1rem;">
-                🚨 PASO 10: ALERGIAS E INTOLERANCIAS ALIMENTARIAS
-            </h2>
-            <p style="text-align: center; margin: 0; font-weight: bold;">Información Crítica para tu Seguridad</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Actualizar progreso
-        progress.progress(79, text="Paso 11 de 14: Alergias e intolerancias (Crítico)")
-        
-        st.markdown('<div class="content-card">', unsafe_allow_html=True)
-        
-        st.markdown("""
-        ### ⚠️ Información Crítica para tu Seguridad Alimentaria
-        Esta sección es **fundamental** para crear un plan alimentario seguro y adecuado para ti.
-        Por favor, sé muy específico y honesto con tus respuestas.
-        """)
-        
-        st.markdown("### ❗ 1. ¿Tienes alguna alergia alimentaria?")
-        st.error("🚨 **IMPORTANTE:** Las alergias alimentarias pueden ser graves. Marca todas las que tengas, aunque sean leves.")
-        st.info("💡 **Instrucción:** Debes seleccionar al menos una opción. Si no tienes alergias, selecciona 'Ninguna'.")
-        alergias_alimentarias = create_vertical_checkboxes(
-            "Selecciona TODAS las alergias alimentarias que tienes:",
-            ["Lácteos", "Huevo", "Frutos secos", "Mariscos", "Pescado", "Gluten", "Soya", "Semillas", "Ninguna"],
-            "alergias_alimentarias",
-            "Incluye cualquier alergia, desde leve hasta severa. Si no tienes alergias, selecciona 'Ninguna'."
-        )
-        
-        otra_alergia = st.text_input(
-            "¿Otra alergia no mencionada? Especifica aquí:",
-            value=st.session_state.get('otra_alergia', ''),
-            placeholder="Ej: alergia al apio, maní, sulfitos, etc.",
-            help="Especifica cualquier otra alergia alimentaria que tengas, en caso de que no tengas escribe ninguna"
-        )
-        
-        st.markdown("---")
-        st.markdown("### ⚠️ 2. ¿Tienes alguna intolerancia o malestar digestivo?")
-        st.warning("💡 **Ayuda:** Las intolerancias causan malestar pero no son tan graves como las alergias. Incluye cualquier alimento que te cause gases, hinchazón, dolor abdominal, etc.")
-        st.info("💡 **Instrucción:** Debes seleccionar al menos una opción. Si no tienes intolerancias, selecciona 'Ninguna'.")
-        intolerancias_digestivas = create_vertical_checkboxes(
-            "Selecciona las intolerancias o malestares digestivos que experimentas:",
-            ["Lácteos con lactosa", "Leguminosas", "FODMAPs", "Gluten", "Crucíferas", "Endulzantes artificiales", "Ninguna"],
-            "intolerancias_digestivas",
-            "Incluye alimentos que te causen malestar digestivo. Si no tienes intolerancias, marca 'Ninguna'."
-        )
-        
-        otra_intolerancia = st.text_input(
-            "¿Otra intolerancia no mencionada? Especifica aquí:",
-            value=st.session_state.get('otra_intolerancia', ''),
-            placeholder="Ej: intolerancia a la fructosa, sorbitol, etc.",
-            help="Especifica cualquier otra intolerancia o malestar digestivo derivado de alimentos que tengas, en caso de que no tengas escribe ninguna"
-        )
-        
-
-
-        # Guardar en session state (solo text inputs)
-        st.session_state.otra_alergia = otra_alergia
-        st.session_state.otra_intolerancia = otra_intolerancia
-        
-        # Resumen de restricciones
-        alergias_count = len(st.session_state.get('alergias_alimentarias', []))
-        intolerancias_count = len(st.session_state.get('intolerancias_digestivas', []))
-        total_restricciones = alergias_count + intolerancias_count
-        if otra_alergia:
-            total_restricciones += 1
-        if otra_intolerancia:
-            total_restricciones += 1
-            
-        if total_restricciones > 0:
-            st.warning(f"⚠️ **Restricciones identificadas:** {total_restricciones} restricciones alimentarias. Tu plan será cuidadosamente adaptado para evitar estos alimentos.")
-        else:
-            st.success("✅ **Sin restricciones:** No has reportado alergias o intolerancias. Esto nos da mayor flexibilidad para tu plan alimentario.")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Botones de navegación
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col1:
-            if st.button("⬅️ Anterior"):
-                go_to_previous_step()
-        with col3:
-            if st.button("Siguiente ➡️"):
-                advance_to_next_step()
-
-    # APARTADO EXTRA 5: ANTOJOS (PASO 12)
-    elif current_step == 12:
-        # Add prominent visual step indicator
-        st.markdown("""
-        <div style="
-            background: linear-gradient(135deg, #673AB7 0%, #512DA8 100%);
-            color: white;
-            padding: 1.5rem;
-            border-radius: 15px;
-            text-align: center;
-            margin-bottom: 2rem;
-            box-shadow: 0 8px 25px rgba(103, 58, 183, 0.3);
-            border: 3px solid #673AB7;
-            animation: slideIn 0.5s ease-out;
-        ">
-            <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
-                😋 PASO 12: EVALUACIÓN DE ANTOJOS ALIMENTARIOS
-            </h2>
-            <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
-                Estás en el paso 12 de 14 - Información para Estrategias
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-
-        
-        st.markdown("""
-        <div class="content-card" style="background: linear-gradient(135deg, #9B59B6 0%, #8E44AD 100%); color: #FFFFFF; margin-bottom: 2rem; border: 3px solid #9B59B6;">
-            <h2 style="color: #FFFFFF; text-align: center; margin-bottom: 1rem;">
-                😋 PASO 12: EVALUACIÓN DE ANTOJOS ALIMENTARIOS
-            </h2>
-            <p style="text-align: center; margin: 0; font-weight: bold;">Información para Estrategias</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Actualizar progreso
-        progress.progress(86, text="Paso 12 de 14: Antojos alimentarios")
-        
-        st.markdown('<div class="content-card">', unsafe_allow_html=True)
-        st.markdown("""
-        ### 🧠 ¿Por qué evaluamos tus antojos?
-        Conocer tus **antojos frecuentes** nos ayuda a:
-        - Crear estrategias para manejarlos de forma saludable
-        - Incluir alternativas satisfactorias en tu plan
-        - Desarrollar un plan realista y sostenible a largo plazo
-        
-        **💡 Instrucción:** Debes seleccionar al menos una opción en cualquiera de las categorías de antojos. 
-        Si no tienes antojos frecuentes, selecciona 'Ninguno' en al menos una categoría.
-        """)
-        
-        st.markdown("---")
-        st.markdown("### 🍫 Antojos de alimentos dulces / postres")
-        antojos_dulces = create_vertical_checkboxes(
-            "¿Cuáles de estos alimentos dulces se te antojan frecuentemente? (Puedes seleccionar varios)",
-            ["Chocolate con leche", "Chocolate amargo", "Pan dulce (conchas, donas, cuernitos)", 
-             "Pastel (tres leches, chocolate, etc.)", "Galletas (Marías, Emperador, Chokis, etc.)", 
-             "Helado / Nieve", "Flan / Gelatina", "Dulces tradicionales (cajeta, obleas, jamoncillo, glorias)", 
-             "Cereal azucarado", "Leche condensada", "Churros", "Ninguno"],
-            "antojos_dulces",
-            "Incluye cualquier dulce, postre o alimento azucarado que se te antoje frecuentemente. Si no tienes antojos dulces, selecciona 'Ninguno'."
-        )
-        
-        st.markdown("---")
-        st.markdown("### 🧂 Antojos de alimentos salados / snacks")
-        antojos_salados = create_vertical_checkboxes(
-            "¿Cuáles de estos alimentos salados se te antojan frecuentemente? (Puedes seleccionar varios)",
-            ["Papas fritas (Sabritas, Ruffles, etc.)", "Cacahuates enchilados", "Frituras (Doritos, Cheetos, Takis, etc.)", 
-             "Totopos con salsa", "Galletas saladas", "Cacahuates japoneses", "Chicharrón (de cerdo o harina)", 
-             "Nachos con queso", "Queso derretido o gratinado", "Ninguno"],
-            "antojos_salados",
-            "Incluye botanas, frituras o alimentos salados que se te antojen. Si no tienes antojos salados, selecciona 'Ninguno'."
-        )
-        
-        st.markdown("---")
-        st.markdown("### 🌮 Antojos de comidas rápidas / callejeras")
-        antojos_comida_rapida = create_vertical_checkboxes(
-            "¿Cuáles de estas comidas rápidas se te antojan frecuentemente? (Puedes seleccionar varios)",
-            ["Tacos (pastor, asada, birria, etc.)", "Tortas (cubana, ahogada, etc.)", "Hamburguesas", "Hot dogs", 
-             "Pizza", "Quesadillas fritas", "Tamales", "Pambazos", "Sopes / gorditas", "Elotes / esquites", 
-             "Burritos", "Enchiladas", "Empanadas", "Ninguno"],
-            "antojos_comida_rapida",
-            "Incluye comida rápida, platillos callejeros o preparaciones que se te antojen. Si no tienes antojos de comida rápida, selecciona 'Ninguno'."
-        )
-        
-        st.markdown("---")
-        st.markdown("### 🍹 Antojos de bebidas y postres líquidos")
-        antojos_bebidas = create_vertical_checkboxes(
-            "¿Cuáles de estas bebidas se te antojan frecuentemente? (Puedes seleccionar varios)",
-            ["Refrescos regulares (Coca-Cola, Fanta, etc.)", "Jugos industrializados (Boing, Jumex, etc.)", 
-             "Malteadas / Frappés", "Agua de sabor con azúcar (jamaica, horchata, tamarindo)", 
-             "Café con azúcar y leche", "Champurrado / atole", "Licuado de plátano con azúcar", 
-             "Bebidas alcohólicas (cerveza, tequila, vino, etc.)", "Ninguno"],
-            "antojos_bebidas",
-            "Incluye bebidas azucaradas, alcohólicas o postres líquidos que se te antojen. Si no tienes antojos de bebidas, selecciona 'Ninguno'."
-        )
-        
-        st.markdown("---")
-        st.markdown("### 🔥 Antojos de alimentos con condimentos estimulantes")
-        antojos_picantes = create_vertical_checkboxes(
-            "¿Cuáles de estos alimentos picantes se te antojan frecuentemente? (Puedes seleccionar varios)",
-            ["Chiles en escabeche", "Salsas picantes", "Salsa Valentina, Tajín o Chamoy", 
-             "Pepinos con chile y limón", "Mangos verdes con chile", "Gomitas enchiladas", 
-             "Fruta con Miguelito o chile en polvo", "Ninguno"],
-            "antojos_picantes",
-            "Incluye alimentos picantes, con chile o condimentos intensos que se te antojen. Si no tienes antojos picantes, selecciona 'Ninguno'."
-        )
-        
-        st.markdown("---")
-        st.markdown("### ❓ Otros antojos no mencionados")
-        st.info("💡 **Ayuda:** Especifica cualquier otro antojo que no aparezca en las listas anteriores.")
-        otros_antojos = st.text_area(
-            "¿Qué otros alimentos o preparaciones se te antojan mucho?",
-            value=st.session_state.get('otros_antojos', ''),
-            placeholder="Ej: palomitas con mantequilla, raspados, gelatinas comerciales, etc.",
-            help="Describe cualquier otro antojo que no esté en las listas anteriores"
-        )
-
-        # Guardar en session state (solo text input)
-        st.session_state.otros_antojos = otros_antojos
-        
-        # Análisis de antojos
-        antojos_dulces_count = len(st.session_state.get('antojos_dulces', []))
-        antojos_salados_count = len(st.session_state.get('antojos_salados', []))
-        antojos_comida_rapida_count = len(st.session_state.get('antojos_comida_rapida', []))
-        antojos_bebidas_count = len(st.session_state.get('antojos_bebidas', []))
-        antojos_picantes_count = len(st.session_state.get('antojos_picantes', []))
-        
-        total_antojos = (antojos_dulces_count + antojos_salados_count + 
-                        antojos_comida_rapida_count + antojos_bebidas_count + antojos_picantes_count)
-        
-        if total_antojos >= 15:
-            st.warning(f"⚠️ **Muchos antojos identificados:** {total_antojos} tipos de antojos. Será importante desarrollar estrategias específicas de manejo.")
-        elif total_antojos >= 8:
-            st.info(f"ℹ️ **Antojos moderados:** {total_antojos} tipos de antojos. Incluiremos alternativas saludables en tu plan.")
-        elif total_antojos >= 3:
-            st.success(f"✅ **Pocos antojos:** {total_antojos} tipos de antojos. Esto facilitará mantener un plan alimentario saludable.")
-        elif total_antojos > 0:
-            st.success(f"✅ **Muy pocos antojos:** Solo {total_antojos} tipos. Tu autocontrol alimentario parece ser muy bueno.")
-        else:
-            st.success("🎉 **Sin antojos frecuentes:** Excelente autocontrol alimentario. Esto será una gran ventaja para tu plan.")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Botones de navegación
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col1:
-            if st.button("⬅️ Anterior"):
-                go_to_previous_step()
-        with col3:
-            if st.button("Siguiente ➡️"):
-                advance_to_next_step()
-
-    # PASO 13: FRECUENCIA DE COMIDAS
-    elif current_step == 13:
-        # CAMBIO: Limpiar antigua variable de radio button para evitar conflictos
-        if 'frecuencia_comidas' in st.session_state:
-            del st.session_state['frecuencia_comidas']
-            
-        # Add prominent visual step indicator
-        st.markdown("""
-        <div style="
-            background: linear-gradient(135deg, #FF9800 0%, #F57C00 100%);
-            color: white;
-            padding: 1.5rem;
-            border-radius: 15px;
-            text-align: center;
-            margin-bottom: 2rem;
-            box-shadow: 0 8px 25px rgba(255, 152, 0, 0.3);
-            border: 3px solid #FF9800;
-            animation: slideIn 0.5s ease-out;
-        ">
-            <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
-                🍽️ PASO 13: FRECUENCIA DE COMIDAS PREFERIDA
-            </h2>
-            <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
-                Estás en el paso 13 de 14 - Adaptación a tu Estilo de Vida
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-
-        
-        # Actualizar progreso
-        progress.progress(93, text="Paso 13 de 14: Frecuencia de comidas preferida")
-        
-        st.markdown('<div class="content-card">', unsafe_allow_html=True)
-        st.markdown("""
-        ### 🎯 ¿Cuál es tu frecuencia de comidas ideal?
-        Queremos conocer la **frecuencia de comidas** que mejor se adapta a tu agenda diaria y estilo de vida.
-        Esto nos ayudará a estructurar tu plan alimentario de manera que sea práctico y sostenible para ti.
-        
-        **💡 Instrucción:** Selecciona la opción que mejor describa tu rutina alimentaria preferida o más realista para tu día a día.
-        """)
-        
-        st.info("💡 **Ayuda:** Piensa en tu horario de trabajo, actividades y preferencias personales para elegir la frecuencia más conveniente.")
-        
-        # CAMBIO: Usar checkboxes verticales en lugar de radio buttons para consistencia con otros pasos
-        # y para resolver problemas de persistencia
-        frecuencia_comidas_ck = create_vertical_checkboxes(
-            "¿Cuál es la frecuencia de comidas que mejor se adapta a tu agenda diaria?",
-            [
-                "Desayuno, comida y cena (3 comidas principales)",
-                "Desayuno, comida, cena y una colación",
-                "Desayuno, comida, cena y dos colaciones", 
-                "Solo dos comidas principales al día",
-                "Ayuno intermitente con dos comidas principales al día",
-                "Ayuno intermitente con tres comidas principales al día",
-                "Ayuno intermitente con tres comidas principales al día y una colación",
-                "Otro (especificar)"
-            ],
-            "frecuencia_comidas_ck",
-            "Selecciona UNA SOLA opción que mejor se ajuste a tu rutina diaria. Si seleccionas más de una, se mostrará un error."
-        )
-        
-        # Validación para asegurar que solo se seleccione UNA opción
-        if len(frecuencia_comidas_ck) > 1:
-            st.error("❌ **Error:** Solo puedes seleccionar UNA frecuencia de comidas. Por favor, desmarca las opciones adicionales.")
-        elif len(frecuencia_comidas_ck) == 0:
-            st.warning("⚠️ **Atención:** Debes seleccionar una frecuencia de comidas para continuar.")
-        
-        # Obtener la opción seleccionada (si hay exactamente una)
-        frecuencia_seleccionada = frecuencia_comidas_ck[0] if len(frecuencia_comidas_ck) == 1 else ""
-        
-        # Campo adicional si selecciona "Otro"
-        otra_frecuencia = ""
-        if frecuencia_seleccionada == "Otro (especificar)":
-            otra_frecuencia = st.text_input(
-                "Especifica tu frecuencia de comidas preferida:",
-                value=st.session_state.get('otra_frecuencia', ''),
-                placeholder="Ej: Ayuno intermitente 16:8, una comida al día, 5 comidas pequeñas, etc.",
-                help="Describe tu rutina alimentaria ideal con el mayor detalle posible"
-            )
-            st.session_state.otra_frecuencia = otra_frecuencia
-        else:
-            # Limpiar el campo otra_frecuencia si se selecciona una opción diferente
-            st.session_state.otra_frecuencia = ""
-        
-        # Resumen de la selección
-        if frecuencia_seleccionada and len(frecuencia_comidas_ck) == 1:
-            if frecuencia_seleccionada == "Otro (especificar)" and otra_frecuencia:
-                st.success(f"✅ **Frecuencia seleccionada:** {otra_frecuencia}")
-            elif frecuencia_seleccionada != "Otro (especificar)":
-                st.success(f"✅ **Frecuencia seleccionada:** {frecuencia_seleccionada}")
-            
-            # Información adicional según la selección
-            if "3 comidas principales" in frecuencia_seleccionada:
-                st.info("🍽️ **Estructura clásica:** Ideal para horarios regulares y control de porciones.")
-            elif "una colación" in frecuencia_seleccionada:
-                st.info("🥪 **Con una colación:** Excelente para mantener energía estable durante el día.")
-            elif "dos colaciones" in frecuencia_seleccionada:
-                st.info("🍎 **Con dos colaciones:** Perfecta para personas con horarios largos o alta actividad física.")
-            elif "dos comidas principales" in frecuencia_seleccionada:
-                st.info("⏰ **Ayuno intermitente:** Ideal para quienes prefieren ventanas de alimentación más concentradas.")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Botones de navegación
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col1:
-            if st.button("⬅️ Anterior"):
-                go_to_previous_step()
-        with col3:
-            if st.button("Siguiente ➡️"):
-                advance_to_next_step()
-
-    # PASO 14: SUGERENCIAS DE MENÚS (antes paso 13)
-    elif current_step == 14:
-        # Add prominent visual step indicator
-        st.markdown("""
-        <div style="
-            background: linear-gradient(135deg, #4CAF50 0%, #388E3C 100%);
-            color: white;
-            padding: 1.5rem;
-            border-radius: 15px;
-            text-align: center;
-            margin-bottom: 2rem;
-            box-shadow: 0 8px 25px rgba(76, 175, 80, 0.3);
-            border: 3px solid #4CAF50;
-            animation: slideIn 0.5s ease-out;
-        ">
-            <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
-                📝 PASO 14: SUGERENCIAS DE MENÚS
-            </h2>
-            <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
-                Paso 14 de 15 en tu evaluación personalizada
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-
-        
-        # Actualizar progreso
-        progress.progress(93, text="Paso 14 de 15: Sugerencias de menús")
-        
-        st.markdown('<div class="content-card">', unsafe_allow_html=True)
-        st.markdown("""
-        ### 💭 Sugerencias de Menús y Preferencias Adicionales
-        Para finalizar tu evaluación, nos gustaría conocer si tienes **sugerencias específicas de menús** que te gustaría que adaptemos a tu plan nutricional, o si prefieres que nuestro equipo de nutrición se encargue de crear las propuestas basándose en toda la información que has proporcionado.
-        
-        **💡 Instrucción:** Puedes escribir menús específicos, platos favoritos, recetas que te gustan, o simplemente indicar que confías en nuestro criterio profesional.
-        """)
-        
-        st.info("💡 **Ayuda:** Puedes mencionar platos específicos, combinaciones que te gustan, recetas familiares, o cualquier idea que tengas. También puedes dejar que nuestro equipo decida completamente.")
-        
-        sugerencias_menus = st.text_area(
-            "¿Tienes alguna sugerencia de menús que quisieras que adaptemos, o prefieres que el equipo decida por ti?",
-            value=st.session_state.get('sugerencias_menus', ''),
-            placeholder="""Ejemplos:
-- Me gustan los desayunos con avena y frutas
-- Prefiero pollo a la plancha con verduras para la cena
-- Me encantan las ensaladas coloridas para el almuerzo
-- Que el equipo decida completamente basándose en mi evaluación
-- Quiero incluir comida mexicana tradicional saludable
-- Prefiero menús sencillos y fáciles de preparar""",
-            height=120,
-            help="Escribe todas las ideas, preferencias o sugerencias que tengas, o indica si prefieres que decidamos nosotros"
-        )
-        
-        # Guardar en session state
-        st.session_state.sugerencias_menus = sugerencias_menus
-        
-        # Opciones predefinidas rápidas
-        st.markdown("### 🎯 Opciones Rápidas (Opcional)")
-        st.markdown("Si no sabes qué escribir, puedes seleccionar una de estas opciones:")
-        
-        opcion_rapida = st.selectbox(
-            "Selecciona una opción si no tienes sugerencias específicas:",
-            [
-                "Seleccionar...",
-                "Que el equipo decida completamente por mí",
-                "Prefiero comida mexicana saludable",
-                "Quiero menús sencillos y fáciles de preparar", 
-                "Me gusta variar mucho los sabores",
-                "Prefiero preparaciones al vapor y a la plancha",
-                "Quiero incluir más recetas internacionales saludables"
-            ],
-            key='opcion_rapida_menu',
-            help="Estas son opciones generales que puedes usar si no tienes ideas específicas"
-        )
-        
-        # Auto-llenar si selecciona una opción rápida
-        if opcion_rapida and opcion_rapida != "Seleccionar..." and not sugerencias_menus:
-            st.session_state.sugerencias_menus = opcion_rapida
-            st.rerun()
-        
-        # Mostrar resumen de la entrada
-        if sugerencias_menus:
-            palabra_count = len(sugerencias_menus.split())
-            if palabra_count > 0:
-                st.success(f"✅ **Sugerencias recibidas:** {palabra_count} palabras. Excelente, esto nos ayudará mucho a personalizar tu plan.")
-            
-            # Análisis rápido del contenido
-            if "equipo decida" in sugerencias_menus.lower() or "decidan por mí" in sugerencias_menus.lower():
-                st.info("👨‍🍳 **Perfecto:** Nuestro equipo de nutrición creará menús completamente personalizados basándose en toda tu evaluación.")
-            elif len(sugerencias_menus) > 50:
-                st.info("📝 **Excelente:** Has proporcionado sugerencias detalladas que nos ayudarán a crear un plan muy específico para ti.")
-            else:
-                st.info("💡 **Recibido:** Tus preferencias han sido registradas y las consideraremos en tu plan personalizado.")
-        else:
-            st.info("ℹ️ **Nota:** Si no escribes nada, nuestro equipo creará menús basándose en todos los alimentos que seleccionaste en los pasos anteriores.")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Botones de navegación - Ya no es el último paso, ahora tiene un paso más
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col1:
-            if st.button("⬅️ Anterior"):
-                go_to_previous_step()
-        with col3:
-            if st.button("Siguiente ➡️"):
-                advance_to_next_step()
-
-    # PASO 15: CONDICIONES MÉDICAS Y MEDICAMENTOS
-    elif current_step == 15:
-        # Add prominent visual step indicator
-        st.markdown("""
-        <div style="
-            background: linear-gradient(135deg, #FF5722 0%, #E64A19 100%);
-            color: white;
-            padding: 1.5rem;
-            border-radius: 15px;
-            text-align: center;
-            margin-bottom: 2rem;
-            box-shadow: 0 8px 25px rgba(255, 87, 34, 0.3);
-            border: 3px solid #FF5722;
-            animation: slideIn 0.5s ease-out;
-        ">
-            <h2 style="margin: 0; font-size: 1.8rem; font-weight: bold; color: white;">
-                🩺 PASO 15: CONDICIONES MÉDICAS Y MEDICAMENTOS
-            </h2>
-            <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9; color: white;">
-                Paso 15 de 15 - Información Crítica para tu Seguridad
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Actualizar progreso
-        progress.progress(100, text="Paso 15 de 15: Condiciones médicas y medicamentos (CRÍTICO)")
-        
-        st.markdown('<div class="content-card">', unsafe_allow_html=True)
-        
-        st.markdown("""
-        ### 🎯 ¿Por qué necesitamos esta información?
-        Esta sección es **fundamental y crítica** para tu seguridad. Conocer tus condiciones médicas, 
-        medicamentos y suplementos nos permite:
-        
-        - 🎯 **Adaptar** el plan nutricional a tus condiciones médicas específicas
-        - ⚠️ **Evitar** interacciones negativas entre alimentos y medicamentos
-        - 🛡️ **Garantizar** que el plan sea seguro y efectivo para tu salud
-        - 💊 **Proporcionar** recomendaciones personalizadas considerando tu contexto médico completo
-        
-        **💡 Instrucción:** Por favor completa TODA esta sección con la mayor precisión posible. 
-        La información médica es confidencial y será tratada con total privacidad.
-        """)
-        
-        st.error("🚨 **IMPORTANTE:** Esta información es CRÍTICA para tu seguridad. Sé completamente honesto y específico.")
-        
-        # Sección 1: Condiciones Médicas y Fisiológicas
-        st.markdown("---")
-        st.markdown("### 📋 1. Condiciones Médicas y Fisiológicas Actuales")
-        st.warning("⚠️ **Instrucción:** Selecciona TODAS las condiciones médicas que tengas actualmente. Si no tienes ninguna, selecciona 'Ninguna de las anteriores'.")
-        
-        condiciones_medicas = create_vertical_checkboxes(
-            "¿Cuáles de estas condiciones médicas o fisiológicas tienes actualmente?",
-            [
-                "Diabetes Tipo 1",
-                "Diabetes Tipo 2",
-                "Prediabetes",
-                "Hipertensión arterial (presión alta)",
-                "Hipotensión arterial (presión baja)",
-                "Hipotiroidismo",
-                "Hipertiroidismo",
-                "Síndrome de ovario poliquístico (SOP)",
-                "Resistencia a la insulina",
-                "Síndrome metabólico",
-                "Enfermedad cardiovascular",
-                "Colesterol alto (hipercolesterolemia)",
-                "Triglicéridos altos (hipertrigliceridemia)",
-                "Enfermedad renal crónica",
-                "Hígado graso (esteatosis hepática)",
-                "Enfermedades gastrointestinales (Crohn, colitis ulcerosa, etc.)",
-                "Síndrome de intestino irritable (SII)",
-                "Reflujo gastroesofágico (ERGE)",
-                "Gota (ácido úrico elevado)",
-                "Anemia",
-                "Osteoporosis",
-                "Artritis reumatoide",
-                "Cáncer (actual o en tratamiento)",
-                "Embarazo",
-                "Lactancia",
-                "Menopausia",
-                "Trastornos de la conducta alimentaria (TCA)",
-                "Ninguna de las anteriores"
-            ],
-            "condiciones_medicas",
-            "Marca TODAS las condiciones que tengas. Si no tienes ninguna, marca 'Ninguna de las anteriores'."
-        )
-        
-        # Validar exclusividad de "Ninguna de las anteriores"
-        if "Ninguna de las anteriores" in condiciones_medicas and len(condiciones_medicas) > 1:
-            st.error("❌ **Error:** Si seleccionas 'Ninguna de las anteriores', no puedes seleccionar otras condiciones médicas. Por favor, desmarca 'Ninguna de las anteriores' o desmarca las otras opciones.")
-        
-        condiciones_otras = st.text_input(
-            "¿Otra condición médica no mencionada? Especifica aquí:",
-            value=st.session_state.get('condiciones_otras', ''),
-            placeholder="Ej: fibromialgia, lupus, etc. Si no aplica, escribe 'No aplica'",
-            help="Especifica cualquier otra condición médica que tengas. Campo obligatorio - escribe 'No aplica' si no tienes otras condiciones"
-        )
-        st.session_state.condiciones_otras = condiciones_otras
-        
-        # Sección 2: Medicamentos de Uso Frecuente
-        st.markdown("---")
-        st.markdown("### 💊 2. Medicamentos de Uso Frecuente")
-        st.info("💡 **Ayuda:** Incluye TODOS los medicamentos que tomes regularmente (recetados, de venta libre, etc.)")
-        
-        consume_medicamentos = create_vertical_checkboxes(
-            "¿Consumes medicamentos de forma regular?",
-            ["Sí", "No"],
-            "consume_medicamentos",
-            "Selecciona SOLO UNA opción: Sí o No"
-        )
-        
-        # Validar que solo se seleccione una opción
-        if len(consume_medicamentos) > 1:
-            st.error("❌ **Error:** Solo puedes seleccionar UNA opción (Sí o No). Por favor, desmarca la opción adicional.")
-        elif len(consume_medicamentos) == 0:
-            st.warning("⚠️ **Atención:** Debes seleccionar si consumes medicamentos o no.")
-        
-        # Mostrar campo de lista si selecciona "Sí"
-        medicamentos_lista = ""
-        if len(consume_medicamentos) == 1 and consume_medicamentos[0] == "Sí":
-            st.markdown("#### 📝 Lista detallada de medicamentos")
-            st.warning("⚠️ **Obligatorio:** Proporciona la lista completa de medicamentos con nombre, dosis y frecuencia.")
-            medicamentos_lista = st.text_area(
-                "Lista de medicamentos que consumes regularmente:",
-                value=st.session_state.get('medicamentos_lista', ''),
-                placeholder="""Ejemplo:
-- Metformina 850mg - 2 veces al día (desayuno y cena)
-- Levotiroxina 100mcg - 1 vez al día (en ayunas)
-- Losartán 50mg - 1 vez al día (por la mañana)
-- Omeprazol 20mg - 1 vez al día (antes del desayuno)
-- Atorvastatina 20mg - 1 vez al día (por la noche)
-
-Por favor especifica: Nombre del medicamento, dosis y frecuencia de consumo""",
-                height=150,
-                help="Especifica TODOS tus medicamentos con nombre completo, dosis y frecuencia. Esta información es crítica."
-            )
-            st.session_state.medicamentos_lista = medicamentos_lista
-            
-            if not medicamentos_lista.strip():
-                st.error("❌ **Campo obligatorio:** Si consumes medicamentos, debes especificar la lista completa.")
-        else:
-            # Limpiar el campo si selecciona "No"
-            st.session_state.medicamentos_lista = ""
-        
-        # Sección 3: Suplementos Nutricionales
-        st.markdown("---")
-        st.markdown("### 💊 3. Suplementos Nutricionales Adicionales")
-        st.info("💡 **Ayuda:** Además de la proteína en polvo que ya evaluamos, ¿consumes otros suplementos?")
-        
-        consume_suplementos = create_vertical_checkboxes(
-            "¿Consumes otros suplementos nutricionales además de proteína en polvo?",
-            ["Sí", "No"],
-            "consume_suplementos",
-            "Selecciona SOLO UNA opción: Sí o No"
-        )
-        
-        # Validar que solo se seleccione una opción
-        if len(consume_suplementos) > 1:
-            st.error("❌ **Error:** Solo puedes seleccionar UNA opción (Sí o No). Por favor, desmarca la opción adicional.")
-        elif len(consume_suplementos) == 0:
-            st.warning("⚠️ **Atención:** Debes seleccionar si consumes suplementos adicionales o no.")
-        
-        # Mostrar campo de lista si selecciona "Sí"
-        suplementos_lista = ""
-        if len(consume_suplementos) == 1 and consume_suplementos[0] == "Sí":
-            st.markdown("#### 📝 Lista de suplementos nutricionales")
-            st.info("💡 **Opcional:** Si consumes suplementos, especifica cuáles y con qué frecuencia.")
-            suplementos_lista = st.text_area(
-                "Lista de suplementos que consumes además de proteína en polvo:",
-                value=st.session_state.get('suplementos_lista', ''),
-                placeholder="""Ejemplos comunes:
-- Multivitamínico - 1 vez al día
-- Omega 3 (aceite de pescado) - 2 cápsulas al día
-- Vitamina D3 - 1000 UI al día
-- Magnesio - 400mg antes de dormir
-- Creatina monohidrato - 5g al día
-- BCAA - durante el entrenamiento
-- Cafeína - pre-entreno
-- Probióticos - 1 cápsula al día
-
-Especifica: Nombre del suplemento, dosis y frecuencia""",
-                height=150,
-                help="Lista TODOS los suplementos que consumes además de la proteína en polvo"
-            )
-            st.session_state.suplementos_lista = suplementos_lista
-            
-            if not suplementos_lista.strip():
-                st.error("❌ **Campo obligatorio:** Si consumes suplementos, debes especificar la lista.")
-        else:
-            # Limpiar el campo si selecciona "No"
-            st.session_state.suplementos_lista = ""
-        
-        # Resumen visual de la sección
-        st.markdown("---")
-        st.markdown("### 📊 Resumen de Información Médica Registrada")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Condiciones médicas
-            condiciones_count = len(st.session_state.get('condiciones_medicas', []))
-            if condiciones_count > 0:
-                if "Ninguna de las anteriores" in st.session_state.get('condiciones_medicas', []):
-                    st.success("✅ **Condiciones médicas:** Sin condiciones médicas reportadas")
-                else:
-                    st.warning(f"⚠️ **Condiciones médicas:** {condiciones_count} condiciones reportadas")
-                    st.write("**Condiciones seleccionadas:**")
-                    for condicion in st.session_state.get('condiciones_medicas', []):
-                        st.write(f"  - {condicion}")
-            
-            # Medicamentos
-            if len(consume_medicamentos) == 1:
-                if consume_medicamentos[0] == "Sí":
-                    if medicamentos_lista and medicamentos_lista.strip():
-                        med_count = len([line for line in medicamentos_lista.split('\n') if line.strip()])
-                        st.info(f"💊 **Medicamentos:** Consume medicamentos ({med_count} líneas registradas)")
-                    else:
-                        st.error("❌ **Medicamentos:** Debe completar la lista de medicamentos")
-                else:
-                    st.success("✅ **Medicamentos:** No consume medicamentos regulares")
-        
-        with col2:
-            # Otras condiciones
-            if condiciones_otras and condiciones_otras.strip() and condiciones_otras.strip().lower() != "no aplica":
-                st.info(f"📝 **Otra condición:** {condiciones_otras[:50]}{'...' if len(condiciones_otras) > 50 else ''}")
-            
-            # Suplementos
-            if len(consume_suplementos) == 1:
-                if consume_suplementos[0] == "Sí":
-                    if suplementos_lista and suplementos_lista.strip():
-                        sup_count = len([line for line in suplementos_lista.split('\n') if line.strip()])
-                        st.info(f"💊 **Suplementos:** Consume suplementos adicionales ({sup_count} líneas registradas)")
-                    else:
-                        st.error("❌ **Suplementos:** Debe completar la lista de suplementos")
-                else:
-                    st.success("✅ **Suplementos:** No consume suplementos adicionales")
-        
-        # Advertencia importante
-        st.markdown("---")
-        st.error("""
-        ### ⚠️ ADVERTENCIA IMPORTANTE
-        
-        La información médica que has proporcionado será revisada cuidadosamente por nuestro equipo de nutrición.
-        
-        **Recuerda que:**
-        - Esta evaluación NO reemplaza una consulta médica profesional
-        - Si tienes condiciones médicas complejas, te recomendamos trabajar con tu médico tratante
-        - El plan nutricional será adaptado a tu contexto médico, pero siempre bajo supervisión profesional
-        - Cualquier duda sobre interacciones medicamento-alimento, consulta con tu médico
-        
-        **🔒 Privacidad:** Tu información médica es confidencial y será tratada con la máxima seguridad.
-        """)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Botones de navegación - Último paso, mostrar anterior y finalizar
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col1:
-            if st.button("⬅️ Anterior"):
-                go_to_previous_step()
-        with col3:
-            # Botón obligatorio para terminar y enviar email
-            if not st.session_state.get("correo_enviado", False):
-                if st.button("📧 Terminar y enviar mi evaluación por email", key="finalizar_con_email"):
-                    # Validar el paso 15 primero
-                    is_valid_15, missing_15 = validate_step_15()
-                    faltantes = datos_completos_para_email()
-                    grupos_incompletos = verificar_grupos_obligatorios_completos()
-                    
-                    if not is_valid_15:
-                        if len(missing_15) == 1:
-                            st.error(f"⚠️ **No se puede finalizar. Debes completar:** {missing_15[0]}")
-                        else:
-                            missing_list = "\n".join([f"• {item}" for item in missing_15])
-                            st.error(f"⚠️ **No se puede finalizar. Completa los siguientes campos del Paso 15:**\n\n{missing_list}")
-                        st.info("💡 **Recuerda:** Todos los campos del Paso 15 son obligatorios por tu seguridad.")
-                    elif faltantes:
-                        st.error(f"❌ No se puede finalizar. Faltan datos personales: {', '.join(faltantes)}")
-                    elif grupos_incompletos:
-                        st.error(f"""
-                        ❌ **No se puede finalizar. Grupos alimentarios incompletos:**
-                        
-                        Los siguientes grupos requieren al menos una selección (puedes marcar 'Ninguno' si no consumes ninguno):
-                        
-                        {chr(10).join([f'• {grupo}' for grupo in grupos_incompletos])}
-                        
-                        Por favor, completa estos grupos antes de finalizar la evaluación.
-                        """)
-                    else:
-                        with st.spinner("📧 Finalizando evaluación y enviando resumen por email..."):
-                            resumen_completo = crear_resumen_email()
-                            ok = enviar_email_resumen(
-                                resumen_completo, 
-                                st.session_state.get('nombre', ''), 
-                                st.session_state.get('email_cliente', ''), 
-                                st.session_state.get('fecha_llenado', ''), 
-                                st.session_state.get('edad', ''), 
-                                st.session_state.get('telefono', '')
-                            )
-                            if ok:
-                                st.session_state["correo_enviado"] = True
-                                st.session_state.step_completed[15] = True
-                                st.success("✅ ¡Evaluación completada exitosamente! Tu resumen fue enviado por email.")
-                                st.balloons()
-                            else:
-                                st.error("❌ Error al enviar email. No se puede finalizar hasta que el envío sea exitoso. Contacta a soporte técnico si el problema persiste.")
-            else:
-                st.success("🎊 ¡Felicitaciones! Has completado toda la evaluación de patrones alimentarios.")
-                st.info("✅ Tu evaluación ya fue enviada por email exitosamente.")
-
-    # RESULTADO FINAL: Solo mostrar después de enviar email exitosamente
-    if st.session_state.get("correo_enviado", False):
-        with st.expander("📈 **RESULTADO FINAL: Tu Perfil Alimentario Completo**", expanded=True):
-            progress.progress(100, text="Análisis completo: Generando tu perfil alimentario personalizado")
-
-            st.markdown('<div class="content-card">', unsafe_allow_html=True)
-            
-            st.markdown("### 🎯 Tu Perfil Alimentario Personalizado")
-            
-            # Crear resumen del perfil por grupos actuales
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("#### 👤 Información Personal")
-                st.write(f"• **Nombre:** {st.session_state.get('nombre', 'No especificado')}")
-                st.write(f"• **Edad:** {st.session_state.get('edad', 'No especificado')} años")
-                st.write(f"• **Sexo:** {st.session_state.get('sexo', 'No especificado')}")
-                st.write(f"• **Fecha evaluación:** {st.session_state.get('fecha_llenado', 'No especificado')}")
-                
-                st.markdown("#### 🥩 Grupo 1: Proteínas Grasas")
-                total_proteinas_grasas = len(st.session_state.get('huevos_embutidos', [])) + len(st.session_state.get('carnes_res_grasas', [])) + len(st.session_state.get('carnes_cerdo_grasas', [])) + len(st.session_state.get('carnes_pollo_grasas', [])) + len(st.session_state.get('organos_grasos', [])) + len(st.session_state.get('quesos_grasos', [])) + len(st.session_state.get('lacteos_enteros', [])) + len(st.session_state.get('pescados_grasos', [])) + len(st.session_state.get('mariscos_grasos', []))
-                st.write(f"• **Total alimentos seleccionados:** {total_proteinas_grasas}")
-                if st.session_state.get('huevos_embutidos'):
-                    st.write(f"• **Huevos/embutidos:** {len(st.session_state.get('huevos_embutidos', []))}")
-                if st.session_state.get('carnes_res_grasas'):
-                    st.write(f"• **Carnes de res grasas:** {len(st.session_state.get('carnes_res_grasas', []))}")
-                if st.session_state.get('carnes_cerdo_grasas'):
-                    st.write(f"• **Carnes de cerdo grasas:** {len(st.session_state.get('carnes_cerdo_grasas', []))}")
-                if st.session_state.get('carnes_pollo_grasas'):
-                    st.write(f"• **Carnes de pollo/pavo grasas:** {len(st.session_state.get('carnes_pollo_grasas', []))}")
-                
-                st.markdown("#### 🍗 Grupo 2: Proteínas Magras")
-                total_proteinas_magras = len(st.session_state.get('carnes_res_magras', [])) + len(st.session_state.get('carnes_cerdo_magras', [])) + len(st.session_state.get('carnes_pollo_magras', [])) + len(st.session_state.get('organos_magros', [])) + len(st.session_state.get('pescados_magros', [])) + len(st.session_state.get('mariscos_magros', [])) + len(st.session_state.get('quesos_magros', [])) + len(st.session_state.get('lacteos_light', [])) + len(st.session_state.get('huevos_embutidos_light', []))
-                st.write(f"• **Total alimentos seleccionados:** {total_proteinas_magras}")
-                if st.session_state.get('carnes_res_magras'):
-                    st.write(f"• **Carnes de res magras:** {len(st.session_state.get('carnes_res_magras', []))}")
-                if st.session_state.get('pescados_magros'):
-                    st.write(f"• **Pescados magros:** {len(st.session_state.get('pescados_magros', []))}")
-            
-            with col2:
-                st.markdown("#### 🥑 Grupo 3: Grasas Saludables")
-                total_grasas = len(st.session_state.get('grasas_naturales', [])) + len(st.session_state.get('frutos_secos_semillas', [])) + len(st.session_state.get('mantequillas_vegetales', []))
-                st.write(f"• **Total alimentos seleccionados:** {total_grasas}")
-                if st.session_state.get('grasas_naturales'):
-                    st.write(f"• **Grasas naturales:** {len(st.session_state.get('grasas_naturales', []))}")
-                if st.session_state.get('frutos_secos_semillas'):
-                    st.write(f"• **Frutos secos/semillas:** {len(st.session_state.get('frutos_secos_semillas', []))}")
-                
-                st.markdown("#### 🍞 Grupo 4: Carbohidratos")
-                total_carbohidratos = len(st.session_state.get('cereales_integrales', [])) + len(st.session_state.get('pastas', [])) + len(st.session_state.get('tortillas_panes', [])) + len(st.session_state.get('raices_tuberculos', [])) + len(st.session_state.get('leguminosas', []))
-                st.write(f"• **Total alimentos seleccionados:** {total_carbohidratos}")
-                if st.session_state.get('cereales_integrales'):
-                    st.write(f"• **Cereales:** {len(st.session_state.get('cereales_integrales', []))}")
-                if st.session_state.get('tortillas_panes'):
-                    st.write(f"• **Tortillas/panes:** {len(st.session_state.get('tortillas_panes', []))}")
-                
-                st.markdown("#### 🥬 Grupos 5 y 6: Vegetales y Frutas")
-                st.write(f"• **Vegetales:** {len(st.session_state.get('vegetales_lista', []))} seleccionados")
-                st.write(f"• **Frutas:** {len(st.session_state.get('frutas_lista', []))} seleccionadas")
-            
-            # Sección de información adicional
-            st.markdown("### 🍳 Información Adicional")
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("#### 🧈 Aceites de Cocción")
-                if st.session_state.get('aceites_coccion'):
-                    st.write(f"• **Aceites preferidos:** {len(st.session_state.get('aceites_coccion', []))} seleccionados")
-                    aceites_top = st.session_state.get('aceites_coccion', [])[:3]
-                    for aceite in aceites_top:
-                        st.write(f"  - {aceite}")
-                
-                st.markdown("#### 🥤 Bebidas Sin Calorías")
-                if st.session_state.get('bebidas_sin_calorias'):
-                    st.write(f"• **Bebidas preferidas:** {len(st.session_state.get('bebidas_sin_calorias', []))} seleccionadas")
-                    bebidas_top = st.session_state.get('bebidas_sin_calorias', [])[:3]
-                    for bebida in bebidas_top:
-                        st.write(f"  - {bebida}")
-            
-            with col2:
-                st.markdown("#### 👨‍🍳 Métodos de Cocción")
-                if st.session_state.get('metodos_coccion_accesibles'):
-                    st.write(f"• **Métodos preferidos:** {len(st.session_state.get('metodos_coccion_accesibles', []))} seleccionados")
-                    metodos_top = st.session_state.get('metodos_coccion_accesibles', [])[:3]
-                    for metodo in metodos_top:
-                        st.write(f"  - {metodo}")
-                
-                if st.session_state.get('otro_metodo_coccion'):
-                    st.write(f"• **Otro método:** {st.session_state.get('otro_metodo_coccion', 'No especificado')}")
-
-            # Restricciones importantes
-            if st.session_state.get('alergias_alimentarias') or st.session_state.get('intolerancias_digestivas'):
-                st.markdown("### ⚠️ Restricciones Importantes")
-                if st.session_state.get('alergias_alimentarias'):
-                    st.warning(f"**Alergias alimentarias:** {', '.join(st.session_state.get('alergias_alimentarias', []))}")
-                    if st.session_state.get('otra_alergia'):
-                        st.write(f"• **Otra alergia:** {st.session_state.get('otra_alergia')}")
-                
-                if st.session_state.get('intolerancias_digestivas'):
-                    st.info(f"**Intolerancias digestivas:** {', '.join(st.session_state.get('intolerancias_digestivas', []))}")
-                    if st.session_state.get('otra_intolerancia'):
-                        st.write(f"• **Otra intolerancia:** {st.session_state.get('otra_intolerancia')}")
-
-            # Antojos alimentarios
-            st.markdown("### 😋 Patrones de Antojos Alimentarios")
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                if st.session_state.get('antojos_dulces'):
-                    st.write(f"• **Antojos dulces:** {len(st.session_state.get('antojos_dulces', []))} tipos")
-                if st.session_state.get('antojos_salados'):
-                    st.write(f"• **Antojos salados:** {len(st.session_state.get('antojos_salados', []))} tipos")
-                if st.session_state.get('antojos_comida_rapida'):
-                    st.write(f"• **Comida rápida:** {len(st.session_state.get('antojos_comida_rapida', []))} tipos")
-            
-            with col2:
-                if st.session_state.get('antojos_bebidas'):
-                    st.write(f"• **Bebidas con calorías:** {len(st.session_state.get('antojos_bebidas', []))} tipos")
-                if st.session_state.get('antojos_picantes'):
-                    st.write(f"• **Condimentos picantes:** {len(st.session_state.get('antojos_picantes', []))} tipos")
-                if st.session_state.get('otros_antojos'):
-                    st.write(f"• **Otros antojos especificados:** Sí")
-
-            # Información de frecuencia de comidas
-            # CAMBIO: Usar nueva variable de checkboxes
-            frecuencia_list = st.session_state.get('frecuencia_comidas_ck', [])
-            if frecuencia_list and len(frecuencia_list) > 0:
-                st.markdown("### 🍽️ Frecuencia de Comidas Preferida")
-                frecuencia = frecuencia_list[0]  # Tomar la primera (debería ser la única)
-                if frecuencia == "Otro (especificar)" and st.session_state.get('otra_frecuencia'):
-                    st.info(f"**Frecuencia personalizada:** {st.session_state.get('otra_frecuencia')}")
-                else:
-                    st.info(f"**Frecuencia seleccionada:** {frecuencia}")
-
-            # Sugerencias de menús
-            if st.session_state.get('sugerencias_menus'):
-                st.markdown("### 📝 Sugerencias de Menús")
-                sugerencias = st.session_state.get('sugerencias_menus', '')
-                palabra_count = len(sugerencias.split()) if sugerencias else 0
-                st.info(f"**Sugerencias del cliente:** {sugerencias[:200]}{'...' if len(sugerencias) > 200 else ''}")
-                if palabra_count > 0:
-                    st.success(f"**Detalle:** {palabra_count} palabras de sugerencias específicas proporcionadas")
-
-            # Proteína en Polvo
-            st.markdown("### 💪 Proteína en Polvo")
-            if st.session_state.get('proteina_polvo_tipos'):
-                tipos_proteina = st.session_state.get('proteina_polvo_tipos', [])
-                if "Ninguno (no consumo proteína en polvo)" in tipos_proteina:
-                    st.info("ℹ️ **No consume proteína en polvo**")
-                else:
-                    st.write(f"• **Tipos consumidos:** {len(tipos_proteina)} seleccionados")
-                    for tipo in tipos_proteina:
-                        st.write(f"  - {tipo}")
-                    
-                    # Mostrar preferencia de marca
-                    preferencia = st.session_state.get('preferencia_marca_proteina', [])
-                    if preferencia and len(preferencia) > 0 and preferencia[0] == "Sí":
-                        marca = st.session_state.get('nombre_marca_proteina', 'No especificada')
-                        st.success(f"🏷️ **Marca preferida:** {marca}")
-
-            # Recomendaciones personalizadas basadas en datos reales
-            st.markdown("### 💡 Recomendaciones Personalizadas Iniciales")
-            
-            # Análisis básico basado en las respuestas actuales
-            recomendaciones = []
-            
-            # Verificar diversidad de alimentos por grupo
-            total_grupos_completos = 0
-            if len(st.session_state.get('huevos_embutidos', [])) + len(st.session_state.get('carnes_res_grasas', [])) > 0:
-                total_grupos_completos += 1
-            if len(st.session_state.get('carnes_res_magras', [])) + len(st.session_state.get('pescados_magros', [])) > 0:
-                total_grupos_completos += 1
-            if len(st.session_state.get('grasas_naturales', [])) + len(st.session_state.get('frutos_secos_semillas', [])) > 0:
-                total_grupos_completos += 1
-            if len(st.session_state.get('cereales_integrales', [])) + len(st.session_state.get('pastas', [])) + len(st.session_state.get('tortillas_panes', [])) > 0:
-                total_grupos_completos += 1
-            if len(st.session_state.get('vegetales_lista', [])) > 5:
-                total_grupos_completos += 1
-            if len(st.session_state.get('frutas_lista', [])) > 5:
-                total_grupos_completos += 1
-            
-            if total_grupos_completos >= 5:
-                recomendaciones.append("✅ **Diversidad nutricional excelente:** Tienes una buena variedad de alimentos en la mayoría de grupos alimentarios.")
-            elif total_grupos_completos >= 3:
-                recomendaciones.append("🔄 **Diversidad nutricional moderada:** Considera ampliar la variedad en algunos grupos alimentarios.")
-            else:
-                recomendaciones.append("📈 **Oportunidad de mejora:** Ampliar la variedad de alimentos puede enriquecer tu plan nutricional.")
-            
-            # Verificar métodos de cocción
-            if len(st.session_state.get('metodos_coccion_accesibles', [])) >= 4:
-                recomendaciones.append("👨‍🍳 **Versatilidad culinaria:** Tienes múltiples métodos de cocción disponibles, ideal para variedad en preparaciones.")
-            elif len(st.session_state.get('metodos_coccion_accesibles', [])) >= 2:
-                recomendaciones.append("🔧 **Métodos básicos:** Con tus métodos de cocción actuales puedes crear preparaciones nutritivas y variadas.")
-            
-            # Verificar restricciones
-            if st.session_state.get('alergias_alimentarias') or st.session_state.get('intolerancias_digestivas'):
-                recomendaciones.append("⚠️ **Plan especializado:** Tus restricciones alimentarias requerirán un plan personalizado cuidadoso.")
-            
-            # Verificar antojos
-            total_antojos = len(st.session_state.get('antojos_dulces', [])) + len(st.session_state.get('antojos_salados', [])) + len(st.session_state.get('antojos_comida_rapida', []))
-            if total_antojos > 10:
-                recomendaciones.append("🧠 **Manejo de antojos:** Se recomienda desarrollar estrategias específicas para controlar los antojos identificados.")
-            elif total_antojos > 5:
-                recomendaciones.append("⚖️ **Equilibrio:** Incluir alternativas saludables para satisfacer antojos ocasionales.")
-            
-            if not recomendaciones:
-                recomendaciones.append("📋 **Perfil base establecido:** Se requiere más información para recomendaciones específicas.")
-            
-            for i, rec in enumerate(recomendaciones, 1):
-                st.write(f"{i}. {rec}")
-
-            st.success(f"""
-            ### ✅ Análisis de patrones alimentarios completado exitosamente
-            
-            **Tu perfil nutricional personalizado está listo** y incluye información detallada sobre:
-            - 6 grupos alimentarios principales evaluados
-            - Suplementación con proteína en polvo (tipos y marcas preferidas)
-            - Métodos de cocción disponibles y preferidos  
-            - Restricciones, alergias e intolerancias específicas
-            - Patrones de antojos alimentarios identificados
-            - Aceites de cocción y bebidas sin calorías preferidas
-            
-            **Este análisis integral permitirá crear un plan nutricional completamente adaptado** 
-            a tus gustos, tolerancias y necesidades específicas.
-            
-            La información será enviada a nuestro equipo de nutrición para desarrollar tu plan personalizado.
-            """)
-
-            st.markdown('</div>', unsafe_allow_html=True)
-
-
-# Opción para reenviar manualmente (solo si ya se envió)
-if st.session_state.get("correo_enviado", False):
-    st.markdown("---")
-    st.markdown("### 📧 Opciones de Email")
-    if st.button("📧 Reenviar Email", key="reenviar_email"):
-        faltantes = datos_completos_para_email()
-        grupos_incompletos = verificar_grupos_obligatorios_completos()
-        
-        if faltantes:
-            st.error(f"❌ No se puede reenviar el email. Faltan datos personales: {', '.join(faltantes)}")
-        elif grupos_incompletos:
-            st.error(f"""
-            ❌ **No se puede reenviar el email. Grupos incompletos:**
-            
-            Los siguientes grupos alimentarios requieren al menos una selección:
-            
-            {chr(10).join([f'• {grupo}' for grupo in grupos_incompletos])}
-            """)
-        else:
-            with st.spinner("📧 Reenviando resumen por email..."):
-                resumen_completo = crear_resumen_email()
-                ok = enviar_email_resumen(
-                    resumen_completo, 
-                    st.session_state.get('nombre', ''), 
-                    st.session_state.get('email_cliente', ''), 
-                    st.session_state.get('fecha_llenado', ''), 
-                    st.session_state.get('edad', ''), 
-                    st.session_state.get('telefono', '')
-                )
-                if ok:
-                    st.session_state["correo_enviado"] = True
-                    st.success("✅ Email reenviado exitosamente a administración")
-                else:
-                    st.error("❌ Error al reenviar email. Contacta a soporte técnico.")
-
-# Limpieza de sesión y botón de nueva evaluación
-if st.button("🔄 Nueva Evaluación", key="nueva"):
-    for key in list(st.session_state.keys()):
-        del st.session_state[key]
-    st.rerun()
-
-# Footer moderno
-st.markdown("""
-<div class="footer-mupai">
-    <h4>MUPAI / Muscle up GYM Alimentary Pattern Assessment Intelligence</h4>
-    <span>Digital Nutrition Science</span>
-    <br>
-    <span>© 2025 MUPAI - Muscle up GYM / MUPAI</span>
-    <br>
-    <a href="https://muscleupgym.fitness" target="_blank">muscleupgym.fitness</a>
-</div>
-""", unsafe_allow_html=True)
+    pagina = st.navigation(list(paginas.values()), position="hidden")
+
+    # Bloquear acceso directo (por URL) a páginas aún no desbloqueadas
+    ruta_pagina = next(ruta for ruta, p in paginas.items() if p is pagina)
+    if not pagina_permitida(ruta_pagina):
+        st.switch_page(paginas[etapa])
+
+    aplicar_estilos()
+    avisar_sesion_desalojada()
+    if panel_instrumentacion_activo():
+        mostrar_panel_instrumentacion()
+    pagina.run()
+finally:
+    terminar_rerun()
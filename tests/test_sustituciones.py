@@ -0,0 +1,15 @@
+from mupai.alergenos import conflictos
+from mupai.catalogo import OPCIONES
+from mupai.respuestas import Respuestas
+from mupai.resumen import crear_resumen
+from mupai.sustituciones import grafo, sugerencias
+
+
+def test_conflicto_con_bebida_sin_calorias_no_tiene_sustitutos():
+    bebida = next(opcion for opcion in OPCIONES["bebidas_sin_calorias"] if "electrolitos" in opcion)
+    r = Respuestas(intolerancias_digestivas=["Endulzantes artificiales"], bebidas_sin_calorias=[bebida])
+
+    assert [c["alimentos"] for c in conflictos(r)] == [[bebida]]
+    assert bebida not in grafo()
+    assert sugerencias(bebida, r) == []
+    assert "Sustitutos de " + bebida in crear_resumen(r)